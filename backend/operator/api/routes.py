@@ -2,21 +2,28 @@
 from __future__ import annotations
 
 import json
-from typing import Any
+from typing import Any, AsyncIterator, Optional, Tuple
 
 from fastapi import APIRouter, Depends, HTTPException, WebSocket, WebSocketDisconnect
-from fastapi.responses import Response
+from fastapi.responses import Response, StreamingResponse
 
 from ..models.api import (
     CameraConfigResponse,
     CameraConfigUpdate,
+    CommandBatchRequest,
+    CommandBatchResponse,
     CommandRequest,
     CommandResponse,
     ControlState,
+    MacroReport,
+    MacroRequest,
+    OdometryReplayRequest,
+    OdometryResetRequest,
     ServiceInfo,
     ShelfMapResetRequest,
     ShelfMapResponse,
     ShelfMapUpdateRequest,
+    TelemetryCaptureRequest,
     ControlTransportUpdate,
     WifiConfigResponse,
     WifiConfigUpdate,
@@ -27,7 +34,11 @@ from ..services.operator_service import (
     OperatorService,
 )
 from ..services.dependencies import get_service
-from ..esp32_link import SerialNotFoundError
+from ..services.motion_macro import MacroBusyError, MacroError
+from ..services.odometry import OdometryConfig, ReplayError
+from ..services.telemetry_capture import CaptureBusyError, CaptureError
+from ..services.telemetry_history import HistoryError
+from ..esp32_link import CommandError, SerialNotFoundError
 
 router = APIRouter()
 
@@ -53,25 +64,199 @@ async def api_command(
         )
     except SerialNotFoundError as exc:
         raise HTTPException(status_code=503, detail=str(exc)) from exc
+    except CommandError as exc:
+        raise HTTPException(status_code=502, detail=str(exc)) from exc
 
     return CommandResponse(command=request.command, raw=result.raw, data=result.data)
 
 
+@router.post("/api/command/stream")
+async def api_command_stream(
+    request: CommandRequest,
+    svc: OperatorService = Depends(get_service),
+) -> StreamingResponse:
+    """Stream the reply as newline-delimited JSON: ``line`` events, then ``result``."""
+
+    events = svc.stream_command(request.command, raise_on_error=request.raise_on_error)
+    first: Optional[Tuple[str, Any]] = None
+    failure: Optional[CommandError] = None
+    try:
+        # Waiting for the first event keeps "no transport" a plain 503.
+        first = await anext(events)
+    except SerialNotFoundError as exc:
+        raise HTTPException(status_code=503, detail=str(exc)) from exc
+    except CommandError as exc:
+        # An ERR reply that arrives whole (Wi-Fi) fails before any line was yielded.
+        failure = exc
+
+    async def body() -> AsyncIterator[str]:
+        event = first
+        try:
+            if failure is not None:
+                yield json.dumps({"type": "error", "error": str(failure)}) + "\n"
+            while event is not None:
+                kind, value = event
+                if kind == "line":
+                    yield json.dumps({"type": "line", "line": value}) + "\n"
+                else:
+                    yield json.dumps(
+                        {"type": "result", "command": request.command, "raw": value.raw, "data": value.data}
+                    ) + "\n"
+                try:
+                    event = await anext(events)
+                except StopAsyncIteration:
+                    event = None
+                except (CommandError, SerialNotFoundError) as exc:
+                    yield json.dumps({"type": "error", "error": str(exc)}) + "\n"
+                    event = None
+        finally:
+            await events.aclose()
+
+    return StreamingResponse(body(), media_type="application/x-ndjson")
+
+
+@router.post("/api/commands", response_model=CommandBatchResponse)
+async def api_commands(
+    request: CommandBatchRequest,
+    svc: OperatorService = Depends(get_service),
+) -> CommandBatchResponse:
+    try:
+        outcome = await svc.run_sequence([step.model_dump() for step in request.steps])
+    except SerialNotFoundError as exc:
+        raise HTTPException(status_code=503, detail=str(exc)) from exc
+
+    results = []
+    for item in outcome["results"]:
+        result = item["result"]
+        results.append(
+            {
+                "command": item["command"],
+                "ok": item["ok"],
+                "skipped": item["skipped"],
+                "error": item["error"],
+                "raw": result.raw if result is not None else [],
+                "data": result.data if result is not None else {},
+            }
+        )
+    return CommandBatchResponse(transport=outcome["transport"], results=results)
+
+
+@router.post("/api/macros", response_model=MacroReport)
+async def api_start_macro(
+    request: MacroRequest,
+    svc: OperatorService = Depends(get_service),
+) -> MacroReport:
+    try:
+        report = await svc.start_macro([step.model_dump() for step in request.steps])
+    except MacroError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+    except MacroBusyError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
+    return MacroReport(**report)
+
+
+@router.get("/api/macros/{macro_id}", response_model=MacroReport)
+async def api_get_macro(
+    macro_id: str,
+    svc: OperatorService = Depends(get_service),
+) -> MacroReport:
+    report = svc.get_macro(macro_id)
+    if report is None:
+        raise HTTPException(status_code=404, detail=f"unknown macro {macro_id}")
+    return MacroReport(**report)
+
+
+@router.post("/api/macros/{macro_id}/cancel", response_model=MacroReport)
+async def api_cancel_macro(
+    macro_id: str,
+    svc: OperatorService = Depends(get_service),
+) -> MacroReport:
+    report = await svc.cancel_macro(macro_id)
+    if report is None:
+        raise HTTPException(status_code=404, detail=f"unknown macro {macro_id}")
+    return MacroReport(**report)
+
+
+@router.post("/api/telemetry/capture")
+async def api_telemetry_capture(
+    request: TelemetryCaptureRequest,
+    svc: OperatorService = Depends(get_service),
+) -> Response:
+    try:
+        capture = await svc.capture_telemetry(
+            duration=request.duration, rate=request.rate, fields=request.fields
+        )
+    except CaptureError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+    except CaptureBusyError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
+    except SerialNotFoundError as exc:
+        raise HTTPException(status_code=503, detail=str(exc)) from exc
+
+    if request.format == "binary":
+        return Response(
+            content=capture.to_binary(),
+            media_type="application/octet-stream",
+            headers={"Content-Disposition": 'attachment; filename="telemetry-capture.bin"'},
+        )
+    return StreamingResponse(
+        capture.iter_ndjson(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="telemetry-capture.ndjson"'},
+    )
+
+
+@router.get("/api/telemetry/history")
+async def api_telemetry_history(
+    fields: Optional[str] = None,
+    window: float = 600.0,
+    points: int = 800,
+    method: str = "lttb",
+    svc: OperatorService = Depends(get_service),
+) -> dict[str, Any]:
+    names = [name.strip() for name in fields.split(",") if name.strip()] if fields else None
+    try:
+        return svc.telemetry_history(fields=names, window=window, points=points, method=method)
+    except HistoryError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+
+
+@router.get("/api/odometry")
+async def api_odometry(svc: OperatorService = Depends(get_service)) -> dict[str, Any]:
+    return svc.odometry()
+
+
+@router.post("/api/odometry/reset")
+async def api_reset_odometry(
+    request: Optional[OdometryResetRequest] = None,
+    svc: OperatorService = Depends(get_service),
+) -> dict[str, Any]:
+    pose = request or OdometryResetRequest()
+    return svc.reset_odometry(x_mm=pose.x_mm, y_mm=pose.y_mm, theta_rad=pose.theta_rad)
+
+
+@router.post("/api/odometry/replay")
+async def api_replay_odometry(
+    request: OdometryReplayRequest,
+    svc: OperatorService = Depends(get_service),
+) -> dict[str, Any]:
+    configs = [OdometryConfig(**config.model_dump()) for config in request.configs]
+    try:
+        return svc.replay_odometry(configs, points=request.points)
+    except ReplayError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
+
+
 @router.websocket("/ws/telemetry")
 async def telemetry_ws(
     websocket: WebSocket,
     svc: OperatorService = Depends(get_service),
 ) -> None:
     await websocket.accept()
-    queue = await svc.register_client()
     try:
-        while True:
-            payload = await queue.get()
-            await websocket.send_text(json.dumps(payload))
+        await svc.serve_telemetry(websocket)
     except WebSocketDisconnect:  # pragma: no cover - network event
         pass
-    finally:
-        await svc.unregister_client(queue)
 
 
 @router.websocket("/ws/camera")
@@ -86,6 +271,30 @@ async def camera_ws(
         pass
 
 
+@router.websocket("/ws/command")
+async def command_ws(
+    websocket: WebSocket,
+    svc: OperatorService = Depends(get_service),
+) -> None:
+    await websocket.accept()
+    try:
+        await svc.serve_command_channel(websocket)
+    except WebSocketDisconnect:  # pragma: no cover - network event
+        pass
+
+
+@router.websocket("/ws/teleop")
+async def teleop_ws(
+    websocket: WebSocket,
+    svc: OperatorService = Depends(get_service),
+) -> None:
+    await websocket.accept()
+    try:
+        await svc.serve_teleop(websocket)
+    except WebSocketDisconnect:  # pragma: no cover - network event
+        pass
+
+
 @router.get("/api/camera/snapshot")
 async def api_camera_snapshot(svc: OperatorService = Depends(get_service)) -> Response:
     try:
@@ -0,0 +1,15 @@
+"""End-to-end benchmarks for the operator backend against the ESP32 simulator."""
+from __future__ import annotations
+
+from .stack import BenchmarkStack
+from .stats import Finding, compare_results, format_findings, latency_summary, percentile, regressions
+
+__all__ = [
+    "BenchmarkStack",
+    "Finding",
+    "compare_results",
+    "format_findings",
+    "latency_summary",
+    "percentile",
+    "regressions",
+]
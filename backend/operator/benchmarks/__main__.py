@@ -0,0 +1,182 @@
+"""Command-line entry point: ``python -m backend.operator.benchmarks``."""
+from __future__ import annotations
+
+import asyncio
+import json
+import platform
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import typer  # type: ignore
+
+from . import scenarios
+from .failover import FAULT_MODES, run_failover
+from .stack import BenchmarkStack
+from .stats import DEFAULT_TOLERANCE, compare_results, format_findings, regressions
+
+app = typer.Typer(add_completion=False, help="Operator backend benchmarks")
+
+DEFAULT_SCENARIOS = ("startup", "command_rtt", "command_channel", "status_poll", "api_status", "fanout", "camera")
+# Failover restarts the stack once per fault mode, so it only runs when asked for.
+SCENARIOS = DEFAULT_SCENARIOS + ("failover",)
+
+
+def _parse_ints(value: str) -> List[int]:
+    return [int(item) for item in value.split(",") if item.strip()]
+
+
+def _load(path: Path) -> Dict[str, Any]:
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+async def _run_live(
+    stack: BenchmarkStack,
+    selected: List[str],
+    *,
+    samples: int,
+    duration: float,
+    clients: List[int],
+    concurrency: List[int],
+    viewers: List[int],
+) -> Dict[str, Any]:
+    results: Dict[str, Any] = {}
+    if "command_rtt" in selected:
+        results["command_rtt"] = await scenarios.command_rtt(stack, samples=samples)
+    if "command_channel" in selected:
+        results["command_channel"] = await scenarios.command_channel(stack, samples=samples)
+    if "status_poll" in selected:
+        results["status_poll"] = await scenarios.status_poll(stack, duration=duration)
+    if "api_status" in selected:
+        results["api_status"] = await scenarios.api_status_load(stack, duration=duration, concurrency=concurrency)
+    if "fanout" in selected:
+        results["fanout"] = await scenarios.fanout(stack, duration=duration, client_counts=clients)
+    if "camera" in selected:
+        results["camera"] = await scenarios.camera_fps(stack, duration=duration, viewer_counts=viewers)
+    return results
+
+
+def _report(current: Dict[str, Any], baseline_path: Optional[Path], tolerance: float) -> int:
+    if baseline_path is None:
+        return 0
+    findings = compare_results(current, _load(baseline_path), tolerance=tolerance)
+    typer.echo(format_findings(findings))
+    return 1 if regressions(findings) else 0
+
+
+@app.command("run")
+def run_benchmarks(
+    output: Optional[Path] = typer.Option(None, "--output", "-o", help="Write results JSON here"),
+    baseline: Optional[Path] = typer.Option(None, help="Compare against this results JSON"),
+    tolerance: float = typer.Option(DEFAULT_TOLERANCE, help="Relative change treated as a regression"),
+    only: str = typer.Option(
+        ",".join(DEFAULT_SCENARIOS), "--scenarios", help=f"Comma-separated scenarios ({', '.join(SCENARIOS)})"
+    ),
+    samples: int = typer.Option(50, help="Commands per transport for command_rtt and command_channel"),
+    duration: float = typer.Option(5.0, help="Seconds per throughput/fan-out measurement"),
+    clients: str = typer.Option("1,10,100,500", help="WebSocket client counts for fanout"),
+    concurrency: str = typer.Option("1,8,32", help="Parallel clients for api_status"),
+    viewers: str = typer.Option("1,4", help="Camera viewer counts"),
+    fault_modes: str = typer.Option(",".join(FAULT_MODES), help="Failure modes for the failover scenario"),
+    fault_window: float = typer.Option(10.0, help="Seconds each injected fault stays active"),
+    fault_transport: str = typer.Option("wifi", help="Transport the faults are injected into"),
+    quick: bool = typer.Option(False, "--quick", help="Short smoke run: few samples, small client counts"),
+) -> None:
+    """Run the selected scenarios and print the results JSON."""
+
+    selected = [name.strip() for name in only.split(",") if name.strip()]
+    unknown = sorted(set(selected) - set(SCENARIOS))
+    if unknown:
+        raise typer.BadParameter(f"unknown scenarios: {', '.join(unknown)}")
+    client_counts = _parse_ints(clients)
+    levels = _parse_ints(concurrency)
+    viewer_counts = _parse_ints(viewers)
+    modes = [mode.strip() for mode in fault_modes.split(",") if mode.strip()]
+    grace = 15.0
+    if quick:
+        samples, duration = min(samples, 10), min(duration, 1.5)
+        fault_window, grace = min(fault_window, 5.0), 8.0
+        client_counts = [count for count in client_counts if count <= 10] or [1]
+        levels = [level for level in levels if level <= 8] or [1]
+
+    started = time.time()
+    results: Dict[str, Any] = {}
+    if "startup" in selected:
+        results["startup"] = scenarios.startup()
+    if "failover" in selected:
+        results["failover"] = run_failover(
+            modes=modes, transport=fault_transport, window_s=fault_window, grace_s=grace
+        )
+    live = [name for name in selected if name not in ("startup", "failover")]
+    stack_info: Dict[str, Any] = {}
+    if live:
+        with BenchmarkStack() as stack:
+            stack_info = stack.describe()
+            results.update(
+                asyncio.run(
+                    _run_live(
+                        stack,
+                        live,
+                        samples=samples,
+                        duration=duration,
+                        clients=client_counts,
+                        concurrency=levels,
+                        viewers=viewer_counts,
+                    )
+                )
+            )
+
+    document = {
+        "meta": {
+            "started_at": started,
+            "elapsed_s": time.time() - started,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "scenarios": selected,
+            "samples": samples,
+            "duration": duration,
+            "stack": stack_info,
+        },
+        "results": results,
+    }
+    text = json.dumps(document, indent=2, sort_keys=True)
+    if output is not None:
+        output.write_text(text + "\n", encoding="utf-8")
+    else:
+        typer.echo(text)
+    code = _report(document, baseline, tolerance)
+    if code:
+        raise typer.Exit(code)
+
+
+@app.command("compare")
+def compare(
+    current: Path = typer.Argument(..., help="Results JSON of the run under test"),
+    baseline: Path = typer.Argument(..., help="Stored baseline results JSON"),
+    tolerance: float = typer.Option(DEFAULT_TOLERANCE, help="Relative change treated as a regression"),
+) -> None:
+    """Compare two result files; exit code 1 when anything regressed."""
+
+    code = _report(_load(current), baseline, tolerance)
+    if code:
+        raise typer.Exit(code)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = argv if argv is not None else sys.argv[1:]
+    try:
+        app(prog_name="rbm-operator-bench", args=args, standalone_mode=False)
+    except typer.Exit as exc:
+        return exc.exit_code
+    return 0
+
+
+def run() -> None:
+    """Entry point for console_scripts."""
+
+    sys.exit(main(sys.argv[1:]))
+
+
+if __name__ == "__main__":  # pragma: no cover - manual execution
+    run()
@@ -0,0 +1,159 @@
+"""Failover harness: time-to-detect and time-to-recover per injected failure mode.
+
+Each mode gets a fresh stack whose server loads a :class:`FaultPlan` through
+``OPERATOR_FAULT_PLAN``. The plan opens the fault window after a warm-up, while the
+harness watches ``/ws/telemetry`` and ``/api/control/transport`` from outside:
+
+* ``detect_s`` — fault start until the backend shows it noticed (a telemetry error,
+  the faulted transport marked unavailable, or a switch away from it);
+* ``recover_s`` — fault start until telemetry flows again after detection;
+* ``max_gap_s`` — the longest stretch without good telemetry around the window.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import tempfile
+import time
+from dataclasses import replace
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import httpx
+
+from ..fault_injection import Fault, FaultPlan
+from .stack import BenchmarkStack
+
+try:  # pragma: no cover - optional dependency
+    from websockets.asyncio.client import connect as ws_connect
+except ImportError:  # pragma: no cover - handled at runtime
+    ws_connect = None  # type: ignore[assignment]
+
+FAULT_MODES: Dict[str, Fault] = {
+    "latency": Fault("latency", delay_s=0.5, jitter_s=0.2, distribution="normal"),
+    "loss": Fault("loss", probability=0.5),
+    "line_loss": Fault("line_loss", probability=0.3),
+    "disconnect": Fault("disconnect"),
+    "stall": Fault("stall"),
+    "truncate": Fault("truncate"),
+}
+DEFAULT_WARMUP_S = 8.0
+CONTROL_POLL_S = 0.1
+
+
+async def _watch_telemetry(stack: BenchmarkStack, until: float, events: List[Tuple[float, bool]]) -> None:
+    async with ws_connect(f"{stack.ws_base_url}/ws/telemetry", max_size=None) as client:
+        while True:
+            remaining = until - time.time()
+            if remaining <= 0:
+                return
+            try:
+                message = await asyncio.wait_for(client.recv(), timeout=remaining)
+            except asyncio.TimeoutError:
+                return
+            payload = json.loads(message)
+            events.append((time.time(), "error" not in payload and bool(payload.get("data"))))
+
+
+async def _watch_control(
+    stack: BenchmarkStack,
+    until: float,
+    transport: str,
+    samples: List[Tuple[float, Optional[str], bool]],
+) -> None:
+    async with httpx.AsyncClient(base_url=stack.base_url, timeout=5.0) as client:
+        while time.time() < until:
+            try:
+                response = await client.get("/api/control/transport")
+                state = response.json()
+            except (httpx.HTTPError, ValueError):
+                await asyncio.sleep(CONTROL_POLL_S)
+                continue
+            available = any(
+                item.get("id") == transport and item.get("available")
+                for item in state.get("transports", [])
+            )
+            samples.append((time.time(), state.get("active"), available))
+            await asyncio.sleep(CONTROL_POLL_S)
+
+
+def summarize_window(
+    telemetry: Sequence[Tuple[float, bool]],
+    control: Sequence[Tuple[float, Optional[str], bool]],
+    *,
+    transport: str,
+    start: float,
+    end: float,
+) -> Dict[str, Any]:
+    """Reduce observed telemetry/control samples to the failover metrics."""
+
+    detections = [at for at, ok in telemetry if at >= start and not ok]
+    detections += [at for at, active, available in control if at >= start and (active != transport or not available)]
+    detected_at = min(detections) if detections else None
+
+    recovered_at: Optional[float] = None
+    if detected_at is not None:
+        recovered_at = next((at for at, ok in telemetry if ok and at > detected_at), None)
+
+    good = [at for at, ok in telemetry if ok and start <= at <= end]
+    edges = [start] + good + [end]
+    healthy_before = any(ok for at, ok in telemetry if start - DEFAULT_WARMUP_S <= at < start)
+    return {
+        "healthy_before": healthy_before,
+        "detect_s": detected_at - start if detected_at is not None else None,
+        # Detected but never back within the observation window counts as the whole window.
+        "recover_s": (
+            (recovered_at - start if recovered_at is not None else end - start)
+            if detected_at is not None
+            else None
+        ),
+        "max_gap_s": max(later - earlier for earlier, later in zip(edges, edges[1:])),
+        "telemetry_errors": sum(1 for at, ok in telemetry if start <= at <= end and not ok),
+        "failed_over": int(any(active not in (None, transport) for at, active, _ in control if at >= start)),
+    }
+
+
+async def _observe(stack: BenchmarkStack, transport: str, start: float, end: float) -> Dict[str, Any]:
+    telemetry: List[Tuple[float, bool]] = []
+    control: List[Tuple[float, Optional[str], bool]] = []
+    await asyncio.gather(
+        _watch_telemetry(stack, end, telemetry),
+        _watch_control(stack, end, transport, control),
+    )
+    return summarize_window(telemetry, control, transport=transport, start=start, end=end)
+
+
+def run_failover(
+    *,
+    modes: Sequence[str] = tuple(FAULT_MODES),
+    transport: str = "wifi",
+    window_s: float = 10.0,
+    grace_s: float = 15.0,
+    warmup_s: float = DEFAULT_WARMUP_S,
+    seed: Optional[int] = 1,
+) -> Dict[str, Any]:
+    """Run one fresh stack per failure mode and report detection/recovery times."""
+
+    if ws_connect is None:
+        raise RuntimeError("websockets is not installed; install via 'pip install websockets'.")
+    unknown = sorted(set(modes) - set(FAULT_MODES))
+    if unknown:
+        raise ValueError(f"unknown fault modes: {', '.join(unknown)}")
+
+    results: Dict[str, Any] = {}
+    with tempfile.TemporaryDirectory(prefix="rbm-failover-") as workdir:
+        for mode in modes:
+            fault = replace(FAULT_MODES[mode], transport=transport, start_s=0.0, duration_s=window_s)
+            plan = FaultPlan(epoch=time.time() + warmup_s, faults=[fault], seed=seed)
+            plan_path = os.path.join(workdir, f"{mode}.json")
+            plan.save(plan_path)
+            with BenchmarkStack(extra_env={"OPERATOR_FAULT_PLAN": plan_path}) as stack:
+                summary = asyncio.run(
+                    _observe(stack, transport, plan.epoch, plan.epoch + window_s + grace_s)
+                )
+            summary["fault_window"] = window_s
+            results[mode] = summary
+    return results
+
+
+__all__ = ["FAULT_MODES", "run_failover", "summarize_window"]
@@ -0,0 +1,354 @@
+"""Benchmark scenarios run against a :class:`BenchmarkStack`.
+
+Every scenario returns a plain dict; metric names carry their unit and direction in
+the suffix (``_ms``/``_s`` lower is better, ``_per_s``/``_fps`` higher is better) so
+:func:`~backend.operator.benchmarks.stats.compare_results` can check them generically.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+import httpx
+
+from .stack import BenchmarkStack
+from .stats import latency_summary
+
+try:  # pragma: no cover - optional dependency
+    from websockets.asyncio.client import connect as ws_connect
+except ImportError:  # pragma: no cover - handled at runtime
+    ws_connect = None  # type: ignore[assignment]
+
+TRANSPORTS = ("serial", "wifi")
+CONNECT_CONCURRENCY = 50
+
+
+def _require_websockets() -> None:
+    if ws_connect is None:
+        raise RuntimeError("websockets is not installed; install via 'pip install websockets'.")
+
+
+async def _select_transport(client: httpx.AsyncClient, transport: str) -> None:
+    response = await client.post("/api/control/transport", json={"mode": transport})
+    response.raise_for_status()
+
+
+async def _timed_command(client: httpx.AsyncClient, command: str) -> Optional[float]:
+    started = time.perf_counter()
+    response = await client.post("/api/command", json={"command": command, "raise_on_error": False})
+    elapsed = time.perf_counter() - started
+    return elapsed if response.status_code == 200 else None
+
+
+async def command_rtt(
+    stack: BenchmarkStack,
+    *,
+    samples: int,
+    commands: Sequence[str] = ("caps", "status"),
+    transports: Sequence[str] = TRANSPORTS,
+) -> Dict[str, Any]:
+    """End-to-end ``POST /api/command`` round trips, per transport and command."""
+
+    results: Dict[str, Any] = {}
+    async with httpx.AsyncClient(base_url=stack.base_url, timeout=30.0) as client:
+        for transport in transports:
+            await _select_transport(client, transport)
+            per_command: Dict[str, Any] = {}
+            for command in commands:
+                await _timed_command(client, command)  # warm-up / negotiation
+                timings: List[float] = []
+                failures = 0
+                for _ in range(samples):
+                    elapsed = await _timed_command(client, command)
+                    if elapsed is None:
+                        failures += 1
+                    else:
+                        timings.append(elapsed)
+                summary = latency_summary(timings)
+                summary["request_errors"] = failures
+                per_command[command] = summary
+            results[transport] = per_command
+        await _select_transport(client, "auto")
+    return results
+
+
+async def command_channel(
+    stack: BenchmarkStack,
+    *,
+    samples: int,
+    commands: Sequence[str] = ("caps", "status"),
+    transports: Sequence[str] = TRANSPORTS,
+) -> Dict[str, Any]:
+    """Round trips over one kept-open ``/ws/command`` socket, per transport and command."""
+
+    _require_websockets()
+    results: Dict[str, Any] = {}
+    async with httpx.AsyncClient(base_url=stack.base_url, timeout=30.0) as client:
+        async with ws_connect(f"{stack.ws_base_url}/ws/command") as channel:
+            request_ids = iter(range(1, 1 << 30))
+
+            async def timed(command: str) -> Optional[float]:
+                request_id = next(request_ids)
+                started = time.perf_counter()
+                await channel.send(json.dumps({"id": request_id, "command": command}))
+                while True:
+                    reply = json.loads(await channel.recv())
+                    if reply["id"] == request_id and reply["type"] != "line":
+                        elapsed = time.perf_counter() - started
+                        return elapsed if reply["type"] == "result" else None
+
+            for transport in transports:
+                await _select_transport(client, transport)
+                per_command: Dict[str, Any] = {}
+                for command in commands:
+                    await timed(command)  # warm-up / negotiation
+                    timings: List[float] = []
+                    failures = 0
+                    for _ in range(samples):
+                        elapsed = await timed(command)
+                        if elapsed is None:
+                            failures += 1
+                        else:
+                            timings.append(elapsed)
+                    summary = latency_summary(timings)
+                    summary["request_errors"] = failures
+                    per_command[command] = summary
+                results[transport] = per_command
+        await _select_transport(client, "auto")
+    return results
+
+
+async def status_poll(
+    stack: BenchmarkStack,
+    *,
+    duration: float,
+    transports: Sequence[str] = TRANSPORTS,
+) -> Dict[str, Any]:
+    """Back-to-back ``/api/status`` from one client: what the poll loop can sustain."""
+
+    results: Dict[str, Any] = {}
+    async with httpx.AsyncClient(base_url=stack.base_url, timeout=30.0) as client:
+        for transport in transports:
+            await _select_transport(client, transport)
+            await client.get("/api/status")
+            timings: List[float] = []
+            failures = 0
+            deadline = time.perf_counter() + duration
+            started = time.perf_counter()
+            while time.perf_counter() < deadline:
+                begin = time.perf_counter()
+                response = await client.get("/api/status")
+                if response.status_code == 200:
+                    timings.append(time.perf_counter() - begin)
+                else:
+                    failures += 1
+            elapsed = time.perf_counter() - started
+            summary = latency_summary(timings)
+            summary["polls_per_s"] = len(timings) / elapsed if elapsed > 0 else 0.0
+            summary["request_errors"] = failures
+            results[transport] = summary
+        await _select_transport(client, "auto")
+    return results
+
+
+async def api_status_load(
+    stack: BenchmarkStack,
+    *,
+    duration: float,
+    concurrency: Sequence[int] = (1, 8, 32),
+) -> Dict[str, Any]:
+    """``GET /api/status`` request rate with ``concurrency`` parallel clients."""
+
+    results: Dict[str, Any] = {}
+    limits = httpx.Limits(max_connections=max(concurrency), max_keepalive_connections=max(concurrency))
+    async with httpx.AsyncClient(base_url=stack.base_url, timeout=30.0, limits=limits) as client:
+        for level in concurrency:
+            timings: List[float] = []
+            failures = 0
+            deadline = time.perf_counter() + duration
+
+            async def worker() -> None:
+                nonlocal failures
+                while time.perf_counter() < deadline:
+                    begin = time.perf_counter()
+                    try:
+                        response = await client.get("/api/status")
+                    except httpx.HTTPError:
+                        failures += 1
+                        continue
+                    if response.status_code == 200:
+                        timings.append(time.perf_counter() - begin)
+                    else:
+                        failures += 1
+
+            started = time.perf_counter()
+            await asyncio.gather(*(worker() for _ in range(level)))
+            elapsed = time.perf_counter() - started
+            summary = latency_summary(timings)
+            summary["requests_per_s"] = len(timings) / elapsed if elapsed > 0 else 0.0
+            summary["request_errors"] = failures
+            results[f"c{level}"] = summary
+    return results
+
+
+async def _open_clients(url: str, count: int) -> List[Any]:
+    _require_websockets()
+    gate = asyncio.Semaphore(CONNECT_CONCURRENCY)
+
+    async def open_one() -> Any:
+        async with gate:
+            return await ws_connect(url, max_size=None, open_timeout=30.0, ping_interval=None)
+
+    return list(await asyncio.gather(*(open_one() for _ in range(count))))
+
+
+async def _close_clients(clients: Sequence[Any]) -> None:
+    await asyncio.gather(*(client.close() for client in clients), return_exceptions=True)
+
+
+async def _collect(client: Any, until: float, sink: List[float], counter: List[int]) -> None:
+    while True:
+        remaining = until - time.monotonic()
+        if remaining <= 0:
+            return
+        try:
+            message = await asyncio.wait_for(client.recv(), timeout=remaining)
+        except (asyncio.TimeoutError, Exception):
+            return
+        received = time.time()
+        payload = json.loads(message)
+        if payload.get("type") == "log":
+            for entry in payload.get("entries", []):
+                if isinstance(entry.get("timestamp"), (int, float)):
+                    sink.append(received - entry["timestamp"])
+            counter[0] += 1
+        elif payload.get("type") == "snapshot":
+            continue
+        elif isinstance(payload.get("timestamp"), (int, float)) and "error" not in payload:
+            sink.append(received - payload["timestamp"])
+            counter[0] += 1
+
+
+async def fanout(
+    stack: BenchmarkStack,
+    *,
+    duration: float,
+    client_counts: Sequence[int] = (1, 10, 100, 500),
+) -> Dict[str, Any]:
+    """Delivery latency of ``/ws/telemetry`` and ``/ws/logs`` broadcasts to N clients each."""
+
+    results: Dict[str, Any] = {}
+    for count in client_counts:
+        telemetry = await _open_clients(f"{stack.ws_base_url}/ws/telemetry", count)
+        logs = await _open_clients(f"{stack.ws_base_url}/ws/logs", count)
+        try:
+            until = time.monotonic() + duration
+            telemetry_latency: List[float] = []
+            log_latency: List[float] = []
+            telemetry_messages = [0]
+            log_messages = [0]
+            await asyncio.gather(
+                *(_collect(client, until, telemetry_latency, telemetry_messages) for client in telemetry),
+                *(_collect(client, until, log_latency, log_messages) for client in logs),
+            )
+        finally:
+            await _close_clients(telemetry + logs)
+        telemetry_summary = latency_summary(telemetry_latency)
+        telemetry_summary["messages_per_s"] = telemetry_messages[0] / duration
+        log_summary = latency_summary(log_latency)
+        log_summary["messages_per_s"] = log_messages[0] / duration
+        results[f"clients_{count}"] = {"telemetry": telemetry_summary, "logs": log_summary}
+    return results
+
+
+async def camera_fps(
+    stack: BenchmarkStack,
+    *,
+    duration: float,
+    viewer_counts: Sequence[int] = (1, 4),
+) -> Dict[str, Any]:
+    """Frames per second each ``/ws/camera`` viewer receives."""
+
+    async with httpx.AsyncClient(base_url=stack.base_url, timeout=30.0) as client:
+        await client.post("/api/command", json={"command": "camstream on", "raise_on_error": False})
+        await client.get("/api/status")
+
+    results: Dict[str, Any] = {}
+    for count in viewer_counts:
+        viewers = await _open_clients(f"{stack.ws_base_url}/ws/camera", count)
+        frames = [0] * count
+        errors = [0]
+        until = time.monotonic() + duration
+
+        async def watch(index: int, viewer: Any) -> None:
+            while True:
+                remaining = until - time.monotonic()
+                if remaining <= 0:
+                    return
+                try:
+                    message = await asyncio.wait_for(viewer.recv(), timeout=remaining)
+                except (asyncio.TimeoutError, Exception):
+                    return
+                if json.loads(message).get("type") == "frame":
+                    frames[index] += 1
+                else:
+                    errors[0] += 1
+
+        try:
+            await asyncio.gather(*(watch(index, viewer) for index, viewer in enumerate(viewers)))
+        finally:
+            await _close_clients(viewers)
+        rates = [count_ / duration for count_ in frames]
+        results[f"viewers_{count}"] = {
+            "mean_fps": sum(rates) / len(rates) if rates else 0.0,
+            "min_fps": min(rates) if rates else 0.0,
+            "frame_errors": errors[0],
+        }
+    return results
+
+
+async def _first_telemetry(stack: BenchmarkStack, timeout: float) -> Optional[float]:
+    _require_websockets()
+    async with ws_connect(f"{stack.ws_base_url}/ws/telemetry", max_size=None) as client:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                message = await asyncio.wait_for(client.recv(), timeout=deadline - time.monotonic())
+            except asyncio.TimeoutError:
+                return None
+            payload = json.loads(message)
+            if payload.get("data") and "error" not in payload:
+                return time.monotonic() - stack.started_at
+    return None
+
+
+def startup(
+    *,
+    timeout: float = 30.0,
+    transports: Sequence[str] = TRANSPORTS,
+    stack_factory: Any = BenchmarkStack,
+) -> Dict[str, Any]:
+    """Launch fresh stacks and time ``/api/info`` readiness and the first good telemetry."""
+
+    results: Dict[str, Any] = {}
+    for transport in transports:
+        with stack_factory(transport=transport) as stack:
+            first = asyncio.run(_first_telemetry(stack, timeout))
+            results[transport] = {
+                "ready_s": stack.ready_s,
+                "first_telemetry_s": first if first is not None else timeout,
+            }
+    return results
+
+
+__all__ = [
+    "api_status_load",
+    "camera_fps",
+    "command_channel",
+    "command_rtt",
+    "fanout",
+    "startup",
+    "status_poll",
+]
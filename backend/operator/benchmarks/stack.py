@@ -0,0 +1,152 @@
+"""Start the simulator and ``backend.operator.server:app`` for a benchmark run."""
+from __future__ import annotations
+
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+try:
+    import httpx
+except ImportError as exc:  # pragma: no cover - optional dependency
+    raise ImportError(
+        "the operator benchmarks need httpx; install them with pip install -e \".[bench]\""
+    ) from exc
+
+from ..simulator import ESP32Simulator, SimulatorConfig
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+READY_TIMEOUT_S = 30.0
+
+
+def _free_port(host: str) -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
+
+
+class BenchmarkStack:
+    """Simulator in-process, the operator server in a child uvicorn process.
+
+    The server runs in its own interpreter so load generation does not compete with it
+    for the GIL; its environment points every transport at the simulator and keeps the
+    Wi-Fi caches in a throwaway directory.
+    """
+
+    def __init__(
+        self,
+        *,
+        transport: str = "auto",
+        sim_config: Optional[SimulatorConfig] = None,
+        host: str = "127.0.0.1",
+        extra_env: Optional[Dict[str, str]] = None,
+    ) -> None:
+        self.transport = transport
+        self.host = host
+        self.simulator = ESP32Simulator(sim_config, host=host)
+        self._extra_env = dict(extra_env or {})
+        self._tmp: Optional[tempfile.TemporaryDirectory] = None
+        self._process: Optional[subprocess.Popen] = None
+        self.port = 0
+        self.started_at = 0.0
+        self.ready_s: Optional[float] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def ws_base_url(self) -> str:
+        return f"ws://{self.host}:{self.port}"
+
+    def start(self) -> "BenchmarkStack":
+        self.simulator.start()
+        self._tmp = tempfile.TemporaryDirectory(prefix="rbm-bench-")
+        env = os.environ.copy()
+        env.update(
+            {
+                "PYTHONPATH": os.pathsep.join(filter(None, [str(REPO_ROOT), env.get("PYTHONPATH")])),
+                "OPERATOR_SERIAL_PORT": self.simulator.serial_port or "",
+                "OPERATOR_WS_ENDPOINT": self.simulator.ws_url or "",
+                # The simulator reports its IP in STATUS; the backend rebuilds the URL from it.
+                "OPERATOR_WIFI_WS_PORT": str(self.simulator.ws_port or ""),
+                "OPERATOR_CAMERA_SNAPSHOT_URL": self.simulator.snapshot_url or "",
+                "OPERATOR_CONTROL_TRANSPORT": self.transport,
+                "OPERATOR_WIFI_CONFIG_PATH": os.path.join(self._tmp.name, "wifi_config.json"),
+                "OPERATOR_WIFI_CACHE_PATH": os.path.join(self._tmp.name, "wifi_endpoint.json"),
+            }
+        )
+        env.update(self._extra_env)
+        self.port = _free_port(self.host)
+        self.started_at = time.monotonic()
+        self._process = subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "uvicorn",
+                "backend.operator.server:app",
+                "--host",
+                self.host,
+                "--port",
+                str(self.port),
+                "--log-level",
+                "warning",
+            ],
+            env=env,
+            cwd=str(REPO_ROOT),
+        )
+        self._wait_ready()
+        return self
+
+    def _wait_ready(self) -> None:
+        deadline = self.started_at + READY_TIMEOUT_S
+        while time.monotonic() < deadline:
+            if self._process is not None and self._process.poll() is not None:
+                raise RuntimeError(f"operator server exited with code {self._process.returncode}")
+            try:
+                response = httpx.get(f"{self.base_url}/api/info", timeout=1.0)
+            except httpx.HTTPError:
+                time.sleep(0.05)
+                continue
+            if response.status_code == 200:
+                self.ready_s = time.monotonic() - self.started_at
+                return
+            time.sleep(0.05)
+        raise RuntimeError("operator server did not become ready in time")
+
+    def stop(self) -> None:
+        if self._process is not None:
+            self._process.terminate()
+            try:
+                self._process.wait(timeout=10.0)
+            except subprocess.TimeoutExpired:  # pragma: no cover - stuck shutdown
+                self._process.kill()
+                self._process.wait()
+            self._process = None
+        self.simulator.stop()
+        if self._tmp is not None:
+            self._tmp.cleanup()
+            self._tmp = None
+
+    def __enter__(self) -> "BenchmarkStack":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
+    def describe(self) -> Dict[str, object]:
+        return {
+            "transport": self.transport,
+            "serial_port": self.simulator.serial_port,
+            "ws_url": self.simulator.ws_url,
+            "snapshot_url": self.simulator.snapshot_url,
+            "simulator": json.loads(json.dumps(self.simulator.config.__dict__, default=str)),
+        }
+
+
+__all__ = ["BenchmarkStack"]
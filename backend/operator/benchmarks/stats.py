@@ -0,0 +1,138 @@
+"""Latency summaries and baseline comparison for benchmark results."""
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+PERCENTILES = (50, 90, 95, 99)
+
+# Metric direction is encoded in the key suffix so result files stay self-describing.
+HIGHER_IS_BETTER = ("_per_s", "_rps", "_fps")
+LOWER_IS_BETTER = ("_ms", "_s", "_errors")
+
+DEFAULT_TOLERANCE = 0.2
+# Differences below this many milliseconds are timer noise, not regressions.
+DEFAULT_FLOOR_MS = 1.0
+
+
+def percentile(sorted_samples: Sequence[float], pct: float) -> float:
+    """Linear-interpolated percentile of an already sorted sequence."""
+
+    if not sorted_samples:
+        return math.nan
+    if len(sorted_samples) == 1:
+        return float(sorted_samples[0])
+    rank = (len(sorted_samples) - 1) * pct / 100.0
+    low = math.floor(rank)
+    high = min(low + 1, len(sorted_samples) - 1)
+    weight = rank - low
+    return float(sorted_samples[low] * (1.0 - weight) + sorted_samples[high] * weight)
+
+
+def latency_summary(samples_s: Sequence[float]) -> Dict[str, Any]:
+    """Summarise latencies given in seconds as millisecond percentiles."""
+
+    ordered = sorted(samples_s)
+    summary: Dict[str, Any] = {"count": len(ordered)}
+    if not ordered:
+        return summary
+    summary["mean_ms"] = sum(ordered) / len(ordered) * 1000.0
+    for pct in PERCENTILES:
+        summary[f"p{pct}_ms"] = percentile(ordered, pct) * 1000.0
+    summary["max_ms"] = ordered[-1] * 1000.0
+    return summary
+
+
+def _flatten(data: Mapping[str, Any], prefix: str = "") -> Iterator[Tuple[str, float]]:
+    for key, value in data.items():
+        path = f"{prefix}.{key}" if prefix else str(key)
+        if isinstance(value, Mapping):
+            yield from _flatten(value, path)
+        elif isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value):
+            yield path, float(value)
+
+
+def metric_direction(path: str) -> Optional[str]:
+    """``"higher"``/``"lower"`` for comparable metrics, ``None`` for informational ones."""
+
+    name = path.rsplit(".", 1)[-1]
+    if name.endswith(HIGHER_IS_BETTER):
+        return "higher"
+    if name.endswith(LOWER_IS_BETTER):
+        return "lower"
+    return None
+
+
+@dataclass
+class Finding:
+    metric: str
+    baseline: float
+    current: float
+    change: float
+    status: str  # "regression", "improvement" or "ok"
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "metric": self.metric,
+            "baseline": self.baseline,
+            "current": self.current,
+            "change": self.change,
+            "status": self.status,
+        }
+
+
+def compare_results(
+    current: Mapping[str, Any],
+    baseline: Mapping[str, Any],
+    *,
+    tolerance: float = DEFAULT_TOLERANCE,
+    floor_ms: float = DEFAULT_FLOOR_MS,
+) -> List[Finding]:
+    """Compare the ``results`` sections of two runs metric by metric."""
+
+    current_metrics = dict(_flatten(current.get("results", current)))
+    findings: List[Finding] = []
+    for path, base in _flatten(baseline.get("results", baseline)):
+        direction = metric_direction(path)
+        if direction is None or path not in current_metrics:
+            continue
+        value = current_metrics[path]
+        change = (value - base) / base if base else (0.0 if value == base else math.inf)
+        worse = value - base if direction == "lower" else base - value
+        floor = floor_ms if path.endswith("_ms") else floor_ms / 1000.0 if path.endswith("_s") else 0.0
+        status = "ok"
+        if worse > abs(base) * tolerance and worse > floor:
+            status = "regression"
+        elif -worse > abs(base) * tolerance and -worse > floor:
+            status = "improvement"
+        findings.append(Finding(path, base, value, change, status))
+    return findings
+
+
+def regressions(findings: Sequence[Finding]) -> List[Finding]:
+    return [finding for finding in findings if finding.status == "regression"]
+
+
+def format_findings(findings: Sequence[Finding]) -> str:
+    lines = []
+    for finding in findings:
+        if finding.status == "ok":
+            continue
+        marker = "REGRESSION" if finding.status == "regression" else "improved"
+        lines.append(
+            f"{marker:>10}  {finding.metric}: {finding.baseline:.3f} -> {finding.current:.3f} "
+            f"({finding.change * 100:+.1f}%)"
+        )
+    return "\n".join(lines) if lines else "no significant changes"
+
+
+__all__ = [
+    "Finding",
+    "compare_results",
+    "format_findings",
+    "latency_summary",
+    "metric_direction",
+    "percentile",
+    "regressions",
+]
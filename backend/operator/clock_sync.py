@@ -0,0 +1,170 @@
+"""Online estimator mapping ESP32 uptime (``millis()``) onto host wall-clock time.
+
+Every observation bounds the clock offset ``host_time - uptime``:
+
+* a command round-trip whose reply carries ``uptime_ms`` brackets it between
+  ``sent_at - uptime`` and ``received_at - uptime``;
+* a one-way WebSocket heartbeat only provides the upper bound ``received_at - uptime``.
+
+Observations are grouped into fixed uptime epochs. Inside an epoch the tightest bounds
+win, which is the classic min-RTT filter: the sample with the shortest round-trip has
+the smallest uncertainty. A least-squares line through the epoch estimates then gives
+the offset plus the crystal drift of the ESP32 relative to the host.
+"""
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+DEFAULT_EPOCH_S = 10.0
+DEFAULT_MAX_EPOCHS = 30
+MAX_DRIFT_PPM = 500.0  # ESP32 crystals are specified well inside this bound
+REBOOT_TOLERANCE_MS = 1000
+
+
+@dataclass
+class _Epoch:
+    upper: float
+    lower: Optional[float]
+    uptime_s: float
+    best_rtt: Optional[float]
+    samples: int = 1
+
+    def estimate(self, one_way_guess: float) -> float:
+        if self.lower is not None and self.lower <= self.upper:
+            return (self.lower + self.upper) / 2.0
+        return self.upper - one_way_guess
+
+
+class DeviceClock:
+    """Thread-safe offset/drift estimator fed from replies and heartbeats."""
+
+    def __init__(self, *, epoch_s: float = DEFAULT_EPOCH_S, max_epochs: int = DEFAULT_MAX_EPOCHS) -> None:
+        self._epoch_ms = max(1.0, epoch_s * 1000.0)
+        self._max_epochs = max(2, max_epochs)
+        self._epochs: "OrderedDict[int, _Epoch]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._last_uptime_ms: Optional[int] = None
+        self._min_rtt: Optional[float] = None
+        self._model: Optional[Tuple[float, float]] = None
+        self._resets = 0
+        self._observations = 0
+
+    # ------------------------------------------------------------------
+    def observe_round_trip(self, sent_at: float, received_at: float, uptime_ms: int) -> None:
+        """Record a reply carrying ``uptime_ms`` that was requested at ``sent_at``."""
+
+        if received_at < sent_at:
+            return
+        uptime_s = uptime_ms / 1000.0
+        rtt = received_at - sent_at
+        with self._lock:
+            self._note_uptime(uptime_ms)
+            if self._min_rtt is None or rtt < self._min_rtt:
+                self._min_rtt = rtt
+            self._merge(uptime_ms, received_at - uptime_s, sent_at - uptime_s, rtt)
+
+    def observe_one_way(self, received_at: float, uptime_ms: int) -> None:
+        """Record a device-initiated message (heartbeat) stamped with ``uptime_ms``."""
+
+        with self._lock:
+            self._note_uptime(uptime_ms)
+            self._merge(uptime_ms, received_at - uptime_ms / 1000.0, None, None)
+
+    def to_host(self, uptime_ms: Optional[int]) -> Optional[float]:
+        """Convert a device uptime into host ``time.time()`` seconds, if synced."""
+
+        if uptime_ms is None:
+            return None
+        with self._lock:
+            model = self._model
+        if model is None:
+            return None
+        intercept, slope = model
+        uptime_s = uptime_ms / 1000.0
+        return uptime_s + intercept + slope * uptime_s
+
+    @property
+    def synced(self) -> bool:
+        with self._lock:
+            return self._model is not None
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            model = self._model
+            uncertainty: Optional[float] = None
+            if self._epochs:
+                latest = next(reversed(self._epochs.values()))
+                if latest.lower is not None and latest.lower <= latest.upper:
+                    uncertainty = (latest.upper - latest.lower) / 2.0
+            return {
+                "synced": model is not None,
+                "offset_s": None if model is None else model[0],
+                "drift_ppm": None if model is None else model[1] * 1e6,
+                "min_rtt_ms": None if self._min_rtt is None else self._min_rtt * 1000.0,
+                "uncertainty_ms": None if uncertainty is None else uncertainty * 1000.0,
+                "epochs": len(self._epochs),
+                "observations": self._observations,
+                "resets": self._resets,
+                "last_uptime_ms": self._last_uptime_ms,
+            }
+
+    # ------------------------------------------------------------------
+    def _note_uptime(self, uptime_ms: int) -> None:
+        if (
+            self._last_uptime_ms is not None
+            and uptime_ms + REBOOT_TOLERANCE_MS < self._last_uptime_ms
+        ):
+            # millis() restarted: the ESP32 rebooted, so the old offset is meaningless.
+            self._epochs.clear()
+            self._model = None
+            self._resets += 1
+        self._last_uptime_ms = uptime_ms
+        self._observations += 1
+
+    def _merge(self, uptime_ms: int, upper: float, lower: Optional[float], rtt: Optional[float]) -> None:
+        key = int(uptime_ms // self._epoch_ms)
+        epoch = self._epochs.get(key)
+        uptime_s = uptime_ms / 1000.0
+        if epoch is None:
+            epoch = _Epoch(upper=upper, lower=lower, uptime_s=uptime_s, best_rtt=rtt)
+            self._epochs[key] = epoch
+            while len(self._epochs) > self._max_epochs:
+                self._epochs.popitem(last=False)
+        else:
+            epoch.samples += 1
+            if upper < epoch.upper:
+                epoch.upper = upper
+                epoch.uptime_s = uptime_s
+            if lower is not None and (epoch.lower is None or lower > epoch.lower):
+                epoch.lower = lower
+            if rtt is not None and (epoch.best_rtt is None or rtt < epoch.best_rtt):
+                epoch.best_rtt = rtt
+        self._model = self._fit()
+
+    def _fit(self) -> Optional[Tuple[float, float]]:
+        if not self._epochs:
+            return None
+        one_way_guess = (self._min_rtt or 0.0) / 2.0
+        points: List[Tuple[float, float]] = [
+            (epoch.uptime_s, epoch.estimate(one_way_guess)) for epoch in self._epochs.values()
+        ]
+        if len(points) < 2:
+            return points[0][1], 0.0
+
+        count = float(len(points))
+        mean_x = sum(x for x, _ in points) / count
+        mean_y = sum(y for _, y in points) / count
+        var_x = sum((x - mean_x) ** 2 for x, _ in points)
+        if var_x <= 1e-9:
+            return mean_y, 0.0
+        slope = sum((x - mean_x) * (y - mean_y) for x, y in points) / var_x
+        limit = MAX_DRIFT_PPM / 1e6
+        slope = max(-limit, min(limit, slope))
+        intercept = mean_y - slope * mean_x
+        return intercept, slope
+
+
+__all__ = ["DeviceClock"]
@@ -12,11 +12,21 @@ import re
 import threading
 import time
 from collections import deque
+from contextvars import ContextVar
 from dataclasses import dataclass
-from typing import Any, Callable, Dict, Iterable, List, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
 
 import logging
 
+from .log_ingest import LogDump, fetch_log_dump
+from .status_binary import (
+    STATUS_BINARY_CAPABILITY,
+    STATUS_BINARY_COMMAND,
+    decode_status_binary_lines,
+    parse_capabilities,
+)
+from .status_frame import StatusFrame, decode_status_line
+
 logger = logging.getLogger(__name__)
 
 try:
@@ -43,13 +53,33 @@ DEFAULT_BAUDRATE = 115200
 # Status polls can block on repeated I2C retries; allow ample margin.
 DEFAULT_TIMEOUT = 20.0  # seconds
 # Allow long gaps between chunks (I2C retries delay status output by several seconds).
-DEFAULT_SILENCE_GAP = 10.0  # seconds without data before we consider reply finished
+DEFAULT_SILENCE_GAP = 10.0  # seconds without reply data before we consider reply finished
+# Port reads return at least this often so a short per-command deadline is honoured.
+READ_POLL_INTERVAL = 0.05  # seconds
+# Lines such as "[CLI] RX: status" are log_sink output mirrored onto the console.
+LOG_LINE_RE = re.compile(r"^\[[A-Za-z0-9_ ]+\]")
+# process_cli() logs this right before it executes a command, which frames pipelined replies.
+CLI_ECHO_RE = re.compile(r"^\[CLI\] RX: (.*)$")
+# CTRL, BRAKE and STATUS BIN answer with exactly one of these lines, so the reply ends there.
+FINAL_REPLY_RE = re.compile(r"^(?:ctrl_[a-z]+|BRAKE|statusb)=", re.IGNORECASE)
+# Handlers such as STATUS and I2C SCAN log this after their last reply line.
+HANDLED_LOG_RE = re.compile(r"^\[CLI\] [a-z0-9 ]+ handled\b", re.IGNORECASE)
+# Commands written back to back; the firmware's UART RX buffer holds a few short lines.
+DEFAULT_PIPELINE_DEPTH = 4
+
+# Called with every reply line as soon as it is read, e.g. to stream partial output.
+# Callers set it in their own context; ``asyncio.to_thread`` carries it to the worker.
+reply_line_sink: ContextVar[Optional[Callable[[str], None]]] = ContextVar("reply_line_sink", default=None)
 
 
 class SerialNotFoundError(RuntimeError):
     """Raised when no matching serial interface is available."""
 
 
+class ReplyTimeoutError(SerialNotFoundError):
+    """The link was up but no reply arrived before the command's deadline."""
+
+
 class CommandError(RuntimeError):
     """Raised when the CLI indicates an error condition."""
 
@@ -60,6 +90,20 @@ class CommandResult:
 
     raw: List[str]
     data: Dict[str, object]
+    sent_at: Optional[float] = None
+    line_times: Optional[List[float]] = None
+    status: Optional[StatusFrame] = None
+
+    def received_at(self, marker: Optional[str] = None) -> Optional[float]:
+        """Return when the first line containing ``marker`` (or the last line) arrived."""
+
+        if not self.line_times:
+            return None
+        if marker is not None:
+            for line, arrived in zip(self.raw, self.line_times):
+                if marker in line:
+                    return arrived
+        return self.line_times[-1]
 
     def __bool__(self) -> bool:  # pragma: no cover - convenience helper
         return bool(self.raw)
@@ -110,6 +154,7 @@ class ESP32Link:
         timeout: float = DEFAULT_TIMEOUT,
         silence_gap: float = DEFAULT_SILENCE_GAP,
         prompt_pattern: str = r"^(?>[>#]\s*)?$",
+        binary_status: bool = False,
     ) -> None:
         self._requested_port = port
         self._baudrate = baudrate
@@ -122,6 +167,12 @@ class ESP32Link:
         self._log_fragment: bytes = b""
         self._log_buffer: "deque[tuple[float, str]]" = deque(maxlen=1000)
         self._pending_logs: list[tuple[float, str]] = []
+        self._log_timestamps: Optional[bool] = None
+        self._binary_status = binary_status
+        # Cleared once a batch came back without CLI echoes to split it by.
+        self._pipelining = True
+        # None: not negotiated yet; reset whenever the port is reopened.
+        self._status_binary: Optional[bool] = None if binary_status else False
 
     # ------------------------------------------------------------------
     # Lifecycle helpers
@@ -144,7 +195,7 @@ class ESP32Link:
                 self._serial = open_serial(
                     port_path,
                     baudrate=self._baudrate,
-                    timeout=self._timeout,
+                    timeout=min(self._timeout, READ_POLL_INTERVAL),
                     write_timeout=self._timeout,
                 )
             except (SerialException, OSError) as exc:
@@ -163,6 +214,7 @@ class ESP32Link:
                 self._serial.close()
             self._serial = None
             self._active_port = None
+            self._reset_capabilities()
 
     def __enter__(self) -> "ESP32Link":
         """Context manager entry."""
@@ -198,6 +250,89 @@ class ESP32Link:
     ) -> CommandResult:
         """Send a command and return the parsed result."""
 
+        if parser is None and self._status_binary is not False and is_status_command(command):
+            with self._lock:
+                result, self._status_binary = run_status_query(
+                    self.run_command, self._status_binary, timeout=timeout
+                )
+            if result is not None:
+                return result
+
+        sent_at, ((lines, line_times),) = self._exchange([command], timeout)
+
+        if raise_on_error:
+            self._detect_cli_error(lines)
+
+        status: Optional[StatusFrame] = None
+        if parser is None:
+            parsed, status = parse_reply_lines(lines)
+        else:
+            parsed = parser(lines)
+        return CommandResult(
+            raw=lines,
+            data=parsed,
+            sent_at=sent_at,
+            line_times=line_times,
+            status=status,
+        )
+
+    def run_pipelined(
+        self,
+        commands: Sequence[str],
+        *,
+        timeout: Optional[float] = None,
+        raise_on_error: bool = True,
+        depth: int = DEFAULT_PIPELINE_DEPTH,
+    ) -> List[CommandResult]:
+        """Write up to ``depth`` commands back to back and split the replies in order.
+
+        A batch costs roughly one round trip plus transfer time instead of one full
+        reply wait per command. ``timeout`` bounds each group of ``depth`` commands.
+        ``status`` is sent as ``STATUS BIN`` once the binary form was negotiated.
+        """
+
+        results: List[CommandResult] = []
+        pending = list(commands)
+        with self._lock:
+            while pending:
+                if not self._pipelining or len(pending) == 1:
+                    results.extend(
+                        self.run_command(command, timeout=timeout, raise_on_error=False)
+                        for command in pending
+                    )
+                    break
+                group, pending = pending[: max(1, depth)], pending[max(1, depth) :]
+                wire = [
+                    STATUS_BINARY_COMMAND
+                    if self._status_binary is True and is_status_command(command)
+                    else command.strip()
+                    for command in group
+                ]
+                sent_at, replies = self._exchange(wire, timeout)
+                for command, (lines, line_times) in zip(wire, replies):
+                    frame = decode_status_binary_lines(lines) if command == STATUS_BINARY_COMMAND else None
+                    if frame is not None:
+                        parsed: Dict[str, object] = frame.as_dict()
+                    else:
+                        parsed, frame = parse_reply_lines(lines)
+                    results.append(
+                        CommandResult(
+                            raw=lines,
+                            data=parsed,
+                            sent_at=sent_at,
+                            line_times=line_times,
+                            status=frame,
+                        )
+                    )
+
+        if raise_on_error:
+            for result in results:
+                self._detect_cli_error(result.raw)
+        return results
+
+    def _exchange(
+        self, commands: Sequence[str], timeout: Optional[float]
+    ) -> Tuple[float, List[Tuple[List[str], List[float]]]]:
         with self._lock:
             self.open()
             if not self._serial:
@@ -206,10 +341,18 @@ class ESP32Link:
             ser = self._serial
             try:
                 self._record_new_logs(self._drain_logs_locked())
-                ser.write((command.strip() + "\n").encode("utf-8"))
+                sent_at = time.time()
+                ser.write("".join(command.strip() + "\n" for command in commands).encode("utf-8"))
                 ser.flush()
 
-                lines = self._read_reply_lines(ser, timeout=timeout)
+                replies = self._read_replies(ser, commands, timeout=timeout)
+                # Log lines interleaved with the replies belong to the log stream as well.
+                for lines, line_times in replies:
+                    self._record_new_logs(
+                        (arrived, line)
+                        for line, arrived in zip(lines, line_times)
+                        if LOG_LINE_RE.match(line)
+                    )
 
                 self._record_new_logs(self._drain_logs_locked())
             except SerialNotFoundError:
@@ -217,12 +360,7 @@ class ESP32Link:
             except (SerialException, OSError) as exc:
                 self._handle_serial_disconnect(exc)
                 raise SerialNotFoundError(str(exc)) from exc
-
-        if raise_on_error:
-            self._detect_cli_error(lines)
-
-        parsed = parse_key_value_lines(lines) if parser is None else parser(lines)
-        return CommandResult(raw=lines, data=parsed)
+        return sent_at, replies
 
     def _handle_serial_disconnect(self, exc: BaseException) -> None:
         """Close the current serial handle after an unexpected disconnect."""
@@ -236,6 +374,12 @@ class ESP32Link:
         self._serial = None
         self._active_port = None
         self._log_fragment = b""
+        self._reset_capabilities()
+
+    def _reset_capabilities(self) -> None:
+        self._log_timestamps = None
+        self._pipelining = True
+        self._status_binary = None if self._binary_status else False
 
     def collect_pending_logs(self) -> list[tuple[float, str]]:
         """Return log lines captured since the last call."""
@@ -246,6 +390,17 @@ class ESP32Link:
             self._pending_logs.clear()
         return pending
 
+    def fetch_logs(self, since: int, limit: int = 64) -> LogDump:
+        """Read log_sink entries newer than ``since`` through the ``LOGS`` command."""
+
+        with self._lock:
+            dump, self._log_timestamps = fetch_log_dump(
+                self.run_command, since, limit, timestamps=self._log_timestamps
+            )
+        if dump.error:
+            raise SerialNotFoundError(f"log dump error: {dump.error}")
+        return dump
+
     def recent_logs(self, limit: int = 200) -> list[tuple[float, str]]:
         """Return the most recent log entries."""
 
@@ -280,15 +435,33 @@ class ESP32Link:
             stop_event.wait(interval)
 
     # ------------------------------------------------------------------
-    def _read_reply_lines(
+    def _read_replies(
         self,
         ser: Any,
+        commands: Sequence[str],
         *,
         timeout: Optional[float],
-    ) -> List[str]:
+    ) -> List[Tuple[List[str], List[float]]]:
+        """Read the replies to ``commands``, which were written back to back.
+
+        Each ``[CLI] RX: <command>`` echo starts the next reply; lines before the first
+        echo belong to the first command. A missing echo leaves that command's reply
+        empty instead of shifting every later reply.
+        """
+
         deadline = time.monotonic() + (timeout or self._timeout)
-        lines: List[str] = []
-        last_data_ts: Optional[float] = None
+        wanted = [command.strip() for command in commands]
+        replies: List[Tuple[List[str], List[float]]] = [([], []) for _ in wanted]
+        current = -1
+        last_reply_ts: Optional[float] = None
+        last_log_ts: Optional[float] = None
+        fragment = b""
+        sink = reply_line_sink.get()
+
+        def append(line: str) -> None:
+            lines, times = replies[max(current, 0)]
+            lines.append(line)
+            times.append(time.time())
 
         while time.monotonic() < deadline:
             try:
@@ -298,18 +471,58 @@ class ESP32Link:
                 raise SerialNotFoundError(str(exc)) from exc
 
             if raw:
+                # Short port reads may return half a line; keep it for the next read.
+                raw = fragment + raw
+                if not raw.endswith(b"\n"):
+                    fragment = raw
+                    continue
+                fragment = b""
                 decoded = raw.decode("utf-8", errors="ignore").strip()
                 if decoded:
                     if self._prompt_regex.match(decoded):
+                        if current >= len(wanted) - 1:
+                            break
+                        continue
+                    echo = CLI_ECHO_RE.match(decoded)
+                    if echo is not None:
+                        echoed = echo.group(1).strip()
+                        for index in range(current + 1, len(wanted)):
+                            if wanted[index] == echoed:
+                                current = index
+                                last_reply_ts = last_log_ts = None
+                                break
+                    append(decoded)
+                    # Only after this command's echo: an earlier reply's marker may precede it.
+                    if current >= 0 and current == len(wanted) - 1 and HANDLED_LOG_RE.match(decoded):
                         break
-                    lines.append(decoded)
-                    last_data_ts = time.monotonic()
-            else:
-                if lines and last_data_ts is not None:
-                    if time.monotonic() - last_data_ts >= self._silence_gap:
-                        break
+                    if LOG_LINE_RE.match(decoded):
+                        last_log_ts = time.monotonic()
+                    else:
+                        last_reply_ts = time.monotonic()
+                        if sink is not None:
+                            sink(decoded)
+                        if FINAL_REPLY_RE.match(decoded) and (current >= len(wanted) - 1 or len(wanted) == 1):
+                            break
+            # Mirrored log lines keep arriving after the reply, so once a reply line was
+            # seen only reply lines count towards the silence gap; a reply made of log
+            # lines alone is timed from its last line. Earlier replies end at the next echo.
+            quiet_since = last_reply_ts if last_reply_ts is not None else last_log_ts
+            if (
+                quiet_since is not None
+                and (current >= len(wanted) - 1 or len(wanted) == 1)
+                and time.monotonic() - quiet_since >= self._silence_gap
+            ):
+                break
+
+        if fragment:
+            decoded = fragment.decode("utf-8", errors="ignore").strip()
+            if decoded and not self._prompt_regex.match(decoded):
+                append(decoded)
 
-        return lines
+        if len(wanted) > 1 and current < 0:
+            logger.warning("No CLI echo in a pipelined reply; sending commands one by one from now on")
+            self._pipelining = False
+        return replies
 
     @staticmethod
     def _detect_cli_error(lines: List[str]) -> None:
@@ -317,12 +530,12 @@ class ESP32Link:
             if line.lower().startswith("error"):
                 raise CommandError(line)
 
-    def _drain_logs_locked(self) -> List[str]:
+    def _drain_logs_locked(self) -> List[tuple[float, str]]:
         if not self._serial or not self._serial.is_open:
             return []
 
         ser = self._serial
-        collected: List[str] = []
+        collected: List[tuple[float, str]] = []
 
         while True:
             try:
@@ -343,6 +556,8 @@ class ESP32Link:
                 raise SerialNotFoundError(str(exc)) from exc
             if not chunk:
                 break
+            # Stamp per chunk rather than per drain so lines keep their arrival order in time.
+            arrived = time.time()
 
             data = self._log_fragment + chunk
             lines = data.split(b"\n")
@@ -357,17 +572,12 @@ class ESP32Link:
             for raw in lines:
                 line = raw.decode("utf-8", errors="ignore").rstrip("\r")
                 if line:
-                    collected.append(line)
+                    collected.append((arrived, line))
 
         return collected
 
-    def _record_new_logs(self, lines: Iterable[str]) -> None:
-        if not lines:
-            return
-
-        now = time.time()
-        for line in lines:
-            entry = (now, line)
+    def _record_new_logs(self, entries: Iterable[tuple[float, str]]) -> None:
+        for entry in entries:
             self._log_buffer.append(entry)
             self._pending_logs.append(entry)
 
@@ -375,6 +585,7 @@ class ESP32Link:
 # ----------------------------------------------------------------------
 # Parsing helpers
 # ----------------------------------------------------------------------
+KEY_VALUE_SPLIT_RE = re.compile(r"[\s,]+")
 VALUE_DECODERS: List[Callable[[str], object]] = [
     lambda token: int(token, 0),
     float,
@@ -395,29 +606,143 @@ def parse_value(token: str) -> object:
     return token
 
 
-def parse_key_value_lines(lines: Iterable[str]) -> Dict[str, object]:
-    """Parse CLI output consisting of key=value pairs."""
+def _parse_key_value_line(line: str, data: Dict[str, object]) -> Dict[str, object]:
+    for segment in KEY_VALUE_SPLIT_RE.split(line):
+        if "=" not in segment:
+            continue
+        key, raw_value = segment.split("=", 1)
+        key = key.strip()
+        if not key:
+            continue
+        data[key] = parse_value(raw_value)
+    return data
+
+
+def _parse_key_value_tail(tail: str) -> Dict[str, object]:
+    return _parse_key_value_line(tail, {})
+
+
+def parse_reply_lines(lines: Iterable[str]) -> Tuple[Dict[str, object], Optional[StatusFrame]]:
+    """Parse a CLI reply, decoding ``STATUS`` lines through the precompiled schema.
+
+    Returns the ``key=value`` mapping together with the typed frame of the last
+    ``STATUS`` line, if the reply contained one.
+    """
 
     data: Dict[str, object] = {}
+    status: Optional[StatusFrame] = None
     for line in lines:
-        segments = re.split(r"[\s,]+", line)
-        for segment in segments:
-            if "=" not in segment:
-                continue
-            key, raw_value = segment.split("=", 1)
-            key = key.strip()
-            if not key:
-                continue
-            data[key] = parse_value(raw_value)
-    return data
+        frame = decode_status_line(line, fallback=_parse_key_value_tail)
+        if frame is not None:
+            status = frame
+            data.update(frame.as_dict())
+            continue
+        _parse_key_value_line(line, data)
+    return data, status
+
+
+def decode_reply_lines(lines: List[str]) -> Tuple[Dict[str, object], Optional[StatusFrame]]:
+    """Like :func:`parse_reply_lines`, but also decodes a raw ``STATUS BIN`` reply.
+
+    Used where replies are handled outside a live link (captures, injected faults),
+    so a ``statusb=`` line has not already been turned into a frame.
+    """
+
+    data, status = parse_reply_lines(lines)
+    if status is None:
+        frame = decode_status_binary_lines(lines)
+        if frame is not None:
+            return frame.as_dict(), frame
+    return data, status
+
+
+def _ignore_reply(_lines: List[str]) -> Dict[str, object]:
+    return {}
+
+
+def is_status_command(command: str) -> bool:
+    return command.strip().lower() == "status"
+
+
+def run_status_query(
+    run_command: Callable[..., CommandResult],
+    binary: Optional[bool],
+    *,
+    timeout: Optional[float] = None,
+) -> Tuple[Optional[CommandResult], Optional[bool]]:
+    """Poll ``STATUS BIN`` when the firmware supports it.
+
+    ``binary`` is the caller's cached capability (``None`` triggers the ``CAPS``
+    handshake). Returns the decoded result, or ``None`` when the caller should fall
+    back to the text ``STATUS``, together with the updated capability.
+    """
+
+    if binary is None:
+        caps = run_command("caps", timeout=timeout, raise_on_error=False, parser=_ignore_reply)
+        if STATUS_BINARY_CAPABILITY not in parse_capabilities(caps.raw):
+            logger.debug("Firmware does not advertise binary STATUS; using text replies")
+            return None, False
+
+    reply = run_command(
+        STATUS_BINARY_COMMAND,
+        timeout=timeout,
+        raise_on_error=False,
+        parser=_ignore_reply,
+    )
+    frame = decode_status_binary_lines(reply.raw)
+    if frame is None:
+        # A garbled line only costs this poll; a rejected command disables the mode.
+        rejected = any(line.lower().startswith("err") for line in reply.raw)
+        return None, (False if rejected else True)
+    return (
+        CommandResult(
+            raw=reply.raw,
+            data=frame.as_dict(),
+            sent_at=reply.sent_at,
+            line_times=reply.line_times,
+            status=frame,
+        ),
+        True,
+    )
+
+
+def run_pipelined(
+    link: Any,
+    commands: Sequence[str],
+    *,
+    timeout: Optional[float] = None,
+    raise_on_error: bool = True,
+) -> List[CommandResult]:
+    """Use ``link.run_pipelined`` when the link has one, else run ``commands`` one by one."""
+
+    pipelined = getattr(link, "run_pipelined", None)
+    if callable(pipelined):
+        return pipelined(commands, timeout=timeout, raise_on_error=raise_on_error)
+    kwargs: Dict[str, Any] = {"raise_on_error": raise_on_error}
+    if timeout is not None:
+        kwargs["timeout"] = timeout
+    return [link.run_command(command, **kwargs) for command in commands]
+
+
+def parse_key_value_lines(lines: Iterable[str]) -> Dict[str, object]:
+    """Parse CLI output consisting of key=value pairs."""
+
+    return parse_reply_lines(lines)[0]
 
 
 __all__ = [
     "CommandError",
     "CommandResult",
     "ESP32Link",
+    "ReplyTimeoutError",
     "SerialNotFoundError",
+    "decode_reply_lines",
     "discover_serial_port",
+    "is_status_command",
     "parse_key_value_lines",
+    "parse_reply_lines",
     "parse_value",
+    "reply_line_sink",
+    "run_pipelined",
+    "run_status_query",
 ]
@@ -18,20 +18,36 @@ else:
 from .esp32_link import (
     CommandError,
     CommandResult,
+    ReplyTimeoutError,
     SerialNotFoundError,
+    is_status_command,
     parse_key_value_lines,
+    parse_reply_lines,
+    run_status_query,
 )
+from .log_ingest import LogDump, fetch_log_dump
 
 logger = logging.getLogger(__name__)
 
 
+def _is_timeout(exc: BaseException) -> bool:
+    timeout_error = getattr(websocket, "WebSocketTimeoutException", None)
+    return isinstance(exc, TimeoutError) or (
+        timeout_error is not None and isinstance(exc, timeout_error)
+    )
+
+
 class ESP32WSLink:
-    """Minimal compatibility layer mirroring the serial link API."""
+    """Minimal compatibility layer mirroring the serial link API.
+
+    Commands share one kept-open connection, so only the first command (or the first
+    after a failure) pays for the WebSocket handshake.
+    """
 
     _LISTENER_BACKOFF_INITIAL = 0.5
     _LISTENER_BACKOFF_MAX = 10.0
 
-    def __init__(self, url: str, timeout: float = 5.0) -> None:
+    def __init__(self, url: str, timeout: float = 5.0, *, binary_status: bool = False) -> None:
         if websocket is None:
             raise SerialNotFoundError(
                 "websocket-client is not installed; install via 'pip install websocket-client'."
@@ -47,7 +63,14 @@ class ESP32WSLink:
         self._listener_stop = threading.Event()
         self._last_heartbeat: Optional[float] = None
         self._uptime_ms: Optional[int] = None
+        self._heartbeat_logs_next: Optional[int] = None
+        self._heartbeat_listeners: List[Callable[[float, Optional[int], Optional[int]], None]] = []
+        self._log_timestamps: Optional[bool] = None
+        self._binary_status = binary_status
+        self._status_binary: Optional[bool] = None if binary_status else False
         self._consecutive_failures = 0
+        self._command_lock = threading.RLock()
+        self._command_ws: Optional[Any] = None
 
     # ------------------------------------------------------------------
     def open(self) -> None:
@@ -60,6 +83,8 @@ class ESP32WSLink:
         """No-op for compatibility."""
 
         self._active_endpoint = None
+        with self._command_lock:
+            self._drop_command_socket()
         self._stop_listener()
 
     def __enter__(self) -> "ESP32WSLink":
@@ -81,29 +106,47 @@ class ESP32WSLink:
         if websocket is None:  # pragma: no cover - defensive when dependency missing
             raise SerialNotFoundError("websocket-client dependency unavailable") from _IMPORT_ERROR
 
-        target = self._url
-        self._ensure_listener()
-        try:
-            ws = websocket.create_connection(
-                target,
-                timeout=timeout or self._timeout,
+        if parser is None and self._status_binary is not False and is_status_command(command):
+            result, self._status_binary = run_status_query(
+                self.run_command, self._status_binary, timeout=timeout
             )
-        except (websocket.WebSocketException, OSError) as exc:
-            self._active_endpoint = None
-            self._log_failure("WebSocket connect failed: %s", exc)
-            raise SerialNotFoundError(str(exc)) from exc
+            if result is not None:
+                return result
 
-        try:
-            ws.send(command.strip())
-            raw_reply = ws.recv()
-        except (websocket.WebSocketException, OSError) as exc:
-            self._log_failure("WebSocket command failed: %s", exc)
-            raise SerialNotFoundError(str(exc)) from exc
-        finally:
-            try:
-                ws.close()
-            except Exception:  # pragma: no cover - best effort cleanup
-                pass
+        target = self._url
+        self._ensure_listener()
+        wait = timeout or self._timeout
+        with self._command_lock:
+            reused = self._command_ws is not None
+            while True:
+                ws = self._command_ws
+                if ws is None:
+                    ws = self._connect(target, wait)
+                else:
+                    settimeout = getattr(ws, "settimeout", None)
+                    if callable(settimeout):
+                        settimeout(wait)
+                delivered = False
+                try:
+                    sent_at = time.time()
+                    ws.send(command.strip())
+                    delivered = True
+                    raw_reply = self._recv_reply(ws)
+                    received_at = time.time()
+                except (websocket.WebSocketException, OSError) as exc:
+                    self._drop_command_socket()
+                    # A kept-open socket the board closed while idle fails on send, before
+                    # the command left, so it is safe to reconnect and send it once more.
+                    # After a successful send the board may already have run it (CTRL,
+                    # START, SMAP SET), so a receive failure is never retried.
+                    if reused and not delivered and not _is_timeout(exc):
+                        reused = False
+                        continue
+                    self._log_failure("WebSocket command failed: %s", exc)
+                    if _is_timeout(exc):
+                        raise ReplyTimeoutError(str(exc)) from exc
+                    raise SerialNotFoundError(str(exc)) from exc
+                break
 
         self._active_endpoint = target
         self._consecutive_failures = 0
@@ -119,8 +162,49 @@ class ESP32WSLink:
                 if line.lower().startswith("err"):
                     raise CommandError(line)
 
-        parsed = parse_key_value_lines(lines) if parser is None else parser(lines)
-        return CommandResult(raw=lines, data=parsed)
+        status = None
+        if parser is None:
+            parsed, status = parse_reply_lines(lines)
+        else:
+            parsed = parser(lines)
+        # The whole reply arrives in one frame, so every line shares its receive time.
+        return CommandResult(
+            raw=lines,
+            data=parsed,
+            sent_at=sent_at,
+            line_times=[received_at] * len(lines),
+            status=status,
+        )
+
+    def _connect(self, target: str, timeout: float) -> Any:
+        try:
+            ws = websocket.create_connection(target, timeout=timeout)
+        except (websocket.WebSocketException, OSError) as exc:
+            self._active_endpoint = None
+            # The board may come back with different firmware; negotiate again.
+            self._status_binary = None if self._binary_status else False
+            self._log_failure("WebSocket connect failed: %s", exc)
+            raise SerialNotFoundError(str(exc)) from exc
+        self._command_ws = ws
+        return ws
+
+    def _drop_command_socket(self) -> None:
+        ws, self._command_ws = self._command_ws, None
+        if ws is not None:
+            try:
+                ws.close()
+            except Exception:  # pragma: no cover - best effort cleanup
+                pass
+
+    def _recv_reply(self, ws: Any) -> Any:
+        while True:
+            message = ws.recv()
+            text = message.decode("utf-8", errors="ignore") if isinstance(message, bytes) else str(message)
+            # Pushes may share the kept-open socket; only CLI replies answer the command.
+            if text.lstrip().startswith("{") and '"heartbeat"' in text:
+                self._on_listener_message(ws, text)
+                continue
+            return message
 
     # ------------------------------------------------------------------
     def collect_pending_logs(self, limit: int = 64) -> List[tuple[float, str]]:
@@ -205,6 +289,20 @@ class ESP32WSLink:
             return []
         return entries
 
+    def fetch_logs(self, since: int, limit: int = 64) -> LogDump:
+        """Read ring-buffer entries newer than ``since`` without touching the local cursor."""
+
+        try:
+            dump, timestamps = fetch_log_dump(
+                self.run_command, since, limit, timestamps=self._log_timestamps
+            )
+        except CommandError as exc:
+            raise SerialNotFoundError(str(exc)) from exc
+        self._log_timestamps = timestamps
+        if dump.error:
+            raise SerialNotFoundError(f"log dump error: {dump.error}")
+        return dump
+
     def recent_logs(self, limit: int = 200) -> List[tuple[float, str]]:
         return []
 
@@ -227,6 +325,37 @@ class ESP32WSLink:
         with self._lock:
             return self._uptime_ms
 
+    @property
+    def heartbeat_sample(self) -> Optional[tuple[float, int]]:
+        """Return ``(received_at, uptime_ms)`` of the latest heartbeat for clock alignment."""
+
+        with self._lock:
+            if self._last_heartbeat is None or self._uptime_ms is None:
+                return None
+            return self._last_heartbeat, self._uptime_ms
+
+    @property
+    def logs_next_hint(self) -> Optional[int]:
+        """Return the firmware ``logs_next`` value from the latest heartbeat."""
+
+        with self._lock:
+            return self._heartbeat_logs_next
+
+    def add_heartbeat_listener(
+        self, callback: Callable[[float, Optional[int], Optional[int]], None]
+    ) -> None:
+        """Call ``callback(received_at, uptime_ms, logs_next)`` for every heartbeat."""
+
+        with self._lock:
+            self._heartbeat_listeners.append(callback)
+
+    def remove_heartbeat_listener(
+        self, callback: Callable[[float, Optional[int], Optional[int]], None]
+    ) -> None:
+        with self._lock:
+            if callback in self._heartbeat_listeners:
+                self._heartbeat_listeners.remove(callback)
+
     # ------------------------------------------------------------------
     def _ensure_listener(self) -> None:
         if self._listener_thread and self._listener_thread.is_alive():
@@ -317,11 +446,23 @@ class ESP32WSLink:
             uptime = payload.get("uptime_ms")
             now = time.time()
             with self._lock:
-                if isinstance(logs_next, (int, float)) and int(logs_next) > self._log_next_seq:
-                    self._log_next_seq = int(logs_next)
+                if isinstance(logs_next, (int, float)):
+                    self._heartbeat_logs_next = int(logs_next)
+                    if int(logs_next) > self._log_next_seq:
+                        self._log_next_seq = int(logs_next)
                 if isinstance(uptime, (int, float)):
                     self._uptime_ms = int(uptime)
                 self._last_heartbeat = now
+                listeners = list(self._heartbeat_listeners)
+            for callback in listeners:
+                try:
+                    callback(
+                        now,
+                        int(uptime) if isinstance(uptime, (int, float)) else None,
+                        int(logs_next) if isinstance(logs_next, (int, float)) else None,
+                    )
+                except Exception:  # pragma: no cover - listener bugs must not kill the loop
+                    logger.debug("Heartbeat listener failed", exc_info=True)
             return
         logger.debug("Unhandled WS push message: %s", text)
 
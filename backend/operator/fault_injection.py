@@ -0,0 +1,275 @@
+"""Composable fault injection for ESP32 links, used to benchmark transport failover.
+
+``FaultInjectingLink`` wraps any object with the link interface (``ESP32Link``,
+``ESP32WSLink``, ``RecordingLink``, ``ReplayLink`` ...) and applies the faults whose
+window is active on the shared wall clock:
+
+* ``latency`` — extra delay drawn from a uniform, normal or exponential distribution;
+* ``loss`` — the command executes but its reply never arrives (timeout, then error);
+* ``line_loss`` — individual reply and log lines are dropped;
+* ``disconnect`` — the link refuses every operation;
+* ``stall`` — the device hangs: nothing executes, the caller waits and then fails;
+* ``truncate`` — the reply is cut mid-line, as after a dropped frame tail.
+
+Windows are expressed relative to a wall-clock ``epoch`` so a plan written by a
+benchmark harness applies consistently inside the server process, including to links
+the backend recreates while a fault is active.
+"""
+from __future__ import annotations
+
+import json
+import random
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from .esp32_link import CommandError, CommandResult, ReplyTimeoutError, SerialNotFoundError, decode_reply_lines
+from .log_ingest import LogDump, fetch_log_dump
+
+FAULT_KINDS = ("latency", "loss", "line_loss", "disconnect", "stall", "truncate")
+LATENCY_DISTRIBUTIONS = ("uniform", "normal", "exponential")
+# How long a lost reply or a stalled device keeps the caller waiting by default.
+DEFAULT_FAULT_TIMEOUT_S = 5.0
+
+
+@dataclass(frozen=True)
+class Fault:
+    """One failure mode applied during ``[start_s, start_s + duration_s)``."""
+
+    kind: str
+    start_s: float = 0.0
+    duration_s: Optional[float] = None
+    probability: float = 1.0
+    delay_s: float = 0.0
+    jitter_s: float = 0.0
+    distribution: str = "uniform"
+    transport: Optional[str] = None
+
+    def __post_init__(self) -> None:
+        if self.kind not in FAULT_KINDS:
+            raise ValueError(f"unknown fault kind {self.kind!r}")
+        if self.distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"unknown latency distribution {self.distribution!r}")
+        if not 0.0 <= self.probability <= 1.0:
+            raise ValueError("probability must be within [0, 1]")
+
+    def active(self, elapsed: float) -> bool:
+        if elapsed < self.start_s:
+            return False
+        return self.duration_s is None or elapsed < self.start_s + self.duration_s
+
+    def sample_delay(self, rng: random.Random) -> float:
+        if self.distribution == "exponential":
+            return rng.expovariate(1.0 / self.delay_s) if self.delay_s > 0 else 0.0
+        if self.distribution == "normal":
+            return max(0.0, rng.gauss(self.delay_s, self.jitter_s))
+        return max(0.0, self.delay_s + rng.uniform(-self.jitter_s, self.jitter_s))
+
+    def wait_s(self, timeout: Optional[float]) -> float:
+        if self.delay_s > 0:
+            return self.delay_s
+        return timeout if timeout else DEFAULT_FAULT_TIMEOUT_S
+
+
+@dataclass
+class FaultPlan:
+    """Faults for one or more transports, anchored at a wall-clock ``epoch``."""
+
+    epoch: float = field(default_factory=time.time)
+    faults: List[Fault] = field(default_factory=list)
+    seed: Optional[int] = None
+
+    def for_transport(self, transport: Optional[str]) -> List[Fault]:
+        return [fault for fault in self.faults if fault.transport in (None, transport)]
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "epoch": self.epoch,
+            "seed": self.seed,
+            "faults": [asdict(fault) for fault in self.faults],
+        }
+
+    @classmethod
+    def from_dict(cls, payload: Dict[str, Any]) -> "FaultPlan":
+        return cls(
+            epoch=float(payload.get("epoch", time.time())),
+            faults=[Fault(**item) for item in payload.get("faults", [])],
+            seed=payload.get("seed"),
+        )
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "FaultPlan":
+        return cls.from_dict(json.loads(Path(path).read_text(encoding="utf-8")))
+
+    def save(self, path: Union[str, Path]) -> None:
+        Path(path).write_text(json.dumps(self.as_dict(), indent=2) + "\n", encoding="utf-8")
+
+
+class FaultInjectingLink:
+    """Link wrapper applying the scheduled faults; other attributes pass through."""
+
+    def __init__(
+        self,
+        link: Any,
+        faults: Sequence[Fault] = (),
+        *,
+        epoch: Optional[float] = None,
+        seed: Optional[int] = None,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.link = link
+        self._faults: List[Fault] = list(faults)
+        self._clock = clock
+        self._sleep = sleep
+        self._epoch = clock() if epoch is None else epoch
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self._log_timestamps: Optional[bool] = None
+        self.injected: Dict[str, int] = {kind: 0 for kind in FAULT_KINDS}
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.link, name)
+
+    def add_fault(self, fault: Fault) -> None:
+        """Schedule another fault; ``start_s`` is relative to the link's epoch."""
+
+        self._faults.append(fault)
+
+    def elapsed(self) -> float:
+        return self._clock() - self._epoch
+
+    def _active(self) -> List[Fault]:
+        elapsed = self.elapsed()
+        active: List[Fault] = []
+        with self._rng_lock:
+            for fault in self._faults:
+                if fault.active(elapsed) and (
+                    fault.probability >= 1.0 or self._rng.random() < fault.probability
+                ):
+                    active.append(fault)
+        return active
+
+    def _hit(self, fault: Fault) -> None:
+        self.injected[fault.kind] += 1
+
+    def _delay(self, fault: Fault) -> float:
+        with self._rng_lock:
+            return fault.sample_delay(self._rng)
+
+    # ------------------------------------------------------------------
+    def run_command(
+        self,
+        command: str,
+        *,
+        timeout: Optional[float] = None,
+        raise_on_error: bool = True,
+        parser: Optional[Callable[[List[str]], Dict[str, object]]] = None,
+    ) -> CommandResult:
+        # Line-level faults apply with their own probability per line, not per command.
+        elapsed = self.elapsed()
+        line_faults = [fault for fault in self._faults if fault.kind == "line_loss" and fault.active(elapsed)]
+        faults = [fault for fault in self._active() if fault.kind != "line_loss"]
+        for fault in faults:
+            if fault.kind == "disconnect":
+                self._hit(fault)
+                raise SerialNotFoundError("injected fault: link disconnected")
+            if fault.kind == "stall":
+                self._hit(fault)
+                self._sleep(fault.wait_s(timeout))
+                raise ReplyTimeoutError("injected fault: device stalled")
+        for fault in faults:
+            if fault.kind == "latency":
+                self._hit(fault)
+                self._sleep(self._delay(fault))
+
+        result = self.link.run_command(
+            command, timeout=timeout, raise_on_error=raise_on_error, parser=parser
+        )
+
+        for fault in faults:
+            if fault.kind == "loss":
+                self._hit(fault)
+                self._sleep(fault.wait_s(timeout))
+                raise ReplyTimeoutError("injected fault: reply lost")
+
+        lines = list(result.raw)
+        times = list(result.line_times or [])
+        changed = False
+        for fault in line_faults:
+            with self._rng_lock:
+                keep = [index for index in range(len(lines)) if self._rng.random() >= fault.probability]
+            if len(keep) != len(lines):
+                self._hit(fault)
+                lines = [lines[index] for index in keep]
+                times = [times[index] for index in keep] if times else times
+                changed = True
+        for fault in faults:
+            if fault.kind == "truncate" and lines:
+                self._hit(fault)
+                keep = (len(lines) + 1) // 2
+                cut = lines[keep - 1]
+                lines = lines[: keep - 1] + ([cut[: len(cut) // 2]] if len(cut) > 1 else [])
+                times = times[: len(lines)]
+                changed = True
+        if not changed:
+            return result
+
+        if parser is None:
+            data, status = decode_reply_lines(lines)
+        else:
+            data, status = parser(lines), None
+        return CommandResult(
+            raw=lines,
+            data=data,
+            sent_at=result.sent_at,
+            line_times=times or None,
+            status=status,
+        )
+
+    def run_pipelined(
+        self,
+        commands: Sequence[str],
+        *,
+        timeout: Optional[float] = None,
+        raise_on_error: bool = True,
+    ) -> List[CommandResult]:
+        # Faults are scheduled per command, so batches run one command at a time here.
+        return [
+            self.run_command(command, timeout=timeout, raise_on_error=raise_on_error)
+            for command in commands
+        ]
+
+    def collect_pending_logs(self, *args: Any, **kwargs: Any) -> List[Tuple[float, str]]:
+        for fault in self._active():
+            if fault.kind in ("disconnect", "stall"):
+                self._hit(fault)
+                raise SerialNotFoundError(f"injected fault: {fault.kind}")
+        entries = self.link.collect_pending_logs(*args, **kwargs)
+        elapsed = self.elapsed()
+        for fault in self._faults:
+            if fault.kind == "line_loss" and fault.active(elapsed) and entries:
+                with self._rng_lock:
+                    entries = [entry for entry in entries if self._rng.random() >= fault.probability]
+        return entries
+
+    def fetch_logs(self, since: int, limit: int = 64) -> LogDump:
+        try:
+            dump, self._log_timestamps = fetch_log_dump(
+                self.run_command, since, limit, timestamps=self._log_timestamps
+            )
+        except CommandError as exc:
+            raise SerialNotFoundError(str(exc)) from exc
+        if dump.error:
+            raise SerialNotFoundError(f"log dump error: {dump.error}")
+        return dump
+
+
+__all__ = [
+    "FAULT_KINDS",
+    "Fault",
+    "FaultInjectingLink",
+    "FaultPlan",
+]
@@ -0,0 +1,509 @@
+"""Record ESP32 link traffic to an append-only capture file and replay it later.
+
+``RecordingLink`` wraps an :class:`~backend.operator.esp32_link.ESP32Link` or
+:class:`~backend.operator.esp32_ws_link.ESP32WSLink` and writes every command, reply,
+log chunk and Wi-Fi heartbeat with a monotonic timestamp. ``ReplayLink`` exposes the
+same ``run_command`` / ``collect_pending_logs`` / ``fetch_logs`` interface on top of a
+capture, paced at the recorded speed, N times faster, or as fast as possible, so a
+recorded session can drive the log parser, the status decoder and the fan-out code.
+
+The file is JSON Lines. Every recording session starts with a header object and is
+followed by compact event arrays whose first element is the session time in seconds:
+
+* ``[t, "c", id, command]`` — command sent;
+* ``[t, "r", id, lines, offsets]`` — reply lines, offsets relative to the command;
+* ``[t, "x", id, error_type, message]`` — the link raised instead of replying;
+* ``[t, "l", [[offset, line], ...]]`` — log lines drained from the link;
+* ``[t, "h", uptime_ms, logs_next]`` — Wi-Fi heartbeat.
+"""
+from __future__ import annotations
+
+import itertools
+import json
+import logging
+import math
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from .esp32_link import CommandError, CommandResult, ReplyTimeoutError, SerialNotFoundError, decode_reply_lines
+from .log_ingest import LogDump, fetch_log_dump
+
+logger = logging.getLogger(__name__)
+
+CAPTURE_VERSION = 1
+CAPTURE_SUFFIX = ".rbmcap"
+
+EVENT_COMMAND = "c"
+EVENT_REPLY = "r"
+EVENT_ERROR = "x"
+EVENT_LOGS = "l"
+EVENT_HEARTBEAT = "h"
+
+_ERROR_TYPES: Dict[str, type] = {
+    "CommandError": CommandError,
+    "ReplyTimeoutError": ReplyTimeoutError,
+    "SerialNotFoundError": SerialNotFoundError,
+}
+
+
+def _error_prefix(transport: Optional[str]) -> str:
+    # ESP32WSLink treats any "err..." line as a failure, the UART link only "error...".
+    return "err" if transport == "wifi" else "error"
+
+
+def _raise_on_cli_error(lines: List[str], transport: Optional[str]) -> None:
+    prefix = _error_prefix(transport)
+    for line in lines:
+        if line.lower().startswith(prefix):
+            raise CommandError(line)
+
+
+class CaptureWriter:
+    """Thread-safe append-only writer; each instance opens one session in the file."""
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        *,
+        transport: Optional[str] = None,
+        endpoint: Optional[str] = None,
+    ) -> None:
+        self.path = Path(path)
+        self.transport = transport
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._origin = time.monotonic()
+        self.wall_origin = time.time()
+        # Line buffering flushes every event, so a crash loses at most a partial line.
+        self._handle = self.path.open("a", encoding="utf-8", buffering=1)
+        self._write(
+            {
+                "capture": CAPTURE_VERSION,
+                "transport": transport,
+                "endpoint": endpoint,
+                "wall": self.wall_origin,
+            }
+        )
+
+    def now(self) -> float:
+        return round(time.monotonic() - self._origin, 6)
+
+    def session_time(self, wall: float) -> float:
+        """Map a wall-clock stamp taken by the link onto the session timeline."""
+
+        return round(wall - self.wall_origin, 6)
+
+    def record(self, kind: str, *fields: Any) -> None:
+        self._write([self.now(), kind, *fields])
+
+    def _write(self, payload: Any) -> None:
+        text = json.dumps(payload, separators=(",", ":"), ensure_ascii=False)
+        with self._lock:
+            if self._handle.closed:
+                return
+            self._handle.write(text + "\n")
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._handle.closed:
+                self._handle.close()
+
+
+class RecordingLink:
+    """Transparent wrapper recording the traffic of an ESP32 link.
+
+    Unknown attributes are forwarded to the wrapped link, so the wrapper can stand in
+    for it wherever the backend expects a transport.
+    """
+
+    def __init__(self, link: Any, writer: CaptureWriter, *, transport: Optional[str] = None) -> None:
+        self.link = link
+        self._writer = writer
+        self._transport = transport or writer.transport
+        self._ids = itertools.count(1)
+        self._log_timestamps: Optional[bool] = None
+        add_listener = getattr(link, "add_heartbeat_listener", None)
+        if callable(add_listener):
+            add_listener(self._on_heartbeat)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.link, name)
+
+    def run_command(
+        self,
+        command: str,
+        *,
+        timeout: Optional[float] = None,
+        raise_on_error: bool = True,
+        parser: Optional[Callable[[List[str]], Dict[str, object]]] = None,
+    ) -> CommandResult:
+        command_id = next(self._ids)
+        self._writer.record(EVENT_COMMAND, command_id, command.strip())
+        try:
+            # Always fetch the full reply so error lines end up in the capture too.
+            result = self.link.run_command(
+                command, timeout=timeout, raise_on_error=False, parser=parser
+            )
+        except Exception as exc:
+            self._writer.record(EVENT_ERROR, command_id, type(exc).__name__, str(exc))
+            raise
+        self._record_reply(command_id, result)
+        if raise_on_error:
+            _raise_on_cli_error(result.raw, self._transport)
+        return result
+
+    def run_pipelined(
+        self,
+        commands: Sequence[str],
+        *,
+        timeout: Optional[float] = None,
+        raise_on_error: bool = True,
+    ) -> List[CommandResult]:
+        pipelined = getattr(self.link, "run_pipelined", None)
+        if not callable(pipelined):
+            return [
+                self.run_command(command, timeout=timeout, raise_on_error=raise_on_error)
+                for command in commands
+            ]
+        command_ids = [next(self._ids) for _ in commands]
+        for command_id, command in zip(command_ids, commands):
+            self._writer.record(EVENT_COMMAND, command_id, command.strip())
+        try:
+            results = pipelined(commands, timeout=timeout, raise_on_error=False)
+        except Exception as exc:
+            for command_id in command_ids:
+                self._writer.record(EVENT_ERROR, command_id, type(exc).__name__, str(exc))
+            raise
+        for command_id, result in zip(command_ids, results):
+            self._record_reply(command_id, result)
+        if raise_on_error:
+            for result in results:
+                _raise_on_cli_error(result.raw, self._transport)
+        return results
+
+    def _record_reply(self, command_id: int, result: CommandResult) -> None:
+        sent_at = result.sent_at
+        offsets = [
+            round(arrived - sent_at, 6) if sent_at is not None else 0.0
+            for arrived in (result.line_times or [sent_at] * len(result.raw))
+        ]
+        self._writer.record(EVENT_REPLY, command_id, list(result.raw), offsets)
+
+    def collect_pending_logs(self, *args: Any, **kwargs: Any) -> List[Tuple[float, str]]:
+        entries = self.link.collect_pending_logs(*args, **kwargs)
+        if entries:
+            self._writer.record(
+                EVENT_LOGS,
+                [[self._writer.session_time(arrived), line] for arrived, line in entries],
+            )
+        return entries
+
+    def fetch_logs(self, since: int, limit: int = 64) -> LogDump:
+        # Issued through the recorded run_command so the LOGS exchange lands in the capture.
+        try:
+            dump, self._log_timestamps = fetch_log_dump(
+                self.run_command, since, limit, timestamps=self._log_timestamps
+            )
+        except CommandError as exc:
+            raise SerialNotFoundError(str(exc)) from exc
+        if dump.error:
+            raise SerialNotFoundError(f"log dump error: {dump.error}")
+        return dump
+
+    def _on_heartbeat(self, received_at: float, uptime_ms: Optional[int], logs_next: Optional[int]) -> None:
+        self._writer.record(EVENT_HEARTBEAT, uptime_ms, logs_next)
+
+
+def unwrap_link(link: Any) -> Any:
+    """Return the transport behind stacked wrappers such as :class:`RecordingLink`.
+
+    Wrappers keep the wrapped object in their own ``link`` attribute; real links do not
+    have one, which ends the walk.
+    """
+
+    while True:
+        inner = getattr(link, "__dict__", {}).get("link")
+        if inner is None:
+            return link
+        link = inner
+
+
+# ----------------------------------------------------------------------
+# Reading and replay
+# ----------------------------------------------------------------------
+@dataclass
+class CaptureSession:
+    """One recording session: the header plus its events in file order."""
+
+    header: Dict[str, Any]
+    events: List[List[Any]] = field(default_factory=list)
+
+    @property
+    def transport(self) -> Optional[str]:
+        return self.header.get("transport")
+
+    @property
+    def duration(self) -> float:
+        return float(self.events[-1][0]) if self.events else 0.0
+
+
+def load_capture(path: Union[str, Path]) -> List[CaptureSession]:
+    """Read every session of a capture file, skipping a torn trailing line."""
+
+    sessions: List[CaptureSession] = []
+    with Path(path).open("r", encoding="utf-8") as handle:
+        for number, text in enumerate(handle, 1):
+            text = text.strip()
+            if not text:
+                continue
+            try:
+                item = json.loads(text)
+            except ValueError:
+                logger.warning("Skipping malformed capture line %s:%d", path, number)
+                continue
+            if isinstance(item, dict) and "capture" in item:
+                sessions.append(CaptureSession(header=item))
+            elif isinstance(item, list) and len(item) >= 2 and sessions:
+                sessions[-1].events.append(item)
+    return sessions
+
+
+@dataclass
+class _RecordedExchange:
+    command: str
+    sent: float
+    done: Optional[float] = None
+    lines: List[str] = field(default_factory=list)
+    offsets: List[float] = field(default_factory=list)
+    error: Optional[Tuple[str, str]] = None
+
+
+class ReplayLink:
+    """Plays a capture back through the link interface.
+
+    ``speed`` scales the recorded timeline: ``1.0`` is real time, ``10.0`` ten times
+    faster and ``None`` (or ``math.inf``) serves every reply immediately. Commands are
+    matched in order against the recorded ones; recorded commands the caller never
+    issues are skipped. Timestamps in results and log entries are rebased onto the
+    replay's wall clock so downstream consumers see a live-looking stream.
+    """
+
+    def __init__(
+        self,
+        capture: Union[str, Path, CaptureSession],
+        *,
+        speed: Optional[float] = 1.0,
+        session: int = -1,
+    ) -> None:
+        if isinstance(capture, CaptureSession):
+            self._session = capture
+            self._source = "replay"
+        else:
+            sessions = load_capture(capture)
+            if not sessions:
+                raise SerialNotFoundError(f"capture {capture} contains no sessions")
+            self._session = sessions[session]
+            self._source = f"replay:{capture}"
+        if speed is not None and speed <= 0:
+            raise ValueError("speed must be positive or None")
+        self._speed = None if speed is None or math.isinf(speed) else float(speed)
+        self._transport = self._session.transport
+        self._lock = threading.RLock()
+        self._closed = threading.Event()
+        self._exchanges: List[_RecordedExchange] = []
+        self._log_chunks: List[Tuple[float, List[Tuple[float, str]]]] = []
+        self._heartbeats: List[Tuple[float, Optional[int], Optional[int]]] = []
+        self._index_events()
+        self._cursor = 0
+        self._log_cursor = 0
+        self._position = 0.0
+        self._origin_mono = time.monotonic()
+        self._origin_wall = time.time()
+        self._log_timestamps: Optional[bool] = None
+
+    def _index_events(self) -> None:
+        pending: Dict[Any, _RecordedExchange] = {}
+        for event in self._session.events:
+            t, kind = float(event[0]), event[1]
+            if kind == EVENT_COMMAND:
+                exchange = _RecordedExchange(command=str(event[3]), sent=t)
+                pending[event[2]] = exchange
+                self._exchanges.append(exchange)
+            elif kind in (EVENT_REPLY, EVENT_ERROR):
+                exchange = pending.pop(event[2], None)
+                if exchange is None:
+                    continue
+                exchange.done = t
+                if kind == EVENT_REPLY:
+                    exchange.lines = [str(line) for line in event[3]]
+                    exchange.offsets = [float(offset) for offset in event[4]]
+                else:
+                    exchange.error = (str(event[3]), str(event[4]))
+            elif kind == EVENT_LOGS:
+                entries = [(float(offset), str(line)) for offset, line in event[2]]
+                self._log_chunks.append((t, entries))
+            elif kind == EVENT_HEARTBEAT:
+                self._heartbeats.append((t, event[2], event[3]))
+        # Commands still in flight when the recording stopped have nothing to replay.
+        self._exchanges = [exchange for exchange in self._exchanges if exchange.done is not None]
+
+    # ------------------------------------------------------------------
+    def open(self) -> None:
+        """No-op for compatibility."""
+
+    def close(self) -> None:
+        self._closed.set()
+
+    def __enter__(self) -> "ReplayLink":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    @property
+    def active_port(self) -> Optional[str]:
+        return None if self._closed.is_set() else self._source
+
+    @property
+    def requested_port(self) -> Optional[str]:
+        return self._source
+
+    @property
+    def exhausted(self) -> bool:
+        with self._lock:
+            return self._cursor >= len(self._exchanges) and self._log_cursor >= len(self._log_chunks)
+
+    # ------------------------------------------------------------------
+    def _now(self) -> float:
+        """Current position on the recorded timeline."""
+
+        if self._speed is None:
+            return self._position
+        return (time.monotonic() - self._origin_mono) * self._speed
+
+    def _wall(self, t: float) -> float:
+        if self._speed is None:
+            return time.time()
+        return self._origin_wall + t / self._speed
+
+    def _wait_until(self, t: float) -> None:
+        if self._speed is None:
+            self._position = max(self._position, t)
+            return
+        delay = (t - self._now()) / self._speed
+        if delay > 0 and self._closed.wait(delay):
+            raise SerialNotFoundError("replay link closed")
+
+    def run_command(
+        self,
+        command: str,
+        *,
+        timeout: Optional[float] = None,
+        raise_on_error: bool = True,
+        parser: Optional[Callable[[List[str]], Dict[str, object]]] = None,
+    ) -> CommandResult:
+        if self._closed.is_set():
+            raise SerialNotFoundError("replay link closed")
+        wanted = command.strip().lower()
+        with self._lock:
+            for index in range(self._cursor, len(self._exchanges)):
+                if self._exchanges[index].command.lower() == wanted:
+                    exchange = self._exchanges[index]
+                    self._cursor = index + 1
+                    break
+            else:
+                raise SerialNotFoundError(f"capture has no further reply to {command.strip()!r}")
+            self._wait_until(exchange.done or exchange.sent)
+
+        if exchange.error is not None:
+            error_type, message = exchange.error
+            raise _ERROR_TYPES.get(error_type, SerialNotFoundError)(message)
+        if raise_on_error:
+            _raise_on_cli_error(exchange.lines, self._transport)
+
+        status = None
+        if parser is None:
+            parsed, status = decode_reply_lines(exchange.lines)
+        else:
+            parsed = parser(exchange.lines)
+        return CommandResult(
+            raw=list(exchange.lines),
+            data=parsed,
+            sent_at=self._wall(exchange.sent),
+            line_times=[self._wall(exchange.sent + offset) for offset in exchange.offsets],
+            status=status,
+        )
+
+    def collect_pending_logs(self, *_args: Any, **_kwargs: Any) -> List[Tuple[float, str]]:
+        """Return recorded log chunks that are due; at max speed the next chunk is always due."""
+
+        with self._lock:
+            now = self._now()
+            if self._speed is None and self._log_cursor < len(self._log_chunks):
+                now = self._position = max(now, self._log_chunks[self._log_cursor][0])
+            entries: List[Tuple[float, str]] = []
+            while self._log_cursor < len(self._log_chunks) and self._log_chunks[self._log_cursor][0] <= now:
+                _, chunk = self._log_chunks[self._log_cursor]
+                entries.extend((self._wall(offset), line) for offset, line in chunk)
+                self._log_cursor += 1
+        return entries
+
+    def fetch_logs(self, since: int, limit: int = 64) -> LogDump:
+        try:
+            dump, self._log_timestamps = fetch_log_dump(
+                self.run_command, since, limit, timestamps=self._log_timestamps
+            )
+        except CommandError as exc:
+            raise SerialNotFoundError(str(exc)) from exc
+        if dump.error:
+            raise SerialNotFoundError(f"log dump error: {dump.error}")
+        return dump
+
+    def recent_logs(self, limit: int = 200) -> List[Tuple[float, str]]:
+        return []
+
+    # ------------------------------------------------------------------
+    def _latest_heartbeat(self) -> Optional[Tuple[float, Optional[int], Optional[int]]]:
+        now = self._now()
+        latest = None
+        for heartbeat in self._heartbeats:
+            if heartbeat[0] > now:
+                break
+            latest = heartbeat
+        return latest
+
+    @property
+    def last_heartbeat(self) -> Optional[float]:
+        latest = self._latest_heartbeat()
+        return self._wall(latest[0]) if latest else None
+
+    @property
+    def uptime_ms(self) -> Optional[int]:
+        latest = self._latest_heartbeat()
+        return latest[1] if latest else None
+
+    @property
+    def heartbeat_sample(self) -> Optional[Tuple[float, int]]:
+        latest = self._latest_heartbeat()
+        if latest is None or latest[1] is None:
+            return None
+        return self._wall(latest[0]), int(latest[1])
+
+    @property
+    def logs_next_hint(self) -> Optional[int]:
+        latest = self._latest_heartbeat()
+        return latest[2] if latest else None
+
+
+__all__ = [
+    "CAPTURE_SUFFIX",
+    "CaptureSession",
+    "CaptureWriter",
+    "RecordingLink",
+    "ReplayLink",
+    "load_capture",
+    "unwrap_link",
+]
@@ -0,0 +1,255 @@
+"""Priority scheduling of commands in front of an ESP32 link.
+
+Both transports execute one command at a time, so without a scheduler every caller
+queues on the link lock in arrival order and a ``BRAKE`` can wait behind a long poll or
+an ``I2C SCAN``. :class:`ScheduledLink` keeps a priority queue in front of the link:
+
+* ``safety`` — ``BRAKE``;
+* ``motion`` — ``CTRL ...`` and ``START``;
+* ``interactive`` — everything an operator or the UI asks for;
+* ``polling`` — ``STATUS`` and its binary form;
+* ``background`` — log dumps, probes and keepalives.
+
+Higher classes overtake every queued lower one; a command already on the wire is never
+interrupted, so a ``BRAKE`` waits for at most one in-flight command. Callers may pass
+``stale_after`` so a poll that waited too long is dropped with :class:`CommandDropped`
+instead of returning outdated data, or a ``cancelled`` event (the losing leg of a hedged
+read) that drops the command if it is set before the slot is granted. Queue wait times are kept per class.
+"""
+from __future__ import annotations
+
+import contextlib
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .esp32_link import CommandResult, run_pipelined
+
+PRIORITY_SAFETY = "safety"
+PRIORITY_MOTION = "motion"
+PRIORITY_INTERACTIVE = "interactive"
+PRIORITY_POLLING = "polling"
+PRIORITY_BACKGROUND = "background"
+
+PRIORITY_CLASSES: Tuple[str, ...] = (
+    PRIORITY_SAFETY,
+    PRIORITY_MOTION,
+    PRIORITY_INTERACTIVE,
+    PRIORITY_POLLING,
+    PRIORITY_BACKGROUND,
+)
+_RANK = {name: rank for rank, name in enumerate(PRIORITY_CLASSES)}
+WAIT_WINDOW = 256
+
+
+class CommandDropped(RuntimeError):
+    """A queued command went stale before the link was free and was not sent."""
+
+
+def classify_command(command: str) -> str:
+    """Return the default priority class for a CLI command."""
+
+    words = command.strip().upper().split()
+    head = words[0] if words else ""
+    if head == "BRAKE":
+        return PRIORITY_SAFETY
+    if head in ("CTRL", "START"):
+        return PRIORITY_MOTION
+    if head == "STATUS":
+        return PRIORITY_POLLING
+    if head == "LOGS":
+        return PRIORITY_BACKGROUND
+    return PRIORITY_INTERACTIVE
+
+
+def batch_priority(commands: Sequence[str]) -> str:
+    """Class of the most urgent command in a batch."""
+
+    return min(
+        (classify_command(command) for command in commands),
+        key=_RANK.__getitem__,
+        default=PRIORITY_INTERACTIVE,
+    )
+
+
+class _ClassStats:
+    __slots__ = ("executed", "dropped", "waits")
+
+    def __init__(self) -> None:
+        self.executed = 0
+        self.dropped = 0
+        self.waits: Deque[float] = deque(maxlen=WAIT_WINDOW)
+
+
+class ScheduledLink:
+    """Link wrapper running one command at a time in priority order."""
+
+    def __init__(self, link: Any, *, clock: Callable[[], float] = time.monotonic) -> None:
+        self.link = link
+        self._clock = clock
+        self._cond = threading.Condition()
+        self._queue: List[List[Any]] = []
+        self._sequence = itertools.count()
+        self._busy = False
+        self._stats: Dict[str, _ClassStats] = {name: _ClassStats() for name in PRIORITY_CLASSES}
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.link, name)
+
+    # ------------------------------------------------------------------
+    def _acquire(
+        self, priority: str, stale_after: Optional[float], cancelled: Optional[threading.Event] = None
+    ) -> None:
+        if priority not in _RANK:
+            raise ValueError(f"unknown priority class {priority!r}")
+        enqueued = self._clock()
+        entry = [_RANK[priority], next(self._sequence)]
+        with self._cond:
+            heapq.heappush(self._queue, entry)
+            while True:
+                # Checked on every wake-up and once more when the slot is granted.
+                if cancelled is not None and cancelled.is_set():
+                    self._drop(entry, priority)
+                    raise CommandDropped(f"{priority} command cancelled before it was sent")
+                if not self._busy and self._queue[0] is entry:
+                    break
+                remaining = None
+                if stale_after is not None:
+                    remaining = enqueued + stale_after - self._clock()
+                    if remaining <= 0:
+                        self._drop(entry, priority)
+                        raise CommandDropped(
+                            f"{priority} command dropped after waiting {stale_after:.2f}s"
+                        )
+                self._cond.wait(remaining)
+            heapq.heappop(self._queue)
+            self._busy = True
+            stats = self._stats[priority]
+            stats.executed += 1
+            stats.waits.append(self._clock() - enqueued)
+
+    def _drop(self, entry: List[Any], priority: str) -> None:
+        self._queue.remove(entry)
+        heapq.heapify(self._queue)
+        self._stats[priority].dropped += 1
+        self._cond.notify_all()
+
+    def _release(self) -> None:
+        with self._cond:
+            self._busy = False
+            self._cond.notify_all()
+
+    def _scheduled(
+        self,
+        priority: str,
+        stale_after: Optional[float],
+        call: Callable[[], Any],
+        cancelled: Optional[threading.Event] = None,
+    ) -> Any:
+        self._acquire(priority, stale_after, cancelled)
+        try:
+            return call()
+        finally:
+            self._release()
+
+    @contextlib.contextmanager
+    def reserve(
+        self, priority: str = PRIORITY_INTERACTIVE, stale_after: Optional[float] = None
+    ) -> Iterator[Any]:
+        """Hold the link for a whole sequence; yields the wrapped link to call directly."""
+
+        self._acquire(priority, stale_after)
+        try:
+            yield self.link
+        finally:
+            self._release()
+
+    # ------------------------------------------------------------------
+    def run_command(
+        self,
+        command: str,
+        *,
+        timeout: Optional[float] = None,
+        raise_on_error: bool = True,
+        parser: Optional[Callable[[List[str]], Dict[str, object]]] = None,
+        priority: Optional[str] = None,
+        stale_after: Optional[float] = None,
+        cancelled: Optional[threading.Event] = None,
+    ) -> CommandResult:
+        """Run ``command`` when its turn comes; ``cancelled`` drops it if set before then."""
+
+        kwargs: Dict[str, Any] = {"raise_on_error": raise_on_error}
+        if timeout is not None:
+            kwargs["timeout"] = timeout
+        if parser is not None:
+            kwargs["parser"] = parser
+        return self._scheduled(
+            priority or classify_command(command),
+            stale_after,
+            lambda: self.link.run_command(command, **kwargs),
+            cancelled,
+        )
+
+    def run_pipelined(
+        self,
+        commands: Sequence[str],
+        *,
+        timeout: Optional[float] = None,
+        raise_on_error: bool = True,
+        priority: Optional[str] = None,
+        stale_after: Optional[float] = None,
+        cancelled: Optional[threading.Event] = None,
+    ) -> List[CommandResult]:
+        """Run a batch in one slot, at the class of its most urgent command."""
+
+        return self._scheduled(
+            priority or batch_priority(commands),
+            stale_after,
+            lambda: run_pipelined(self.link, commands, timeout=timeout, raise_on_error=raise_on_error),
+            cancelled,
+        )
+
+    def collect_pending_logs(self, *args: Any, **kwargs: Any) -> Any:
+        return self._scheduled(
+            PRIORITY_BACKGROUND, None, lambda: self.link.collect_pending_logs(*args, **kwargs)
+        )
+
+    def fetch_logs(self, since: int, limit: int = 64) -> Any:
+        return self._scheduled(PRIORITY_BACKGROUND, None, lambda: self.link.fetch_logs(since, limit))
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Per-class counters and queue wait times in milliseconds."""
+
+        with self._cond:
+            queued = {name: 0 for name in PRIORITY_CLASSES}
+            for rank, _ in self._queue:
+                queued[PRIORITY_CLASSES[rank]] += 1
+            result: Dict[str, Dict[str, Any]] = {}
+            for name, stats in self._stats.items():
+                waits = sorted(stats.waits)
+                result[name] = {
+                    "queued": queued[name],
+                    "executed": stats.executed,
+                    "dropped": stats.dropped,
+                    "wait_ms_mean": sum(waits) / len(waits) * 1000.0 if waits else None,
+                    "wait_ms_p95": waits[min(len(waits) - 1, int(0.95 * len(waits)))] * 1000.0 if waits else None,
+                    "wait_ms_max": waits[-1] * 1000.0 if waits else None,
+                }
+            return result
+
+
+__all__ = [
+    "CommandDropped",
+    "PRIORITY_BACKGROUND",
+    "PRIORITY_CLASSES",
+    "PRIORITY_INTERACTIVE",
+    "PRIORITY_MOTION",
+    "PRIORITY_POLLING",
+    "PRIORITY_SAFETY",
+    "ScheduledLink",
+    "batch_priority",
+    "classify_command",
+]
@@ -0,0 +1,464 @@
+"""Sequence-keyed ingest pipeline for ESP32 log lines arriving over several transports.
+
+The firmware ``log_sink`` numbers every line it records. Wi-Fi clients read the ring
+buffer through ``LOGS since=<seq>`` and therefore see those numbers, while the UART
+console mirrors the same lines without them. ``LogSequencer`` merges both feeds:
+
+* sequenced lines are keyed on their firmware sequence number and deduplicated with a
+  bounded sliding window (O(1) membership and eviction);
+* unsequenced UART lines are held for a short grace period and matched by content
+  against the sequenced feed, so a line seen on both transports is emitted once;
+* holes in the sequence are reported through :meth:`LogSequencer.gaps` so the caller
+  can backfill them from whichever transport is reachable, and lines that aged out of
+  the firmware ring before anyone read them are surfaced as an explicit notice.
+"""
+from __future__ import annotations
+
+import re
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Iterable, List, Mapping, Optional, Tuple
+
+DEFAULT_DEDUP_WINDOW = 1024
+DEFAULT_UNSEQUENCED_HOLD = 0.75  # seconds an unsequenced line waits for its sequenced twin
+DEFAULT_SEQUENCED_STALE_AFTER = 5.0  # seconds without a sequenced dump before UART lines pass straight through
+DEFAULT_MATCH_HORIZON = 30.0  # seconds a line stays eligible for cross-transport matching
+LOST_LINES_TAG = "[LOG]"
+
+_SUMMARY_RE = re.compile(r"(?P<key>logs_[a-z_]+)=(?P<value>[^\s,]+)", re.IGNORECASE)
+
+
+@dataclass
+class LogDump:
+    """Parsed reply of the firmware ``LOGS`` command."""
+
+    entries: List[Tuple[int, str]] = field(default_factory=list)
+    next_seq: Optional[int] = None
+    count: Optional[int] = None
+    truncated: bool = False
+    error: Optional[str] = None
+    uptimes: Dict[int, int] = field(default_factory=dict)
+    uptime_ms: Optional[int] = None
+    sent_at: Optional[float] = None
+    received_at: Optional[float] = None
+
+
+@dataclass(frozen=True)
+class LogRecord:
+    """A single log line accepted by the ingest pipeline."""
+
+    timestamp: float
+    text: str
+    seq: Optional[int] = None
+    source: Optional[str] = None
+
+
+def parse_log_dump(lines: Iterable[str], *, with_timestamps: bool = False) -> LogDump:
+    """Split a ``LOGS`` reply into ``(seq, text)`` entries and the trailing summary.
+
+    ``with_timestamps`` expects the ``LOGS ... ts=1`` layout ``<seq>|<uptime_ms>|<text>``
+    and records each capture time in :attr:`LogDump.uptimes`.
+    """
+
+    dump = LogDump()
+    summary: Dict[str, str] = {}
+    for line in lines:
+        normalized = line.strip()
+        if not normalized:
+            continue
+        if normalized.lower().startswith("logs_"):
+            for match in _SUMMARY_RE.finditer(normalized):
+                summary[match.group("key").lower()] = match.group("value")
+            continue
+        if "|" not in normalized:
+            continue
+        seq_text, payload = normalized.split("|", 1)
+        try:
+            seq_value = int(seq_text.strip())
+        except ValueError:
+            continue
+        if with_timestamps and "|" in payload:
+            uptime_text, text = payload.split("|", 1)
+            if uptime_text.strip().isdigit():
+                dump.uptimes[seq_value] = int(uptime_text.strip())
+                payload = text
+        dump.entries.append((seq_value, payload.strip()))
+
+    dump.next_seq = _summary_int(summary.get("logs_next"))
+    dump.count = _summary_int(summary.get("logs_count"))
+    dump.truncated = bool(_summary_int(summary.get("logs_truncated")))
+    dump.uptime_ms = _summary_int(summary.get("logs_uptime_ms"))
+    error_hint = summary.get("logs_error")
+    if error_hint:
+        dump.error = error_hint
+    return dump
+
+
+def fetch_log_dump(
+    run_command: Callable[..., Any],
+    since: int,
+    limit: int,
+    *,
+    timestamps: Optional[bool],
+) -> Tuple[LogDump, Optional[bool]]:
+    """Issue ``LOGS`` through ``run_command`` and return the dump plus timestamp support.
+
+    ``timestamps`` is the caller's cached capability: ``None`` means unknown, in which
+    case ``ts=1`` is tried once and firmware that rejects it with ``logs_error=SYNTAX``
+    is remembered as not supporting capture timestamps.
+    """
+
+    command = f"logs since={max(0, int(since))}"
+    if limit > 0:
+        command = f"{command} limit={limit}"
+    want_timestamps = timestamps is not False
+    result = run_command(f"{command} ts=1" if want_timestamps else command, raise_on_error=False)
+    dump = parse_log_dump(result.raw, with_timestamps=want_timestamps)
+    if want_timestamps and timestamps is None and dump.error == "SYNTAX":
+        timestamps = False
+        result = run_command(command, raise_on_error=False)
+        dump = parse_log_dump(result.raw)
+    elif want_timestamps and not dump.error:
+        timestamps = True
+
+    dump.sent_at = getattr(result, "sent_at", None)
+    received_at = getattr(result, "received_at", None)
+    dump.received_at = received_at("logs_") if callable(received_at) else None
+    return dump, timestamps
+
+
+def _summary_int(value: Optional[str]) -> Optional[int]:
+    if value is None:
+        return None
+    try:
+        return int(value, 0)
+    except ValueError:
+        return None
+
+
+class _CountingWindow:
+    """Multiset of recently seen keys with O(1) add/consume and bounded age and size."""
+
+    def __init__(self, capacity: int, horizon: float) -> None:
+        self._capacity = max(1, capacity)
+        self._horizon = horizon
+        self._order: Deque[Tuple[float, str]] = deque()
+        self._counts: Dict[str, int] = {}
+        self._consumed: Dict[str, int] = {}
+
+    def add(self, key: str, now: float) -> None:
+        self._expire(now)
+        self._order.append((now, key))
+        self._counts[key] = self._counts.get(key, 0) + 1
+        while len(self._order) > self._capacity:
+            self._evict()
+
+    def consume(self, key: str, now: float) -> bool:
+        self._expire(now)
+        if self._counts.get(key, 0) <= 0:
+            return False
+        self._decrement(self._counts, key)
+        # The slot stays queued; eviction retires it through ``_consumed``.
+        self._consumed[key] = self._consumed.get(key, 0) + 1
+        return True
+
+    def clear(self) -> None:
+        self._order.clear()
+        self._counts.clear()
+        self._consumed.clear()
+
+    def _expire(self, now: float) -> None:
+        cutoff = now - self._horizon
+        while self._order and self._order[0][0] < cutoff:
+            self._evict()
+
+    def _evict(self) -> None:
+        _, key = self._order.popleft()
+        if self._consumed.get(key, 0) > 0:
+            self._decrement(self._consumed, key)
+        else:
+            self._decrement(self._counts, key)
+
+    @staticmethod
+    def _decrement(table: Dict[str, int], key: str) -> None:
+        remaining = table.get(key, 0) - 1
+        if remaining > 0:
+            table[key] = remaining
+        else:
+            table.pop(key, None)
+
+
+@dataclass
+class _HeldLine:
+    timestamp: float
+    text: str
+    source: Optional[str]
+    release_at: float
+    matched: bool = False
+
+
+class LogSequencer:
+    """Merge sequenced and unsequenced log feeds into one duplicate-free stream."""
+
+    def __init__(
+        self,
+        *,
+        window: int = DEFAULT_DEDUP_WINDOW,
+        hold: float = DEFAULT_UNSEQUENCED_HOLD,
+        sequenced_stale_after: float = DEFAULT_SEQUENCED_STALE_AFTER,
+        match_horizon: float = DEFAULT_MATCH_HORIZON,
+        clock=time.monotonic,
+    ) -> None:
+        self._window = max(16, window)
+        self._hold = max(0.0, hold)
+        self._sequenced_stale_after = sequenced_stale_after
+        self._clock = clock
+        self._seen: set[int] = set()
+        self._seen_order: Deque[int] = deque()
+        self._last_contiguous: Optional[int] = None
+        self._highest: Optional[int] = None
+        self._sequenced_texts = _CountingWindow(self._window, match_horizon)
+        self._released_texts = _CountingWindow(self._window, match_horizon)
+        self._held: Deque[_HeldLine] = deque()
+        self._held_index: Dict[str, Deque[_HeldLine]] = {}
+        self._last_sequenced_at: Optional[float] = None
+        self._unsequenced_since_dump = 0
+        self.stats: Dict[str, int] = {
+            "sequenced": 0,
+            "unsequenced": 0,
+            "duplicates": 0,
+            "lost": 0,
+            "resets": 0,
+            "gap_fills": 0,
+        }
+
+    # ------------------------------------------------------------------
+    @property
+    def cursor(self) -> int:
+        """Return the ``since=`` value for the next ``LOGS`` request."""
+
+        return self._last_contiguous or 0
+
+    def gaps(self, limit: int = 4) -> List[Tuple[int, int]]:
+        """Return up to ``limit`` inclusive seq ranges missing below the high-water mark."""
+
+        if self._highest is None or self._last_contiguous is None:
+            return []
+        ranges: List[Tuple[int, int]] = []
+        start: Optional[int] = None
+        upper = min(self._highest, self._last_contiguous + 1 + self._window)
+        for seq in range(self._last_contiguous + 1, upper):
+            if seq in self._seen:
+                if start is not None:
+                    ranges.append((start, seq - 1))
+                    start = None
+                    if len(ranges) >= limit:
+                        return ranges
+            elif start is None:
+                start = seq
+        if start is not None:
+            ranges.append((start, upper - 1))
+        return ranges[:limit]
+
+    def sequenced_active(self, now: Optional[float] = None) -> bool:
+        """Return ``True`` while a sequenced feed delivered a dump recently."""
+
+        if self._last_sequenced_at is None:
+            return False
+        now = self._clock() if now is None else now
+        return (now - self._last_sequenced_at) < self._sequenced_stale_after
+
+    # ------------------------------------------------------------------
+    def ingest_dump(
+        self,
+        dump: LogDump,
+        *,
+        since: Optional[int] = None,
+        source: Optional[str] = None,
+        timestamp: Optional[float] = None,
+        timestamps: Optional[Mapping[int, float]] = None,
+    ) -> List[LogRecord]:
+        """Accept a parsed ``LOGS`` reply and return the lines not seen before.
+
+        ``timestamps`` maps sequence numbers to host-aligned capture times; lines without
+        an entry fall back to ``timestamp`` (the time the dump was received).
+        """
+
+        received_at = time.time() if timestamp is None else timestamp
+        now = self._clock()
+        self._last_sequenced_at = now
+
+        if (
+            dump.next_seq is not None
+            and self._last_contiguous is not None
+            and dump.next_seq <= self._last_contiguous
+            and all(seq <= dump.next_seq for seq, _ in dump.entries)
+        ):
+            # The firmware counter went backwards: the ESP32 rebooted.
+            self._reset_sequence()
+
+        requested_since = self.cursor if since is None else since
+        emitted: List[LogRecord] = []
+        ordered = sorted(dump.entries, key=lambda item: item[0])
+
+        if ordered and since is not None and requested_since <= self.cursor:
+            first_seq = ordered[0][0]
+            expected = self.cursor + 1
+            if first_seq > expected and self._last_contiguous is not None:
+                lost_notice = self._mark_lost(expected, first_seq - 1, received_at)
+                if lost_notice is not None:
+                    emitted.append(lost_notice)
+
+        for seq, text in ordered:
+            if seq <= requested_since and since is not None:
+                continue
+            if seq in self._seen or (
+                self._last_contiguous is not None and seq <= self._last_contiguous
+            ):
+                self.stats["duplicates"] += 1
+                continue
+            self._remember_seq(seq)
+            if self._released_texts.consume(text, now):
+                # Already emitted from the unsequenced feed.
+                self.stats["duplicates"] += 1
+                continue
+            captured_at = timestamps.get(seq) if timestamps else None
+            held = self._claim_held(text)
+            if held is not None:
+                self.stats["duplicates"] += 1
+                fallback = held.timestamp
+            else:
+                self._sequenced_texts.add(text, now)
+                fallback = received_at
+            record = LogRecord(
+                fallback if captured_at is None else captured_at,
+                text,
+                seq=seq,
+                source=source,
+            )
+            self.stats["sequenced"] += 1
+            emitted.append(record)
+
+        self._advance_contiguous()
+        self._unsequenced_since_dump = 0
+        return emitted
+
+    def ingest_unsequenced(
+        self,
+        entries: Iterable[Tuple[float, str]],
+        *,
+        source: Optional[str] = None,
+    ) -> List[LogRecord]:
+        """Queue UART-mirrored lines; returns the ones that can be emitted right away."""
+
+        now = self._clock()
+        passthrough = not self.sequenced_active(now)
+        emitted: List[LogRecord] = []
+        for timestamp, text in entries:
+            if not text:
+                continue
+            if self._sequenced_texts.consume(text, now):
+                self.stats["duplicates"] += 1
+                continue
+            self._unsequenced_since_dump += 1
+            if passthrough or self._hold <= 0:
+                self._released_texts.add(text, now)
+                self.stats["unsequenced"] += 1
+                emitted.append(LogRecord(timestamp, text, source=source))
+                continue
+            held = _HeldLine(timestamp, text, source, now + self._hold)
+            self._held.append(held)
+            self._held_index.setdefault(text, deque()).append(held)
+        return emitted
+
+    def release(self, now: Optional[float] = None) -> List[LogRecord]:
+        """Emit held unsequenced lines whose grace period expired without a match."""
+
+        now = self._clock() if now is None else now
+        emitted: List[LogRecord] = []
+        while self._held and (self._held[0].matched or self._held[0].release_at <= now):
+            held = self._held.popleft()
+            if held.matched:
+                continue
+            self._unindex_held(held)
+            self._released_texts.add(held.text, now)
+            self.stats["unsequenced"] += 1
+            emitted.append(LogRecord(held.timestamp, held.text, source=held.source))
+        return emitted
+
+    def note_gap_fill(self) -> None:
+        self.stats["gap_fills"] += 1
+
+    # ------------------------------------------------------------------
+    def _remember_seq(self, seq: int) -> None:
+        self._seen.add(seq)
+        self._seen_order.append(seq)
+        while len(self._seen_order) > self._window:
+            self._seen.discard(self._seen_order.popleft())
+        if self._highest is None or seq + 1 > self._highest:
+            self._highest = seq + 1
+
+    def _advance_contiguous(self) -> None:
+        if self._highest is None:
+            return
+        if self._last_contiguous is None:
+            # First dump: start from the lowest sequence we observed.
+            lowest = min(self._seen) if self._seen else None
+            if lowest is None:
+                return
+            self._last_contiguous = lowest
+        while (self._last_contiguous + 1) in self._seen:
+            self._last_contiguous += 1
+
+    def _mark_lost(self, first: int, last: int, timestamp: float) -> Optional[LogRecord]:
+        if self._last_contiguous is None or last > self._last_contiguous:
+            self._last_contiguous = last
+        missing = last - first + 1
+        if self._unsequenced_since_dump:
+            # The UART mirror was delivering lines during the hole; the content was not lost.
+            return None
+        self.stats["lost"] += missing
+        text = f"{LOST_LINES_TAG} lost={missing} first_seq={first} last_seq={last}"
+        return LogRecord(timestamp, text, source=None)
+
+    def _reset_sequence(self) -> None:
+        self.stats["resets"] += 1
+        self._seen.clear()
+        self._seen_order.clear()
+        self._last_contiguous = None
+        self._highest = None
+        self._sequenced_texts.clear()
+
+    def _claim_held(self, text: str) -> Optional[_HeldLine]:
+        bucket = self._held_index.get(text)
+        if not bucket:
+            return None
+        held = bucket.popleft()
+        if not bucket:
+            self._held_index.pop(text, None)
+        held.matched = True
+        return held
+
+    def _unindex_held(self, held: _HeldLine) -> None:
+        bucket = self._held_index.get(held.text)
+        if not bucket:
+            return
+        if bucket[0] is held:
+            bucket.popleft()
+        else:
+            try:
+                bucket.remove(held)
+            except ValueError:
+                return
+        if not bucket:
+            self._held_index.pop(held.text, None)
+
+
+__all__ = [
+    "LogDump",
+    "LogRecord",
+    "LogSequencer",
+    "fetch_log_dump",
+    "parse_log_dump",
+]
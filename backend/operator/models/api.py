@@ -1,9 +1,15 @@
 """Pydantic schemas shared across API routes."""
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Literal, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+from ..services.telemetry_capture import MAX_CAPTURE_DURATION, MAX_CAPTURE_RATE
+
+MAX_BATCH_STEPS = 32
+MAX_MACRO_STEPS = 64
+MAX_ODOMETRY_CONFIGS = 32
 
 
 class CommandRequest(BaseModel):
@@ -17,6 +23,91 @@ class CommandResponse(BaseModel):
     data: Dict[str, Any]
 
 
+class CommandStep(BaseModel):
+    command: str
+    raise_on_error: bool = False
+    stop_on_failure: bool = False
+
+
+class CommandBatchRequest(BaseModel):
+    steps: List[CommandStep] = Field(min_length=1, max_length=MAX_BATCH_STEPS)
+
+
+class CommandStepResult(BaseModel):
+    command: str
+    ok: bool
+    skipped: bool = False
+    error: Optional[str] = None
+    raw: list[str] = []
+    data: Dict[str, Any] = {}
+
+
+class CommandBatchResponse(BaseModel):
+    transport: Optional[str]
+    results: List[CommandStepResult]
+
+
+class MacroStepRequest(BaseModel):
+    command: str
+    at_ms: Optional[float] = None
+    when: Optional[str] = None
+    timeout_ms: Optional[float] = None
+
+
+class MacroRequest(BaseModel):
+    steps: List[MacroStepRequest] = Field(min_length=1, max_length=MAX_MACRO_STEPS)
+
+
+class MacroStepReport(BaseModel):
+    index: int
+    command: str
+    at_ms: Optional[float] = None
+    when: Optional[str] = None
+    dispatched_ms: Optional[float] = None
+    jitter_ms: Optional[float] = None
+    ok: bool
+    skipped: bool = False
+    error: Optional[str] = None
+    reply: list[str] = []
+
+
+class MacroReport(BaseModel):
+    id: str
+    state: str
+    error: Optional[str] = None
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    jitter_ms_p50: Optional[float] = None
+    jitter_ms_max: Optional[float] = None
+    steps: List[MacroStepReport]
+
+
+class TelemetryCaptureRequest(BaseModel):
+    duration: float = Field(gt=0, le=MAX_CAPTURE_DURATION)
+    rate: Optional[float] = Field(None, gt=0, le=MAX_CAPTURE_RATE)
+    fields: Optional[List[str]] = None
+    format: Literal["ndjson", "binary"] = "ndjson"
+
+
+class OdometryConfigRequest(BaseModel):
+    cpr: int = Field(192, gt=0, le=65535)
+    gear_num: int = Field(16, gt=0, le=65535)
+    gear_den: int = Field(1, gt=0, le=65535)
+    wheel_diam_mm: float = Field(160.0, gt=0)
+    track_mm: float = Field(600.0, gt=0)
+
+
+class OdometryResetRequest(BaseModel):
+    x_mm: float = 0.0
+    y_mm: float = 0.0
+    theta_rad: float = 0.0
+
+
+class OdometryReplayRequest(BaseModel):
+    configs: List[OdometryConfigRequest] = Field(min_length=1, max_length=MAX_ODOMETRY_CONFIGS)
+    points: int = Field(200, ge=2, le=5000)
+
+
 class CameraConfigResponse(BaseModel):
     resolution: str
     quality: int
@@ -73,6 +164,45 @@ class ControlTransportUpdate(BaseModel):
     mode: str
 
 
+class TransportBreakerState(BaseModel):
+    state: str
+    consecutive_failures: int = 0
+    consecutive_successes: int = 0
+    backoff: Optional[float] = None
+    retry_in: Optional[float] = None
+    failures: int = 0
+    successes: int = 0
+    probes: int = 0
+    rejected: int = 0
+    transitions: Dict[str, int] = {}
+
+
+class TransportHedgeStats(BaseModel):
+    races: int = 0
+    wins: int = 0
+    win_rate: Optional[float] = None
+    hedges_sent: int = 0
+    hedge_wins: int = 0
+    cancelled: int = 0
+
+
+class SchedulerClassStats(BaseModel):
+    queued: int = 0
+    executed: int = 0
+    dropped: int = 0
+    wait_ms_mean: Optional[float] = None
+    wait_ms_p95: Optional[float] = None
+    wait_ms_max: Optional[float] = None
+
+
+class CommandTimeoutStats(BaseModel):
+    samples: int = 0
+    srtt_ms: Optional[float] = None
+    p99_ms: Optional[float] = None
+    timeout_ms: Optional[float] = None
+    timeouts: int = 0
+
+
 class TransportDescriptor(BaseModel):
     id: str
     label: str
@@ -81,6 +211,10 @@ class TransportDescriptor(BaseModel):
     last_error: Optional[str] = None
     last_success: Optional[float] = None
     last_failure: Optional[float] = None
+    breaker: Optional[TransportBreakerState] = None
+    hedge: Optional[TransportHedgeStats] = None
+    scheduler: Optional[Dict[str, SchedulerClassStats]] = None
+    timeouts: Optional[Dict[str, CommandTimeoutStats]] = None
 
 
 class ControlState(BaseModel):
@@ -111,18 +245,34 @@ class WifiConfigUpdate(BaseModel):
 __all__ = [
     "CameraConfigResponse",
     "CameraConfigUpdate",
+    "CommandBatchRequest",
+    "CommandBatchResponse",
     "CommandRequest",
     "CommandResponse",
+    "CommandStep",
+    "CommandStepResult",
+    "CommandTimeoutStats",
     "ControlState",
     "ControlTransportUpdate",
+    "MacroReport",
+    "MacroRequest",
+    "MacroStepReport",
+    "MacroStepRequest",
+    "OdometryConfigRequest",
+    "OdometryReplayRequest",
+    "OdometryResetRequest",
     "WifiConfigResponse",
     "WifiConfigUpdate",
     "ShelfMapPaletteEntry",
     "ShelfMapResetRequest",
     "ShelfMapResponse",
     "ShelfMapUpdateRequest",
+    "SchedulerClassStats",
     "ServiceInfo",
+    "TelemetryCaptureRequest",
+    "TransportBreakerState",
     "TransportDescriptor",
+    "TransportHedgeStats",
 ]
 
 ServiceInfo.model_rebuild()
@@ -0,0 +1,162 @@
+"""Per-command reply deadlines derived from observed round-trip times."""
+from __future__ import annotations
+
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from ..esp32_link import LOG_LINE_RE, CommandResult
+from .transport_hedge import normalize_command
+
+DEFAULT_TIMEOUT_FLOOR = 0.25  # seconds; below this scheduling noise dominates
+DEFAULT_SAFETY_FACTOR = 2.0
+TIMEOUT_PERCENTILE = 0.99
+EWMA_ALPHA = 0.125  # same gains as TCP's SRTT / RTTVAR estimator
+EWMA_BETA = 0.25
+DEVIATION_WEIGHT = 4.0
+RTT_WINDOW = 128
+MIN_RTT_SAMPLES = 8
+
+
+def timeout_key(command: str) -> str:
+    """Estimator key for ``command``: ``key=value`` arguments count by key only.
+
+    ``CTRL DRIVE vx=120 t=300`` and ``CTRL DRIVE vx=80 t=300`` take equally long, so
+    teleop setpoints share one learned deadline instead of each starting cold.
+    """
+
+    tokens = normalize_command(command).split()
+    return " ".join(token.split("=", 1)[0] + "=" if "=" in token else token for token in tokens)
+
+
+def reply_latency(result: CommandResult, *, since: Optional[float] = None) -> Optional[float]:
+    """Seconds from sending the command until its last reply line arrived.
+
+    Mirrored log lines are ignored, and ``None`` is returned when the reply carries
+    no timing or no reply lines at all. ``since`` replaces the send time for pipelined
+    commands, which only start once the previous reply is complete.
+    """
+
+    started = result.sent_at if since is None else since
+    if started is None or not result.line_times:
+        return None
+    arrivals = [
+        arrived
+        for line, arrived in zip(result.raw, result.line_times)
+        if not LOG_LINE_RE.match(line)
+    ]
+    if not arrivals:
+        return None
+    return max(0.0, arrivals[-1] - started)
+
+
+class _RttStats:
+    __slots__ = ("samples", "srtt", "rttvar", "backoff", "timeouts")
+
+    def __init__(self, window: int) -> None:
+        self.samples: Deque[float] = deque(maxlen=window)
+        self.srtt: Optional[float] = None
+        self.rttvar = 0.0
+        self.backoff = 1.0
+        self.timeouts = 0
+
+
+class CommandTimeouts:
+    """Derive reply deadlines per transport/command pair from recent round-trip times.
+
+    Once ``MIN_RTT_SAMPLES`` replies were seen the deadline is the larger of
+    ``p99 × safety_factor`` and ``srtt + 4 × rttvar``, clamped to ``[floor, ceiling]``.
+    Until then (slow start) the caller's initial timeout, by default ``ceiling``, is
+    used. Every missed deadline doubles the derived value, up to ``ceiling``, until
+    the next reply arrives in time.
+    """
+
+    def __init__(
+        self,
+        *,
+        ceiling: float,
+        floor: float = DEFAULT_TIMEOUT_FLOOR,
+        safety_factor: float = DEFAULT_SAFETY_FACTOR,
+        window: int = RTT_WINDOW,
+    ) -> None:
+        self._ceiling = max(0.0, ceiling)
+        self._floor = min(max(0.0, floor), self._ceiling)
+        self._safety_factor = max(1.0, safety_factor)
+        self._window = max(1, window)
+        self._lock = threading.Lock()
+        self._stats: Dict[Tuple[str, str], _RttStats] = {}
+
+    def _entry(self, transport: str, command: str) -> _RttStats:
+        key = (transport, timeout_key(command))
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats[key] = _RttStats(self._window)
+        return stats
+
+    def observe(self, transport: str, command: str, rtt: float) -> None:
+        with self._lock:
+            stats = self._entry(transport, command)
+            stats.samples.append(rtt)
+            stats.backoff = 1.0
+            if stats.srtt is None:
+                stats.srtt = rtt
+                stats.rttvar = rtt / 2.0
+            else:
+                stats.rttvar += EWMA_BETA * (abs(stats.srtt - rtt) - stats.rttvar)
+                stats.srtt += EWMA_ALPHA * (rtt - stats.srtt)
+
+    def record_timeout(self, transport: str, command: str) -> None:
+        with self._lock:
+            stats = self._entry(transport, command)
+            stats.timeouts += 1
+            stats.backoff = min(stats.backoff * 2.0, 64.0)
+
+    def learned(self, transport: str, command: str) -> bool:
+        """Whether enough replies were seen to expect one within the deadline."""
+
+        with self._lock:
+            stats = self._stats.get((transport, timeout_key(command)))
+            return stats is not None and len(stats.samples) >= MIN_RTT_SAMPLES
+
+    def _derive(self, stats: Optional[_RttStats], initial: float) -> float:
+        if stats is None or len(stats.samples) < MIN_RTT_SAMPLES or stats.srtt is None:
+            return min(self._ceiling, initial)
+        ordered = sorted(stats.samples)
+        p99 = ordered[min(len(ordered) - 1, int(TIMEOUT_PERCENTILE * len(ordered)))]
+        value = max(p99 * self._safety_factor, stats.srtt + DEVIATION_WEIGHT * stats.rttvar)
+        value = max(self._floor, value) * stats.backoff
+        return min(self._ceiling, value)
+
+    def timeout(self, transport: str, command: str, *, initial: Optional[float] = None) -> float:
+        with self._lock:
+            stats = self._stats.get((transport, timeout_key(command)))
+            return self._derive(stats, self._ceiling if initial is None else initial)
+
+    def snapshot(self, transport: str) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            result: Dict[str, Dict[str, Any]] = {}
+            for (owner, command), stats in sorted(self._stats.items()):
+                if owner != transport:
+                    continue
+                ordered = sorted(stats.samples)
+                result[command] = {
+                    "samples": len(ordered),
+                    "srtt_ms": stats.srtt * 1000.0 if stats.srtt is not None else None,
+                    "p99_ms": (
+                        ordered[min(len(ordered) - 1, int(TIMEOUT_PERCENTILE * len(ordered)))] * 1000.0
+                        if ordered
+                        else None
+                    ),
+                    "timeout_ms": self._derive(stats, self._ceiling) * 1000.0,
+                    "timeouts": stats.timeouts,
+                }
+            return result
+
+
+__all__ = [
+    "CommandTimeouts",
+    "DEFAULT_SAFETY_FACTOR",
+    "DEFAULT_TIMEOUT_FLOOR",
+    "reply_latency",
+    "timeout_key",
+]
@@ -0,0 +1,278 @@
+"""Timed motion macros dispatched by the backend on a monotonic clock.
+
+A macro is a list of ``CTRL`` (or ``BRAKE``) steps. A step may carry ``at_ms``, its
+offset from the macro start, and/or ``when``, a telemetry condition such as
+``elev_mm >= 120`` that must hold before it is sent. Steps without either follow the
+previous one immediately. Everything is validated before the first command goes out.
+
+Steps run on the ``safety`` scheduler slot. The runner sleeps until shortly before
+each deadline and yields to the event loop for the last couple of milliseconds, so
+dispatch does not inherit ``asyncio.sleep`` granularity. Per-step jitter is the time
+from the trigger (deadline or the telemetry sample that met the condition) until the
+command was written to the link. A failed step, a condition that times out or a
+cancel sends ``BRAKE`` and skips the remaining steps.
+"""
+from __future__ import annotations
+
+import asyncio
+import itertools
+import operator
+import re
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+from ..esp32_link import CommandResult, SerialNotFoundError
+from ..status_frame import STATUS_FIELDS, TEXT, IP
+
+MACRO_TARGETS = frozenset({"DRIVE", "MOVE", "TURN", "ELEV", "LIFT", "GRIP", "HOME"})
+DEFAULT_CONDITION_TIMEOUT_MS = 10_000
+SPIN_MARGIN = 0.002  # seconds before a deadline spent yielding instead of sleeping
+MACRO_HISTORY = 16
+
+MACRO_PENDING = "pending"
+MACRO_RUNNING = "running"
+MACRO_DONE = "done"
+MACRO_FAILED = "failed"
+MACRO_CANCELLED = "cancelled"
+
+CONDITION_RE = re.compile(r"^\s*([A-Za-z_][A-Za-z0-9_]*)\s*(>=|<=|==|!=|>|<)\s*(-?\d+(?:\.\d+)?)\s*$")
+_OPERATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    ">=": operator.ge,
+    "<=": operator.le,
+    "==": operator.eq,
+    "!=": operator.ne,
+    ">": operator.gt,
+    "<": operator.lt,
+}
+# Status fields a condition can compare against a number.
+CONDITION_FIELDS = frozenset(name for name, kind, _ in STATUS_FIELDS if kind not in (TEXT, IP))
+_ACK_RE = re.compile(r"^(?:ctrl_[a-z]+|BRAKE)=OK\b", re.IGNORECASE)
+_MACRO_IDS = itertools.count(1)
+
+
+class MacroError(ValueError):
+    """A macro failed validation and was not started."""
+
+
+class MacroBusyError(RuntimeError):
+    """Another macro is still running."""
+
+
+class _StepFailed(RuntimeError):
+    pass
+
+
+@dataclass(frozen=True)
+class Condition:
+    field: str
+    op: str
+    value: float
+
+    def holds(self, data: Dict[str, Any]) -> bool:
+        current = data.get(self.field)
+        if isinstance(current, bool):
+            current = int(current)
+        if not isinstance(current, (int, float)):
+            return False
+        return _OPERATORS[self.op](current, self.value)
+
+    def __str__(self) -> str:
+        value = int(self.value) if self.value.is_integer() else self.value
+        return f"{self.field} {self.op} {value}"
+
+
+@dataclass(frozen=True)
+class MacroStep:
+    command: str
+    at: Optional[float] = None  # seconds after the macro start
+    condition: Optional[Condition] = None
+    timeout: float = DEFAULT_CONDITION_TIMEOUT_MS / 1000.0
+
+
+def parse_condition(text: str) -> Condition:
+    match = CONDITION_RE.match(text)
+    if match is None:
+        raise MacroError(f"condition {text!r} must look like 'elev_mm >= 120'")
+    field, op, value = match.groups()
+    if field not in CONDITION_FIELDS:
+        raise MacroError(f"unknown telemetry field {field!r} in condition")
+    return Condition(field, op, float(value))
+
+
+def compile_macro(steps: Sequence[Dict[str, Any]]) -> List[MacroStep]:
+    """Validate raw steps (``command``, ``at_ms``, ``when``, ``timeout_ms``)."""
+
+    compiled: List[MacroStep] = []
+    last_at = 0.0
+    for index, raw in enumerate(steps, start=1):
+        command = " ".join(str(raw.get("command") or "").split())
+        words = command.upper().split()
+        if words != ["BRAKE"] and (len(words) < 2 or words[0] != "CTRL" or words[1] not in MACRO_TARGETS):
+            raise MacroError(f"step {index}: only CTRL {'/'.join(sorted(MACRO_TARGETS))} and BRAKE are allowed")
+        at: Optional[float] = None
+        if raw.get("at_ms") is not None:
+            at = float(raw["at_ms"]) / 1000.0
+            if at < 0:
+                raise MacroError(f"step {index}: at_ms must not be negative")
+            if at < last_at:
+                raise MacroError(f"step {index}: at_ms must not be earlier than the previous timed step")
+            last_at = at
+        condition = parse_condition(raw["when"]) if raw.get("when") else None
+        timeout_ms = raw.get("timeout_ms")
+        timeout = DEFAULT_CONDITION_TIMEOUT_MS if timeout_ms is None else float(timeout_ms)
+        if timeout <= 0:
+            raise MacroError(f"step {index}: timeout_ms must be positive")
+        compiled.append(MacroStep(command=command, at=at, condition=condition, timeout=timeout / 1000.0))
+    if not compiled:
+        raise MacroError("a macro needs at least one step")
+    return compiled
+
+
+class MacroRun:
+    """Execution state and per-step report of one macro."""
+
+    def __init__(self, steps: Sequence[MacroStep]) -> None:
+        self.id = f"m{next(_MACRO_IDS)}"
+        self.steps = list(steps)
+        self.state = MACRO_PENDING
+        self.error: Optional[str] = None
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.reports: List[Dict[str, Any]] = [
+            {
+                "index": index,
+                "command": step.command,
+                "at_ms": None if step.at is None else step.at * 1000.0,
+                "when": None if step.condition is None else str(step.condition),
+                "dispatched_ms": None,
+                "jitter_ms": None,
+                "ok": False,
+                "skipped": False,
+                "error": None,
+                "reply": [],
+            }
+            for index, step in enumerate(self.steps)
+        ]
+
+    @property
+    def active(self) -> bool:
+        return self.state in (MACRO_PENDING, MACRO_RUNNING)
+
+    async def execute(
+        self,
+        *,
+        run_step: Callable[[str], Awaitable[CommandResult]],
+        brake: Callable[[], Awaitable[Any]],
+        telemetry: Callable[[], Awaitable[Dict[str, Any]]],
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Dispatch every step; ``telemetry`` returns the next status payload."""
+
+        self.state = MACRO_RUNNING
+        start = clock()
+        start_wall = time.time()
+        self.started_at = start_wall
+        index = 0
+        try:
+            for index, step in enumerate(self.steps):
+                report = self.reports[index]
+                trigger = start_wall
+                if step.at is not None:
+                    await _sleep_until(start + step.at, clock)
+                    trigger = start_wall + step.at
+                if step.condition is not None:
+                    # A sample already queued before the step was reached triggers it now.
+                    reached = time.time()
+                    trigger = max(reached, await _wait_for(step.condition, step.timeout, telemetry, clock))
+                dispatched = time.time()
+                result = await run_step(step.command)
+                sent_at = result.sent_at if result.sent_at is not None else dispatched
+                report["dispatched_ms"] = (sent_at - start_wall) * 1000.0
+                if step.at is not None or step.condition is not None:
+                    report["jitter_ms"] = max(0.0, sent_at - trigger) * 1000.0
+                report["reply"] = list(result.raw)
+                if not any(_ACK_RE.match(line) for line in result.raw):
+                    raise _StepFailed(f"step {index + 1} was not acknowledged: {' | '.join(result.raw) or 'no reply'}")
+                report["ok"] = True
+            self.state = MACRO_DONE
+        except asyncio.CancelledError:
+            self._abort(index, MACRO_CANCELLED, "cancelled")
+            try:
+                await brake()
+            except SerialNotFoundError:
+                pass  # the cancellation still has to reach the caller
+            raise
+        except (_StepFailed, SerialNotFoundError) as exc:
+            self._abort(index, MACRO_FAILED, str(exc))
+            try:
+                await brake()
+            except SerialNotFoundError:
+                pass
+        finally:
+            self.finished_at = time.time()
+
+    def _abort(self, index: int, state: str, error: str) -> None:
+        self.state = state
+        self.error = error
+        self.reports[index]["error"] = error
+        for report in self.reports[index + 1 :]:
+            report["skipped"] = True
+
+    def snapshot(self) -> Dict[str, Any]:
+        jitters = sorted(report["jitter_ms"] for report in self.reports if report["jitter_ms"] is not None)
+        return {
+            "id": self.id,
+            "state": self.state,
+            "error": self.error,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "jitter_ms_p50": jitters[len(jitters) // 2] if jitters else None,
+            "jitter_ms_max": jitters[-1] if jitters else None,
+            "steps": [dict(report) for report in self.reports],
+        }
+
+
+async def _wait_for(
+    condition: Condition,
+    timeout: float,
+    telemetry: Callable[[], Awaitable[Dict[str, Any]]],
+    clock: Callable[[], float],
+) -> float:
+    """Wait for a status payload satisfying ``condition``; returns its receive time."""
+
+    deadline = clock() + timeout
+    while True:
+        remaining = deadline - clock()
+        if remaining <= 0:
+            raise _StepFailed(f"timed out waiting for {condition}")
+        try:
+            payload = await asyncio.wait_for(telemetry(), remaining)
+        except asyncio.TimeoutError:
+            continue
+        if condition.holds(payload.get("data") or {}):
+            return float(payload.get("timestamp") or time.time())
+
+
+async def _sleep_until(deadline: float, clock: Callable[[], float]) -> None:
+    remaining = deadline - clock() - SPIN_MARGIN
+    if remaining > 0:
+        await asyncio.sleep(remaining)
+    while clock() < deadline:
+        await asyncio.sleep(0)
+
+
+__all__ = [
+    "CONDITION_FIELDS",
+    "MACRO_CANCELLED",
+    "MACRO_DONE",
+    "MACRO_FAILED",
+    "MACRO_HISTORY",
+    "MACRO_RUNNING",
+    "MacroBusyError",
+    "MacroError",
+    "MacroRun",
+    "MacroStep",
+    "compile_macro",
+    "parse_condition",
+]
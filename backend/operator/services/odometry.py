@@ -0,0 +1,214 @@
+"""Differential-drive pose integration from the status odometry counters.
+
+``odo_left``/``odo_right`` are the UNO's 32-bit quadrature counters (4× decoding).
+They are scaled with the ``CFG_ODO`` parameters as in ICD §7.4::
+
+    rev  = ticks / (cpr * gear_num / gear_den)
+    s_mm = rev * π * wheel_diam_mm
+    θ    = (sR_mm - sL_mm) / track_mm
+
+Counters are cumulative, so a missed status frame only makes the next step longer:
+each step is integrated as a circular arc, which is exact for a constant wheel-speed
+ratio. Differences are taken modulo 2³² to survive counter wrap. A step faster than
+``max_speed_mm_s``, a device reboot (``uptime_ms`` going back) or ``ODO_FAIL`` in
+``err_flags`` drops the step and re-anchors on the next frame instead of jumping.
+"""
+from __future__ import annotations
+
+import math
+import os
+from array import array
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Mapping, Optional, Sequence, Tuple
+
+ERR_ODO_FAIL = 0x0080
+DEFAULT_MAX_SPEED = 2000.0  # mm/s; faster steps are counter glitches or resets
+_WRAP = 1 << 32
+_HALF_WRAP = 1 << 31
+
+
+@dataclass(frozen=True)
+class OdometryConfig:
+    """``CFG_ODO`` fields; the defaults match the firmware's ``i2c_cfg_odo`` call."""
+
+    cpr: int = 192
+    gear_num: int = 16
+    gear_den: int = 1
+    wheel_diam_mm: float = 160.0
+    track_mm: float = 600.0
+
+    def __post_init__(self) -> None:
+        if min(self.cpr, self.gear_num, self.gear_den) <= 0 or self.wheel_diam_mm <= 0 or self.track_mm <= 0:
+            raise ValueError("odometry parameters must be positive")
+
+    @property
+    def mm_per_tick(self) -> float:
+        return math.pi * self.wheel_diam_mm * self.gear_den / (self.cpr * self.gear_num)
+
+    @classmethod
+    def from_env(cls, name: str = "OPERATOR_ODO_CONFIG") -> "OdometryConfig":
+        """Parse ``cpr,gear_num,gear_den,wheel_diam_mm,track_mm`` from ``name``."""
+
+        value = os.getenv(name, "").strip()
+        if not value:
+            return cls()
+        parts = [part.strip() for part in value.split(",")]
+        if len(parts) != 5:
+            raise ValueError(f"{name} needs cpr,gear_num,gear_den,wheel_diam_mm,track_mm")
+        cpr, gear_num, gear_den = (int(part) for part in parts[:3])
+        return cls(cpr, gear_num, gear_den, float(parts[3]), float(parts[4]))
+
+
+def tick_delta(current: int, previous: int) -> int:
+    """Signed difference of two 32-bit counter readings, across a wrap."""
+
+    return (current - previous + _HALF_WRAP) % _WRAP - _HALF_WRAP
+
+
+def arc_step(x: float, y: float, theta: float, ds: float, dtheta: float) -> Tuple[float, float, float]:
+    """Move ``ds`` mm along an arc that turns by ``dtheta`` rad."""
+
+    if abs(dtheta) < 1e-9:
+        return x + ds * math.cos(theta), y + ds * math.sin(theta), theta
+    radius = ds / dtheta
+    end = theta + dtheta
+    return x + radius * (math.sin(end) - math.sin(theta)), y - radius * (math.cos(end) - math.cos(theta)), end
+
+
+class ReplayError(ValueError):
+    """A capture cannot be replayed through the odometry integrator."""
+
+
+class OdometryTracker:
+    """Incremental pose from consecutive status frames."""
+
+    def __init__(self, config: Optional[OdometryConfig] = None, *, max_speed_mm_s: float = DEFAULT_MAX_SPEED) -> None:
+        self.config = config or OdometryConfig()
+        self.max_speed_mm_s = max_speed_mm_s
+        self.x = self.y = self.theta = 0.0
+        self.v_mm_s = self.w_rad_s = 0.0
+        self.distance_mm = 0.0
+        self.samples = 0
+        self.skipped = 0
+        self.resets = 0
+        self.updated_at: Optional[float] = None
+        self._anchor: Optional[Tuple[int, int, int]] = None
+
+    def reset(self, x: float = 0.0, y: float = 0.0, theta: float = 0.0) -> None:
+        """Set the pose; the next frame continues from here."""
+
+        self.x, self.y, self.theta = x, y, theta
+        self.v_mm_s = self.w_rad_s = 0.0
+        self.distance_mm = 0.0
+
+    def update(self, data: Mapping[str, Any], timestamp: Optional[float] = None) -> bool:
+        """Fold one status frame in; returns ``True`` when the pose advanced."""
+
+        left, right, uptime = data.get("odo_left"), data.get("odo_right"), data.get("uptime_ms")
+        if not all(isinstance(value, int) for value in (left, right, uptime)):
+            return False
+        err_flags = data.get("err_flags")
+        if isinstance(err_flags, int) and err_flags & ERR_ODO_FAIL:
+            self._anchor = None
+            self.skipped += 1
+            return False
+        anchor, self._anchor = self._anchor, (left, right, uptime)
+        if anchor is None:
+            return False
+        if uptime <= anchor[2]:
+            if uptime < anchor[2]:  # the ESP32 rebooted
+                self.resets += 1
+            else:  # the same frame twice
+                self._anchor = anchor
+            return False
+        dt = (uptime - anchor[2]) / 1000.0
+        mm_per_tick = self.config.mm_per_tick
+        ds_left = tick_delta(left, anchor[0]) * mm_per_tick
+        ds_right = tick_delta(right, anchor[1]) * mm_per_tick
+        if max(abs(ds_left), abs(ds_right)) > self.max_speed_mm_s * dt:
+            self.resets += 1
+            return False
+        ds = (ds_left + ds_right) / 2.0
+        dtheta = (ds_right - ds_left) / self.config.track_mm
+        self.x, self.y, self.theta = arc_step(self.x, self.y, self.theta, ds, dtheta)
+        self.distance_mm += abs(ds)
+        self.v_mm_s, self.w_rad_s = ds / dt, dtheta / dt
+        self.samples += 1
+        self.updated_at = timestamp
+        return True
+
+    def snapshot(self) -> Dict[str, Any]:
+        theta = math.remainder(self.theta, math.tau)
+        return {
+            "x_mm": self.x,
+            "y_mm": self.y,
+            "theta_rad": theta,
+            "theta_deg": math.degrees(theta),
+            "v_mm_s": self.v_mm_s,
+            "w_rad_s": self.w_rad_s,
+            "distance_mm": self.distance_mm,
+            "samples": self.samples,
+            "skipped": self.skipped,
+            "resets": self.resets,
+            "updated_at": self.updated_at,
+            "config": asdict(self.config),
+        }
+
+
+def integrate_trajectory(
+    uptime_ms: Sequence[int],
+    left: Sequence[float],
+    right: Sequence[float],
+    config: OdometryConfig,
+    *,
+    max_speed_mm_s: float = DEFAULT_MAX_SPEED,
+) -> Dict[str, Any]:
+    """Recompute a whole trajectory from recorded counter columns.
+
+    Used to replay a telemetry capture under several ``CFG_ODO`` candidates during a
+    calibration sweep. Returns ``x_mm``/``y_mm``/``theta_rad`` columns (one entry per
+    sample, starting at the origin) and the final pose.
+    """
+
+    count = min(len(uptime_ms), len(left), len(right))
+    xs, ys, thetas = array("d", bytes(8 * count)), array("d", bytes(8 * count)), array("d", bytes(8 * count))
+    mm_per_tick = config.mm_per_tick
+    track = config.track_mm
+    x = y = theta = distance = 0.0
+    skipped = 0
+    for index in range(1, count):
+        dt = (uptime_ms[index] - uptime_ms[index - 1]) / 1000.0
+        counts = (left[index - 1], left[index], right[index - 1], right[index])
+        if dt <= 0 or any(math.isnan(value) for value in counts):
+            skipped += 1
+        else:
+            ds_left = tick_delta(int(counts[1]), int(counts[0])) * mm_per_tick
+            ds_right = tick_delta(int(counts[3]), int(counts[2])) * mm_per_tick
+            if max(abs(ds_left), abs(ds_right)) > max_speed_mm_s * dt:
+                skipped += 1
+            else:
+                ds = (ds_left + ds_right) / 2.0
+                x, y, theta = arc_step(x, y, theta, ds, (ds_right - ds_left) / track)
+                distance += abs(ds)
+        xs[index], ys[index], thetas[index] = x, y, theta
+    return {
+        "config": asdict(config),
+        "x_mm": xs,
+        "y_mm": ys,
+        "theta_rad": thetas,
+        "final": {"x_mm": x, "y_mm": y, "theta_rad": theta, "theta_deg": math.degrees(theta)},
+        "distance_mm": distance,
+        "skipped": skipped,
+    }
+
+
+__all__ = [
+    "DEFAULT_MAX_SPEED",
+    "ERR_ODO_FAIL",
+    "OdometryConfig",
+    "OdometryTracker",
+    "ReplayError",
+    "arc_step",
+    "integrate_trajectory",
+    "tick_delta",
+]
@@ -7,6 +7,7 @@ import base64
 import ipaddress
 import json
 import logging
+import math
 import os
 import re
 import socket
@@ -14,14 +15,74 @@ import threading
 import time
 import urllib.error
 import urllib.request
-from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from collections import OrderedDict, deque
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Sequence, Set, Tuple
 from urllib.parse import urlparse
 
 from fastapi import WebSocket
 
-from ..esp32_link import CommandResult, ESP32Link, SerialNotFoundError
+from ..clock_sync import DeviceClock
+from ..esp32_link import (
+    CLI_ECHO_RE,
+    LOG_LINE_RE,
+    CommandError,
+    CommandResult,
+    ESP32Link,
+    ReplyTimeoutError,
+    SerialNotFoundError,
+    reply_line_sink,
+    run_pipelined,
+)
 from ..esp32_ws_link import ESP32WSLink
+from ..fault_injection import FaultInjectingLink, FaultPlan
+from ..link_capture import CAPTURE_SUFFIX, CaptureWriter, RecordingLink, unwrap_link
+from ..link_scheduler import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_MOTION,
+    PRIORITY_POLLING,
+    PRIORITY_SAFETY,
+    CommandDropped,
+    ScheduledLink,
+    batch_priority,
+    classify_command,
+)
+from ..log_ingest import LogRecord, LogSequencer
 from ..log_parser import structure_logs
+from ..status_frame import StatusFrame
+from .command_timeouts import DEFAULT_TIMEOUT_FLOOR, CommandTimeouts, reply_latency
+from .transport_breaker import (
+    ADMIT_REQUEST,
+    BREAKER_CLOSED,
+    DEFAULT_BACKOFF_BASE,
+    DEFAULT_BACKOFF_MAX,
+    DEFAULT_FAILURE_THRESHOLD,
+    DEFAULT_SUCCESS_THRESHOLD,
+    TransportBreaker,
+)
+from .motion_macro import MACRO_HISTORY, MacroBusyError, MacroRun, compile_macro
+from .odometry import OdometryConfig, OdometryTracker, ReplayError, integrate_trajectory
+from .poll_scheduler import (
+    DEFAULT_IDLE_INTERVAL,
+    DEFAULT_LIVE_INTERVAL,
+    DEFAULT_MOTION_HOLD,
+    POLL_IDLE,
+    POLL_LIVE,
+    POLL_WATCHED,
+    PollScheduler,
+    PollSource,
+)
+from .telemetry_capture import (
+    MAX_CAPTURE_RATE,
+    CaptureBuffer,
+    CaptureBusyError,
+    TelemetryCapture,
+    run_capture,
+    validate_capture,
+)
+from .telemetry_history import TelemetryHistory
+from .teleop import DEFAULT_DEADMAN_TIMEOUT, DEFAULT_TELEOP_RATE, TeleopController, TeleopStats
+from .transport_hedge import DEFAULT_HEDGE_MAX_DELAY, TransportHedger, is_hedgeable
 from .wifi_config import load_wifi_config, save_wifi_config
 from .wifi_registry import clear_last_endpoint, load_last_endpoint, save_last_endpoint
 from .wifi_discovery import discover_wifi_endpoint
@@ -36,7 +97,18 @@ TRANSPORT_LABELS = {
     TRANSPORT_SERIAL: "UART",
 }
 DEFAULT_TRANSPORT_RETRY_COOLDOWN = 5.0
+# Half-open probes and standby keepalives use a command the firmware answers without
+# touching the I2C bus.
+TRANSPORT_PROBE_COMMAND = "caps"
+DEFAULT_STANDBY_KEEPALIVE_INTERVAL = 5.0
 DEFAULT_WIFI_DISCOVERY_INTERVAL = 15.0
+DEFAULT_LOG_FETCH_LIMIT = 64
+DEFAULT_LOG_HISTORY = 1000
+COMMAND_CHANNEL_MAX_IN_FLIGHT = 32
+# Slow-changing state polled while a client is connected; not polled when idle.
+CAMCFG_POLL_INTERVAL = 15.0
+I2C_DIAG_POLL_INTERVAL = 30.0
+SHELF_MAP_POLL_INTERVAL = 30.0
 MAC_TOKEN_RE = re.compile(r"[0-9a-f]{2}", re.IGNORECASE)
 UNSET = object()
 
@@ -71,8 +143,9 @@ class OperatorService:
         self._transport_endpoints: Dict[str, Optional[str]] = {}
         self._transport_health: Dict[str, Dict[str, Any]] = {}
         self._transport_probe_at: Dict[str, float] = {}
-        self._serial_probe_task: Optional[asyncio.Task[None]] = None
-        self._serial_probe_next = 0.0
+        # Standby transports are kept open and warm so a failover costs one command RTT.
+        self._standby_tasks: Dict[str, asyncio.Task[None]] = {}
+        self._standby_next: Dict[str, float] = {}
         self._transport_retry_cooldown = DEFAULT_TRANSPORT_RETRY_COOLDOWN
         cooldown_env = os.getenv("OPERATOR_TRANSPORT_RETRY_COOLDOWN")
         if cooldown_env:
@@ -84,6 +157,44 @@ class OperatorService:
                     cooldown_env,
                     DEFAULT_TRANSPORT_RETRY_COOLDOWN,
                 )
+        self._breaker_settings: Dict[str, Any] = {
+            "failure_threshold": DEFAULT_FAILURE_THRESHOLD,
+            "success_threshold": DEFAULT_SUCCESS_THRESHOLD,
+            "backoff_base": DEFAULT_BACKOFF_BASE,
+            "backoff_max": DEFAULT_BACKOFF_MAX,
+        }
+        for env_name, key, cast in (
+            ("OPERATOR_BREAKER_FAILURES", "failure_threshold", int),
+            ("OPERATOR_BREAKER_SUCCESSES", "success_threshold", int),
+            ("OPERATOR_BREAKER_BACKOFF", "backoff_base", float),
+            ("OPERATOR_BREAKER_BACKOFF_MAX", "backoff_max", float),
+        ):
+            env_value = os.getenv(env_name)
+            if not env_value:
+                continue
+            try:
+                self._breaker_settings[key] = cast(env_value)
+            except ValueError:
+                logger.warning(
+                    "Invalid %s=%s; using %s", env_name, env_value, self._breaker_settings[key]
+                )
+        self._transport_breakers: Dict[str, TransportBreaker] = {}
+        # Idempotent reads race the standby transport once the primary is slower than its p95.
+        hedge_env = os.getenv("OPERATOR_HEDGING", "").strip().lower()
+        self._hedging = hedge_env not in {"0", "false", "no", "off"}
+        hedge_max_delay = DEFAULT_HEDGE_MAX_DELAY
+        hedge_max_env = os.getenv("OPERATOR_HEDGE_MAX_DELAY")
+        if hedge_max_env:
+            try:
+                hedge_max_delay = max(0.0, float(hedge_max_env))
+            except ValueError:
+                logger.warning(
+                    "Invalid OPERATOR_HEDGE_MAX_DELAY=%s; using %.2f",
+                    hedge_max_env,
+                    DEFAULT_HEDGE_MAX_DELAY,
+                )
+        self._hedger = TransportHedger(max_delay=hedge_max_delay)
+        self._hedge_stragglers: Set[asyncio.Task[Any]] = set()
         self._active_transport: Optional[str] = None
         self._control_transport: Optional[str] = None
         self._control_endpoint: Optional[str] = None
@@ -112,16 +223,37 @@ class OperatorService:
                 logger.warning("Invalid OPERATOR_SERIAL_TIMEOUT=%s; using %s", env_timeout, timeout)
         self._serial_timeout = timeout_override
 
-        probe_interval_env = os.getenv("OPERATOR_SERIAL_PROBE_INTERVAL")
-        self._serial_probe_interval = 5.0
+        binary_env = os.getenv("OPERATOR_STATUS_BINARY", "").strip().lower()
+        # Binary STATUS is negotiated through CAPS, so it is safe to try by default.
+        self._binary_status = binary_env not in {"0", "false", "no", "off"}
+
+        # Competition sessions can be recorded per transport and replayed with ReplayLink.
+        capture_dir = os.getenv("OPERATOR_LINK_CAPTURE_DIR", "").strip()
+        self._capture_dir: Optional[Path] = Path(capture_dir) if capture_dir else None
+        self._capture_writers: Dict[str, CaptureWriter] = {}
+        # Failover benchmarks inject faults into the links from a plan file.
+        self._fault_plan: Optional[FaultPlan] = None
+        fault_plan_env = os.getenv("OPERATOR_FAULT_PLAN", "").strip()
+        if fault_plan_env:
+            try:
+                self._fault_plan = FaultPlan.load(fault_plan_env)
+            except (OSError, ValueError, TypeError) as exc:
+                logger.warning("Invalid OPERATOR_FAULT_PLAN=%s (%s); ignoring", fault_plan_env, exc)
+            else:
+                logger.warning("Fault injection enabled from %s", fault_plan_env)
+
+        probe_interval_env = os.getenv("OPERATOR_STANDBY_KEEPALIVE_INTERVAL") or os.getenv(
+            "OPERATOR_SERIAL_PROBE_INTERVAL"
+        )
+        self._standby_interval = DEFAULT_STANDBY_KEEPALIVE_INTERVAL
         if probe_interval_env:
             try:
-                self._serial_probe_interval = max(1.0, float(probe_interval_env))
+                self._standby_interval = max(1.0, float(probe_interval_env))
             except ValueError:
                 logger.warning(
-                    "Invalid OPERATOR_SERIAL_PROBE_INTERVAL=%s; using %.1f",
+                    "Invalid OPERATOR_STANDBY_KEEPALIVE_INTERVAL=%s; using %.1f",
                     probe_interval_env,
-                    self._serial_probe_interval,
+                    self._standby_interval,
                 )
 
         probe_timeout_env = os.getenv("OPERATOR_SERIAL_PROBE_TIMEOUT")
@@ -139,6 +271,41 @@ class OperatorService:
             else:
                 self._serial_probe_timeout = max(0.2, min(self._serial_timeout, candidate))
 
+        # Reply deadlines follow the observed RTT per command; the configured timeout
+        # is the slow-start value and the ceiling.
+        adaptive_env = os.getenv("OPERATOR_ADAPTIVE_TIMEOUTS", "").strip().lower()
+        self._adaptive_timeouts = adaptive_env not in {"0", "false", "no", "off"}
+        timeout_floor = DEFAULT_TIMEOUT_FLOOR
+        floor_env = os.getenv("OPERATOR_TIMEOUT_FLOOR")
+        if floor_env:
+            try:
+                timeout_floor = max(0.0, float(floor_env))
+            except ValueError:
+                logger.warning(
+                    "Invalid OPERATOR_TIMEOUT_FLOOR=%s; using %.2f", floor_env, DEFAULT_TIMEOUT_FLOOR
+                )
+        self._timeouts = CommandTimeouts(ceiling=self._serial_timeout, floor=timeout_floor)
+
+        self._teleop_rate = DEFAULT_TELEOP_RATE
+        rate_env = os.getenv("OPERATOR_TELEOP_RATE")
+        if rate_env:
+            try:
+                self._teleop_rate = max(0.1, float(rate_env))
+            except ValueError:
+                logger.warning("Invalid OPERATOR_TELEOP_RATE=%s; using %.1f", rate_env, DEFAULT_TELEOP_RATE)
+        self._teleop_deadman = DEFAULT_DEADMAN_TIMEOUT
+        deadman_env = os.getenv("OPERATOR_TELEOP_DEADMAN")
+        if deadman_env:
+            try:
+                self._teleop_deadman = max(0.0, float(deadman_env))
+            except ValueError:
+                logger.warning(
+                    "Invalid OPERATOR_TELEOP_DEADMAN=%s; using %.2f", deadman_env, DEFAULT_DEADMAN_TIMEOUT
+                )
+        self._teleop_stats = TeleopStats()
+        self._macros: "OrderedDict[str, MacroRun]" = OrderedDict()
+        self._macro_tasks: Dict[str, asyncio.Task[None]] = {}
+
         transport_override = control_transport
         if transport_override is None:
             env_transport = os.getenv("OPERATOR_CONTROL_TRANSPORT")
@@ -270,10 +437,15 @@ class OperatorService:
                     "Wi-Fi transport will be auto-configured once the ESP32 reports its IP address"
                 )
 
-        serial_link = ESP32Link(
-            port=port_override,
-            baudrate=baud_override,
-            timeout=timeout_override,
+        serial_link = self._instrument_link(
+            TRANSPORT_SERIAL,
+            ESP32Link(
+                port=port_override,
+                baudrate=baud_override,
+                timeout=timeout_override,
+                binary_status=self._binary_status,
+            ),
+            port_override,
         )
         self._transports[TRANSPORT_SERIAL] = serial_link
         self._transport_endpoints[TRANSPORT_SERIAL] = port_override
@@ -294,12 +466,53 @@ class OperatorService:
         self._poll_task: Optional[asyncio.Task[None]] = None
         self._stop_event = asyncio.Event()
         self._clients: Set[asyncio.Queue[dict[str, Any]]] = set()
+        self._poll_idle_interval = self._interval_from_env("OPERATOR_POLL_IDLE_INTERVAL", DEFAULT_IDLE_INTERVAL)
+        self._poll_live_interval = self._interval_from_env("OPERATOR_POLL_LIVE_INTERVAL", DEFAULT_LIVE_INTERVAL)
+        self._poll_motion_hold = self._interval_from_env("OPERATOR_POLL_MOTION_HOLD", DEFAULT_MOTION_HOLD)
+        self._live_watchers = 0
+        self._teleop_sessions = 0
+        self._motion_until = 0.0
+        self._polled_camcfg: Optional[CommandResult] = None
+        self._capture_running = False
+        self._capture_latest: Optional[CommandResult] = None
+        self._history = TelemetryHistory()
+        self._last_capture: Optional[TelemetryCapture] = None
+        try:
+            odometry_config = OdometryConfig.from_env()
+        except ValueError as exc:
+            logger.warning("Invalid OPERATOR_ODO_CONFIG (%s); using the firmware defaults", exc)
+            odometry_config = OdometryConfig()
+        self._odometry = OdometryTracker(odometry_config)
+        self._i2c_diag: Dict[str, Any] = {}
+        watched = (POLL_WATCHED, POLL_LIVE)
+        self._poll_scheduler = PollScheduler(
+            [
+                PollSource(
+                    "status",
+                    self._poll_status,
+                    {
+                        POLL_IDLE: max(self._poll_idle_interval, poll_interval),
+                        POLL_WATCHED: poll_interval,
+                        POLL_LIVE: min(self._poll_live_interval, poll_interval),
+                    },
+                ),
+                PollSource("camcfg", self._poll_camcfg, dict.fromkeys(watched, CAMCFG_POLL_INTERVAL)),
+                PollSource("i2c", self._poll_i2c_diag, dict.fromkeys(watched, I2C_DIAG_POLL_INTERVAL)),
+                PollSource("smap", self._poll_shelf_map, dict.fromkeys(watched, SHELF_MAP_POLL_INTERVAL)),
+                PollSource("keepalive", self._poll_keepalive, dict.fromkeys((POLL_IDLE, *watched), poll_interval)),
+            ],
+            self._poll_demand,
+        )
         self._clients_lock = asyncio.Lock()
         self._log_clients: Set[asyncio.Queue[dict[str, Any]]] = set()
         self._log_clients_lock = asyncio.Lock()
         self._log_task: Optional[asyncio.Task[None]] = None
         self._initial_probe_task: Optional[asyncio.Task[None]] = None
         self._log_sequence = 0
+        self._log_sequencer = LogSequencer()
+        self._log_history: "deque[dict[str, Any]]" = deque(maxlen=DEFAULT_LOG_HISTORY)
+        self._device_clock = DeviceClock()
+        self._last_heartbeat_sample: Optional[Tuple[float, int]] = None
         override = (
             camera_snapshot_url
             if camera_snapshot_url is not None
@@ -316,7 +529,7 @@ class OperatorService:
             if camera_stream_interval is not None
             else self._resolve_camera_stream_interval()
         )
-        self._last_status: dict[str, Any] = {}
+        self._last_status: Optional[StatusFrame] = None
         self._last_status_timestamp: Optional[float] = None
         self._last_status_error: Optional[str] = None
         self._camera_resolution_options = [
@@ -343,9 +556,8 @@ class OperatorService:
         self._shelf_cache_timestamp: Optional[float] = None
         self._shelf_cache_ttl = 1.0
         self._cached_camera_max_resolution = None
-
-        with contextlib.suppress(Exception):
-            self._probe_serial_transport(force=True)
+        # Serial is opened by the startup race in start(), not synchronously here.
+        self._startup_result: Optional[asyncio.Future[Optional[CommandResult]]] = None
 
     def _compose_wifi_endpoint(self, ip: str, port: Optional[int], path: Optional[str]) -> str:
         resolved_port = port if isinstance(port, int) and port > 0 else 81
@@ -372,9 +584,43 @@ class OperatorService:
             return None
         return ":".join(token.lower() for token in tokens[:3])
 
+    def _instrument_link(self, transport: str, link: Any, endpoint: Optional[str]) -> Any:
+        return ScheduledLink(self._wrap_link(transport, link, endpoint))
+
+    def _wrap_link(self, transport: str, link: Any, endpoint: Optional[str]) -> Any:
+        if self._fault_plan is not None:
+            link = FaultInjectingLink(
+                link,
+                self._fault_plan.for_transport(transport),
+                epoch=self._fault_plan.epoch,
+                seed=self._fault_plan.seed,
+            )
+        if self._capture_dir is None:
+            return link
+        writer = self._capture_writers.get(transport)
+        if writer is None:
+            try:
+                writer = CaptureWriter(
+                    self._capture_dir / f"{transport}{CAPTURE_SUFFIX}",
+                    transport=transport,
+                    endpoint=endpoint,
+                )
+            except OSError as exc:
+                logger.warning("Link capture disabled for %s: %s", transport, exc)
+                return link
+            self._capture_writers[transport] = writer
+        return RecordingLink(link, writer)
+
+    def _new_wifi_link(self, endpoint: str, timeout: float) -> Any:
+        return self._instrument_link(
+            TRANSPORT_WIFI,
+            ESP32WSLink(url=endpoint, timeout=timeout, binary_status=self._binary_status),
+            endpoint,
+        )
+
     def _configure_wifi_transport(self, endpoint: str, timeout: float) -> bool:
         try:
-            ws_link = ESP32WSLink(url=endpoint, timeout=timeout)
+            ws_link = self._new_wifi_link(endpoint, timeout)
         except SerialNotFoundError as exc:
             logger.warning("Wi-Fi transport unavailable at %s: %s", endpoint, exc)
             self._transports.pop(TRANSPORT_WIFI, None)
@@ -495,7 +741,7 @@ class OperatorService:
         if "connected" not in wifi_info:
             wifi_info["connected"] = transport_available
 
-    def _ensure_wifi_transport(self, status: Dict[str, Any]) -> None:
+    def _ensure_wifi_transport(self, status: StatusFrame) -> None:
         wifi_connected = bool(status.get("wifi_connected"))
         wifi_ip_raw = status.get("wifi_ip")
         wifi_ip = str(wifi_ip_raw or "").strip()
@@ -532,8 +778,8 @@ class OperatorService:
         with self._link_lock:
             current_endpoint = self._transport_endpoints.get(TRANSPORT_WIFI)
             if current_endpoint == endpoint and TRANSPORT_WIFI in self._transports:
-                # ensure availability flag reflects runtime
-                self._record_transport_success(TRANSPORT_WIFI)
+                # The ESP32 reports Wi-Fi up, but only a real reply may close the breaker.
+                self._note_transport_reachable(TRANSPORT_WIFI)
                 return
 
             existing_link = self._transports.get(TRANSPORT_WIFI)
@@ -557,7 +803,7 @@ class OperatorService:
             if self._control_mode in {TRANSPORT_WIFI, TRANSPORT_AUTO}:
                 self._set_active_transport(TRANSPORT_WIFI)
 
-            self._record_transport_success(TRANSPORT_WIFI)
+            self._note_transport_reachable(TRANSPORT_WIFI)
 
             self._ws_static_endpoint = endpoint
 
@@ -607,22 +853,12 @@ class OperatorService:
                 self._wifi_config_store = config_snapshot
                 save_wifi_config(config_snapshot)
 
-            self._transport_health.setdefault(
-                TRANSPORT_WIFI,
-                {"available": True, "last_error": None, "last_success": None, "last_failure": None},
-            )
-            self._transport_health[TRANSPORT_WIFI].update({
-                "available": True,
-                "last_error": None,
-                "last_success": time.time(),
-            })
-
-    async def _maybe_discover_wifi_endpoint(self, *, force: bool = False) -> None:
+    async def _discover_wifi_candidate(self, *, force: bool = False) -> Optional[str]:
         if not self._ws_auto_enabled:
-            return
+            return None
         now = time.time()
         if not force and (now - self._last_wifi_discovery_attempt) < self._wifi_discovery_interval:
-            return
+            return None
         self._last_wifi_discovery_attempt = now
 
         try:
@@ -635,8 +871,11 @@ class OperatorService:
             )
         except Exception:  # pragma: no cover - defensive
             logger.debug("Wi-Fi discovery via MAC lookup failed", exc_info=True)
-            return
+            return None
+        return endpoint or None
 
+    async def _maybe_discover_wifi_endpoint(self, *, force: bool = False) -> None:
+        endpoint = await self._discover_wifi_candidate(force=force)
         if not endpoint:
             return
 
@@ -655,6 +894,7 @@ class OperatorService:
 
             save_last_endpoint(endpoint)
             logger.info("Auto-discovered Wi-Fi control endpoint at %s", endpoint)
+            self._breaker(TRANSPORT_WIFI).expedite()
             if self._control_mode in {TRANSPORT_WIFI, TRANSPORT_AUTO}:
                 self._set_active_transport(TRANSPORT_WIFI)
 
@@ -861,7 +1101,30 @@ class OperatorService:
 
         return self.get_wifi_config()
 
+    def _breaker(self, transport: str) -> TransportBreaker:
+        breaker = self._transport_breakers.get(transport)
+        if breaker is None:
+            breaker = TransportBreaker(**self._breaker_settings)
+            self._transport_breakers[transport] = breaker
+        return breaker
+
+    def _note_transport_reachable(self, transport: str) -> None:
+        """Handle out-of-band evidence (e.g. STATUS over UART) that a transport is up."""
+
+        breaker = self._breaker(transport)
+        if breaker.state != BREAKER_CLOSED:
+            breaker.expedite()
+            return
+        state = self._transport_health.setdefault(
+            transport,
+            {"available": False, "last_error": None, "last_success": None, "last_failure": None},
+        )
+        state["available"] = True
+        state["last_error"] = None
+        state["last_success"] = time.time()
+
     def _record_transport_success(self, transport: str) -> None:
+        self._breaker(transport).record_success()
         state = self._transport_health.setdefault(
             transport,
             {"available": False, "last_error": None, "last_success": None, "last_failure": None},
@@ -871,10 +1134,13 @@ class OperatorService:
         timestamp = time.time()
         state["last_success"] = timestamp
         self._transport_probe_at[transport] = timestamp
-        if transport == TRANSPORT_SERIAL:
-            self._serial_probe_next = max(self._serial_probe_next, timestamp + self._serial_probe_interval)
+        # Any reply keeps the link warm, so keepalives only fill idle stretches.
+        self._standby_next[transport] = max(
+            self._standby_next.get(transport, 0.0), timestamp + self._standby_interval
+        )
 
     def _record_transport_failure(self, transport: str, error: str) -> None:
+        tripped = self._breaker(transport).record_failure()
         state = self._transport_health.setdefault(
             transport,
             {"available": False, "last_error": None, "last_success": None, "last_failure": None},
@@ -884,10 +1150,10 @@ class OperatorService:
         timestamp = time.time()
         state["last_failure"] = timestamp
         self._transport_probe_at[transport] = timestamp
-        if transport == TRANSPORT_SERIAL:
-            self._serial_probe_next = min(timestamp + 1.0, timestamp + self._serial_probe_interval)
+        self._standby_next[transport] = timestamp + 1.0
 
-        if transport == TRANSPORT_WIFI:
+        # Tear down and rediscover only when the breaker trips, not on every failed probe.
+        if transport == TRANSPORT_WIFI and tripped:
             should_enable_auto = False
             cleared_manual_ip = False
             current_endpoint: Optional[str] = None
@@ -907,11 +1173,9 @@ class OperatorService:
 
                 if not static_env_override:
                     should_enable_auto = True
-                    link = self._transports.pop(TRANSPORT_WIFI, None)
-                    if link and hasattr(link, "close"):
-                        with contextlib.suppress(Exception):
-                            link.close()
-                    self._transport_endpoints[TRANSPORT_WIFI] = None
+                    # The link stays open as a warm standby: the breaker gates it and
+                    # keepalives bring it back if the board returns at the same address,
+                    # while discovery replaces it if the address changed.
                     self._ws_static_endpoint = None
                     self._ws_auto_enabled = True
                     if self._active_transport == TRANSPORT_WIFI:
@@ -951,6 +1215,12 @@ class OperatorService:
                 if (now - last_probe) < self._transport_retry_cooldown:
                     return
 
+            active_port = getattr(link, "active_port", None)
+            if active_port and not force:
+                # Already open: open() would wait on the link lock behind a running command.
+                self._transport_endpoints[TRANSPORT_SERIAL] = active_port
+                return
+
             try:
                 open_method()
             except SerialNotFoundError as exc:
@@ -976,62 +1246,92 @@ class OperatorService:
                     self._transport_endpoints[TRANSPORT_SERIAL] = endpoint_hint
 
             self._transport_probe_at[TRANSPORT_SERIAL] = now
-            self._serial_probe_next = min(self._serial_probe_next, now)
+            self._standby_next[TRANSPORT_SERIAL] = min(self._standby_next.get(TRANSPORT_SERIAL, 0.0), now)
+
+    def _maybe_schedule_standby_keepalive(self) -> None:
+        """Keep every non-active transport open with a cheap command once it idles.
+
+        Called from the ``keepalive`` poll source; at most one keepalive is in flight
+        per transport, and any foreground reply on that transport pushes it back.
+        """
 
-    def _maybe_schedule_serial_probe(self) -> None:
         if self._stop_event.is_set():
             return
-        if TRANSPORT_SERIAL not in self._transports:
-            return
-        if self._control_mode == TRANSPORT_SERIAL:
-            return
-        if self._active_transport == TRANSPORT_SERIAL:
-            return
-        if self._serial_probe_task and not self._serial_probe_task.done():
-            return
-
         now = time.time()
-        if now < self._serial_probe_next:
-            return
-
-        self._serial_probe_next = now + self._serial_probe_interval
-        self._serial_probe_task = asyncio.create_task(self._run_serial_probe())
+        for transport_id in list(self._transports):
+            if transport_id == self._active_transport:
+                continue
+            task = self._standby_tasks.get(transport_id)
+            if task is not None and not task.done():
+                continue
+            if now < self._standby_next.get(transport_id, 0.0):
+                continue
+            self._standby_next[transport_id] = now + self._standby_interval
+            self._standby_tasks[transport_id] = asyncio.create_task(
+                self._run_standby_keepalive(transport_id)
+            )
 
-    async def _run_serial_probe(self) -> None:
-        link = self._transports.get(TRANSPORT_SERIAL)
-        if not link:
-            self._serial_probe_task = None
+    async def _run_standby_keepalive(self, transport: str) -> None:
+        link = self._transports.get(transport)
+        if not link or self._breaker(transport).admit() is None:
             return
+        await self._send_probe(transport, link)
+
+    async def _cancel_standby_keepalives(self) -> None:
+        tasks = [task for task in self._standby_tasks.values() if not task.done()]
+        self._standby_tasks.clear()
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+    async def _send_probe(self, transport: str, link: Any) -> bool:
+        """Send the cheap probe command and feed the outcome into the breaker."""
 
+        timeout = self._command_timeout(
+            transport, TRANSPORT_PROBE_COMMAND, initial=self._serial_probe_timeout
+        )
         try:
-            await asyncio.to_thread(
+            result = await asyncio.to_thread(
                 link.run_command,
-                self._poll_command,
-                timeout=self._serial_probe_timeout,
+                TRANSPORT_PROBE_COMMAND,
+                timeout=timeout,
                 raise_on_error=False,
+                priority=PRIORITY_BACKGROUND,
             )
+        except asyncio.CancelledError:
+            self._breaker(transport).release()
+            raise
         except SerialNotFoundError as exc:
-            self._record_transport_failure(TRANSPORT_SERIAL, str(exc))
-        except Exception as exc:  # pragma: no cover - defensive
-            logger.debug("Serial connectivity probe failed", exc_info=True)
-            self._record_transport_failure(TRANSPORT_SERIAL, str(exc))
-        else:
-            self._record_transport_success(TRANSPORT_SERIAL)
-        finally:
-            self._serial_probe_task = None
-
-    def _should_skip_transport(self, transport: str) -> bool:
-        if self._control_mode != TRANSPORT_AUTO:
+            self._record_transport_failure(transport, str(exc))
             return False
-        if transport == self._active_transport:
+        except Exception as exc:  # pragma: no cover - defensive
+            logger.debug("Connectivity probe via %s failed", transport, exc_info=True)
+            self._record_transport_failure(transport, str(exc))
             return False
-        state = self._transport_health.get(transport)
-        if not state or state.get("available", False):
+        if not self._note_reply(transport, TRANSPORT_PROBE_COMMAND, result) or not result.raw:
+            # A silent UART still opens fine, so an empty reply is a failure here.
+            self._record_transport_failure(transport, "no reply to probe")
             return False
-        last_failure = state.get("last_failure")
-        if last_failure is None:
+        self._record_transport_success(transport)
+        return True
+
+    async def _admit_transport(self, transport: str, link: Any) -> bool:
+        """Ask the transport's breaker; a half-open transport must pass a probe first.
+
+        Explicit modes always use their transport, so breakers only gate ``auto``.
+        """
+
+        if self._control_mode != TRANSPORT_AUTO:
+            return True
+        breaker = self._breaker(transport)
+        admission = breaker.admit()
+        if admission is None:
             return False
-        return (time.time() - last_failure) < self._transport_retry_cooldown
+        if admission == ADMIT_REQUEST:
+            return True
+        return await self._send_probe(transport, link) and breaker.state == BREAKER_CLOSED
 
     def _control_state_snapshot(self) -> Dict[str, Any]:
         self._probe_serial_transport()
@@ -1073,6 +1373,10 @@ class OperatorService:
                     "last_error": health.get("last_error"),
                     "last_success": health.get("last_success"),
                     "last_failure": health.get("last_failure"),
+                    "breaker": self._breaker(transport_id).snapshot(),
+                    "hedge": self._hedger.snapshot(transport_id),
+                    "scheduler": self._scheduler_snapshot(transport_id),
+                    "timeouts": self._timeouts.snapshot(transport_id),
                 }
             )
         return {
@@ -1081,6 +1385,12 @@ class OperatorService:
             "transports": transports,
         }
 
+    def _scheduler_snapshot(self, transport_id: str) -> Optional[Dict[str, Dict[str, Any]]]:
+        link = self._transports.get(transport_id)
+        if not isinstance(link, ScheduledLink):
+            return None
+        return link.snapshot()
+
     def get_control_state(self) -> Dict[str, Any]:
         return self._control_state_snapshot()
 
@@ -1113,51 +1423,169 @@ class OperatorService:
 
         return self._control_state_snapshot()
 
-    async def _initial_probe(self) -> None:
+    def _wifi_race_endpoints(self) -> List[str]:
+        if self._env_static_endpoint:
+            return [self._env_static_endpoint]
+        candidates = [self._transport_endpoints.get(TRANSPORT_WIFI)]
+        if self._wifi_user_ip:
+            candidates.append(
+                self._compose_wifi_endpoint(self._wifi_user_ip, self._wifi_ws_port, self._wifi_ws_path)
+            )
+        candidates.append(load_last_endpoint())
+        endpoints: List[str] = []
+        for endpoint in candidates:
+            if endpoint and endpoint not in endpoints:
+                endpoints.append(endpoint)
+        return endpoints
+
+    async def _race_candidate(
+        self, transport_id: str, endpoint: Optional[str], link: Any
+    ) -> Optional[Tuple[str, Optional[str], Any, CommandResult, float]]:
+        registered = self._transports.get(transport_id) is link
+        if registered and not await self._admit_transport(transport_id, link):
+            return None
+        started = time.perf_counter()
+        try:
+            result = await asyncio.to_thread(
+                link.run_command,
+                self._poll_command,
+                timeout=self._command_timeout(transport_id, self._poll_command),
+                raise_on_error=False,
+            )
+        except Exception as exc:
+            if not isinstance(exc, SerialNotFoundError):  # pragma: no cover - defensive
+                logger.exception("Initial probe failed for transport %s", transport_id)
+            if self._transports.get(transport_id) is link:
+                self._record_transport_failure(transport_id, str(exc))
+            elif not registered:
+                with contextlib.suppress(Exception):
+                    await asyncio.to_thread(link.close)
+            return None
+        self._note_reply(transport_id, self._poll_command, result)
+        return transport_id, endpoint, link, result, time.perf_counter() - started
+
+    async def _race_discovered_wifi(
+        self, known: Sequence[str], *, force: bool
+    ) -> Optional[Tuple[str, Optional[str], Any, CommandResult, float]]:
+        endpoint = await self._discover_wifi_candidate(force=force)
+        if not endpoint or endpoint in known:
+            return None
+        try:
+            link = self._new_wifi_link(endpoint, self._serial_timeout)
+        except SerialNotFoundError:
+            return None
+        return await self._race_candidate(TRANSPORT_WIFI, endpoint, link)
+
+    def _claim_wifi_link(self, endpoint: Optional[str], link: Any) -> None:
+        with self._link_lock:
+            current = self._transports.get(TRANSPORT_WIFI)
+            if current is link:
+                return
+            if current is not None and hasattr(current, "close"):
+                with contextlib.suppress(Exception):
+                    current.close()
+            self._transports[TRANSPORT_WIFI] = link
+            self._transport_endpoints[TRANSPORT_WIFI] = endpoint
+        if endpoint:
+            save_last_endpoint(endpoint)
+            logger.info("Wi-Fi control endpoint %s answered the startup race", endpoint)
+
+    async def _initial_probe(self, *, startup: bool = False) -> None:
+        """Race every candidate transport; the first healthy reply picks the active one.
+
+        Candidates are the serial port and each distinct Wi-Fi endpoint (registered,
+        static IP, cached, ARP-discovered). Slower responders finish their probe and stay
+        registered as warm standbys, except that only the first Wi-Fi endpoint to answer
+        keeps the Wi-Fi slot. At startup the winning reply becomes the first telemetry.
+        """
+
+        future = self._startup_result if startup else None
+        tasks: List[asyncio.Task[Any]] = []
         try:
             order = self._preferred_transport_order()
-            for transport_id in order:
-                if self._should_skip_transport(transport_id):
-                    continue
-                link = self._transports.get(transport_id)
-                if not link:
-                    continue
-                try:
-                    await asyncio.to_thread(
-                        link.run_command,
-                        self._poll_command,
-                        raise_on_error=False,
+            if TRANSPORT_SERIAL in order and self._transports.get(TRANSPORT_SERIAL):
+                tasks.append(
+                    asyncio.create_task(
+                        self._race_candidate(
+                            TRANSPORT_SERIAL,
+                            self._transport_endpoints.get(TRANSPORT_SERIAL),
+                            self._transports[TRANSPORT_SERIAL],
+                        )
                     )
-                    self._record_transport_success(transport_id)
-                    with self._link_lock:
-                        self._set_active_transport(transport_id)
-                    return
-                except SerialNotFoundError as exc:
-                    self._record_transport_failure(transport_id, str(exc))
-                    if self._control_mode != TRANSPORT_AUTO:
-                        return
-                except Exception as exc:  # pragma: no cover - defensive
-                    logger.exception("Initial probe failed for transport %s", transport_id)
-            logger.warning("No control transport available during initial probe")
+                )
+            if self._control_mode in {TRANSPORT_AUTO, TRANSPORT_WIFI}:
+                endpoints = self._wifi_race_endpoints()
+                registered = self._transports.get(TRANSPORT_WIFI)
+                registered_endpoint = self._transport_endpoints.get(TRANSPORT_WIFI)
+                for endpoint in endpoints:
+                    if registered is not None and endpoint == registered_endpoint:
+                        link = registered
+                    else:
+                        try:
+                            link = self._new_wifi_link(endpoint, self._serial_timeout)
+                        except SerialNotFoundError:
+                            continue
+                    tasks.append(asyncio.create_task(self._race_candidate(TRANSPORT_WIFI, endpoint, link)))
+                tasks.append(asyncio.create_task(self._race_discovered_wifi(endpoints, force=startup)))
+
+            winner: Optional[str] = None
+            wifi_claimed = False
+            for next_done in asyncio.as_completed(tasks):
+                outcome = await next_done
+                if outcome is None:
+                    continue
+                transport_id, endpoint, link, result, elapsed = outcome
+                if transport_id == TRANSPORT_WIFI:
+                    if wifi_claimed:
+                        if self._transports.get(TRANSPORT_WIFI) is not link:
+                            with contextlib.suppress(Exception):
+                                await asyncio.to_thread(link.close)
+                        continue
+                    wifi_claimed = True
+                    self._claim_wifi_link(endpoint, link)
+                self._hedger.observe(transport_id, self._poll_command, elapsed)
+                self._record_transport_success(transport_id)
+                if winner is None:
+                    winner = transport_id
+                    self._adopt_command_result(transport_id, result)
+                    if future is not None and not future.done():
+                        future.set_result(result)
+            if winner is None:
+                logger.warning("No control transport available during initial probe")
         finally:
+            for task in tasks:
+                task.cancel()
+            if future is not None and not future.done():
+                future.set_result(None)
             self._initial_probe_task = None
 
+    async def _startup_status(self) -> Optional[CommandResult]:
+        """Hand the startup race's winning reply to the first poll cycle."""
+
+        future = self._startup_result
+        if future is None:
+            return None
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout=self._serial_timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            self._startup_result = None
 
     async def start(self) -> None:
         if self._poll_task and not self._poll_task.done():
             return
         self._stop_event.clear()
-        if self._ws_auto_enabled:
+        if self._control_mode == TRANSPORT_AUTO:
+            # Discovery runs inside the race instead of delaying the first poll.
+            if not self._initial_probe_task:
+                self._startup_result = asyncio.get_running_loop().create_future()
+                self._initial_probe_task = asyncio.create_task(self._initial_probe(startup=True))
+        elif self._ws_auto_enabled:
             await self._maybe_discover_wifi_endpoint(force=True)
-        if self._control_mode == TRANSPORT_AUTO and not self._initial_probe_task:
-            self._initial_probe_task = asyncio.create_task(self._initial_probe())
-        self._serial_probe_next = 0.0
-        if self._serial_probe_task and not self._serial_probe_task.done():
-            self._serial_probe_task.cancel()
-            with contextlib.suppress(asyncio.CancelledError):
-                await self._serial_probe_task
-        self._serial_probe_task = None
-        self._poll_task = asyncio.create_task(self._poll_loop())
+        self._standby_next.clear()
+        await self._cancel_standby_keepalives()
+        self._poll_task = asyncio.create_task(self._poll_scheduler.run(self._stop_event))
         self._log_task = asyncio.create_task(self._log_loop())
 
     async def stop(self) -> None:
@@ -1171,11 +1599,7 @@ class OperatorService:
             with contextlib.suppress(asyncio.CancelledError):
                 await self._initial_probe_task
             self._initial_probe_task = None
-        if self._serial_probe_task:
-            self._serial_probe_task.cancel()
-            with contextlib.suppress(asyncio.CancelledError):
-                await self._serial_probe_task
-            self._serial_probe_task = None
+        await self._cancel_standby_keepalives()
         for link in set(self._transports.values()):
             await asyncio.to_thread(link.close)
         self._poll_task = None
@@ -1186,27 +1610,67 @@ class OperatorService:
         command: str,
         *,
         raise_on_error: bool = True,
+        priority: Optional[str] = None,
+        stale_after: Optional[float] = None,
+        cancelled: Optional[threading.Event] = None,
     ) -> CommandResult:
+        """Run ``command`` on the preferred transport, failing over in ``auto`` mode.
+
+        ``priority`` overrides the scheduler class derived from the command and
+        ``stale_after`` drops it with :class:`CommandDropped` if it queued that long;
+        so does ``cancelled`` once it is set. A cancellable command is not hedged.
+        """
+
         order = self._preferred_transport_order()
         if not order:
             raise SerialNotFoundError("No control transports configured")
+        self._note_motion([command])
 
         last_error: Optional[SerialNotFoundError] = None
+        attempted: Set[str] = set()
+
+        if cancelled is None and self._hedging and self._control_mode == TRANSPORT_AUTO and is_hedgeable(command):
+            try:
+                won = await self._run_hedged(
+                    command, order, raise_on_error, attempted, priority=priority, stale_after=stale_after
+                )
+            except SerialNotFoundError as exc:
+                last_error = exc
+            else:
+                if won is not None:
+                    transport_id, result = won
+                    self._adopt_command_result(transport_id, result)
+                    return result
 
         for transport_id in order:
-            if self._should_skip_transport(transport_id):
+            if transport_id in attempted:
                 continue
             link = self._transports.get(transport_id)
             if not link:
                 continue
+            if not await self._admit_transport(transport_id, link):
+                continue
+            timeout = self._command_timeout(transport_id, command)
             try:
+                started = time.perf_counter()
                 result = await asyncio.to_thread(
                     link.run_command,
                     command,
+                    timeout=timeout,
                     raise_on_error=raise_on_error,
+                    priority=priority,
+                    stale_after=stale_after,
+                    cancelled=cancelled,
                 )
+            except CommandDropped:
+                raise
+            except CommandError:
+                # The device answered with an error: the transport works, and running
+                # the command again on the other one could execute it twice.
+                self._record_transport_success(transport_id)
+                raise
             except SerialNotFoundError as exc:
-                self._record_transport_failure(transport_id, str(exc))
+                self._note_failure(transport_id, command, exc)
                 last_error = exc
                 if self._control_mode != TRANSPORT_AUTO:
                     raise
@@ -1218,17 +1682,470 @@ class OperatorService:
                     raise last_error
                 continue
 
+            if not self._note_reply(transport_id, command, result):
+                last_error = SerialNotFoundError(self._missed_deadline_error(command, timeout))
+                self._record_transport_failure(transport_id, str(last_error))
+                if self._control_mode != TRANSPORT_AUTO:
+                    return result
+                continue
+
+            self._hedger.observe(transport_id, command, time.perf_counter() - started)
             self._record_transport_success(transport_id)
-            with self._link_lock:
-                if transport_id != self._active_transport:
-                    logger.info("Switching control transport to %s", transport_id)
-                self._set_active_transport(transport_id)
+            self._adopt_command_result(transport_id, result)
             return result
 
         if last_error is not None:
             raise last_error
         raise SerialNotFoundError("All control transports are unavailable")
 
+    async def stream_command(
+        self,
+        command: str,
+        *,
+        raise_on_error: bool = False,
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """Run ``command`` like :meth:`run_command`, yielding its output as it arrives.
+
+        Yields ``("line", text)`` for every reply line as soon as the link reads it and
+        finally ``("result", CommandResult)``. Links that deliver the reply at once
+        (Wi-Fi frames, a standby hedge leg) have their reply lines yielded just before
+        the result. Errors from :meth:`run_command` propagate from the iterator.
+        """
+
+        loop = asyncio.get_running_loop()
+        lines: asyncio.Queue[str] = asyncio.Queue()
+
+        async def execute() -> CommandResult:
+            reply_line_sink.set(lambda line: loop.call_soon_threadsafe(lines.put_nowait, line))
+            return await self.run_command(command, raise_on_error=raise_on_error)
+
+        task = asyncio.create_task(execute())
+        streamed = 0
+        try:
+            while True:
+                waiter = asyncio.ensure_future(lines.get())
+                await asyncio.wait({task, waiter}, return_when=asyncio.FIRST_COMPLETED)
+                if not waiter.done():
+                    waiter.cancel()
+                    break
+                streamed += 1
+                yield "line", waiter.result()
+            # Lines are queued before the worker thread hands back its result.
+            while not lines.empty():
+                streamed += 1
+                yield "line", lines.get_nowait()
+            result = task.result()
+            if not streamed:
+                for line in result.raw:
+                    if not LOG_LINE_RE.match(line):
+                        yield "line", line
+            yield "result", result
+        finally:
+            if not task.done():
+                task.cancel()
+
+    async def run_batch(
+        self,
+        commands: Sequence[str],
+        *,
+        raise_on_error: bool = True,
+        cancelled: Optional[threading.Event] = None,
+    ) -> List[CommandResult]:
+        """Run ``commands`` in order, pipelined when the UART is the active transport.
+
+        Other transports (and a UART that fails mid-batch in ``auto`` mode) run the
+        commands one by one through :meth:`run_command`, keeping hedging and failover.
+        Setting ``cancelled`` drops whatever has not reached the link yet with
+        :class:`CommandDropped`.
+        """
+
+        self._note_motion(commands)
+        serial_link = self._transports.get(TRANSPORT_SERIAL)
+        if (
+            len(commands) > 1
+            and self._active_transport == TRANSPORT_SERIAL
+            and callable(getattr(unwrap_link(serial_link), "run_pipelined", None))
+            and await self._admit_transport(TRANSPORT_SERIAL, serial_link)
+        ):
+            try:
+                results = await asyncio.to_thread(
+                    serial_link.run_pipelined,
+                    list(commands),
+                    timeout=self._batch_timeout(TRANSPORT_SERIAL, commands),
+                    raise_on_error=raise_on_error,
+                    cancelled=cancelled,
+                )
+            except SerialNotFoundError as exc:
+                self._record_transport_failure(TRANSPORT_SERIAL, str(exc))
+                if self._control_mode != TRANSPORT_AUTO:
+                    raise
+            else:
+                if any(result.raw for result in results):
+                    self._note_batch_replies(TRANSPORT_SERIAL, commands, results)
+                    self._record_transport_success(TRANSPORT_SERIAL)
+                    self._adopt_command_result(TRANSPORT_SERIAL, results[0])
+                    return results
+                self._record_transport_failure(TRANSPORT_SERIAL, "no reply to pipelined batch")
+                if self._control_mode != TRANSPORT_AUTO:
+                    return results
+
+        return [
+            await self.run_command(command, raise_on_error=raise_on_error, cancelled=cancelled)
+            for command in commands
+        ]
+
+    async def run_sequence(self, steps: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+        """Run ordered steps under one reservation of a single transport.
+
+        Each step is a mapping with ``command`` and optional ``raise_on_error`` (an
+        error line fails the step) and ``stop_on_failure`` (a failed step skips the
+        rest). Steps up to the next ``stop_on_failure`` step are pipelined together.
+        The sequence moves to the next transport in ``auto`` mode only if the
+        transport failed before any step ran.
+        """
+
+        order = self._preferred_transport_order()
+        if not order:
+            raise SerialNotFoundError("No control transports configured")
+        self._note_motion(str(step["command"]) for step in steps)
+
+        last_error: Optional[SerialNotFoundError] = None
+        for transport_id in order:
+            link = self._transports.get(transport_id)
+            if not link:
+                continue
+            if not await self._admit_transport(transport_id, link):
+                continue
+            try:
+                outcomes, error = await asyncio.to_thread(self._run_steps, transport_id, link, steps)
+            except SerialNotFoundError as exc:
+                self._record_transport_failure(transport_id, str(exc))
+                last_error = exc
+                if self._control_mode != TRANSPORT_AUTO:
+                    raise
+                continue
+
+            if error is not None:
+                self._record_transport_failure(transport_id, str(error))
+            else:
+                self._record_transport_success(transport_id)
+            answered = next((item["result"] for item in outcomes if item["result"] is not None), None)
+            if answered is not None:
+                self._adopt_command_result(transport_id, answered)
+            return {"transport": transport_id, "results": outcomes}
+
+        if last_error is not None:
+            raise last_error
+        raise SerialNotFoundError("All control transports are unavailable")
+
+    def _run_steps(
+        self, transport_id: str, link: Any, steps: Sequence[Dict[str, Any]]
+    ) -> Tuple[List[Dict[str, Any]], Optional[SerialNotFoundError]]:
+        commands = [str(step["command"]) for step in steps]
+        reservation = (
+            link.reserve(batch_priority(commands))
+            if isinstance(link, ScheduledLink)
+            else contextlib.nullcontext(link)
+        )
+        outcomes: List[Dict[str, Any]] = []
+
+        def finish(
+            step: Dict[str, Any], result: Optional[CommandResult], error: Optional[str], skipped: bool
+        ) -> None:
+            outcomes.append(
+                {
+                    "command": str(step["command"]),
+                    "ok": error is None and not skipped,
+                    "skipped": skipped,
+                    "error": error,
+                    "result": result,
+                }
+            )
+
+        with reservation as target:
+            start = 0
+            while start < len(steps):
+                end = start
+                while end < len(steps) - 1 and not steps[end].get("stop_on_failure"):
+                    end += 1
+                segment = steps[start : end + 1]
+                segment_commands = [str(step["command"]) for step in segment]
+                try:
+                    results = run_pipelined(
+                        target,
+                        segment_commands,
+                        timeout=self._batch_timeout(transport_id, segment_commands),
+                        raise_on_error=False,
+                    )
+                except SerialNotFoundError as exc:
+                    if not outcomes:
+                        raise
+                    for step in steps[start:]:
+                        finish(step, None, str(exc), False)
+                    return outcomes, exc
+                self._note_batch_replies(transport_id, segment_commands, results)
+                for step, result in zip(segment, results):
+                    error_line = (
+                        self._cli_error_line(transport_id, result.raw)
+                        if step.get("raise_on_error")
+                        else None
+                    )
+                    finish(step, result, error_line, False)
+                start = end + 1
+                if start < len(steps) and not outcomes[-1]["ok"]:
+                    for step in steps[start:]:
+                        finish(step, None, None, True)
+                    break
+        return outcomes, None
+
+    def _batch_timeout(self, transport_id: str, commands: Sequence[str]) -> Optional[float]:
+        # Pipelined commands share one deadline and the device answers them back to
+        # back, so the slowest command bounds the wait for the final reply.
+        timeouts = [self._command_timeout(transport_id, command) for command in commands]
+        return None if None in timeouts else max(timeouts)
+
+    @staticmethod
+    def _cli_error_line(transport_id: str, lines: Sequence[str]) -> Optional[str]:
+        # Same rule as the links: Wi-Fi fails on any "err..." line, the UART only on
+        # "error..." because status text carries keys such as err_flags.
+        prefix = "err" if transport_id == TRANSPORT_WIFI else "error"
+        return next((line for line in lines if line.lower().startswith(prefix)), None)
+
+    def _command_timeout(
+        self, transport_id: str, command: str, *, initial: Optional[float] = None
+    ) -> Optional[float]:
+        """Reply deadline for ``command``; ``None`` leaves the link's own timeout."""
+
+        if not self._adaptive_timeouts:
+            return initial
+        return self._timeouts.timeout(transport_id, command, initial=initial)
+
+    def _note_reply(self, transport_id: str, command: str, result: CommandResult) -> bool:
+        """Feed the reply RTT into the deadline estimator.
+
+        Returns ``False`` when a command that normally answers produced no reply lines
+        before its deadline, i.e. the link is most likely dead.
+        """
+
+        rtt = reply_latency(result)
+        if rtt is not None:
+            self._timeouts.observe(transport_id, command, rtt)
+            return True
+        if any(CLI_ECHO_RE.match(line) for line in result.raw):
+            return True  # answered with log lines only, before the deadline
+        if self._adaptive_timeouts and self._timeouts.learned(transport_id, command):
+            self._timeouts.record_timeout(transport_id, command)
+            return False
+        return True
+
+    def _note_failure(self, transport_id: str, command: str, exc: SerialNotFoundError) -> None:
+        # Only an expired deadline says anything about the RTT; a port that is not
+        # present or a refused connection must not inflate the estimate.
+        if isinstance(exc, ReplyTimeoutError):
+            self._timeouts.record_timeout(transport_id, command)
+        self._record_transport_failure(transport_id, str(exc))
+
+    def _note_batch_replies(
+        self, transport_id: str, commands: Sequence[str], results: Sequence[CommandResult]
+    ) -> None:
+        """Observe pipelined replies, timing each from the end of the previous one."""
+
+        started: Optional[float] = None
+        for command, result in zip(commands, results):
+            if started is None or (result.sent_at is not None and result.sent_at > started):
+                started = result.sent_at
+            rtt = reply_latency(result, since=started)
+            if rtt is None:
+                continue
+            self._timeouts.observe(transport_id, command, rtt)
+            if started is not None:
+                started += rtt
+
+    @staticmethod
+    def _missed_deadline_error(command: str, timeout: Optional[float]) -> str:
+        if timeout is None:
+            return f"no reply to '{command}'"
+        return f"no reply to '{command}' within {timeout:.2f}s"
+
+    def _adopt_command_result(self, transport_id: str, result: CommandResult) -> None:
+        self._observe_device_clock(result)
+        with self._link_lock:
+            if transport_id != self._active_transport:
+                logger.info("Switching control transport to %s", transport_id)
+            self._set_active_transport(transport_id)
+
+    async def _hedge_attempt(
+        self,
+        transport_id: str,
+        link: Any,
+        command: str,
+        raise_on_error: bool,
+        cancelled: threading.Event,
+        *,
+        priority: Optional[str] = None,
+        stale_after: Optional[float] = None,
+        stream_lines: bool = True,
+    ) -> Optional[CommandResult]:
+        """One leg of a hedged race; returns ``None`` if cancelled before it was sent."""
+
+        timeout = self._command_timeout(transport_id, command)
+        if not stream_lines:
+            # Runs in its own task, so this only mutes this leg's partial output.
+            reply_line_sink.set(None)
+
+        def send() -> Optional[CommandResult]:
+            if cancelled.is_set():
+                return None
+            try:
+                return link.run_command(
+                    command,
+                    timeout=timeout,
+                    raise_on_error=raise_on_error,
+                    priority=priority,
+                    stale_after=stale_after,
+                    cancelled=cancelled,
+                )
+            except CommandDropped:
+                if cancelled.is_set():  # lost the race while queued for the link
+                    return None
+                raise
+
+        started = time.perf_counter()
+        try:
+            result = await asyncio.to_thread(send)
+        except CommandDropped:
+            raise
+        except CommandError:
+            self._record_transport_success(transport_id)
+            raise
+        except SerialNotFoundError as exc:
+            self._note_failure(transport_id, command, exc)
+            raise
+        except Exception as exc:  # pragma: no cover - safeguard
+            logger.exception("Failed to run command '%s' via %s", command, transport_id)
+            raise SerialNotFoundError(str(exc)) from exc
+        if result is None:
+            self._hedger.record_cancelled(transport_id)
+            return None
+        if not self._note_reply(transport_id, command, result):
+            error = SerialNotFoundError(self._missed_deadline_error(command, timeout))
+            self._record_transport_failure(transport_id, str(error))
+            raise error
+        # Late replies from losers still count towards latency and breaker health.
+        self._hedger.observe(transport_id, command, time.perf_counter() - started)
+        self._record_transport_success(transport_id)
+        return result
+
+    async def _run_hedged(
+        self,
+        command: str,
+        order: Sequence[str],
+        raise_on_error: bool,
+        attempted: Set[str],
+        *,
+        priority: Optional[str] = None,
+        stale_after: Optional[float] = None,
+    ) -> Optional[Tuple[str, CommandResult]]:
+        """Send an idempotent read on the primary and hedge it on the standby transport.
+
+        Returns ``None`` when no race is possible so the caller falls back to trying
+        transports in order; every transport used here is added to ``attempted``.
+        Blocking link calls cannot be interrupted, so a loser that has not reached the
+        wire yet is cancelled and one already in flight is left to finish unobserved.
+        """
+
+        candidates = [transport_id for transport_id in order if self._transports.get(transport_id)]
+        if len(candidates) < 2:
+            return None
+        primary, standby = candidates[:2]
+        if not await self._admit_transport(primary, self._transports[primary]):
+            return None
+        attempted.add(primary)
+
+        legs: Dict[asyncio.Task[Optional[CommandResult]], Tuple[str, threading.Event]] = {}
+
+        def launch(transport_id: str) -> None:
+            cancelled = threading.Event()
+            task = asyncio.create_task(
+                self._hedge_attempt(
+                    transport_id,
+                    self._transports[transport_id],
+                    command,
+                    raise_on_error,
+                    cancelled,
+                    priority=priority,
+                    stale_after=stale_after,
+                    stream_lines=transport_id == primary,
+                )
+            )
+            legs[task] = (transport_id, cancelled)
+
+        launch(primary)
+        done, pending = await asyncio.wait(set(legs), timeout=self._hedger.delay(primary, command))
+        if not done:
+            standby_link = self._transports.get(standby)
+            if standby_link is not None and await self._admit_transport(standby, standby_link):
+                attempted.add(standby)
+                self._hedger.record_hedge(primary, standby)
+                launch(standby)
+            pending = {task for task in legs if not task.done()}
+            done = {task for task in legs if task.done()}
+
+        last_error: Optional[BaseException] = None
+        while True:
+            for task in done:
+                error = task.exception()
+                if error is not None and not isinstance(error, CommandError):
+                    last_error = error
+                    continue
+                transport_id, _ = legs[task]
+                if len(legs) > 1:
+                    self._hedger.record_win(transport_id, as_hedge=transport_id == standby)
+                for loser in pending:
+                    legs[loser][1].set()
+                    self._hedge_stragglers.add(loser)
+                    loser.add_done_callback(self._finish_hedge_straggler)
+                # An error reply is an answer too; it ends the race like a result.
+                return transport_id, task.result()
+            if not pending:
+                break
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+
+        if isinstance(last_error, (SerialNotFoundError, CommandDropped)):
+            raise last_error
+        raise SerialNotFoundError(str(last_error))
+
+    def _finish_hedge_straggler(self, task: asyncio.Task[Any]) -> None:
+        self._hedge_stragglers.discard(task)
+        if not task.cancelled():
+            task.exception()  # outcome already recorded by _hedge_attempt
+
+    def _observe_device_clock(self, result: CommandResult) -> None:
+        """Feed replies carrying ``uptime_ms`` into the device clock estimator."""
+
+        data = result.data if isinstance(result.data, dict) else {}
+        uptime = data.get("uptime_ms")
+        sent_at = getattr(result, "sent_at", None)
+        received_at = getattr(result, "received_at", None)
+        if not isinstance(uptime, int) or sent_at is None or not callable(received_at):
+            return
+        arrived = received_at("uptime_ms=")
+        if arrived is not None:
+            self._device_clock.observe_round_trip(sent_at, arrived, uptime)
+
+    def _observe_heartbeat_clock(self, link: Any) -> None:
+        sample = getattr(link, "heartbeat_sample", None)
+        if not isinstance(sample, tuple) or sample == self._last_heartbeat_sample:
+            return
+        self._last_heartbeat_sample = sample
+        received_at, uptime = sample
+        self._device_clock.observe_one_way(received_at, uptime)
+
+    def device_time(self, uptime_ms: Optional[int]) -> Optional[float]:
+        """Translate an ESP32 ``millis()`` value into host time once the clock is synced."""
+
+        return self._device_clock.to_host(uptime_ms)
+
     async def get_camera_snapshot(self) -> Tuple[bytes, str]:
         url, source = self._resolve_camera_snapshot(require_stream=True)
         if not url:
@@ -1267,23 +2184,21 @@ class OperatorService:
         transport = self._determine_camera_transport()
         serial_link = self._transports.get(TRANSPORT_SERIAL)
         serial_port = None
-        if isinstance(serial_link, ESP32Link):
+        if isinstance(unwrap_link(serial_link), ESP32Link):
             serial_port = serial_link.active_port or serial_link.requested_port
         if serial_port is None:
             serial_port = self._transport_endpoints.get(TRANSPORT_SERIAL)
 
         control_state = self._control_state_snapshot()
         active_endpoint = None
-        if self._active_transport == TRANSPORT_SERIAL and isinstance(serial_link, ESP32Link):
+        if self._active_transport == TRANSPORT_SERIAL and isinstance(unwrap_link(serial_link), ESP32Link):
             active_endpoint = serial_link.active_port or serial_link.requested_port
         if active_endpoint is None and self._active_transport:
             active_endpoint = self._transport_endpoints.get(self._active_transport)
 
-        status_fresh = self._status_is_recent()
-        snapshot_url, source = self._resolve_camera_snapshot()
-        streaming_flag = (
-            bool((self._last_status or {}).get("cam_streaming")) if status_fresh else False
-        )
+        frame = self._effective_status_snapshot()
+        snapshot_url, source = self._resolve_camera_snapshot(frame)
+        streaming_flag = frame.camera_streaming if frame is not None else False
         return {
             "serial_port": serial_port,
             "control_mode": control_state["mode"],
@@ -1294,7 +2209,7 @@ class OperatorService:
             "camera_snapshot_source": source,
             "camera_transport": transport,
             "camera_streaming": streaming_flag,
-            "status_fresh": status_fresh,
+            "status_fresh": self._status_is_recent(),
         }
 
     def camera_configured(self) -> bool:
@@ -1316,6 +2231,9 @@ class OperatorService:
             result = await self.run_command("camcfg ?", raise_on_error=False)
         except SerialNotFoundError:
             raise
+        return self._camera_config_from_result(result)
+
+    def _camera_config_from_result(self, result: CommandResult) -> dict[str, Any]:
         data = result.data or {}
         error = data.get("camcfg_error")
         if error:
@@ -1348,7 +2266,8 @@ class OperatorService:
                 option["supported"] = idx <= cutoff
             available_options.append(option)
 
-        running = bool((self._last_status or {}).get("cam_streaming")) if self._status_is_recent() else False
+        frame = self._effective_status_snapshot()
+        running = frame.camera_streaming if frame is not None else False
         return {
             "resolution": resolution,
             "quality": quality_int,
@@ -1374,8 +2293,9 @@ class OperatorService:
             return await self.camera_get_config()
 
         stream_restart_required = False
-        if not self._camera_snapshot_override and self._status_is_recent():
-            stream_restart_required = bool((self._last_status or {}).get("cam_streaming"))
+        frame = self._effective_status_snapshot()
+        if not self._camera_snapshot_override and frame is not None:
+            stream_restart_required = frame.camera_streaming
 
         restart_succeeded = False
 
@@ -1532,11 +2452,15 @@ class OperatorService:
 
     async def shelf_get_map(self, *, force_refresh: bool = False) -> dict[str, Any]:
         now = time.time()
+        ttl = self._shelf_cache_ttl
+        if self._poll_scheduler.fresh("smap"):
+            # The poller refreshes the map; serve it until the next poll is due.
+            ttl = max(ttl, self._poll_scheduler.interval("smap") or 0.0)
         if (
             not force_refresh
             and self._shelf_cache
             and self._shelf_cache_timestamp is not None
-            and (now - self._shelf_cache_timestamp) <= self._shelf_cache_ttl
+            and (now - self._shelf_cache_timestamp) <= ttl
         ):
             cached_grid = self._shelf_clone_grid(self._shelf_cache["grid"])
             return {
@@ -1549,6 +2473,17 @@ class OperatorService:
             }
 
         result = await self.run_command("SMAP GET", raise_on_error=False)
+        grid, payload, timestamp = self._store_shelf_reply(result)
+        return {
+            "grid": grid,
+            "palette": self._shelf_palette_copy(),
+            "raw": payload,
+            "timestamp": timestamp,
+            "source": "live",
+            "persisted": None,
+        }
+
+    def _store_shelf_reply(self, result: CommandResult) -> Tuple[List[List[str]], str, float]:
         payload = self._extract_shelf_payload_line(result.raw or [])
         grid = self._parse_shelf_payload(payload)
         timestamp = time.time()
@@ -1558,14 +2493,7 @@ class OperatorService:
             "persisted": None,
         }
         self._shelf_cache_timestamp = timestamp
-        return {
-            "grid": grid,
-            "palette": self._shelf_palette_copy(),
-            "raw": payload,
-            "timestamp": timestamp,
-            "source": "live",
-            "persisted": None,
-        }
+        return grid, payload, timestamp
 
     async def shelf_set_map(
         self,
@@ -1612,26 +2540,18 @@ class OperatorService:
 
     def _resolve_camera_snapshot(
         self,
-        status: Optional[dict[str, Any]] = None,
+        status: Optional[StatusFrame] = None,
         *,
         require_stream: bool = False,
     ) -> Tuple[Optional[str], str]:
         if self._camera_snapshot_override:
             return self._camera_snapshot_override, "override"
 
-        effective = status if status is not None else self._effective_status_snapshot()
-        data = effective or {}
-        ip = data.get("wifi_ip") or data.get("wifi_ip_addr")
-        streaming = data.get("cam_streaming")
-        streaming_flag = bool(streaming) if isinstance(streaming, bool) else str(streaming).lower() == "true"
-
-        if require_stream and not streaming_flag:
+        frame = status if status is not None else self._effective_status_snapshot()
+        if require_stream and (frame is None or not frame.camera_streaming):
             raise CameraSnapshotError("Camera stream disabled")
 
-        if not ip or not streaming_flag:
-            return None, "auto"
-
-        return f"http://{ip}/camera/snapshot", "auto"
+        return (frame.camera_snapshot_url if frame is not None else None), "auto"
 
     def _resolve_camera_stream_interval(self) -> float:
         env_value = os.getenv("OPERATOR_CAMERA_STREAM_INTERVAL_MS")
@@ -1645,19 +2565,49 @@ class OperatorService:
             logger.warning("Invalid OPERATOR_CAMERA_STREAM_INTERVAL_MS='%s'", env_value)
             return default_seconds
 
+    @staticmethod
+    def _interval_from_env(name: str, default: float) -> float:
+        value = os.getenv(name)
+        if not value:
+            return default
+        try:
+            return max(0.05, float(value))
+        except ValueError:
+            logger.warning("Invalid %s=%s; using %.2f", name, value, default)
+            return default
+
     def _status_is_recent(self, now: Optional[float] = None) -> bool:
         if self._last_status_timestamp is None:
             return False
         now = now or time.time()
-        freshness_horizon = max(self._poll_interval * 2.5, 5.0)
+        freshness_horizon = max(self._poll_scheduler.interval("status") * 2.5, 5.0)
         return (now - self._last_status_timestamp) <= freshness_horizon
 
-    def _effective_status_snapshot(self) -> Optional[dict[str, Any]]:
+    def _effective_status_snapshot(self) -> Optional[StatusFrame]:
+        """Return the latest status frame while it is fresh; frames are shared, not copied."""
+
         if not self._status_is_recent():
             return None
-        if not self._last_status:
-            return None
-        return dict(self._last_status)
+        return self._last_status
+
+    def _adopt_status(self, result: CommandResult, now: float) -> Optional[StatusFrame]:
+        """Turn a ``STATUS`` reply into the current frame.
+
+        Schema-decoded frames replace the previous one wholesale; replies that only
+        went through the generic parser are layered over the previous frame.
+        """
+
+        frame = getattr(result, "status", None)
+        if frame is None:
+            if not result.data:
+                return None
+            frame = StatusFrame.from_mapping(result.data, base=self._last_status)
+        self._ensure_wifi_transport(frame)
+        if "cam_streaming" in frame or "wifi_connected" in frame:
+            self._last_status = frame
+        self._last_status_timestamp = now
+        self._last_status_error = None
+        return frame
 
     def _normalize_transport(self, value: Optional[str]) -> Optional[str]:
         if not value:
@@ -1702,15 +2652,14 @@ class OperatorService:
 
             return "unknown"
 
-        snapshot = self._effective_status_snapshot()
-        if snapshot:
-            ip_candidate = snapshot.get("wifi_ip") or snapshot.get("wifi_ip_addr")
-            if ip_candidate:
+        frame = self._effective_status_snapshot()
+        if frame is not None:
+            if frame.wifi_address:
                 return "wifi"
 
-            if snapshot.get("cam_streaming") is not None:
+            if frame.cam_streaming is not None:
                 serial_link = self._transports.get(TRANSPORT_SERIAL)
-                if isinstance(serial_link, ESP32Link) and (
+                if isinstance(unwrap_link(serial_link), ESP32Link) and (
                     serial_link.active_port or serial_link.requested_port
                 ):
                     return "type-c"
@@ -1728,7 +2677,7 @@ class OperatorService:
         serial_link = self._transports.get(TRANSPORT_SERIAL)
         requested_port = None
         active_port = None
-        if isinstance(serial_link, ESP32Link):
+        if isinstance(unwrap_link(serial_link), ESP32Link):
             requested_port = serial_link.requested_port
             active_port = serial_link.active_port
         if requested_port is None:
@@ -1761,10 +2710,20 @@ class OperatorService:
                 "seq_ack": None,
             },
             "status": {},
+            "i2c": dict(self._i2c_diag),
+            "teleop": self._teleop_stats.snapshot(),
+            "polling": self._poll_scheduler.snapshot(),
         }
 
+        # Reuse what the poller fetched within its interval; the rest goes out in one
+        # pipelined exchange on the UART.
+        commands: List[str] = []
+        if not self._poll_scheduler.fresh("status"):
+            commands.append("status")
+        if self._polled_camcfg is None or not self._poll_scheduler.fresh("camcfg"):
+            commands.append("camcfg ?")
         try:
-            status_result = await self.run_command("status", raise_on_error=False)
+            replies = await self.run_batch(commands, raise_on_error=False) if commands else []
         except SerialNotFoundError as exc:
             self._last_status_error = str(exc)
             diag["serial"]["connected"] = False
@@ -1783,27 +2742,27 @@ class OperatorService:
                 self._initial_probe_task = asyncio.create_task(self._initial_probe())
             return diag
 
+        fetched = dict(zip(commands, replies))
+        status_result = fetched.get("status")
+        camcfg_result = fetched.get("camcfg ?")
+        if camcfg_result is not None and camcfg_result.raw:
+            self._polled_camcfg = camcfg_result
+        else:
+            camcfg_result = self._polled_camcfg
         now = time.time()
-        data = status_result.data or {}
-        lines = status_result.raw or []
-        status_fresh = False
-
-        if lines and data:
-            merged = dict(self._last_status)
-            merged.update(data)
-            self._last_status = merged
-            self._last_status_timestamp = now
-            self._last_status_error = None
+        lines = status_result.raw if status_result is not None else []
+
+        if lines and self._adopt_status(status_result, now) is not None:
             status_fresh = True
         else:
             status_fresh = self._status_is_recent(now)
             if not status_fresh and not lines:
                 self._last_status_error = "no_data"
 
-        snapshot = dict(self._last_status) if status_fresh else {}
+        frame = self._last_status if status_fresh else None
 
         active_port = None
-        if isinstance(serial_link, ESP32Link):
+        if isinstance(unwrap_link(serial_link), ESP32Link):
             active_port = serial_link.active_port
         if active_port is None:
             active_port = self._transport_endpoints.get(TRANSPORT_SERIAL)
@@ -1823,39 +2782,32 @@ class OperatorService:
         if self._last_status_error:
             diag["serial"]["status_error"] = self._last_status_error
 
-        diag["status"] = snapshot if status_fresh else {}
+        diag["status"] = frame.as_dict() if frame is not None else {}
 
-        wifi_connected_flag = snapshot.get("wifi_connected") if status_fresh else None
-        if wifi_connected_flag is not None:
-            diag["wifi"]["connected"] = bool(wifi_connected_flag)
-            wifi_ip = snapshot.get("wifi_ip") or snapshot.get("wifi_ip_addr")
-            if wifi_ip is not None:
-                diag["wifi"]["ip"] = wifi_ip
+        if frame is not None and frame.wifi_connected is not None:
+            diag["wifi"]["connected"] = bool(frame.wifi_connected)
+            diag["wifi"]["ip"] = frame.wifi_address
         else:
             diag["wifi"]["connected"] = False
             diag["wifi"]["ip"] = None
 
-        status_error = snapshot.get("status_error") if status_fresh else None
-        diag["uno"]["error"] = status_error
-        diag["uno"]["connected"] = bool(status_fresh and status_error is None)
-        diag["uno"]["state_id"] = snapshot.get("state_id") if status_fresh else None
-        diag["uno"]["err_flags"] = snapshot.get("err_flags") if status_fresh else None
-        diag["uno"]["seq_ack"] = snapshot.get("seq_ack") if status_fresh else None
+        if frame is not None:
+            diag["uno"].update(frame.uno_health)
 
-        snapshot_url, source = self._resolve_camera_snapshot(status=snapshot if status_fresh else None)
+        snapshot_url, source = self._resolve_camera_snapshot(status=frame)
         configured = snapshot_url is not None
-        if status_fresh and any(snapshot.get(field) for field in ("cam_resolution", "cam_quality", "cam_max")):
+        if frame is not None and any(frame.get(field) for field in ("cam_resolution", "cam_quality", "cam_max")):
             configured = True
 
         reachable = False
         diag["camera"]["snapshot_url"] = snapshot_url
-        diag["camera"]["streaming"] = bool(status_fresh and snapshot.get("cam_streaming"))
+        diag["camera"]["streaming"] = frame.camera_streaming if frame is not None else False
         diag["camera"]["source"] = source
-        diag["camera"]["resolution"] = snapshot.get("cam_resolution") if status_fresh else None
-        diag["camera"]["quality"] = snapshot.get("cam_quality") if status_fresh else None
-        diag["camera"]["cam_max"] = snapshot.get("cam_max") if status_fresh else None
+        diag["camera"]["resolution"] = frame.get("cam_resolution") if frame is not None else None
+        diag["camera"]["quality"] = frame.get("cam_quality") if frame is not None else None
+        diag["camera"]["cam_max"] = frame.get("cam_max") if frame is not None else None
         try:
-            camcfg = await self.camera_get_config()
+            camcfg = self._camera_config_from_result(camcfg_result) if camcfg_result is not None else None
             if isinstance(camcfg, dict):
                 reachable = True
                 configured = True
@@ -1869,8 +2821,6 @@ class OperatorService:
                     diag["camera"]["max_resolution"] = camcfg.get("max_resolution")
                 if camcfg.get("running") is not None:
                     diag["camera"]["streaming"] = bool(camcfg.get("running"))
-        except SerialNotFoundError:
-            pass
         except Exception:
             logger.exception("Failed to fetch camera config for diagnostics")
 
@@ -1890,6 +2840,8 @@ class OperatorService:
         if self._last_status_error:
             diag["meta"]["status_error"] = self._last_status_error
 
+        diag["clock"] = self._device_clock.snapshot()
+
         self._attach_control_snapshot(diag)
         return diag
 
@@ -1897,11 +2849,154 @@ class OperatorService:
         queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(maxsize=1)
         async with self._clients_lock:
             self._clients.add(queue)
+        self._poll_scheduler.poke()
         return queue
 
     async def unregister_client(self, queue: asyncio.Queue[dict[str, Any]]) -> None:
         async with self._clients_lock:
             self._clients.discard(queue)
+        self._poll_scheduler.poke()
+
+    async def capture_telemetry(
+        self,
+        *,
+        duration: float,
+        rate: Optional[float] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> TelemetryCapture:
+        """Record ``status`` samples for ``duration`` seconds, as fast as the link allows
+        or at ``rate`` samples per second.
+
+        Raises :class:`CaptureError` for invalid parameters, :class:`CaptureBusyError`
+        while another capture runs and :class:`SerialNotFoundError` if no sample was
+        taken. Telemetry clients keep receiving the newest captured sample.
+        """
+
+        chosen = validate_capture(duration, rate, fields)
+        if self._capture_running:
+            raise CaptureBusyError("another telemetry capture is still running")
+        buffer = CaptureBuffer(chosen, math.ceil(duration * (rate or MAX_CAPTURE_RATE)))
+        started_at = time.time()
+        self._capture_running = True
+        try:
+            stats = await run_capture(
+                buffer,
+                poll=lambda count: self.run_batch([self._poll_command] * count, raise_on_error=False),
+                to_host=self.device_time,
+                duration=duration,
+                rate=rate,
+                on_sample=self._keep_capture_sample,
+            )
+        finally:
+            self._capture_running = False
+            self._capture_latest = None
+        if not buffer.count and stats["error"]:
+            raise SerialNotFoundError(stats["error"])
+        capture = TelemetryCapture(
+            buffer, {"started_at": started_at, "transport": self._active_transport, **stats}
+        )
+        self._last_capture = capture
+        return capture
+
+    def _keep_capture_sample(self, result: CommandResult) -> None:
+        self._capture_latest = result
+        self._ingest_status(result)
+
+    def _ingest_status(self, result: CommandResult) -> None:
+        """Feed a polled or captured status frame to the history and the odometry."""
+
+        uptime = result.data.get("uptime_ms")
+        timestamp = self.device_time(uptime if isinstance(uptime, int) else None)
+        timestamp = timestamp or result.received_at() or time.time()
+        self._history.ingest(timestamp, result.data)
+        self._odometry.update(result.data, timestamp)
+
+    def odometry(self) -> Dict[str, Any]:
+        """Pose integrated from ``odo_left``/``odo_right`` since start or the last reset."""
+
+        return self._odometry.snapshot()
+
+    def reset_odometry(self, *, x_mm: float = 0.0, y_mm: float = 0.0, theta_rad: float = 0.0) -> Dict[str, Any]:
+        self._odometry.reset(x_mm, y_mm, theta_rad)
+        return self._odometry.snapshot()
+
+    def replay_odometry(self, configs: Sequence[OdometryConfig], *, points: int = 200) -> Dict[str, Any]:
+        """Integrate the last telemetry capture once per ``CFG_ODO`` candidate.
+
+        Raises :class:`ReplayError` when there is no capture with both odometry columns.
+        """
+
+        capture = self._last_capture
+        if capture is None:
+            raise ReplayError("no telemetry capture recorded yet")
+        buffer = capture.buffer
+        if "odo_left" not in buffer.fields or "odo_right" not in buffer.fields:
+            raise ReplayError("the last capture did not record odo_left and odo_right")
+        count = buffer.count
+        uptime = buffer.uptime[:count]
+        left, right = buffer.columns["odo_left"][:count], buffer.columns["odo_right"][:count]
+        stride = max(1, math.ceil(count / max(1, points)))
+        runs = []
+        for config in configs:
+            run = integrate_trajectory(uptime, left, right, config, max_speed_mm_s=self._odometry.max_speed_mm_s)
+            for column in ("x_mm", "y_mm", "theta_rad"):
+                run[column] = run[column][::stride].tolist()
+            runs.append(run)
+        return {
+            "started_at": capture.meta.get("started_at"),
+            "samples": count,
+            "t": buffer.time[:count][::stride].tolist(),
+            "runs": runs,
+        }
+
+    def telemetry_history(
+        self,
+        *,
+        fields: Optional[Sequence[str]] = None,
+        window: float,
+        points: int,
+        method: str = "lttb",
+    ) -> Dict[str, Any]:
+        """Status fields over the last ``window`` seconds, downsampled to ``points``.
+
+        Raises :class:`HistoryError` for unknown fields or methods.
+        """
+
+        return self._history.query(fields, window=window, points=points, method=method)
+
+    async def serve_telemetry(self, websocket: WebSocket) -> None:
+        """Send every status payload to ``websocket`` until it disconnects.
+
+        A client showing live telemetry sends ``{"live": true}``, which polls at the
+        live rate until it sends ``{"live": false}`` or disconnects.
+        """
+
+        queue = await self.register_client()
+        live = False
+
+        async def send_payloads() -> None:
+            while True:
+                await websocket.send_text(json.dumps(await queue.get()))
+
+        writer = asyncio.create_task(send_payloads())
+        try:
+            while True:
+                try:
+                    message = json.loads(await websocket.receive_text())
+                except ValueError:
+                    continue
+                if not isinstance(message, dict) or "live" not in message:
+                    continue
+                wanted = bool(message["live"])
+                if wanted != live:
+                    live = wanted
+                    self._live_watchers += 1 if live else -1
+                    self._poll_scheduler.poke()
+        finally:
+            writer.cancel()
+            if live:
+                self._live_watchers -= 1
+            await self.unregister_client(queue)
 
     async def _broadcast(self, payload: dict[str, Any]) -> None:
         async with self._clients_lock:
@@ -1917,8 +3012,11 @@ class OperatorService:
 
     def get_recent_logs(self, limit: int = 200) -> List[dict[str, Any]]:
         limit = max(1, min(limit, 1000))
+        if self._log_history:
+            history = list(self._log_history)
+            return [dict(entry) for entry in history[-limit:]]
         serial_link = self._transports.get(TRANSPORT_SERIAL)
-        if not isinstance(serial_link, ESP32Link):
+        if not isinstance(unwrap_link(serial_link), ESP32Link):
             return []
         raw_entries = serial_link.recent_logs(limit * 4)
         structured = structure_logs(raw_entries)
@@ -1970,86 +3068,235 @@ class OperatorService:
 
     async def _log_loop(self) -> None:
         while not self._stop_event.is_set():
-            entries: List[tuple[float, str]] = []
             with self._link_lock:
                 wifi_link = self._transports.get(TRANSPORT_WIFI)
                 serial_link = self._transports.get(TRANSPORT_SERIAL)
 
-            if isinstance(wifi_link, ESP32WSLink):
-                try:
-                    entries = await asyncio.to_thread(wifi_link.collect_pending_logs)
-                except SerialNotFoundError as exc:
-                    logger.debug("Wi-Fi log collection unavailable: %s", exc)
-                    entries = []
+            records: List[LogRecord] = []
+            sequenced_link: Optional[Tuple[str, Any]] = None
+            if wifi_link is not None:
+                self._observe_heartbeat_clock(wifi_link)
+            if wifi_link is not None and callable(getattr(wifi_link, "fetch_logs", None)):
+                sequenced_link = (TRANSPORT_WIFI, wifi_link)
+                if self._wifi_logs_pending(wifi_link):
+                    records.extend(await self._fetch_sequenced_logs(TRANSPORT_WIFI, wifi_link))
 
-            if not entries and isinstance(serial_link, ESP32Link):
+            if serial_link is not None and callable(getattr(serial_link, "collect_pending_logs", None)):
                 try:
-                    entries = await asyncio.to_thread(serial_link.collect_pending_logs)
+                    drained = await asyncio.to_thread(serial_link.collect_pending_logs)
                 except SerialNotFoundError as exc:
                     logger.debug("Serial log collection unavailable: %s", exc)
-                    entries = []
+                    drained = []
+                if drained:
+                    records.extend(
+                        self._log_sequencer.ingest_unsequenced(drained, source=TRANSPORT_SERIAL)
+                    )
+                if sequenced_link is None and callable(getattr(serial_link, "fetch_logs", None)):
+                    sequenced_link = (TRANSPORT_SERIAL, serial_link)
+
+            records.extend(await self._fill_log_gaps(sequenced_link, serial_link))
+            records.extend(self._log_sequencer.release())
 
-            if entries:
-                structured = structure_logs(entries)
+            if records:
+                structured = structure_logs([(record.timestamp, record.text) for record in records])
                 if structured:
                     structured = self._attach_log_ids(structured)
+                    self._log_history.extend(structured)
                     await self._broadcast_logs(structured)
             try:
                 await asyncio.wait_for(self._stop_event.wait(), timeout=0.25)
             except asyncio.TimeoutError:
                 continue
 
-    async def _poll_loop(self) -> None:
-        while not self._stop_event.is_set():
-            try:
-                result = await self.run_command(
-                    self._poll_command, raise_on_error=False
-                )
-                if result.raw and result.data:
-                    merged = dict(self._last_status)
-                    merged.update(result.data)
-                    if merged:
-                        self._ensure_wifi_transport(merged)
-                    if "cam_streaming" in merged or "wifi_connected" in merged:
-                        self._last_status = merged
-                    self._last_status_timestamp = time.time()
-                    self._last_status_error = None
-                elif not result.raw:
-                    self._last_status_error = "no_data"
-                payload = {
-                    "command": self._poll_command,
-                    "raw": result.raw,
-                    "data": result.data,
-                }
-            except SerialNotFoundError as exc:
-                self._last_status_error = str(exc)
-                payload = {
-                    "command": self._poll_command,
-                    "error": str(exc),
-                }
-                if self._ws_auto_enabled:
-                    await self._maybe_discover_wifi_endpoint()
-                if (
-                    self._control_mode == TRANSPORT_AUTO
-                    and not self._initial_probe_task
-                    and not self._stop_event.is_set()
-                ):
-                    self._initial_probe_task = asyncio.create_task(self._initial_probe())
-            except Exception as exc:  # pragma: no cover - unexpected
-                self._last_status_error = str(exc)
-                payload = {
-                    "command": self._poll_command,
-                    "error": f"unexpected error: {exc}",
-                }
+    def _wifi_logs_pending(self, link: Any) -> bool:
+        """Skip the Wi-Fi ``LOGS`` round-trip when the heartbeat says nothing is new."""
 
+        hint = getattr(link, "logs_next_hint", None)
+        heartbeat = getattr(link, "last_heartbeat", None)
+        if not isinstance(hint, int) or not isinstance(heartbeat, (int, float)):
+            return True
+        if (time.time() - heartbeat) > 5.0:
+            return True
+        return hint - 1 > self._log_sequencer.cursor
+
+    async def _fetch_sequenced_logs(
+        self,
+        transport_id: str,
+        link: Any,
+        *,
+        since: Optional[int] = None,
+        limit: int = DEFAULT_LOG_FETCH_LIMIT,
+    ) -> List[LogRecord]:
+        cursor = self._log_sequencer.cursor if since is None else since
+        try:
+            dump = await asyncio.to_thread(link.fetch_logs, cursor, limit)
+        except SerialNotFoundError as exc:
+            logger.debug("%s log collection unavailable: %s", TRANSPORT_LABELS.get(transport_id, transport_id), exc)
+            return []
+        if dump.sent_at is not None and dump.received_at is not None and dump.uptime_ms is not None:
+            self._device_clock.observe_round_trip(dump.sent_at, dump.received_at, dump.uptime_ms)
+        timestamps: Dict[int, float] = {}
+        for seq, uptime in dump.uptimes.items():
+            captured_at = self._device_clock.to_host(uptime)
+            if captured_at is not None:
+                timestamps[seq] = captured_at
+        return self._log_sequencer.ingest_dump(
+            dump,
+            since=cursor,
+            source=transport_id,
+            timestamp=dump.received_at,
+            timestamps=timestamps,
+        )
+
+    async def _fill_log_gaps(
+        self,
+        sequenced_link: Optional[Tuple[str, Any]],
+        serial_link: Optional[Any],
+    ) -> List[LogRecord]:
+        gaps = self._log_sequencer.gaps(limit=1)
+        if not gaps:
+            return []
+        candidates: List[Tuple[str, Any]] = []
+        if sequenced_link is not None:
+            candidates.append(sequenced_link)
+        if (
+            serial_link is not None
+            and callable(getattr(serial_link, "fetch_logs", None))
+            and all(link is not serial_link for _, link in candidates)
+        ):
+            candidates.append((TRANSPORT_SERIAL, serial_link))
+
+        first, last = gaps[0]
+        for transport_id, link in candidates:
+            records = await self._fetch_sequenced_logs(
+                transport_id,
+                link,
+                since=first - 1,
+                limit=last - first + 1,
+            )
+            if records:
+                self._log_sequencer.note_gap_fill()
+                return records
+        return []
+
+    def _poll_demand(self) -> str:
+        if (
+            self._live_watchers
+            or self._teleop_sessions
+            or any(run.active for run in self._macros.values())
+            or time.monotonic() < self._motion_until
+        ):
+            return POLL_LIVE
+        return POLL_WATCHED if self._clients else POLL_IDLE
+
+    def _note_motion(self, commands: Iterable[str]) -> None:
+        """Poll at the live rate for a while after a motion command."""
+
+        if any(classify_command(command) == PRIORITY_MOTION for command in commands):
+            self._motion_until = time.monotonic() + self._poll_motion_hold
+            self._poll_scheduler.poke()
+
+    async def _poll_status(self) -> bool:
+        payload: Optional[dict[str, Any]]
+        try:
+            result = await self._startup_status()
+            if result is None and self._capture_running:
+                # A running capture already polls status; publish its newest sample.
+                result, self._capture_latest = self._capture_latest, None
+                if result is None:
+                    return True
+            else:
+                if result is None:
+                    result = await self.run_command(
+                        self._poll_command,
+                        raise_on_error=False,
+                        priority=PRIORITY_POLLING,
+                        stale_after=self._poll_scheduler.interval("status"),
+                    )
+                if result.raw:
+                    self._ingest_status(result)
+            received_at = result.received_at() or time.time()
+            uptime = result.data.get("uptime_ms")
+            frame = self._adopt_status(result, time.time()) if result.raw else None
+            if not result.raw:
+                self._last_status_error = "no_data"
+            payload = {
+                "command": self._poll_command,
+                "raw": result.raw,
+                "data": result.data,
+                "timestamp": received_at,
+                "captured_at": self.device_time(uptime if isinstance(uptime, int) else None),
+            }
+            if frame is not None:
+                payload["seq"] = frame.seq
+                payload["odometry"] = self._odometry.snapshot()
+        except CommandDropped:
+            # Safety and operator commands kept the link busy; the next poll is fresher.
+            payload = None
+        except SerialNotFoundError as exc:
+            self._last_status_error = str(exc)
+            payload = {
+                "command": self._poll_command,
+                "error": str(exc),
+            }
+            if self._ws_auto_enabled:
+                await self._maybe_discover_wifi_endpoint()
+            if (
+                self._control_mode == TRANSPORT_AUTO
+                and not self._initial_probe_task
+                and not self._stop_event.is_set()
+            ):
+                self._initial_probe_task = asyncio.create_task(self._initial_probe())
+        except Exception as exc:  # pragma: no cover - unexpected
+            self._last_status_error = str(exc)
+            payload = {
+                "command": self._poll_command,
+                "error": f"unexpected error: {exc}",
+            }
+
+        if payload is not None:
             await self._broadcast(payload)
+        return payload is not None and "error" not in payload
+
+    async def _poll_once(self, source: str, command: str) -> Optional[CommandResult]:
+        try:
+            result = await self.run_command(
+                command,
+                raise_on_error=False,
+                priority=PRIORITY_POLLING,
+                stale_after=self._poll_scheduler.interval(source),
+            )
+        except (CommandDropped, SerialNotFoundError):
+            return None
+        return result if result.raw else None
 
-            self._maybe_schedule_serial_probe()
+    async def _poll_camcfg(self) -> bool:
+        result = await self._poll_once("camcfg", "camcfg ?")
+        if result is None:
+            return False
+        self._polled_camcfg = result
+        return True
 
-            try:
-                await asyncio.wait_for(self._stop_event.wait(), timeout=self._poll_interval)
-            except asyncio.TimeoutError:
-                continue
+    async def _poll_i2c_diag(self) -> bool:
+        result = await self._poll_once("i2c", "I2C DIAG")
+        if result is None:
+            return False
+        self._i2c_diag = dict(result.data)
+        return True
+
+    async def _poll_shelf_map(self) -> bool:
+        result = await self._poll_once("smap", "SMAP GET")
+        if result is None:
+            return False
+        try:
+            self._store_shelf_reply(result)
+        except (RuntimeError, ValueError):
+            return False
+        return True
+
+    async def _poll_keepalive(self) -> bool:
+        self._maybe_schedule_standby_keepalive()
+        return True
 
     async def stream_camera_frames(self, websocket: WebSocket) -> None:
         reconnect_delay = max(self._camera_stream_interval, 0.5)
@@ -2083,6 +3330,169 @@ class OperatorService:
             await websocket.send_text(json.dumps(payload))
             await asyncio.sleep(self._camera_stream_interval)
 
+    async def serve_command_channel(self, websocket: WebSocket) -> None:
+        """Run commands received on ``websocket`` and answer each under its ``id``.
+
+        Clients send ``{"id": ..., "command": "...", "raise_on_error": false}``. Every
+        command runs as its own task, so several can be in flight while the link
+        scheduler orders them. Reply lines are forwarded as ``line`` messages as they
+        arrive (see :meth:`stream_command`), before the ``result`` or ``error`` message
+        for the same ``id``.
+        """
+
+        outbox: asyncio.Queue[str] = asyncio.Queue()
+        pending: Dict[Any, asyncio.Task] = {}
+
+        def reply(request_id: Any, kind: str, **fields: Any) -> None:
+            outbox.put_nowait(json.dumps({"id": request_id, "type": kind, **fields}))
+
+        async def execute(request_id: Any, command: str, raise_on_error: bool) -> None:
+            result: Any = None
+            try:
+                async for kind, value in self.stream_command(command, raise_on_error=raise_on_error):
+                    if kind == "line":
+                        reply(request_id, "line", line=value)
+                    else:
+                        result = value
+            except (CommandError, SerialNotFoundError) as exc:
+                pending.pop(request_id, None)
+                reply(request_id, "error", error=str(exc))
+                return
+            except Exception as exc:  # pragma: no cover - safeguard
+                logger.exception("Command channel failed to run '%s'", command)
+                pending.pop(request_id, None)
+                reply(request_id, "error", error=str(exc))
+                return
+            pending.pop(request_id, None)
+            reply(
+                request_id,
+                "result",
+                command=command,
+                transport=self._active_transport,
+                raw=result.raw,
+                data=result.data,
+            )
+
+        async def send_replies() -> None:
+            while True:
+                await websocket.send_text(await outbox.get())
+
+        writer = asyncio.create_task(send_replies())
+        try:
+            while True:
+                try:
+                    message = json.loads(await websocket.receive_text())
+                except ValueError:
+                    reply(None, "error", error="message is not valid JSON")
+                    continue
+                if not isinstance(message, dict):
+                    reply(None, "error", error="message must be a JSON object")
+                    continue
+                request_id = message.get("id")
+                command = message.get("command")
+                if not isinstance(request_id, (str, int)) or isinstance(request_id, bool):
+                    reply(None, "error", error="id must be a string or an integer")
+                elif not isinstance(command, str) or not command.strip():
+                    reply(request_id, "error", error="command must be a non-empty string")
+                elif request_id in pending:
+                    reply(request_id, "error", error="a command with this id is still running")
+                elif len(pending) >= COMMAND_CHANNEL_MAX_IN_FLIGHT:
+                    reply(request_id, "error", error="too many commands in flight")
+                else:
+                    pending[request_id] = asyncio.create_task(
+                        execute(request_id, command.strip(), bool(message.get("raise_on_error", False)))
+                    )
+        finally:
+            writer.cancel()
+            for task in pending.values():
+                task.cancel()
+
+    async def start_macro(self, steps: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+        """Validate and start a motion macro; returns its initial report.
+
+        Raises :class:`MacroError` for invalid steps and :class:`MacroBusyError` while
+        another macro is running.
+        """
+
+        compiled = compile_macro(steps)
+        if any(run.active for run in self._macros.values()):
+            raise MacroBusyError("another macro is still running")
+        run = MacroRun(compiled)
+        self._macros[run.id] = run
+        while len(self._macros) > MACRO_HISTORY:
+            self._macros.popitem(last=False)
+        self._macro_tasks[run.id] = asyncio.create_task(self._execute_macro(run))
+        self._poll_scheduler.poke()
+        return run.snapshot()
+
+    async def _execute_macro(self, run: MacroRun) -> None:
+        queue = await self.register_client()
+        try:
+            await run.execute(
+                run_step=lambda command: self.run_command(
+                    command, raise_on_error=False, priority=PRIORITY_SAFETY
+                ),
+                brake=lambda: self.run_command("BRAKE", raise_on_error=False),
+                telemetry=queue.get,
+            )
+        except asyncio.CancelledError:
+            pass
+        finally:
+            await self.unregister_client(queue)
+            self._macro_tasks.pop(run.id, None)
+
+    def get_macro(self, macro_id: str) -> Optional[Dict[str, Any]]:
+        run = self._macros.get(macro_id)
+        return run.snapshot() if run is not None else None
+
+    async def cancel_macro(self, macro_id: str) -> Optional[Dict[str, Any]]:
+        """Stop a running macro; it sends ``BRAKE`` before reporting ``cancelled``."""
+
+        run = self._macros.get(macro_id)
+        if run is None:
+            return None
+        task = self._macro_tasks.get(macro_id)
+        if task is not None:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        return run.snapshot()
+
+    async def serve_teleop(self, websocket: WebSocket) -> None:
+        """Drive the robot from ``websocket`` with latest-wins setpoints and a deadman.
+
+        See :class:`~backend.operator.services.teleop.TeleopController` for the frame
+        format; replies are ``ack`` messages carrying the setpoint-to-ack latency and
+        ``brake`` messages.
+        """
+
+        outbox: asyncio.Queue[str] = asyncio.Queue()
+        controller = TeleopController(
+            send=lambda commands, cancelled: self.run_batch(commands, raise_on_error=False, cancelled=cancelled),
+            brake=lambda: self.run_command("BRAKE", raise_on_error=False, priority=PRIORITY_SAFETY),
+            emit=lambda message: outbox.put_nowait(json.dumps(message)),
+            stats=self._teleop_stats,
+            rate=self._teleop_rate,
+            deadman=self._teleop_deadman,
+        )
+
+        async def send_replies() -> None:
+            while True:
+                await websocket.send_text(await outbox.get())
+
+        writer = asyncio.create_task(send_replies())
+        ticker = asyncio.create_task(controller.run())
+        self._teleop_sessions += 1
+        self._poll_scheduler.poke()
+        try:
+            while True:
+                controller.handle_frame(await websocket.receive_text())
+        finally:
+            self._teleop_sessions -= 1
+            ticker.cancel()
+            writer.cancel()
+            await controller.close()
+
 
 __all__ = [
     "CameraNotConfiguredError",
@@ -0,0 +1,186 @@
+"""Demand-driven polling of the device.
+
+The backend used to send ``status`` at a fixed interval whether or not anyone was
+listening. :class:`PollScheduler` runs several poll sources (status, camera config,
+I2C diagnostics, the shelf map, standby keepalives), each with its own interval per
+demand level:
+
+* ``idle`` — no telemetry subscriber and no motion;
+* ``watched`` — at least one telemetry subscriber is connected;
+* ``live`` — a client shows live telemetry, or a motion command, macro or teleop
+  session is running.
+
+A source whose interval is ``None`` is not polled at that level. Sources run one at a
+time, earliest due first, so two polls never compete for the link; a change of demand
+wakes the scheduler at once instead of at the end of the previous interval.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+POLL_IDLE = "idle"
+POLL_WATCHED = "watched"
+POLL_LIVE = "live"
+POLL_LEVELS: Tuple[str, ...] = (POLL_IDLE, POLL_WATCHED, POLL_LIVE)
+
+DEFAULT_IDLE_INTERVAL = 5.0  # seconds between status polls with nobody listening
+DEFAULT_LIVE_INTERVAL = 0.2  # seconds between status polls during live view or motion
+DEFAULT_MOTION_HOLD = 2.0  # seconds a motion command keeps polling at the live rate
+
+
+class PollSource:
+    """One periodic poll; ``intervals`` maps each demand level to seconds or ``None``.
+
+    ``poll`` returns ``False`` when it got no data (link down, dropped as stale).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        poll: Callable[[], Awaitable[bool]],
+        intervals: Dict[str, Optional[float]],
+    ) -> None:
+        unknown = set(intervals) - set(POLL_LEVELS)
+        if unknown:
+            raise ValueError(f"unknown demand levels {sorted(unknown)}")
+        self.name = name
+        self.poll = poll
+        self.intervals = dict(intervals)
+        self.runs = 0
+        self.failures = 0
+        self.last_started: Optional[float] = None
+        self.last_finished: Optional[float] = None
+        self.last_success: Optional[float] = None
+        self.last_duration: Optional[float] = None
+
+    def interval(self, level: str) -> Optional[float]:
+        return self.intervals.get(level)
+
+    def due(self, level: str) -> Optional[float]:
+        """Monotonic time of the next poll at ``level``; ``None`` when not polled."""
+
+        interval = self.interval(level)
+        if interval is None:
+            return None
+        if self.last_started is None:
+            return 0.0
+        return self.last_started + interval
+
+
+class PollScheduler:
+    """Runs poll sources at the rate the current demand calls for."""
+
+    def __init__(
+        self,
+        sources: Sequence[PollSource],
+        demand: Callable[[], str],
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._sources: Dict[str, PollSource] = {source.name: source for source in sources}
+        self._demand = demand
+        self._clock = clock
+        self._wake = asyncio.Event()
+        self.level = POLL_IDLE
+        self.level_changes = 0
+
+    def poke(self) -> None:
+        """Re-evaluate demand now, e.g. after a subscriber joined or motion started."""
+
+        self._wake.set()
+
+    def interval(self, name: str) -> Optional[float]:
+        return self._sources[name].interval(self.level)
+
+    def fresh(self, name: str) -> bool:
+        """Whether ``name`` got data within its interval at the current level."""
+
+        source = self._sources[name]
+        interval = source.interval(self.level)
+        if interval is None or source.last_success is None:
+            return False
+        return self._clock() - source.last_success <= interval
+
+    def _next(self) -> Tuple[Optional[PollSource], float]:
+        chosen: Optional[PollSource] = None
+        chosen_due = 0.0
+        for source in self._sources.values():
+            due = source.due(self.level)
+            if due is not None and (chosen is None or due < chosen_due):
+                chosen, chosen_due = source, due
+        return chosen, chosen_due
+
+    async def run(self, stop: asyncio.Event) -> None:
+        """Poll until ``stop`` is set."""
+
+        while not stop.is_set():
+            self._wake.clear()
+            level = self._demand()
+            if level != self.level:
+                logger.debug("Poll demand %s -> %s", self.level, level)
+                self.level = level
+                self.level_changes += 1
+            source, due = self._next()
+            now = self._clock()
+            if source is None or due > now:
+                await self._sleep(stop, None if source is None else due - now)
+                continue
+            source.last_started = now
+            try:
+                ok = await source.poll()
+            except Exception:  # pragma: no cover - sources handle their own errors
+                logger.exception("Poll source %s failed", source.name)
+                ok = False
+            source.runs += 1
+            source.last_finished = self._clock()
+            source.last_duration = source.last_finished - now
+            if ok:
+                source.last_success = source.last_finished
+            else:
+                source.failures += 1
+
+    async def _sleep(self, stop: asyncio.Event, timeout: Optional[float]) -> None:
+        waiters: List[asyncio.Future[Any]] = [
+            asyncio.ensure_future(stop.wait()),
+            asyncio.ensure_future(self._wake.wait()),
+        ]
+        try:
+            await asyncio.wait(waiters, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for waiter in waiters:
+                waiter.cancel()
+
+    def snapshot(self) -> Dict[str, Any]:
+        now = self._clock()
+        return {
+            "level": self.level,
+            "level_changes": self.level_changes,
+            "sources": {
+                name: {
+                    "interval_s": source.interval(self.level),
+                    "runs": source.runs,
+                    "failures": source.failures,
+                    "last_ms": None if source.last_duration is None else source.last_duration * 1000.0,
+                    "age_s": None if source.last_success is None else now - source.last_success,
+                }
+                for name, source in self._sources.items()
+            },
+        }
+
+
+__all__ = [
+    "DEFAULT_IDLE_INTERVAL",
+    "DEFAULT_LIVE_INTERVAL",
+    "DEFAULT_MOTION_HOLD",
+    "POLL_IDLE",
+    "POLL_LEVELS",
+    "POLL_LIVE",
+    "POLL_WATCHED",
+    "PollScheduler",
+    "PollSource",
+]
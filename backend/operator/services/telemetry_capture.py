@@ -0,0 +1,228 @@
+"""Burst telemetry capture: pipelined status polling into a columnar buffer.
+
+Regular polling samples ``status`` at most a few times per second, while the ESP32
+refreshes the UNO registers every 20–50 ms. A capture polls ``status`` (``STATUS BIN``
+on the UART) back to back in pipelined groups for a few seconds, or paced at a
+requested rate, and stores the samples in preallocated ``array`` columns: host time
+aligned to the device clock, the device ``uptime_ms`` and one column per field.
+
+Results download as NDJSON (a header object, then one array per sample) or as a
+binary file::
+
+    b"OPTC" | version u8 | 3 reserved bytes | header length u32 | header JSON
+    | t f64[count] | uptime_ms u32[count] | <field> f64[count] ...
+
+Everything is little-endian; a missing value is ``null`` in NDJSON and NaN in binary.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import math
+import struct
+import sys
+import time
+from array import array
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Sequence
+
+from ..esp32_link import DEFAULT_PIPELINE_DEPTH, CommandResult, SerialNotFoundError
+from ..status_frame import IP, STATUS_FIELDS, TEXT
+
+# Numeric status fields a capture can record; uptime_ms is always recorded.
+CAPTURE_FIELDS = tuple(
+    name for name, kind, _ in STATUS_FIELDS if kind not in (TEXT, IP) and name != "uptime_ms"
+)
+MAX_CAPTURE_DURATION = 30.0  # seconds
+MAX_CAPTURE_RATE = 200.0  # samples per second; also sizes the buffer of an unpaced capture
+CAPTURE_MAGIC = b"OPTC"
+CAPTURE_VERSION = 1
+_PREAMBLE = struct.Struct("<4sB3xI")
+
+
+class CaptureError(ValueError):
+    """Capture parameters are invalid."""
+
+
+class CaptureBusyError(RuntimeError):
+    """Another capture is still running."""
+
+
+def _little_endian(column: array) -> bytes:
+    if sys.byteorder == "big":  # pragma: no cover - depends on the host
+        column = array(column.typecode, column)
+        column.byteswap()
+    return column.tobytes()
+
+
+class CaptureBuffer:
+    """Preallocated columns for up to ``capacity`` samples."""
+
+    def __init__(self, fields: Sequence[str], capacity: int) -> None:
+        self.fields = tuple(fields)
+        self.capacity = max(1, int(capacity))
+        self.count = 0
+        self.time = array("d", bytes(8 * self.capacity))
+        self.uptime = array("I", bytes(4 * self.capacity))
+        self.columns: Dict[str, array] = {name: array("d", bytes(8 * self.capacity)) for name in self.fields}
+
+    @property
+    def full(self) -> bool:
+        return self.count >= self.capacity
+
+    def append(self, timestamp: float, uptime_ms: Optional[int], data: Dict[str, Any]) -> bool:
+        if self.full:
+            return False
+        index = self.count
+        self.time[index] = timestamp
+        self.uptime[index] = uptime_ms if isinstance(uptime_ms, int) and uptime_ms >= 0 else 0
+        for name, column in self.columns.items():
+            value = data.get(name)
+            column[index] = float(value) if isinstance(value, (int, float)) else math.nan
+        self.count += 1
+        return True
+
+    def rows(self) -> Iterator[List[Any]]:
+        columns = [self.columns[name] for name in self.fields]
+        for index in range(self.count):
+            row: List[Any] = [round(self.time[index], 6), self.uptime[index]]
+            for column in columns:
+                value = column[index]
+                row.append(None if math.isnan(value) else (int(value) if value.is_integer() else value))
+            yield row
+
+
+class TelemetryCapture:
+    """A finished capture: the buffer plus what the download header reports."""
+
+    def __init__(self, buffer: CaptureBuffer, meta: Dict[str, Any]) -> None:
+        self.buffer = buffer
+        self.meta = meta
+
+    def header(self) -> Dict[str, Any]:
+        return {
+            **self.meta,
+            "count": self.buffer.count,
+            "columns": ["t", "uptime_ms", *self.buffer.fields],
+        }
+
+    def iter_ndjson(self) -> Iterator[str]:
+        yield json.dumps(self.header()) + "\n"
+        for row in self.buffer.rows():
+            yield json.dumps(row, separators=(",", ":")) + "\n"
+
+    def to_binary(self) -> bytes:
+        header = json.dumps(self.header(), separators=(",", ":")).encode("utf-8")
+        count = self.buffer.count
+        parts = [
+            _PREAMBLE.pack(CAPTURE_MAGIC, CAPTURE_VERSION, len(header)),
+            header,
+            _little_endian(self.buffer.time[:count]),
+            _little_endian(self.buffer.uptime[:count]),
+        ]
+        parts.extend(_little_endian(self.buffer.columns[name][:count]) for name in self.buffer.fields)
+        return b"".join(parts)
+
+
+def validate_capture(
+    duration: float, rate: Optional[float], fields: Optional[Sequence[str]]
+) -> Sequence[str]:
+    """Check capture parameters; returns the fields to record."""
+
+    if not 0 < duration <= MAX_CAPTURE_DURATION:
+        raise CaptureError(f"duration must be in (0, {MAX_CAPTURE_DURATION:g}] seconds")
+    if rate is not None and not 0 < rate <= MAX_CAPTURE_RATE:
+        raise CaptureError(f"rate must be in (0, {MAX_CAPTURE_RATE:g}] samples per second")
+    if not fields:
+        return CAPTURE_FIELDS
+    unknown = [name for name in fields if name not in CAPTURE_FIELDS]
+    if unknown:
+        raise CaptureError(f"unknown telemetry fields: {', '.join(unknown)}")
+    return list(dict.fromkeys(fields))
+
+
+async def run_capture(
+    buffer: CaptureBuffer,
+    *,
+    poll: Callable[[int], Awaitable[List[CommandResult]]],
+    to_host: Callable[[Optional[int]], Optional[float]],
+    duration: float,
+    rate: Optional[float] = None,
+    depth: int = DEFAULT_PIPELINE_DEPTH,
+    on_sample: Optional[Callable[[CommandResult], None]] = None,
+    clock: Callable[[], float] = time.monotonic,
+) -> Dict[str, Any]:
+    """Fill ``buffer`` for ``duration`` seconds; returns capture statistics.
+
+    ``poll(n)`` runs ``n`` status queries, pipelined where the link allows. Without a
+    ``rate`` every call asks for ``depth`` samples; with one, samples are due on a
+    fixed grid and a call takes every sample that is due, up to ``depth``.
+    """
+
+    period = None if rate is None else 1.0 / rate
+    started = clock()
+    deadline = started + duration
+    requested = missed = 0
+    error: Optional[str] = None
+    device_aligned = True
+    while not buffer.full and clock() < deadline:
+        if period is None:
+            wanted = depth
+        else:
+            due = started + requested * period
+            delay = due - clock()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            lagging = int((clock() - started) / period) - requested + 1
+            wanted = max(1, min(depth, lagging))
+        wanted = min(wanted, buffer.capacity - buffer.count)
+        try:
+            results = await poll(wanted)
+        except SerialNotFoundError as exc:
+            error = str(exc)
+            break
+        requested += wanted
+        for result in results:
+            uptime = result.data.get("uptime_ms") if result.raw else None
+            if not isinstance(uptime, int):
+                missed += 1
+                continue
+            timestamp = to_host(uptime)
+            if timestamp is None:
+                device_aligned = False
+                timestamp = result.received_at() or time.time()
+            buffer.append(timestamp, uptime, result.data)
+            if on_sample is not None:
+                on_sample(result)
+    elapsed = clock() - started
+
+    spacing = sorted(
+        buffer.uptime[index] - buffer.uptime[index - 1]
+        for index in range(1, buffer.count)
+        if buffer.uptime[index] >= buffer.uptime[index - 1]
+    )
+    return {
+        "duration_s": elapsed,
+        "requested_rate_hz": rate,
+        "rate_hz": buffer.count / elapsed if elapsed > 0 else None,
+        "samples": buffer.count,
+        "missed": missed,
+        "device_aligned": device_aligned,
+        "spacing_ms_p50": spacing[len(spacing) // 2] if spacing else None,
+        "spacing_ms_max": spacing[-1] if spacing else None,
+        "error": error,
+    }
+
+
+__all__ = [
+    "CAPTURE_FIELDS",
+    "CAPTURE_MAGIC",
+    "CAPTURE_VERSION",
+    "MAX_CAPTURE_DURATION",
+    "MAX_CAPTURE_RATE",
+    "CaptureBuffer",
+    "CaptureBusyError",
+    "CaptureError",
+    "TelemetryCapture",
+    "run_capture",
+    "validate_capture",
+]
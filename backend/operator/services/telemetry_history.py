@@ -0,0 +1,373 @@
+"""Telemetry history with rollups and downsampling for charts.
+
+Every status sample is folded into a raw ring and three rollup tiers (1 s, 10 s and
+1 min buckets) as it arrives, so a chart request never scans more than the tier that
+fits it. Each tier keeps preallocated float64 ``array`` columns: bucket start, sample
+count, and per field the mean and both extremes in the order they happened, so the
+common queries are slices of stored columns rather than per-point Python loops.
+
+A query picks the finest tier that covers the window and downsamples it:
+
+* ``lttb`` — the tier must hold at most ``points`` buckets, which are returned as they
+  are (raw values or bucket means). Largest-Triangle-Three-Buckets runs only when even
+  the coarsest tier holds more; it is a per-point loop and costs milliseconds.
+* ``minmax`` — the tier may hold up to ``MINMAX_FACTOR × points`` buckets; groups of
+  consecutive buckets are reduced to their minimum and maximum, so spikes survive
+  (up to ``2 × points`` values). Within a bucket the extremes keep the order they
+  happened in; within a merged group, narrower than a pixel column, they follow the
+  group's trend.
+"""
+from __future__ import annotations
+
+import math
+import operator
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import compress
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .telemetry_capture import CAPTURE_FIELDS
+
+HISTORY_FIELDS = CAPTURE_FIELDS
+HISTORY_METHODS = ("lttb", "minmax")
+RAW_CAPACITY = 4096  # samples; about 14 min at the live poll rate
+# (name, bucket width in seconds, buckets kept)
+ROLLUP_TIERS: Tuple[Tuple[str, float, int], ...] = (
+    ("1s", 1.0, 2 * 3600),
+    ("10s", 10.0, 24 * 360),
+    ("1m", 60.0, 3 * 24 * 60),
+)
+MINMAX_FACTOR = 2  # min/max reduces up to this many stored points per output column
+MAX_HISTORY_POINTS = 5000
+
+
+class HistoryError(ValueError):
+    """A history query is invalid."""
+
+
+class _Ring:
+    """Chronological view over a ring of bucket start times, for ``bisect``."""
+
+    def __init__(self, time: array, size: int, first: int) -> None:
+        self._time = time
+        self._size = size
+        self._first = first
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, index: int) -> float:
+        return self._time[(self._first + index) % len(self._time)]
+
+
+def _floats(count: int, value: float = math.nan) -> array:
+    return array("d", [value]) * count
+
+
+class _RawTier:
+    name = "raw"
+    width: Optional[float] = None
+
+    def __init__(self, fields: Sequence[str], capacity: int) -> None:
+        self.capacity = capacity
+        self.size = 0
+        self.next = 0
+        self.time = _floats(capacity, 0.0)
+        self.values = {name: _floats(capacity) for name in fields}
+        # A raw sample is its own mean and both of its extremes, taken at its own time.
+        self.mid = self.time
+        self.mean = self.first = self.second = self.values
+
+    @property
+    def offset(self) -> int:
+        return (self.next - self.size) % self.capacity
+
+    def ingest(self, timestamp: float, data: Dict[str, Any]) -> None:
+        slot = self.next
+        self.time[slot] = timestamp
+        for name, column in self.values.items():
+            value = data.get(name)
+            column[slot] = value if isinstance(value, (int, float)) and not isinstance(value, bool) else math.nan
+        self.next = (slot + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def ring(self) -> _Ring:
+        return _Ring(self.time, self.size, self.offset)
+
+
+class _RollupTier:
+    """Buckets of ``width`` seconds.
+
+    Per field a bucket stores its mean and its two extremes in the order they happened
+    (``first``/``second``); the earlier extreme is drawn at the bucket start, the later
+    one at ``mid``.
+    """
+
+    def __init__(self, name: str, width: float, fields: Sequence[str], capacity: int) -> None:
+        self.name = name
+        self.width = width
+        self.capacity = capacity
+        self.size = 0
+        self.slot = -1
+        self.time = _floats(capacity, 0.0)
+        self.mid = _floats(capacity, 0.0)
+        self.count = array("I", bytes(4 * capacity))
+        self.mean = {name: _floats(capacity) for name in fields}
+        self.first = {name: _floats(capacity) for name in fields}
+        self.second = {name: _floats(capacity) for name in fields}
+        # Open bucket per field: samples seen, low, high, whether the high came first.
+        self._open: Dict[str, List[Any]] = {}
+
+    def ingest(self, timestamp: float, data: Dict[str, Any]) -> None:
+        start = math.floor(timestamp / self.width) * self.width
+        slot = self.slot
+        if slot < 0 or start > self.time[slot]:
+            slot = self.slot = (slot + 1) % self.capacity
+            self.size = min(self.size + 1, self.capacity)
+            self.time[slot] = start
+            self.mid[slot] = start + self.width / 2
+            self.count[slot] = 0
+            for name in self.mean:
+                self.mean[name][slot] = self.first[name][slot] = self.second[name][slot] = math.nan
+            self._open.clear()
+        # A late sample from an earlier bucket is folded into the open one.
+        self.count[slot] += 1
+        for name, mean in self.mean.items():
+            value = data.get(name)
+            if not isinstance(value, (int, float)) or isinstance(value, bool):
+                continue
+            state = self._open.get(name)
+            if state is None:
+                self._open[name] = [1, value, value, False]
+                mean[slot] = self.first[name][slot] = self.second[name][slot] = value
+                continue
+            state[0] += 1
+            mean[slot] += (value - mean[slot]) / state[0]
+            if value < state[1]:
+                state[1], state[3] = value, True
+            elif value > state[2]:
+                state[2], state[3] = value, False
+            else:
+                continue
+            low, high, high_first = state[1], state[2], state[3]
+            self.first[name][slot], self.second[name][slot] = (high, low) if high_first else (low, high)
+
+    @property
+    def offset(self) -> int:
+        return (self.slot - self.size + 1) % self.capacity
+
+    def ring(self) -> _Ring:
+        return _Ring(self.time, self.size, self.offset)
+
+
+def lttb(xs: Sequence[float], ys: Sequence[float], threshold: int) -> List[int]:
+    """Indices of the points Largest-Triangle-Three-Buckets keeps."""
+
+    count = len(xs)
+    if threshold >= count or count <= 2:
+        return list(range(count))
+    if threshold < 3:
+        return [0, count - 1][:max(threshold, 1)]
+    every = (count - 2) / (threshold - 2)
+    kept = [0]
+    anchor = 0
+    for bucket in range(threshold - 2):
+        start = int(bucket * every) + 1
+        end = int((bucket + 1) * every) + 1
+        next_end = min(int((bucket + 2) * every) + 1, count)
+        span = next_end - end
+        avg_x = sum(xs[end:next_end]) / span
+        avg_y = sum(ys[end:next_end]) / span
+        ax, ay = xs[anchor], ys[anchor]
+        dx, dy = ax - avg_x, avg_y - ay
+        best, best_area = start, -1.0
+        for index in range(start, end):
+            area = abs(dx * (ys[index] - ay) - (ax - xs[index]) * dy)
+            if area > best_area:
+                best, best_area = index, area
+        kept.append(best)
+        anchor = best
+    kept.append(count - 1)
+    return kept
+
+
+class TelemetryHistory:
+    """Raw ring plus rollup tiers, updated on every ingested status sample."""
+
+    def __init__(
+        self,
+        fields: Sequence[str] = HISTORY_FIELDS,
+        *,
+        raw_capacity: int = RAW_CAPACITY,
+        tiers: Sequence[Tuple[str, float, int]] = ROLLUP_TIERS,
+    ) -> None:
+        self.fields = tuple(fields)
+        self._raw = _RawTier(self.fields, raw_capacity)
+        self._rollups = [_RollupTier(name, width, self.fields, capacity) for name, width, capacity in tiers]
+        self.latest: Optional[float] = None
+        self.ingested = 0
+
+    def ingest(self, timestamp: float, data: Dict[str, Any]) -> None:
+        self._raw.ingest(timestamp, data)
+        for tier in self._rollups:
+            tier.ingest(timestamp, data)
+        self.latest = timestamp if self.latest is None else max(self.latest, timestamp)
+        self.ingested += 1
+
+    def query(
+        self,
+        fields: Optional[Sequence[str]],
+        *,
+        window: float,
+        points: int,
+        method: str = "lttb",
+        end: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """Downsample the last ``window`` seconds (up to ``end``) to about ``points``."""
+
+        chosen = list(dict.fromkeys(fields)) if fields else list(self.fields)
+        unknown = [name for name in chosen if name not in self.fields]
+        if unknown:
+            raise HistoryError(f"unknown telemetry fields: {', '.join(unknown)}")
+        if method not in HISTORY_METHODS:
+            raise HistoryError(f"method must be one of {', '.join(HISTORY_METHODS)}")
+        if window <= 0 or not 2 <= points <= MAX_HISTORY_POINTS:
+            raise HistoryError(f"window must be positive and points in [2, {MAX_HISTORY_POINTS}]")
+
+        stop = end if end is not None else (self.latest or 0.0)
+        start = stop - window
+        limit = points * MINMAX_FACTOR if method == "minmax" else points
+        tier, first, last = self._pick_tier(start, stop, limit)
+        xs = _window(tier.time, tier.offset, first, last)
+        mids = xs if tier.mid is tier.time else _window(tier.mid, tier.offset, first, last)
+        series = {name: _downsample(tier, name, xs, mids, first, last, points, method) for name in chosen}
+        return {
+            "tier": tier.name,
+            "bucket_s": tier.width,
+            "method": method,
+            "start": start,
+            "end": stop,
+            "series": series,
+        }
+
+    def _pick_tier(self, start: float, stop: float, limit: int) -> Tuple[Any, int, int]:
+        # Too many points everywhere: the coarsest tier, which also reaches furthest back.
+        candidate: Tuple[Any, int, int] = (self._raw, 0, 0)
+        for tier in [self._raw, *self._rollups]:
+            ring = tier.ring()
+            first = bisect_left(ring, start if tier is self._raw else start - tier.width)
+            last = bisect_right(ring, stop)
+            candidate = (tier, first, last)
+            covers = tier.size < tier.capacity or (len(ring) and ring[0] <= start)
+            if covers and last - first <= limit:
+                break
+        return candidate
+
+
+def _window(column: array, offset: int, first: int, last: int) -> List[float]:
+    """Entries ``first:last`` of a ring column in chronological order."""
+
+    size = len(column)
+    begin, end = (offset + first) % size, (offset + last) % size
+    if first >= last:
+        return []
+    if begin < end:
+        return column[begin:end].tolist()
+    return column[begin:].tolist() + column[:end].tolist()
+
+
+def _downsample(
+    tier: Any,
+    name: str,
+    xs: List[float],
+    mids: List[float],
+    first: int,
+    last: int,
+    points: int,
+    method: str,
+) -> Dict[str, List[float]]:
+    offset = tier.offset
+    means = _window(tier.mean[name], offset, first, last)
+    missing = sum(map(math.isnan, means))
+    if missing == len(means):
+        return {"t": [], "v": []}
+    keep = list(map(operator.not_, map(math.isnan, means))) if missing else None
+
+    def values(column: List[float]) -> List[float]:
+        return column if keep is None else list(compress(column, keep))
+
+    if method == "lttb":
+        times, ys = values(xs), values(means)
+        if len(ys) <= points:
+            return {"t": times, "v": ys}
+        chosen = lttb(times, ys, points)
+        return {"t": [times[index] for index in chosen], "v": [ys[index] for index in chosen]}
+    if tier.width is None:
+        times, ys = values(xs), values(means)
+        return _minmax(times, times, ys, ys, points)
+    firsts = means if tier.first is tier.mean else _window(tier.first[name], offset, first, last)
+    seconds = _window(tier.second[name], offset, first, last)
+    return _minmax(values(xs), values(mids), values(firsts), values(seconds), points)
+
+
+def _interleave(evens: List[float], odds: List[float]) -> List[float]:
+    out: List[float] = [0.0] * (2 * len(evens))
+    out[0::2] = evens
+    out[1::2] = odds
+    return out
+
+
+def _minmax(
+    xs: List[float],
+    mids: List[float],
+    firsts: List[float],
+    seconds: List[float],
+    points: int,
+) -> Dict[str, List[float]]:
+    """Minimum and maximum of groups of consecutive points.
+
+    ``firsts``/``seconds`` are each source point's extremes in time order, taken at
+    ``xs`` and ``mids``; raw samples pass the same list for both. Groups hold
+    ``ceil(len / points)`` points and are reduced with ``map`` over strided slices of
+    the stored columns, never point by point.
+    """
+
+    raw = firsts is seconds
+    group = -(-len(xs) // points)
+    if group <= 1:
+        # At most one source point per column: the stored extremes already are the answer.
+        if raw:
+            return {"t": xs, "v": firsts}
+        return {"t": _interleave(xs, mids), "v": _interleave(firsts, seconds)}
+
+    pad = -len(xs) % group
+    if pad:
+        xs, mids = xs + [xs[-1]] * pad, mids + [mids[-1]] * pad
+        firsts, seconds = firsts + [firsts[-1]] * pad, seconds + [seconds[-1]] * pad
+    columns = [firsts[k::group] for k in range(group)]
+    if not raw:
+        columns += [seconds[k::group] for k in range(group)]
+    lows = list(map(min, *columns))
+    highs = list(map(max, *columns))
+    # A group is at most one pixel column wide; its extremes follow the group's trend.
+    rising = list(map(operator.lt, firsts[0::group], seconds[group - 1::group]))
+    pick = operator.getitem
+    return {
+        "t": _interleave(xs[0::group], mids[group - 1::group]),
+        "v": _interleave(
+            list(map(pick, zip(highs, lows), rising)),
+            list(map(pick, zip(lows, highs), rising)),
+        ),
+    }
+
+
+__all__ = [
+    "HISTORY_FIELDS",
+    "HISTORY_METHODS",
+    "MAX_HISTORY_POINTS",
+    "RAW_CAPACITY",
+    "ROLLUP_TIERS",
+    "HistoryError",
+    "TelemetryHistory",
+    "lttb",
+]
@@ -0,0 +1,277 @@
+"""Latest-wins teleoperation: coalesced actuator setpoints sent at a fixed rate.
+
+A gamepad produces setpoints faster than a lagging link can execute them. Instead of
+queueing every ``CTRL`` command, :class:`TeleopController` keeps only the newest
+setpoint per actuator and sends whatever is pending once per tick; a setpoint replaced
+before its tick is dropped. When client frames stop for longer than the deadman
+interval while motion is armed, ``BRAKE`` is sent and pending setpoints are discarded,
+including a batch still queued for the link: ``BRAKE`` overtakes it in the scheduler,
+so it is cancelled rather than allowed to run after the brake.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+from ..esp32_link import LOG_LINE_RE, CommandResult, SerialNotFoundError
+from ..link_scheduler import CommandDropped
+
+logger = logging.getLogger(__name__)
+
+TELEOP_ACTUATORS: Dict[str, Tuple[str, ...]] = {
+    "drive": ("vx", "vy", "w", "t"),
+    "elev": ("h", "speed", "mode"),
+    "grip": ("cmd", "deg"),
+}
+DEFAULT_TELEOP_RATE = 20.0  # setpoint ticks per second
+DEFAULT_DEADMAN_TIMEOUT = 0.5  # seconds without a client frame before BRAKE
+ACK_WINDOW = 256
+
+
+def teleop_command(actuator: str, params: Any) -> str:
+    """Build the ``CTRL`` command for one actuator setpoint; raises ``ValueError``."""
+
+    allowed = TELEOP_ACTUATORS.get(actuator)
+    if allowed is None:
+        raise ValueError(f"unknown actuator {actuator!r}")
+    if not isinstance(params, dict) or not params:
+        raise ValueError(f"{actuator} setpoint must be a non-empty object")
+    parts = [f"CTRL {actuator.upper()}"]
+    for key, value in params.items():
+        if key not in allowed:
+            raise ValueError(f"unknown {actuator} parameter {key!r}")
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ValueError(f"{actuator}.{key} must be a number")
+        parts.append(f"{key}={int(value)}")
+    return " ".join(parts)
+
+
+def _ack_time(result: CommandResult) -> Optional[float]:
+    for line, arrived in zip(result.raw, result.line_times or []):
+        if not LOG_LINE_RE.match(line):
+            return arrived
+    return None
+
+
+def _acknowledged(actuator: str, result: CommandResult) -> bool:
+    prefix = f"ctrl_{actuator}=ok"
+    return any(line.lower().startswith(prefix) for line in result.raw)
+
+
+class TeleopStats:
+    """Service-wide counters and setpoint-to-ack latencies across teleop sessions."""
+
+    def __init__(self, window: int = ACK_WINDOW) -> None:
+        self.sent = 0
+        self.superseded = 0
+        self.rejected = 0
+        self.deadman_brakes = 0
+        self._latencies: Deque[float] = deque(maxlen=max(1, window))
+
+    def observe_ack(self, latency: float) -> None:
+        self._latencies.append(latency)
+
+    def snapshot(self) -> Dict[str, Any]:
+        ordered = sorted(self._latencies)
+
+        def pct(value: float) -> Optional[float]:
+            if not ordered:
+                return None
+            return ordered[min(len(ordered) - 1, int(value * len(ordered)))] * 1000.0
+
+        return {
+            "sent": self.sent,
+            "superseded": self.superseded,
+            "rejected": self.rejected,
+            "deadman_brakes": self.deadman_brakes,
+            "ack_ms_p50": pct(0.5),
+            "ack_ms_p95": pct(0.95),
+            "ack_ms_max": ordered[-1] * 1000.0 if ordered else None,
+        }
+
+
+class TeleopController:
+    """One client's teleop session.
+
+    ``send`` runs a list of commands in order (pipelined where the link allows) and
+    drops those not yet sent once its event is set; ``brake`` sends ``BRAKE``; ``emit`` delivers messages to the client. Client frames
+    look like ``{"seq": 7, "drive": {"vx": 200, "w": 0, "t": 300}}``; any frame, even
+    one without setpoints, feeds the deadman, and ``{"brake": true}`` brakes at once.
+    """
+
+    def __init__(
+        self,
+        *,
+        send: Callable[[Sequence[str], threading.Event], Awaitable[List[CommandResult]]],
+        brake: Callable[[], Awaitable[CommandResult]],
+        emit: Callable[[Dict[str, Any]], None],
+        stats: TeleopStats,
+        rate: float = DEFAULT_TELEOP_RATE,
+        deadman: float = DEFAULT_DEADMAN_TIMEOUT,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._send = send
+        self._brake = brake
+        self._emit = emit
+        self._stats = stats
+        self._period = 1.0 / max(rate, 0.1)
+        self._deadman = max(deadman, self._period)
+        self._clock = clock
+        # actuator -> (seq, command, received_at wall time)
+        self._pending: Dict[str, Tuple[Any, str, float]] = {}
+        self._last_frame = clock()
+        self._armed = False
+        self._brake_task: Optional[asyncio.Task[None]] = None
+        # Set to drop the batch in flight when a brake makes it stale.
+        self._in_flight: Optional[threading.Event] = None
+
+    # ------------------------------------------------------------------
+    def handle_frame(self, text: str) -> None:
+        self._last_frame = self._clock()
+        try:
+            frame = json.loads(text)
+        except ValueError:
+            frame = None
+        if not isinstance(frame, dict):
+            self._reject(None, "frame must be a JSON object")
+            return
+        seq = frame.get("seq")
+        if frame.get("brake"):
+            self._pending.clear()
+            self._armed = False
+            self._cancel_in_flight()
+            self._brake_task = asyncio.create_task(self._send_brake("client"))
+            return
+        setpoints: Dict[str, str] = {}
+        for actuator in TELEOP_ACTUATORS:
+            if actuator not in frame:
+                continue
+            try:
+                setpoints[actuator] = teleop_command(actuator, frame[actuator])
+            except ValueError as exc:
+                self._reject(seq, str(exc))
+                return
+        received_at = time.time()
+        for actuator, command in setpoints.items():
+            if actuator in self._pending:
+                self._stats.superseded += 1
+            self._pending[actuator] = (seq, command, received_at)
+        if setpoints:
+            self._armed = True
+
+    def _reject(self, seq: Any, error: str) -> None:
+        self._stats.rejected += 1
+        self._emit({"type": "error", "seq": seq, "error": error})
+
+    # ------------------------------------------------------------------
+    async def run(self) -> None:
+        """Send pending setpoints once per tick until cancelled."""
+
+        next_tick = self._clock()
+        while True:
+            if self._deadman_expired():
+                await self._deadman_brake()
+            elif self._pending:
+                await self._flush_guarded()
+            # A tick that overran its period starts the next one right away with
+            # whatever setpoints are newest by then.
+            next_tick = max(next_tick + self._period, self._clock())
+            await asyncio.sleep(max(0.0, next_tick - self._clock()))
+
+    def _deadman_expired(self) -> bool:
+        return self._armed and self._clock() - self._last_frame > self._deadman
+
+    async def _deadman_brake(self) -> None:
+        self._pending.clear()
+        self._armed = False
+        self._cancel_in_flight()
+        self._stats.deadman_brakes += 1
+        await self._send_brake("deadman")
+
+    def _cancel_in_flight(self) -> None:
+        if self._in_flight is not None:
+            self._in_flight.set()
+
+    async def _flush_guarded(self) -> None:
+        """Flush, braking as soon as the deadman expires even if the link stalls.
+
+        The flush waits for at most the remaining deadman budget at a time, so a slow
+        link cannot hold the brake back until the flush returns. The brake sets the
+        batch's event, so a batch still queued for the link is dropped, not run after it.
+        """
+
+        batch = list(self._pending.items())
+        self._pending.clear()
+        cancelled = self._in_flight = threading.Event()
+        flush = asyncio.create_task(self._flush(batch, cancelled))
+        try:
+            while not flush.done():
+                if self._deadman_expired():
+                    await self._deadman_brake()
+                    continue
+                budget = self._last_frame + self._deadman - self._clock() if self._armed else self._deadman
+                await asyncio.wait({flush}, timeout=max(0.0, budget))
+        except asyncio.CancelledError:
+            flush.cancel()
+            raise
+        flush.result()
+
+    async def close(self) -> None:
+        """Brake if the client left while motion was armed."""
+
+        self._pending.clear()
+        # The ticker is cancelled by now, but its worker thread may still be queued.
+        self._cancel_in_flight()
+        if self._armed:
+            self._armed = False
+            self._stats.deadman_brakes += 1
+            await self._send_brake("disconnect")
+
+    async def _flush(self, batch: List[Tuple[str, Tuple[Any, str, float]]], cancelled: threading.Event) -> None:
+        try:
+            results = await self._send([command for _, (_, command, _) in batch], cancelled)
+        except (SerialNotFoundError, CommandDropped) as exc:
+            for actuator, (seq, _, _) in batch:
+                self._emit({"type": "ack", "actuator": actuator, "seq": seq, "ok": False, "error": str(exc)})
+            return
+        self._stats.sent += len(batch)
+        for (actuator, (seq, _, received_at)), result in zip(batch, results):
+            acked_at = _ack_time(result)
+            latency = None if acked_at is None else max(0.0, acked_at - received_at)
+            if latency is not None:
+                self._stats.observe_ack(latency)
+            self._emit(
+                {
+                    "type": "ack",
+                    "actuator": actuator,
+                    "seq": seq,
+                    "ok": _acknowledged(actuator, result),
+                    "latency_ms": None if latency is None else latency * 1000.0,
+                    "reply": result.raw,
+                }
+            )
+
+    async def _send_brake(self, reason: str) -> None:
+        try:
+            result = await self._brake()
+        except SerialNotFoundError as exc:
+            logger.warning("Teleop %s brake failed: %s", reason, exc)
+            self._emit({"type": "brake", "reason": reason, "ok": False, "error": str(exc)})
+            return
+        ok = any(line.upper().startswith("BRAKE=OK") for line in result.raw)
+        self._emit({"type": "brake", "reason": reason, "ok": ok})
+
+
+__all__ = [
+    "DEFAULT_DEADMAN_TIMEOUT",
+    "DEFAULT_TELEOP_RATE",
+    "TELEOP_ACTUATORS",
+    "TeleopController",
+    "TeleopStats",
+    "teleop_command",
+]
@@ -0,0 +1,168 @@
+"""Per-transport circuit breaker with jittered exponential backoff."""
+from __future__ import annotations
+
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+BREAKER_CLOSED = "closed"
+BREAKER_OPEN = "open"
+BREAKER_HALF_OPEN = "half_open"
+
+ADMIT_REQUEST = "request"
+ADMIT_PROBE = "probe"
+
+DEFAULT_FAILURE_THRESHOLD = 1
+DEFAULT_SUCCESS_THRESHOLD = 1
+DEFAULT_BACKOFF_BASE = 1.0  # seconds before the first half-open probe
+DEFAULT_BACKOFF_MAX = 30.0
+DEFAULT_BACKOFF_JITTER = 0.2  # +/- fraction applied to every backoff
+
+
+class TransportBreaker:
+    """Closed / open / half-open state machine guarding one control transport.
+
+    * closed — traffic flows; ``failure_threshold`` consecutive failures trip it open;
+    * open — traffic is refused until the backoff expires, which doubles (with jitter)
+      after every failed probe up to ``backoff_max``;
+    * half-open — a single cheap probe is admitted at a time and
+      ``success_threshold`` consecutive successes close the breaker again.
+    """
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        success_threshold: int = DEFAULT_SUCCESS_THRESHOLD,
+        backoff_base: float = DEFAULT_BACKOFF_BASE,
+        backoff_max: float = DEFAULT_BACKOFF_MAX,
+        jitter: float = DEFAULT_BACKOFF_JITTER,
+        clock: Callable[[], float] = time.monotonic,
+        rng: Optional[random.Random] = None,
+    ) -> None:
+        self._failure_threshold = max(1, failure_threshold)
+        self._success_threshold = max(1, success_threshold)
+        self._backoff_base = max(0.0, backoff_base)
+        self._backoff_max = max(self._backoff_base, backoff_max)
+        self._jitter = min(max(0.0, jitter), 1.0)
+        self._clock = clock
+        self._rng = rng or random.Random()
+        self._lock = threading.Lock()
+        self._state = BREAKER_CLOSED
+        self._level = 0
+        self._backoff: Optional[float] = None
+        self._next_attempt = 0.0
+        self._probe_in_flight = False
+        self._consecutive_failures = 0
+        self._consecutive_successes = 0
+        self._counters: Dict[str, int] = {"failures": 0, "successes": 0, "probes": 0, "rejected": 0}
+        self._transitions: Dict[str, int] = {}
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def _move(self, state: str) -> None:
+        if state == self._state:
+            return
+        key = f"{self._state}->{state}"
+        self._transitions[key] = self._transitions.get(key, 0) + 1
+        self._state = state
+
+    def _open(self, now: float) -> None:
+        delay = min(self._backoff_max, self._backoff_base * (2 ** self._level))
+        if self._jitter:
+            delay *= 1.0 + self._rng.uniform(-self._jitter, self._jitter)
+        self._backoff = delay
+        self._next_attempt = now + delay
+        self._level += 1
+        self._consecutive_successes = 0
+        self._probe_in_flight = False
+        self._move(BREAKER_OPEN)
+
+    def admit(self) -> Optional[str]:
+        """Return ``"request"``, ``"probe"`` or ``None`` when the transport must be skipped."""
+
+        with self._lock:
+            if self._state == BREAKER_CLOSED:
+                return ADMIT_REQUEST
+            if self._probe_in_flight or (
+                self._state == BREAKER_OPEN and self._clock() < self._next_attempt
+            ):
+                self._counters["rejected"] += 1
+                return None
+            self._move(BREAKER_HALF_OPEN)
+            self._probe_in_flight = True
+            self._counters["probes"] += 1
+            return ADMIT_PROBE
+
+    def release(self) -> None:
+        """Give back a probe slot whose outcome was never recorded."""
+
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._counters["successes"] += 1
+            self._consecutive_failures = 0
+            self._probe_in_flight = False
+            if self._state == BREAKER_CLOSED:
+                return
+            self._consecutive_successes += 1
+            if self._consecutive_successes >= self._success_threshold:
+                self._level = 0
+                self._backoff = None
+                self._consecutive_successes = 0
+                self._move(BREAKER_CLOSED)
+            else:
+                self._move(BREAKER_HALF_OPEN)
+
+    def record_failure(self) -> bool:
+        """Count a failure; returns ``True`` when it tripped a closed breaker open."""
+
+        with self._lock:
+            self._counters["failures"] += 1
+            self._consecutive_failures += 1
+            now = self._clock()
+            if self._state == BREAKER_CLOSED:
+                if self._consecutive_failures < self._failure_threshold:
+                    return False
+                self._open(now)
+                return True
+            self._open(now)
+            return False
+
+    def expedite(self) -> None:
+        """Allow the next probe right away, e.g. after the endpoint was rediscovered."""
+
+        with self._lock:
+            if self._state == BREAKER_OPEN:
+                self._next_attempt = self._clock()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            retry_in = None
+            if self._state == BREAKER_OPEN:
+                retry_in = max(0.0, self._next_attempt - self._clock())
+            return {
+                "state": self._state,
+                "consecutive_failures": self._consecutive_failures,
+                "consecutive_successes": self._consecutive_successes,
+                "backoff": self._backoff,
+                "retry_in": retry_in,
+                **self._counters,
+                "transitions": dict(self._transitions),
+            }
+
+
+__all__ = [
+    "ADMIT_PROBE",
+    "ADMIT_REQUEST",
+    "BREAKER_CLOSED",
+    "BREAKER_HALF_OPEN",
+    "BREAKER_OPEN",
+    "TransportBreaker",
+]
@@ -0,0 +1,110 @@
+"""Hedge delays and win statistics for racing idempotent reads across transports."""
+from __future__ import annotations
+
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+# Commands that only read device state and are therefore safe to send twice.
+HEDGEABLE_COMMANDS = frozenset({"status", "status bin", "camcfg ?", "smap get"})
+
+DEFAULT_HEDGE_DELAY = 0.25  # seconds, until enough latency samples exist
+DEFAULT_HEDGE_MIN_DELAY = 0.05
+DEFAULT_HEDGE_MAX_DELAY = 1.0
+HEDGE_PERCENTILE = 0.95
+LATENCY_WINDOW = 64
+MIN_LATENCY_SAMPLES = 8
+
+
+def normalize_command(command: str) -> str:
+    return " ".join(command.lower().split())
+
+
+def is_hedgeable(command: str) -> bool:
+    return normalize_command(command) in HEDGEABLE_COMMANDS
+
+
+class TransportHedger:
+    """Track per-transport reply latencies and the outcome of hedged races.
+
+    The hedge delay for a transport/command pair is the p95 of its recent successful
+    replies, clamped to ``[min_delay, max_delay]``; until ``MIN_LATENCY_SAMPLES``
+    replies were seen ``default_delay`` is used.
+    """
+
+    def __init__(
+        self,
+        *,
+        default_delay: float = DEFAULT_HEDGE_DELAY,
+        min_delay: float = DEFAULT_HEDGE_MIN_DELAY,
+        max_delay: float = DEFAULT_HEDGE_MAX_DELAY,
+        window: int = LATENCY_WINDOW,
+    ) -> None:
+        self._default_delay = default_delay
+        self._min_delay = max(0.0, min_delay)
+        self._max_delay = max(self._min_delay, max_delay)
+        self._window = max(1, window)
+        self._lock = threading.Lock()
+        self._latencies: Dict[Tuple[str, str], Deque[float]] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def observe(self, transport: str, command: str, latency: float) -> None:
+        key = (transport, normalize_command(command))
+        with self._lock:
+            samples = self._latencies.get(key)
+            if samples is None:
+                samples = self._latencies[key] = deque(maxlen=self._window)
+            samples.append(latency)
+
+    def delay(self, transport: str, command: str) -> float:
+        with self._lock:
+            samples = sorted(self._latencies.get((transport, normalize_command(command)), ()))
+        if len(samples) < MIN_LATENCY_SAMPLES:
+            value = self._default_delay
+        else:
+            value = samples[min(len(samples) - 1, int(HEDGE_PERCENTILE * len(samples)))]
+        return min(self._max_delay, max(self._min_delay, value))
+
+    def _counters(self, transport: str) -> Dict[str, int]:
+        counters = self._stats.get(transport)
+        if counters is None:
+            counters = self._stats[transport] = {
+                "races": 0,
+                "wins": 0,
+                "hedges_sent": 0,
+                "hedge_wins": 0,
+                "cancelled": 0,
+            }
+        return counters
+
+    def record_hedge(self, primary: str, standby: str) -> None:
+        with self._lock:
+            self._counters(primary)["races"] += 1
+            self._counters(standby)["races"] += 1
+            self._counters(standby)["hedges_sent"] += 1
+
+    def record_win(self, winner: str, *, as_hedge: bool) -> None:
+        with self._lock:
+            counters = self._counters(winner)
+            counters["wins"] += 1
+            if as_hedge:
+                counters["hedge_wins"] += 1
+
+    def record_cancelled(self, transport: str) -> None:
+        with self._lock:
+            self._counters(transport)["cancelled"] += 1
+
+    def snapshot(self, transport: str) -> Dict[str, Any]:
+        with self._lock:
+            counters = dict(self._counters(transport))
+        races = counters["races"]
+        counters["win_rate"] = counters["wins"] / races if races else None
+        return counters
+
+
+__all__ = [
+    "HEDGEABLE_COMMANDS",
+    "TransportHedger",
+    "is_hedgeable",
+    "normalize_command",
+]
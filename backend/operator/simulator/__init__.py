@@ -0,0 +1,24 @@
+"""Firmware-faithful ESP32 simulator for development, tests and benchmarks.
+
+The simulator runs the ESP32 CLI model behind the same transports as the board: a
+pseudo-terminal for :class:`~backend.operator.esp32_link.ESP32Link`, ``/ws/cli`` for
+:class:`~backend.operator.esp32_ws_link.ESP32WSLink` and ``/camera/snapshot`` for the
+camera proxy. Start it with ``python -m backend.operator.simulator``.
+"""
+from __future__ import annotations
+
+from .firmware import CAMERA_RESOLUTIONS, SimulatedFirmware, SimulatorConfig
+from .jpeg import synthetic_jpeg
+from .runner import ESP32Simulator
+from .transports import CameraHttpServer, PtySerialServer, WebSocketCliServer
+
+__all__ = [
+    "CAMERA_RESOLUTIONS",
+    "CameraHttpServer",
+    "ESP32Simulator",
+    "PtySerialServer",
+    "SimulatedFirmware",
+    "SimulatorConfig",
+    "WebSocketCliServer",
+    "synthetic_jpeg",
+]
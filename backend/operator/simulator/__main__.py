@@ -0,0 +1,78 @@
+"""Command-line entry point: ``python -m backend.operator.simulator``."""
+from __future__ import annotations
+
+import sys
+import time
+from typing import Optional
+
+import typer  # type: ignore
+
+from .firmware import SimulatorConfig
+from .runner import ESP32Simulator
+
+app = typer.Typer(add_completion=False, help="Simulated RBM ESP32 controller")
+
+
+@app.command()
+def run_simulator(
+    host: str = typer.Option("127.0.0.1", help="Address for the WebSocket and HTTP servers"),
+    ws_port: int = typer.Option(8081, help="Port serving /ws/cli (firmware uses 81)"),
+    http_port: int = typer.Option(8080, help="Port serving /camera/snapshot (firmware uses 80)"),
+    baudrate: int = typer.Option(115200, help="UART pacing for the PTY console"),
+    no_uno: bool = typer.Option(False, "--no-uno", help="Simulate a missing UNO on the I2C bus"),
+    i2c_failure_rate: float = typer.Option(0.0, help="Probability that an I2C transfer fails"),
+    i2c_error_delay: float = typer.Option(0.05, help="Seconds lost per failed I2C transfer"),
+    i2c_retries: int = typer.Option(0, help="Retries per I2C transfer"),
+    i2c_retry_delay: float = typer.Option(0.005, help="Delay between I2C retries in seconds"),
+    contention_interval: float = typer.Option(0.0, help="Seconds between background CLI mutex holds"),
+    contention_hold: float = typer.Option(0.0, help="Seconds each background hold keeps the CLI mutex"),
+    jitter: float = typer.Option(0.0, help="Maximum random extra delay per command in seconds"),
+    seed: Optional[int] = typer.Option(None, help="Seed for reproducible failures and jitter"),
+) -> None:
+    """Start the simulator and print how to point the backend at it."""
+
+    config = SimulatorConfig(
+        baudrate=baudrate,
+        uno_present=not no_uno,
+        wifi_ip=host,
+        i2c_failure_rate=i2c_failure_rate,
+        i2c_error_delay_s=i2c_error_delay,
+        i2c_retries=i2c_retries,
+        i2c_retry_delay_s=i2c_retry_delay,
+        contention_interval_s=contention_interval,
+        contention_hold_s=contention_hold,
+        jitter_s=jitter,
+        seed=seed,
+    )
+    with ESP32Simulator(config, host=host, ws_port=ws_port, http_port=http_port) as sim:
+        typer.echo(f"serial:   {sim.serial_port}")
+        typer.echo(f"ws:       {sim.ws_url}")
+        typer.echo(f"snapshot: {sim.snapshot_url}")
+        typer.echo(
+            f"backend:  OPERATOR_SERIAL_PORT={sim.serial_port} OPERATOR_WIFI_WS_PORT={sim.ws_port} "
+            f"OPERATOR_CAMERA_SNAPSHOT_URL={sim.snapshot_url}"
+        )
+        try:
+            while True:
+                time.sleep(1.0)
+        except KeyboardInterrupt:
+            typer.echo("stopping")
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = argv if argv is not None else sys.argv[1:]
+    try:
+        app(prog_name="rbm-esp32-sim", args=args, standalone_mode=False)
+    except typer.Exit as exc:
+        return exc.exit_code
+    return 0
+
+
+def run() -> None:
+    """Entry point for console_scripts."""
+
+    sys.exit(main(sys.argv[1:]))
+
+
+if __name__ == "__main__":  # pragma: no cover - manual execution
+    run()
@@ -0,0 +1,1023 @@
+"""Behavioural model of the ESP32 firmware CLI used by the simulator transports.
+
+``SimulatedFirmware`` mirrors ``cli_execute_unlocked`` in
+``firmware/src/esp32/src/main.cpp`` command by command: the same reply lines, the same
+``log_line`` side effects (mirrored to the console), the same ``LOGS`` ring semantics
+and the same 2 s CLI mutex. Everything that talks to the UNO goes through
+:meth:`SimulatedFirmware._i2c_transfer`, which charges bus time for the bytes moved at
+the current I2C clock and can fail, time out and retry according to
+:class:`SimulatorConfig`. A small kinematic model of the chassis, elevator and gripper
+keeps ``STATUS``/``[TLM]`` values moving the way the real robot reports them.
+"""
+from __future__ import annotations
+
+import math
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from ..status_binary import format_status_binary_line
+from .jpeg import synthetic_jpeg
+
+LOG_CAPACITY = 256
+CLI_LOCK_TIMEOUT_S = 2.0
+SNAPSHOT_LOCK_TIMEOUT_S = 5.0
+TELEMETRY_LOG_INTERVAL_S = 0.5
+UNO_RECHECK_INTERVAL_S = 2.0
+
+I2C_ADDR_UNO = 0x12
+I2C_FREQ_DEFAULT = 100_000
+I2C_FREQ_FALLBACK = 50_000
+I2C_FREQ_MIN = 10_000
+I2C_FREQ_MAX = 1_000_000
+
+# (name, width, height) in framesize_t order, as listed by camera_http.
+CAMERA_RESOLUTIONS: Tuple[Tuple[str, int, int], ...] = (
+    ("QQVGA", 160, 120),
+    ("QVGA", 320, 240),
+    ("VGA", 640, 480),
+    ("SVGA", 800, 600),
+    ("XGA", 1024, 768),
+    ("SXGA", 1280, 1024),
+    ("UXGA", 1600, 1200),
+)
+_RESOLUTION_INDEX = {name: index for index, (name, _, _) in enumerate(CAMERA_RESOLUTIONS)}
+
+# Register block sizes read by cli_collect_status(), in STATUS order.
+_STATUS_BLOCKS: Tuple[Tuple[str, int, int], ...] = (
+    ("STATUS0", 0x00, 4),
+    ("STATUS1", 0x04, 4),
+    ("LINES", 0x08, 6),
+    ("POWER", 0x0E, 4),
+    ("DRIVEFB", 0x12, 8),
+    ("AUXFB", 0x1A, 4),
+    ("SENS", 0x1E, 4),
+    ("ODOM", 0x22, 8),
+)
+
+_SILENT_BLOCKS = frozenset({"DRIVEFB", "AUXFB"})
+
+_DRIVE_KEYS = {"VX": "VX", "VY": "VY", "W": "W", "OMEGA": "W", "T": "T", "TIME": "T", "MS": "T"}
+
+_SHELF_COLORS = {"R", "G", "B", "Y", "W", "K"}
+_SHELF_DEFAULT = [["K", "W", "Y"], ["G", "B", "R"], ["-", "-", "-"]]
+
+# Behaviour-tree states reported as STATUS0.state_id.
+ST_INIT = 0
+ST_PICK = 1
+
+
+@dataclass
+class SimulatorConfig:
+    """Knobs for the simulated robot; defaults match the production firmware."""
+
+    baudrate: int = 115200
+    uno_present: bool = True
+    wifi_connected: bool = True
+    wifi_ip: str = "127.0.0.1"
+    camera_max_resolution: str = "UXGA"
+    camera_capture_s: float = 0.04
+    # I2C bus timing: bytes are charged at the current clock; failed transfers cost
+    # ``i2c_error_delay_s`` (Wire timeout) and are retried ``i2c_retries`` times.
+    i2c_failure_rate: float = 0.0
+    i2c_error_delay_s: float = 0.05
+    i2c_retries: int = 0
+    i2c_retry_delay_s: float = 0.005
+    i2c_primary_hz: int = I2C_FREQ_DEFAULT
+    i2c_fallback_hz: int = I2C_FREQ_FALLBACK
+    # CLI mutex: background holders emulate the behaviour tree and the WS task
+    # grabbing the lock; ``cli_lock_timeout_s`` is the firmware's 2 s take timeout.
+    cli_lock_timeout_s: float = CLI_LOCK_TIMEOUT_S
+    contention_interval_s: float = 0.0
+    contention_hold_s: float = 0.0
+    # Uniform extra processing delay added to every command.
+    jitter_s: float = 0.0
+    heartbeat_interval_s: float = 2.0
+    log_capacity: int = LOG_CAPACITY
+    counts_per_mm: float = 5.0
+    track_mm: float = 160.0
+    seed: Optional[int] = None
+
+
+class _Reply(list):
+    """Reply lines, optionally streamed to the console as they are printed."""
+
+    def __init__(self, sink: Optional[Callable[[str], None]]) -> None:
+        super().__init__()
+        self._sink = sink
+
+    def append(self, line: str) -> None:
+        super().append(line)
+        if self._sink is not None:
+            self._sink(line + "\n")
+
+
+@dataclass
+class _Motion:
+    vx: float = 0.0
+    vy: float = 0.0
+    w: float = 0.0
+    until: float = 0.0
+
+
+class SimulatedFirmware:
+    """Thread-safe ESP32 CLI model shared by the PTY, WebSocket and HTTP front ends."""
+
+    def __init__(
+        self,
+        config: Optional[SimulatorConfig] = None,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.config = config or SimulatorConfig()
+        self._clock = clock
+        self._sleep = sleep
+        self._boot = clock()
+        self._random = random.Random(self.config.seed)
+
+        self._log_lock = threading.Lock()
+        self._logs: Deque[Tuple[int, int, str]] = deque(maxlen=max(1, self.config.log_capacity))
+        self._next_seq = 1
+        self._log_listeners: List[Callable[[str], None]] = []
+
+        self._cli_mutex = threading.Lock()
+        self._state_lock = threading.RLock()
+
+        self._uno_ready = False
+        self._i2c_ready = True
+        self._i2c_current_hz = self.config.i2c_primary_hz
+        self._i2c_primary_hz = self.config.i2c_primary_hz
+        self._i2c_fallback_hz = self.config.i2c_fallback_hz
+        self._i2c_last_ping_err = 0xFF
+        self._i2c_last_write_err: Tuple[int, int] = (0xFF, 0xFF)
+        self._i2c_last_read_err: Tuple[int, int] = (0xFF, 0xFF)
+
+        self._state_id = ST_INIT
+        self._seq_ack = 0
+        self._err_flags = 0
+        self._motion = _Motion()
+        self._wheel_speed = (0.0, 0.0)
+        self._odo = [0.0, 0.0]
+        self._elev_mm = 0.0
+        self._elev_target = 0.0
+        self._elev_speed = 150.0
+        self._grip_deg = 90.0
+        self._grip_target = 90.0
+        self._last_physics = self._boot
+        self._last_tlm = self._boot
+        self._last_uno_check = self._boot
+
+        self._snapshot_lock = threading.Lock()
+        self._frames = 0
+        self._camera_running = False
+        self._camera_resolution = "QQVGA"
+        self._camera_quality = 12
+        self._shelf = [row[:] for row in _SHELF_DEFAULT]
+        self._shelf_saved = self._shelf_text()
+
+        self.log_line("[ESP32] Boot")
+        self._uno_ready = self.config.uno_present and self._i2c_ping()
+        if not self._uno_ready:
+            self.log_line("[ESP32] UNO not responding; automation disabled")
+        self.log_line(f"[ESP32] Camera max resolution detected: {self.config.camera_max_resolution}")
+        self.log_line(f"[ESP32] SHELF_MAP: {self._shelf_text()}")
+
+    # ------------------------------------------------------------------
+    # Clock and log sink
+    # ------------------------------------------------------------------
+    def millis(self) -> int:
+        return int((self._clock() - self._boot) * 1000) & 0xFFFFFFFF
+
+    def add_log_listener(self, callback: Callable[[str], None]) -> None:
+        """Receive every ``log_line`` as it is printed to the console."""
+
+        with self._log_lock:
+            self._log_listeners.append(callback)
+
+    def remove_log_listener(self, callback: Callable[[str], None]) -> None:
+        with self._log_lock:
+            if callback in self._log_listeners:
+                self._log_listeners.remove(callback)
+
+    def log_line(self, text: str) -> None:
+        with self._log_lock:
+            self._logs.append((self._next_seq, self.millis(), text))
+            self._next_seq += 1
+            listeners = list(self._log_listeners)
+        for callback in listeners:
+            callback(text)
+
+    @property
+    def next_log_seq(self) -> int:
+        with self._log_lock:
+            return self._next_seq
+
+    def _log_dump(self, since: int, limit: int, with_timestamps: bool, out: List[str]) -> Tuple[int, bool]:
+        with self._log_lock:
+            entries = list(self._logs)
+            next_seq = self._next_seq
+        emitted = 0
+        truncated = False
+        for seq, ms, text in entries:
+            if seq <= since:
+                continue
+            if emitted >= limit:
+                truncated = True
+                next_seq = seq
+                break
+            out.append(f"{seq}|{ms}|{text}" if with_timestamps else f"{seq}|{text}")
+            emitted += 1
+            next_seq = seq + 1
+        out.append(
+            f"logs_next={next_seq} logs_count={emitted} logs_truncated={1 if truncated else 0} "
+            f"logs_uptime_ms={self.millis()}"
+        )
+        return emitted, truncated
+
+    # ------------------------------------------------------------------
+    # CLI entry points
+    # ------------------------------------------------------------------
+    def handle_command(self, command: str, sink: Optional[Callable[[str], None]] = None) -> str:
+        """Run one command the way ``cli_handle_command`` does and return the reply text.
+
+        ``sink`` receives every reply line as it is printed, which keeps replies and
+        mirrored log lines in firmware order on the serial console.
+        """
+
+        command = command.strip()
+        if not command:
+            return ""
+        out = _Reply(sink)
+        if not self._cli_mutex.acquire(timeout=self.config.cli_lock_timeout_s):
+            out.append("ERR CLI_LOCK_TIMEOUT")
+            self.log_line("[CLI] mutex timeout")
+            return "".join(line + "\n" for line in out)
+        try:
+            if self.config.jitter_s > 0:
+                self._sleep(self._random.uniform(0.0, self.config.jitter_s))
+            self._execute(command, out)
+        finally:
+            self._cli_mutex.release()
+        return "".join(line + "\n" for line in out)
+
+    def hold_cli_mutex(self, duration: float) -> bool:
+        """Occupy the CLI mutex like a long-running firmware task would."""
+
+        if not self._cli_mutex.acquire(timeout=self.config.cli_lock_timeout_s):
+            return False
+        try:
+            self._sleep(duration)
+        finally:
+            self._cli_mutex.release()
+        return True
+
+    def tick(self) -> None:
+        """Advance the robot model and emit the periodic ``[TLM]`` line."""
+
+        now = self._clock()
+        with self._state_lock:
+            self._integrate(now)
+            if not self._uno_ready and self.config.uno_present and now - self._last_uno_check > UNO_RECHECK_INTERVAL_S:
+                self._last_uno_check = now
+                self._uno_ready = self._i2c_ping()
+                if self._uno_ready:
+                    self.log_line("[ESP32] UNO link restored")
+            if now - self._last_tlm <= TELEMETRY_LOG_INTERVAL_S:
+                return
+            self._last_tlm = now
+            if not self._uno_ready:
+                self.log_line("[TLM] UNO offline")
+                return
+            if not (self._read_block(0x00, 4) and self._read_block(0x22, 8) and self._read_block(0x08, 6)):
+                return
+            line_left, line_right = self._line_readings()
+            odo_left, odo_right = self._odometry()
+            self.log_line(
+                f"[TLM] st={self._state_id} err=0x{self._err_flags:04X} "
+                f"ODO(L={odo_left} R={odo_right}) L={line_left} R={line_right}"
+            )
+
+    # ------------------------------------------------------------------
+    # Camera hooks used by the HTTP front end
+    # ------------------------------------------------------------------
+    @property
+    def camera_running(self) -> bool:
+        with self._state_lock:
+            return self._camera_running
+
+    def camera_settings(self) -> Tuple[str, int, int, int]:
+        """Return ``(resolution, width, height, quality)`` of the current sensor setup."""
+
+        with self._state_lock:
+            name = self._camera_resolution
+            quality = self._camera_quality
+        _, width, height = CAMERA_RESOLUTIONS[_RESOLUTION_INDEX[name]]
+        return name, width, height, quality
+
+    def capture(self) -> Optional[bytes]:
+        """Grab one JPEG frame like ``snapshot_handler``; ``None`` when the camera is busy."""
+
+        if not self._snapshot_lock.acquire(timeout=SNAPSHOT_LOCK_TIMEOUT_S):
+            return None
+        try:
+            if self.config.camera_capture_s > 0:
+                self._sleep(self.config.camera_capture_s)
+            _, width, height, quality = self.camera_settings()
+            self._frames += 1
+            frame = synthetic_jpeg(width, height, quality, self._frames)
+        finally:
+            self._snapshot_lock.release()
+        self.log_line(f"[CameraHTTP] Serving snapshot {width}x{height}, len={len(frame)}")
+        return frame
+
+    # ------------------------------------------------------------------
+    # Command dispatch
+    # ------------------------------------------------------------------
+    def _execute(self, command: str, out: List[str]) -> None:
+        upper = command.upper()
+        if upper.startswith("SMAP"):
+            self._cmd_smap(command, upper, out)
+            return
+        if upper.startswith("CTRL"):
+            self._cmd_ctrl(command[len("CTRL"):].strip(), out)
+            return
+        if upper.startswith("I2C"):
+            self._cmd_i2c(command[len("I2C"):].strip(), out)
+            return
+        if upper == "STATUS":
+            out.append(self._format_status())
+            self.log_line("[CLI] status handled")
+            return
+        if upper == "STATUS BIN":
+            out.append(format_status_binary_line(self._collect_status()))
+            return
+        if upper == "CAPS":
+            out.append("caps=status_bin,logs_ts status_bin_version=1")
+            return
+        if upper.startswith("CAMCFG"):
+            self._cmd_camcfg(command[len("CAMCFG"):].strip(), out)
+            return
+        if upper == "BRAKE":
+            out.append("BRAKE=OK" if self._brake() else "BRAKE=FAIL")
+            self.log_line("[CLI] brake handled")
+            return
+        if upper.startswith("CAMSTREAM"):
+            self._cmd_camstream(upper[len("CAMSTREAM"):].strip(), out)
+            return
+        if upper.startswith("LOGS"):
+            self._cmd_logs(command[len("LOGS"):].strip(), out)
+            return
+        if upper.startswith("START"):
+            self._cmd_start(out)
+            return
+        out.append("ERR UNKNOWN_CMD")
+        self.log_line("[CLI] unknown command")
+
+    @staticmethod
+    def _tokens(payload: str) -> List[Tuple[str, str]]:
+        tokens = []
+        for token in payload.replace(",", " ").split():
+            key, _, value = token.partition("=")
+            tokens.append((key.strip().upper(), value.strip()))
+        return tokens
+
+    @staticmethod
+    def _parse_int(text: str) -> Optional[int]:
+        body = text[1:] if text[:1] in "+-" else text
+        if not text or not body.isdigit():
+            return None
+        return int(text)
+
+    def _cmd_smap(self, command: str, upper: str, out: List[str]) -> None:
+        if upper == "SMAP GET":
+            out.append(self._shelf_text())
+        elif upper.startswith("SMAP SET"):
+            parts = command.split(" ", 2)
+            payload = parts[2].strip() if len(parts) > 2 else ""
+            if not payload:
+                out.append("SMAP=ERR")
+                return
+            self._shelf_from_text(payload)
+            out.append("OK")
+        elif upper == "SMAP SAVE":
+            self._shelf_saved = self._shelf_text()
+            out.append("SAVED")
+        elif upper == "SMAP CLEAR":
+            self._shelf = [row[:] for row in _SHELF_DEFAULT]
+            out.append("RESET")
+        else:
+            out.append("SMAP=ERR")
+
+    def _cmd_ctrl(self, args: str, out: List[str]) -> None:
+        if not args:
+            out.append("ctrl_error=SYNTAX")
+            self.log_line("[CLI] ctrl missing target")
+            return
+        target, _, payload = args.partition(" ")
+        target = target.strip().upper()
+
+        if target == "HOME":
+            if not self._uno_ready:
+                out.append("ctrl_error=UNO_OFFLINE")
+                self.log_line("[CLI] ctrl home aborted (UNO offline)")
+                return
+            if not self._i2c_write(0x40, 1):
+                out.append("ctrl_error=I2C")
+                self.log_line("[CLI] ctrl home failed")
+                return
+            with self._state_lock:
+                self._integrate(self._clock())
+                self._motion = _Motion()
+                self._elev_target = 0.0
+                self._grip_target = 90.0
+                self._state_id = ST_INIT
+            out.append("ctrl_home=OK")
+            self.log_line("[CLI] ctrl home ok")
+            return
+
+        if not self._uno_ready:
+            out.append("ctrl_error=UNO_OFFLINE")
+            self.log_line("[CLI] ctrl aborted (UNO offline)")
+            return
+
+        tokens = self._tokens(payload)[:8]
+        if target in {"DRIVE", "MOVE"}:
+            values: Dict[str, Optional[int]] = {"VX": None, "VY": None, "W": None, "T": None}
+            error = False
+            for key, value in tokens:
+                slot = _DRIVE_KEYS.get(key)
+                number = self._parse_int(value)
+                if slot is None or number is None or (slot == "T" and number <= 0):
+                    error = True
+                    break
+                values[slot] = number
+            if error or all(values[key] is None for key in ("VX", "VY", "W")):
+                out.append("ctrl_error=DRIVE_ARGS")
+                self.log_line("[CLI] ctrl drive args invalid")
+                return
+            vx, vy, w = (values[key] or 0 for key in ("VX", "VY", "W"))
+            t = 500 if values["T"] is None else values["T"]
+            if not self._drive(vx, vy, w, t):
+                out.append("ctrl_error=I2C")
+                self.log_line("[CLI] ctrl drive failed")
+                return
+            out.append(f"ctrl_drive=OK vx={vx} vy={vy} w={w} t={t}")
+            self.log_line(f"[CLI] ctrl drive vx={vx} vy={vy} w={w} t={t}")
+            return
+
+        if target == "TURN":
+            w: Optional[int] = None
+            t = 500
+            error = False
+            for key, value in tokens:
+                number = self._parse_int(value)
+                if key in {"DIR", "DIRECTION"} and value.upper() in {"LEFT", "RIGHT"}:
+                    w = 400 if value.upper() == "LEFT" else -400
+                elif key in {"LEFT", "RIGHT"}:
+                    w = 400 if key == "LEFT" else -400
+                elif key in {"W", "OMEGA", "SPEED"} and number is not None:
+                    w = number
+                elif key in {"T", "TIME", "MS"} and number is not None and number > 0:
+                    t = number
+                elif key:
+                    error = True
+                    break
+            if error or w is None:
+                out.append("ctrl_error=TURN_ARGS")
+                self.log_line("[CLI] ctrl turn args invalid")
+                return
+            if not self._drive(0, 0, w, t):
+                out.append("ctrl_error=I2C")
+                self.log_line("[CLI] ctrl turn failed")
+                return
+            out.append(f"ctrl_turn=OK w={w} t={t}")
+            self.log_line(f"[CLI] ctrl turn w={w} t={t}")
+            return
+
+        if target in {"ELEV", "LIFT"}:
+            height: Optional[int] = None
+            speed = 150
+            mode = 0
+            error = False
+            for key, value in tokens:
+                number = self._parse_int(value)
+                if key in {"H", "HEIGHT", "MM"} and number is not None:
+                    height = number
+                elif key in {"SPEED", "V", "VEL"} and number is not None:
+                    speed = number
+                elif key == "MODE" and number is not None:
+                    mode = number
+                elif key:
+                    error = True
+                    break
+            if error or height is None:
+                out.append("ctrl_error=ELEV_ARGS")
+                self.log_line("[CLI] ctrl elev args invalid")
+                return
+            if not self._i2c_write(0x44, 6):
+                out.append("ctrl_error=I2C")
+                self.log_line("[CLI] ctrl elev failed")
+                return
+            with self._state_lock:
+                self._integrate(self._clock())
+                self._elev_target = float(height)
+                self._elev_speed = float(max(1, abs(speed)))
+            out.append(f"ctrl_elev=OK h={height} speed={speed} mode={mode}")
+            self.log_line(f"[CLI] ctrl elev h={height} speed={speed} mode={mode}")
+            return
+
+        if target == "GRIP":
+            cmd: Optional[int] = None
+            arg: Optional[int] = None
+            error = False
+            for key, value in tokens:
+                if key == "OPEN":
+                    cmd = 0
+                elif key == "CLOSE":
+                    cmd = 1
+                elif key == "HOLD":
+                    cmd = 2
+                elif key == "CMD" and self._parse_int(value) is not None:
+                    cmd = self._parse_int(value) & 0xFF  # type: ignore[operator]
+                elif key in {"DEG", "ANGLE"} and self._parse_int(value) is not None:
+                    arg = self._parse_int(value)
+                elif key:
+                    error = True
+                    break
+            if cmd is None:
+                cmd = 2 if arg is not None else 0
+            arg = arg or 0
+            if error:
+                out.append("ctrl_error=GRIP_ARGS")
+                self.log_line("[CLI] ctrl grip args invalid")
+                return
+            if not self._i2c_write(0x46, 3):
+                out.append("ctrl_error=I2C")
+                self.log_line("[CLI] ctrl grip failed")
+                return
+            with self._state_lock:
+                self._integrate(self._clock())
+                self._grip_target = {0: 90.0, 1: 0.0}.get(cmd, float(max(0, min(180, arg))))
+            out.append(f"ctrl_grip=OK cmd={cmd} arg={arg}")
+            self.log_line(f"[CLI] ctrl grip cmd={cmd} arg={arg}")
+            return
+
+        out.append("ctrl_error=UNKNOWN_TARGET")
+        self.log_line("[CLI] ctrl unknown target")
+
+    def _cmd_i2c(self, args: str, out: List[str]) -> None:
+        upper = args.upper()
+        if not args or upper == "SCAN":
+            if not self._i2c_ready:
+                out.append("i2c_error=BUS_UNAVAILABLE")
+                self.log_line("[CLI] i2c scan skipped (bus not ready)")
+                return
+            # A full scan probes all 119 addresses, one address byte each.
+            self._sleep(119 * 2 * 9 / self._i2c_current_hz)
+            found = self.config.uno_present
+            if found:
+                out.append(f"i2c_device=0x{I2C_ADDR_UNO:02X}")
+            out.append(f"i2c_uno_found={'true' if found else 'false'}")
+            self.log_line("[CLI] i2c scan handled")
+            return
+        if upper == "DIAG":
+            self._print_i2c_diag(out)
+            self.log_line("[CLI] i2c diag handled")
+            return
+        if upper.startswith("FREQ"):
+            freq_args = args[len("FREQ"):].strip()
+            if not freq_args or freq_args.upper() == "SHOW":
+                self._print_i2c_diag(out)
+                self.log_line("[CLI] i2c freq show")
+                return
+            if freq_args.upper() == "RESET":
+                self._i2c_primary_hz = I2C_FREQ_DEFAULT
+                self._i2c_fallback_hz = I2C_FREQ_FALLBACK
+                self._i2c_current_hz = self._i2c_primary_hz
+                self._print_i2c_diag(out)
+                self.log_line("[CLI] i2c freq reset")
+                return
+            tokens = self._tokens(freq_args)[:4]
+            primary, fallback, apply_now = self._i2c_primary_hz, self._i2c_fallback_hz, True
+            error = not tokens
+            for key, value in tokens:
+                number = self._parse_int(value)
+                if key in {"PRIMARY", "P"} and number is not None:
+                    primary = number
+                elif key in {"FALLBACK", "F"} and number is not None:
+                    fallback = number
+                elif key == "APPLY" and value.upper() in {"NOW", "TRUE", "1"}:
+                    apply_now = True
+                elif key == "APPLY" and value.upper() in {"LATER", "FALSE", "0"}:
+                    apply_now = False
+                else:
+                    error = True
+                    break
+            if error:
+                out.append("i2c_error=FREQ_SYNTAX")
+                self.log_line("[CLI] i2c freq syntax error")
+                return
+            if not (I2C_FREQ_MIN <= fallback <= primary <= I2C_FREQ_MAX):
+                out.append("i2c_error=FREQ_RANGE")
+                self.log_line("[CLI] i2c freq invalid range")
+                return
+            self._i2c_primary_hz, self._i2c_fallback_hz = primary, fallback
+            if apply_now:
+                self._i2c_current_hz = primary
+            self._print_i2c_diag(out)
+            out.append(f"i2c_freq_applied={'true' if apply_now else 'false'}")
+            self.log_line("[CLI] i2c freq updated")
+            return
+        out.append("i2c_error=UNKNOWN_SUBCOMMAND")
+        self.log_line("[CLI] i2c command invalid")
+
+    def _print_i2c_diag(self, out: List[str]) -> None:
+        using_fallback = self._i2c_current_hz != self._i2c_primary_hz
+        out.append(
+            f"i2c_ready={'true' if self._i2c_ready else 'false'} "
+            f"i2c_using_fallback={'true' if using_fallback else 'false'} "
+            f"i2c_current_hz={self._i2c_current_hz} i2c_primary_hz={self._i2c_primary_hz} "
+            f"i2c_fallback_hz={self._i2c_fallback_hz}"
+        )
+        if self._i2c_last_ping_err != 0xFF:
+            out.append(f"i2c_last_ping_err={self._i2c_last_ping_err}")
+        reg, code = self._i2c_last_write_err
+        if reg != 0xFF:
+            out.append(f"i2c_last_write_err_reg=0x{reg:02X} code={code}")
+        reg, code = self._i2c_last_read_err
+        if reg != 0xFF:
+            out.append(f"i2c_last_read_err_reg=0x{reg:02X} code={code}")
+
+    def _cmd_camcfg(self, args: str, out: List[str]) -> None:
+        if args.upper() in {"", "?", "INFO"}:
+            out.append(self._camcfg_line())
+            self.log_line("[CLI] camcfg handled")
+            return
+        error: Optional[str] = None
+        max_index = _RESOLUTION_INDEX.get(self.config.camera_max_resolution.upper(), len(CAMERA_RESOLUTIONS) - 1)
+        for token in args.replace(",", " ").split():
+            key, sep, value = token.partition("=")
+            if not sep:
+                error = "SYNTAX"
+                break
+            key = key.strip().upper()
+            value = value.strip()
+            if key in {"QUALITY", "Q"}:
+                if not value.isdigit():
+                    error = "QUALITY"
+                    break
+                with self._state_lock:
+                    self._camera_quality = max(10, min(63, int(value) & 0xFF))
+            elif key in {"RES", "RESOLUTION", "FRAME"}:
+                index = _RESOLUTION_INDEX.get(value.upper())
+                if index is None or index > max_index:
+                    error = "RESOLUTION"
+                    break
+                with self._state_lock:
+                    self._camera_resolution = CAMERA_RESOLUTIONS[index][0]
+            else:
+                error = "UNKNOWN_KEY"
+                break
+        if error:
+            out.append(f"camcfg_error={error}")
+            self.log_line("[CLI] camcfg error")
+            return
+        out.append(self._camcfg_line())
+        self.log_line("[CLI] camcfg handled")
+
+    def _camcfg_line(self) -> str:
+        name, _, _, quality = self.camera_settings()
+        return f"cam_resolution={name} cam_quality={quality} cam_max={self.config.camera_max_resolution.upper()}"
+
+    def _cmd_camstream(self, args: str, out: List[str]) -> None:
+        with self._state_lock:
+            if args == "ON":
+                self._camera_running = self.config.wifi_connected
+                out.append("CAMSTREAM=ON" if self._camera_running else "CAMSTREAM=FAIL")
+            elif args == "OFF":
+                self._camera_running = False
+                out.append("CAMSTREAM=OFF")
+            else:
+                out.append(f"CAMSTREAM={'ON' if self._camera_running else 'OFF'}")
+        self.log_line("[CLI] camstream handled")
+
+    def _cmd_logs(self, args: str, out: List[str]) -> None:
+        since, limit, with_timestamps = 0, 64, False
+        error = False
+        for token in args.replace(",", " ").split():
+            key, sep, value = token.partition("=")
+            key, value = key.strip().upper(), value.strip()
+            if not sep:
+                error = True
+                break
+            if key == "SINCE":
+                since = self._atoi(value)
+            elif key == "LIMIT":
+                limit = self._atoi(value)
+                if limit <= 0:
+                    error = True
+                    break
+            elif key == "TS":
+                with_timestamps = value == "1" or value.upper() == "TRUE"
+            else:
+                error = True
+                break
+        if error:
+            out.append("logs_error=SYNTAX")
+            self.log_line("[CLI] logs error")
+            return
+        count, truncated = self._log_dump(since, limit, with_timestamps, out)
+        self.log_line(
+            f"[CLI] logs handled since={since} limit={limit} count={count} truncated={1 if truncated else 0}"
+        )
+
+    @staticmethod
+    def _atoi(text: str) -> int:
+        # Arduino String::toInt(): leading integer prefix, 0 when there is none.
+        digits = ""
+        for index, char in enumerate(text):
+            if char.isdigit() or (index == 0 and char in "+-"):
+                digits += char
+            else:
+                break
+        try:
+            return int(digits)
+        except ValueError:
+            return 0
+
+    def _cmd_start(self, out: List[str]) -> None:
+        if not self._i2c_write(0x48, 1):
+            out.append("START=FAIL")
+            self.log_line("[CLI] start failed")
+            return
+        with self._state_lock:
+            self._state_id = ST_PICK
+            if not self._uno_ready:
+                out.append("START=UNO_OFFLINE")
+                self.log_line("[CLI] start aborted (UNO offline)")
+                return
+            self._seq_ack = (self._seq_ack + 1) & 0xFF
+            self._camera_running = False
+        out.append("START=OK")
+        self.log_line("[CLI] start handled")
+
+    # ------------------------------------------------------------------
+    # STATUS
+    # ------------------------------------------------------------------
+    def _collect_status(self) -> Dict[str, object]:
+        errors: List[str] = []
+        values: Dict[str, object] = {}
+        with self._state_lock:
+            self._integrate(self._clock())
+            if self._uno_ready:
+                failed = [name for name, reg, size in _STATUS_BLOCKS if not self._read_block(reg, size)]
+                # DRIVEFB/AUXFB failures zero their fields without an error tag.
+                errors.extend(name for name in failed if name not in _SILENT_BLOCKS)
+                values.update(self._register_values(failed))
+            else:
+                errors.append("UNO_MISSING")
+            values["wifi_connected"] = self.config.wifi_connected
+            values["wifi_ip"] = self.config.wifi_ip if self.config.wifi_connected else ""
+            values["cam_streaming"] = self._camera_running
+        values["uptime_ms"] = self.millis()
+        if errors:
+            values["status_error"] = ",".join(errors)
+        return values
+
+    def _register_values(self, failed: List[str]) -> Dict[str, object]:
+        line_left, line_right = self._line_readings()
+        odo_left, odo_right = self._odometry()
+        left_speed, right_speed = self._wheel_speed
+        lifting = abs(self._elev_target - self._elev_mm) > 0.5
+        gripping = abs(self._grip_target - self._grip_deg) > 0.5
+        blocks: Dict[str, Dict[str, object]] = {
+            "STATUS0": {"state_id": self._state_id, "seq_ack": self._seq_ack, "err_flags": self._err_flags},
+            "STATUS1": {"elev_mm": int(round(self._elev_mm)), "grip_deg": int(round(self._grip_deg))},
+            "LINES": {"line_left": line_left, "line_right": line_right, "line_thr": 512},
+            "POWER": {"vbatt_mV": self._battery_mv(), "mps": 1, "estop": 0},
+            "DRIVEFB": {
+                "drive_left": _pulse_us(left_speed),
+                "drive_right": _pulse_us(right_speed),
+                "drive_res1": 0,
+                "drive_res2": 0,
+            },
+            "AUXFB": {"aux_lift": 1 if lifting else 0, "aux_grip": 1 if gripping else 0},
+            "SENS": {"grip_enc": int(self._grip_deg * 4), "lift_enc": int(self._elev_mm * 10)},
+            "ODOM": {"odo_left": odo_left, "odo_right": odo_right},
+        }
+        values: Dict[str, object] = {}
+        for name, fields in blocks.items():
+            # The firmware reports a failed block as zeros (DRIVEFB/AUXFB/SENS) or leaves
+            # the memset frame untouched; either way the fields read back as 0.
+            values.update({key: (0 if name in failed else value) for key, value in fields.items()})
+        return values
+
+    def _format_status(self) -> str:
+        values = self._collect_status()
+        prefix = f"status_error={values['status_error']} " if "status_error" in values else ""
+        return prefix + (
+            "state_id={state_id} seq_ack={seq_ack} err_flags=0x{err_flags:04X} elev_mm={elev_mm} "
+            "grip_deg={grip_deg} line_left={line_left} line_right={line_right} line_thr={line_thr} "
+            "vbatt_mV={vbatt_mV} mps={mps} estop={estop} drive_left={drive_left} "
+            "drive_right={drive_right} drive_res1={drive_res1} drive_res2={drive_res2} "
+            "aux_lift={aux_lift} aux_grip={aux_grip} grip_enc={grip_enc} lift_enc={lift_enc} "
+            "odo_left={odo_left} odo_right={odo_right} wifi_connected={wifi} wifi_ip={wifi_ip} "
+            "cam_streaming={cam} uptime_ms={uptime_ms}"
+        ).format(
+            **{name: values.get(name, 0) for name in _ZERO_FIELDS},
+            wifi="true" if values["wifi_connected"] else "false",
+            wifi_ip=values["wifi_ip"],
+            cam="true" if values["cam_streaming"] else "false",
+            uptime_ms=values["uptime_ms"],
+        )
+
+    # ------------------------------------------------------------------
+    # I2C model
+    # ------------------------------------------------------------------
+    def _i2c_transfer(self, reg: int, nbytes: int, *, write: bool) -> bool:
+        cfg = self.config
+        if not self._i2c_ready:
+            return False
+        # Address + register + (repeated start + address) + payload, 9 clocks per byte.
+        frame_bytes = 2 + nbytes + (0 if write else 1)
+        for attempt in range(max(0, cfg.i2c_retries) + 1):
+            if attempt:
+                self._sleep(cfg.i2c_retry_delay_s)
+            failed = not cfg.uno_present or (
+                cfg.i2c_failure_rate > 0 and self._random.random() < cfg.i2c_failure_rate
+            )
+            if not failed:
+                self._sleep(frame_bytes * 9 / self._i2c_current_hz)
+                if write:
+                    self._i2c_last_write_err = (0xFF, 0xFF)
+                else:
+                    self._i2c_last_read_err = (0xFF, 0xFF)
+                if self._i2c_current_hz != self._i2c_primary_hz:
+                    self._i2c_current_hz = self._i2c_primary_hz
+                    self.log_line("[I2C] restored primary frequency after successful transaction")
+                return True
+            self._sleep(cfg.i2c_error_delay_s)
+            code = 2 if not cfg.uno_present else 0xFE
+            last = (reg, code)
+            previous = self._i2c_last_write_err if write else self._i2c_last_read_err
+            if previous != last:
+                kind = "write" if write else "read"
+                if code == 0xFE:
+                    self.log_line(f"[I2C] {kind} short reg=0x{reg:02X} got=0 expected={nbytes}")
+                else:
+                    self.log_line(f"[I2C] {kind} err={code} reg=0x{reg:02X} @ {self._i2c_current_hz} Hz")
+            if write:
+                self._i2c_last_write_err = last
+            else:
+                self._i2c_last_read_err = last
+            if self._i2c_fallback_hz != self._i2c_primary_hz and self._i2c_current_hz != self._i2c_fallback_hz:
+                self._i2c_current_hz = self._i2c_fallback_hz
+                self.log_line(f"[I2C] fallback frequency {self._i2c_fallback_hz} Hz after err={code}")
+        return False
+
+    def _read_block(self, reg: int, nbytes: int) -> bool:
+        return self._i2c_transfer(reg, nbytes, write=False)
+
+    def _i2c_write(self, reg: int, nbytes: int) -> bool:
+        if not self._uno_ready:
+            return False
+        return self._i2c_transfer(reg, nbytes, write=True)
+
+    def _i2c_ping(self) -> bool:
+        if not self.config.uno_present:
+            self._i2c_last_ping_err = 2
+            return False
+        self._sleep(9 / self._i2c_current_hz)
+        self._i2c_last_ping_err = 0xFF
+        return True
+
+    # ------------------------------------------------------------------
+    # Robot model
+    # ------------------------------------------------------------------
+    def _drive(self, vx: int, vy: int, w: int, t_ms: int) -> bool:
+        if not self._i2c_write(0x42, 8):
+            return False
+        with self._state_lock:
+            now = self._clock()
+            self._integrate(now)
+            self._motion = _Motion(float(vx), float(vy), float(w), now + max(0, t_ms) / 1000.0)
+        return True
+
+    def _brake(self) -> bool:
+        if not self._uno_ready or not self._i2c_write(0x4A, 1):
+            return False
+        with self._state_lock:
+            self._integrate(self._clock())
+            self._motion = _Motion()
+        return True
+
+    def _integrate(self, now: float) -> None:
+        dt = now - self._last_physics
+        if dt <= 0:
+            return
+        self._last_physics = now
+        motion = self._motion
+        active = min(dt, max(0.0, motion.until - (now - dt)))
+        half_track = self.config.track_mm / 2.0
+        # w is in mrad/s; wheel speeds in mm/s.
+        left = motion.vx - motion.w / 1000.0 * half_track
+        right = motion.vx + motion.w / 1000.0 * half_track
+        self._wheel_speed = (left, right) if now < motion.until else (0.0, 0.0)
+        if active > 0:
+            self._odo[0] += left * active * self.config.counts_per_mm
+            self._odo[1] += right * active * self.config.counts_per_mm
+        self._elev_mm = _approach(self._elev_mm, self._elev_target, self._elev_speed * dt)
+        self._grip_deg = _approach(self._grip_deg, self._grip_target, 180.0 * dt)
+
+    def _odometry(self) -> Tuple[int, int]:
+        return _int32(self._odo[0]), _int32(self._odo[1])
+
+    def _line_readings(self) -> Tuple[int, int]:
+        phase = (self._odo[0] + self._odo[1]) / 400.0
+        return (
+            int(480 + 300 * math.sin(phase) + self._random.randint(-8, 8)),
+            int(480 + 300 * math.cos(phase) + self._random.randint(-8, 8)),
+        )
+
+    def _battery_mv(self) -> int:
+        return max(6600, int(8200 - (self._clock() - self._boot) * 0.05))
+
+    # ------------------------------------------------------------------
+    # Shelf map
+    # ------------------------------------------------------------------
+    def _shelf_text(self) -> str:
+        return "; ".join(",".join(row) for row in self._shelf)
+
+    def _shelf_from_text(self, payload: str) -> None:
+        row, col, token = 0, 0, ""
+        for char in payload:
+            if row >= 3:
+                break
+            if char in ",;":
+                if col < 3:
+                    self._shelf[row][col] = _shelf_color(token)
+                col += 1
+                token = ""
+                if char == ";":
+                    row, col = row + 1, 0
+            else:
+                token += char
+        if row < 3 and token and col < 3:
+            self._shelf[row][col] = _shelf_color(token)
+
+
+_ZERO_FIELDS = (
+    "state_id",
+    "seq_ack",
+    "err_flags",
+    "elev_mm",
+    "grip_deg",
+    "line_left",
+    "line_right",
+    "line_thr",
+    "vbatt_mV",
+    "mps",
+    "estop",
+    "drive_left",
+    "drive_right",
+    "drive_res1",
+    "drive_res2",
+    "aux_lift",
+    "aux_grip",
+    "grip_enc",
+    "lift_enc",
+    "odo_left",
+    "odo_right",
+)
+
+
+def _shelf_color(token: str) -> str:
+    value = token.strip().upper()
+    return value if value in _SHELF_COLORS else "-"
+
+
+def _approach(current: float, target: float, step: float) -> float:
+    if abs(target - current) <= step:
+        return target
+    return current + math.copysign(step, target - current)
+
+
+def _pulse_us(speed_mm_s: float) -> int:
+    return int(max(1000, min(2000, 1500 + speed_mm_s)))
+
+
+def _int32(value: float) -> int:
+    # Encoder counters are int32 on the UNO and wrap on overflow.
+    wrapped = int(value) & 0xFFFFFFFF
+    return wrapped - (1 << 32) if wrapped & 0x80000000 else wrapped
+
+
+__all__ = [
+    "CAMERA_RESOLUTIONS",
+    "SimulatedFirmware",
+    "SimulatorConfig",
+]
@@ -0,0 +1,120 @@
+"""Tiny baseline JPEG encoder for simulated camera snapshots.
+
+The simulator has to serve real ``image/jpeg`` bodies (the UI and the camera proxy
+decode them) without pulling an imaging library into the backend. Frames are
+grayscale and carry only the DC coefficient of every 8x8 block, which is enough for a
+moving test pattern and keeps the encoder to a few dozen lines. ``COM`` padding brings
+the body up to the size an OV2640 produces at the configured resolution and quality so
+transfer timings in benchmarks stay realistic.
+"""
+from __future__ import annotations
+
+import struct
+from functools import lru_cache
+from typing import Dict, Tuple
+
+FRAME_PERIOD = 16  # distinct frames before the pattern repeats
+
+# ITU T.81 Annex K.3 luminance DC table.
+_DC_BITS = (0, 1, 5, 1, 1, 1, 1, 1, 1, 0, 0, 0, 0, 0, 0, 0)
+_DC_VALUES = tuple(range(12))
+# Every block ends right after DC, so the AC table only needs EOB (0x00) as code "0".
+_AC_BITS = (1,) + (0,) * 15
+_AC_VALUES = (0x00,)
+
+
+def _huffman_codes(bits: Tuple[int, ...], values: Tuple[int, ...]) -> Dict[int, Tuple[int, int]]:
+    codes: Dict[int, Tuple[int, int]] = {}
+    code = 0
+    index = 0
+    for length, count in enumerate(bits, start=1):
+        for _ in range(count):
+            codes[values[index]] = (code, length)
+            code += 1
+            index += 1
+        code <<= 1
+    return codes
+
+
+_DC_CODES = _huffman_codes(_DC_BITS, _DC_VALUES)
+
+
+def _segment(marker: int, payload: bytes) -> bytes:
+    return struct.pack(">HH", 0xFF00 | marker, len(payload) + 2) + payload
+
+
+def _dc_step(quality: int) -> int:
+    # libjpeg quality scaling applied to the DC entry (16) of the luminance table;
+    # ESP32 "quality" is inverted (lower number = better), so map 10..63 onto 90..10.
+    jpeg_quality = max(1, min(100, 90 - (quality - 10) * 80 // 53))
+    scale = 5000 // jpeg_quality if jpeg_quality < 50 else 200 - jpeg_quality * 2
+    return max(1, min(255, (16 * scale + 50) // 100))
+
+
+def _target_size(width: int, height: int, quality: int) -> int:
+    bits_per_pixel = 0.15 + 1.5 * (63 - max(10, min(63, quality))) / 53
+    return int(width * height * bits_per_pixel / 8)
+
+
+def _scan(width: int, height: int, step: int, frame: int) -> bytes:
+    blocks_x = width // 8
+    blocks_y = height // 8
+    bar = (frame * max(1, blocks_x // FRAME_PERIOD)) % blocks_x
+    out = bytearray()
+    acc = 0
+    nbits = 0
+    previous = 0
+    for by in range(blocks_y):
+        row_level = 40 + 150 * by // max(1, blocks_y - 1)
+        for bx in range(blocks_x):
+            level = 235 if abs(bx - bar) <= 1 else row_level
+            dc = int(round((level - 128) * 8 / step))
+            diff = dc - previous
+            previous = dc
+            magnitude = abs(diff)
+            category = magnitude.bit_length()
+            code, length = _DC_CODES[category]
+            extra = diff if diff >= 0 else diff + (1 << category) - 1
+            # DC code, its extra bits, then the one-bit EOB.
+            acc = (acc << (length + category + 1)) | (code << (category + 1)) | (extra << 1)
+            nbits += length + category + 1
+            while nbits >= 8:
+                nbits -= 8
+                byte = (acc >> nbits) & 0xFF
+                out.append(byte)
+                if byte == 0xFF:
+                    out.append(0x00)
+            acc &= (1 << nbits) - 1
+    if nbits:
+        byte = ((acc << (8 - nbits)) | ((1 << (8 - nbits)) - 1)) & 0xFF
+        out.append(byte)
+        if byte == 0xFF:
+            out.append(0x00)
+    return bytes(out)
+
+
+@lru_cache(maxsize=64)
+def synthetic_jpeg(width: int, height: int, quality: int, frame: int = 0) -> bytes:
+    """Return a decodable grayscale JPEG of ``width`` x ``height`` for ``frame``."""
+
+    frame %= FRAME_PERIOD
+    step = _dc_step(quality)
+    header = bytearray(b"\xFF\xD8")
+    header += _segment(0xE0, b"JFIF\x00\x01\x01\x00\x00\x01\x00\x01\x00\x00")
+    header += _segment(0xDB, bytes([0]) + bytes([step]) * 64)
+    header += _segment(0xC0, struct.pack(">BHHB3B", 8, height, width, 1, 1, 0x11, 0))
+    header += _segment(0xC4, bytes([0x00]) + bytes(_DC_BITS) + bytes(_DC_VALUES))
+    header += _segment(0xC4, bytes([0x10]) + bytes(_AC_BITS) + bytes(_AC_VALUES))
+    header += _segment(0xFE, f"rbm-sim frame={frame} q={quality}".encode("ascii"))
+    scan = _scan(width, height, step, frame)
+    trailer = _segment(0xDA, bytes([1, 1, 0x00, 0, 63, 0])) + scan + b"\xFF\xD9"
+
+    padding = _target_size(width, height, quality) - len(header) - len(trailer)
+    while padding > 4:
+        chunk = min(padding - 4, 65533)
+        header += _segment(0xFE, bytes(chunk))
+        padding -= chunk + 4
+    return bytes(header + trailer)
+
+
+__all__ = ["FRAME_PERIOD", "synthetic_jpeg"]
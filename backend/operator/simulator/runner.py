@@ -0,0 +1,98 @@
+"""Bundle the simulated firmware with its serial, WebSocket and HTTP front ends."""
+from __future__ import annotations
+
+import threading
+from typing import Optional
+
+from .firmware import SimulatedFirmware, SimulatorConfig
+from .transports import CameraHttpServer, PtySerialServer, WebSocketCliServer
+
+TICK_INTERVAL_S = 0.05
+
+
+class ESP32Simulator:
+    """Run a :class:`SimulatedFirmware` behind every transport the backend uses.
+
+    Usage::
+
+        with ESP32Simulator() as sim:
+            link = ESP32Link(port=sim.serial_port)
+            ws_link = ESP32WSLink(sim.ws_url)
+    """
+
+    def __init__(
+        self,
+        config: Optional[SimulatorConfig] = None,
+        *,
+        host: str = "127.0.0.1",
+        ws_port: int = 0,
+        http_port: int = 0,
+        serial: bool = True,
+        websocket: bool = True,
+        http: bool = True,
+    ) -> None:
+        self.firmware = SimulatedFirmware(config)
+        self.config = self.firmware.config
+        self._serial = PtySerialServer(self.firmware) if serial else None
+        self._ws = WebSocketCliServer(self.firmware, host=host, port=ws_port) if websocket else None
+        self._http = CameraHttpServer(self.firmware, host=host, port=http_port) if http else None
+        self._stop = threading.Event()
+        self._threads: list[threading.Thread] = []
+
+    @property
+    def serial_port(self) -> Optional[str]:
+        return self._serial.port if self._serial else None
+
+    @property
+    def ws_url(self) -> Optional[str]:
+        return self._ws.url if self._ws else None
+
+    @property
+    def ws_port(self) -> Optional[int]:
+        return self._ws.port if self._ws else None
+
+    @property
+    def snapshot_url(self) -> Optional[str]:
+        return self._http.url if self._http else None
+
+    def start(self) -> "ESP32Simulator":
+        self._stop.clear()
+        for server in (self._serial, self._ws, self._http):
+            if server is not None:
+                server.start()
+        self._spawn(self._tick_loop, "sim-tick")
+        if self.config.contention_interval_s > 0 and self.config.contention_hold_s > 0:
+            self._spawn(self._contention_loop, "sim-contention")
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout=self.config.cli_lock_timeout_s + 1.0)
+        self._threads.clear()
+        for server in (self._http, self._ws, self._serial):
+            if server is not None:
+                server.stop()
+
+    def __enter__(self) -> "ESP32Simulator":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
+    def _spawn(self, target, name: str) -> None:
+        thread = threading.Thread(target=target, name=name, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def _tick_loop(self) -> None:
+        while not self._stop.wait(TICK_INTERVAL_S):
+            self.firmware.tick()
+
+    def _contention_loop(self) -> None:
+        # Periodically hold the CLI mutex, like a blocking BT step would.
+        while not self._stop.wait(self.config.contention_interval_s):
+            self.firmware.hold_cli_mutex(self.config.contention_hold_s)
+
+
+__all__ = ["ESP32Simulator"]
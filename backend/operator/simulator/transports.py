@@ -0,0 +1,386 @@
+"""Front ends exposing :class:`SimulatedFirmware` the way the real board does.
+
+* :class:`PtySerialServer` opens a pseudo-terminal so :class:`ESP32Link` talks to a
+  real serial device node. Input and output are paced at the configured baud rate and
+  every ``log_line`` is mirrored onto the console, interleaving with replies exactly as
+  on the UART.
+* :class:`WebSocketCliServer` serves ``/ws/cli`` like ``cli_ws.cpp``: one text frame
+  per command, ``"\\n"`` for empty replies, at most eight registered clients, and
+  heartbeats only for clients that pinged.
+* :class:`CameraHttpServer` serves ``/camera/snapshot`` with synthetic JPEG frames.
+"""
+from __future__ import annotations
+
+import asyncio
+import errno
+import json
+import logging
+import os
+import queue
+import select
+import threading
+import time
+import tty
+from collections import OrderedDict
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional
+
+from .firmware import SimulatedFirmware
+
+try:  # pragma: no cover - optional dependency
+    from websockets.asyncio.server import ServerConnection, serve
+    from websockets.frames import Frame, Opcode
+except ImportError:  # pragma: no cover - handled at runtime
+    ServerConnection = object  # type: ignore[assignment,misc]
+    serve = None  # type: ignore[assignment]
+    Frame = Opcode = None  # type: ignore[assignment,misc]
+
+logger = logging.getLogger(__name__)
+
+WS_PATH = "/ws/cli"
+WS_MAX_CLIENTS = 8
+WS_MAX_COMMAND_LENGTH = 512
+WS_CLIENT_IDLE_TIMEOUT_S = 15.0
+SNAPSHOT_PATH = "/camera/snapshot"
+
+
+class PtySerialServer:
+    """Serve the firmware console on a pseudo-terminal."""
+
+    def __init__(self, firmware: SimulatedFirmware, *, baudrate: Optional[int] = None) -> None:
+        self._firmware = firmware
+        self._baudrate = baudrate or firmware.config.baudrate
+        self._master: Optional[int] = None
+        self._slave: Optional[int] = None
+        self._port: Optional[str] = None
+        self._tx: "queue.Queue[Optional[bytes]]" = queue.Queue(maxsize=4096)
+        self._stop = threading.Event()
+        self._threads: list[threading.Thread] = []
+
+    @property
+    def port(self) -> Optional[str]:
+        """Device node to hand to ``ESP32Link(port=...)``."""
+
+        return self._port
+
+    def _byte_time(self, count: int) -> float:
+        # 8N1 framing: ten bit times per byte.
+        return count * 10.0 / self._baudrate
+
+    def start(self) -> str:
+        master, slave = os.openpty()
+        tty.setraw(slave)
+        os.set_blocking(master, False)
+        self._master, self._slave = master, slave
+        self._port = os.ttyname(slave)
+        self._stop.clear()
+        self._firmware.add_log_listener(self._mirror_log)
+        for target, name in ((self._rx_loop, "sim-uart-rx"), (self._tx_loop, "sim-uart-tx")):
+            thread = threading.Thread(target=target, name=name, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self._port
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._firmware.remove_log_listener(self._mirror_log)
+        try:
+            self._tx.put_nowait(None)
+        except queue.Full:
+            pass
+        for thread in self._threads:
+            thread.join(timeout=2.0)
+        self._threads.clear()
+        for fd in (self._master, self._slave):
+            if fd is not None:
+                os.close(fd)
+        self._master = self._slave = None
+
+    def _mirror_log(self, text: str) -> None:
+        self._send(text + "\n")
+
+    def _send(self, text: str) -> None:
+        if not text:
+            return
+        try:
+            self._tx.put_nowait(text.encode("utf-8"))
+        except queue.Full:
+            # Nobody is draining the console; the UART would drop these bytes too.
+            pass
+
+    def _rx_loop(self) -> None:
+        buffer = b""
+        while not self._stop.is_set():
+            master = self._master
+            if master is None:
+                return
+            ready, _, _ = select.select([master], [], [], 0.1)
+            if not ready:
+                continue
+            try:
+                chunk = os.read(master, 1024)
+            except OSError as exc:
+                if exc.errno in (errno.EAGAIN, errno.EIO):
+                    continue
+                return
+            buffer += chunk
+            while b"\n" in buffer:
+                raw, buffer = buffer.split(b"\n", 1)
+                # The command only reaches process_cli() once it crossed the wire.
+                time.sleep(self._byte_time(len(raw) + 1))
+                self._firmware.log_line(f"[LOOP] available={len(raw) + 1}")
+                self._firmware.log_line(f"[CLI] available={len(raw) + 1}")
+                command = raw.decode("utf-8", errors="ignore").strip()
+                if not command:
+                    continue
+                self._firmware.log_line(f"[CLI] RX: {command}")
+                self._firmware.handle_command(command, sink=self._send)
+
+    def _tx_loop(self) -> None:
+        while not self._stop.is_set():
+            data = self._tx.get()
+            if data is None or self._master is None:
+                return
+            try:
+                os.write(self._master, data)
+            except BlockingIOError:
+                # Host side is not reading (port closed): drop like a USB bridge would.
+                continue
+            except OSError:
+                return
+            time.sleep(self._byte_time(len(data)))
+
+
+class _CliConnection(ServerConnection):  # type: ignore[misc,valid-type]
+    """Connection that notices control frames, like ``touch_client(fd, true)``."""
+
+    wants_heartbeat = False
+
+    def process_event(self, event: Any) -> None:
+        super().process_event(event)
+        if isinstance(event, Frame) and event.opcode in (Opcode.PING, Opcode.PONG):
+            self.wants_heartbeat = True
+            on_ping = getattr(self, "on_ping", None)
+            if on_ping is not None:
+                on_ping(self)
+
+
+class WebSocketCliServer:
+    """Serve the CLI on ``ws://host:port/ws/cli`` from a private event loop thread."""
+
+    def __init__(self, firmware: SimulatedFirmware, *, host: str = "127.0.0.1", port: int = 0) -> None:
+        self._firmware = firmware
+        self._host = host
+        self._port = port
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+        self._server: Any = None
+        self._stopping: Optional[asyncio.Event] = None
+        self._clients: "OrderedDict[Any, float]" = OrderedDict()
+        self._error: Optional[BaseException] = None
+
+    @property
+    def port(self) -> int:
+        return self._port
+
+    @property
+    def url(self) -> str:
+        return f"ws://{self._host}:{self._port}{WS_PATH}"
+
+    def start(self) -> str:
+        if serve is None:
+            raise RuntimeError("websockets is not installed; install via 'pip install websockets'.")
+        self._ready.clear()
+        self._thread = threading.Thread(target=self._run, name="sim-ws", daemon=True)
+        self._thread.start()
+        self._ready.wait(timeout=5.0)
+        if self._error is not None:
+            raise RuntimeError(f"WebSocket simulator failed to start: {self._error}")
+        return self.url
+
+    def stop(self) -> None:
+        loop, stopping = self._loop, self._stopping
+        if loop is not None and stopping is not None:
+            loop.call_soon_threadsafe(stopping.set)
+        if self._thread is not None:
+            self._thread.join(timeout=5.0)
+        self._thread = None
+        self._loop = None
+
+    def _run(self) -> None:
+        loop = asyncio.new_event_loop()
+        self._loop = loop
+        try:
+            loop.run_until_complete(self._serve())
+        except BaseException as exc:  # pragma: no cover - surfaced through start()
+            self._error = exc
+            self._ready.set()
+        finally:
+            loop.close()
+
+    async def _serve(self) -> None:
+        self._stopping = asyncio.Event()
+        async with serve(
+            self._handle,
+            self._host,
+            self._port,
+            create_connection=_CliConnection,
+            process_request=self._process_request,
+            ping_interval=None,
+        ) as server:
+            self._server = server
+            self._port = server.sockets[0].getsockname()[1]
+            self._ready.set()
+            heartbeat = asyncio.ensure_future(self._heartbeat_loop())
+            await self._stopping.wait()
+            heartbeat.cancel()
+            server.close()
+
+    @staticmethod
+    def _process_request(connection: Any, request: Any) -> Any:
+        if request.path.split("?", 1)[0] != WS_PATH:
+            return connection.respond(HTTPStatus.NOT_FOUND, "Not found\n")
+        return None
+
+    def _touch(self, connection: Any) -> None:
+        if connection not in self._clients and len(self._clients) >= WS_MAX_CLIENTS:
+            victim, _ = self._clients.popitem(last=False)
+            victim.wants_heartbeat = False
+            self._firmware.log_line(
+                f"[CLIWS] client registered fd={id(connection) & 0xFFFF} after evicting fd={id(victim) & 0xFFFF}"
+            )
+        self._clients[connection] = time.monotonic()
+        self._clients.move_to_end(connection)
+
+    async def _handle(self, connection: Any) -> None:
+        self._firmware.log_line("[CLIWS] handshake")
+        connection.on_ping = self._touch
+        self._touch(connection)
+        loop = asyncio.get_running_loop()
+        try:
+            async for message in connection:
+                if isinstance(message, bytes):
+                    message = message.decode("utf-8", errors="ignore")
+                if len(message) > WS_MAX_COMMAND_LENGTH:
+                    await connection.send("ERR COMMAND_TOO_LONG")
+                    continue
+                command = message.strip()
+                if not command:
+                    continue
+                self._firmware.log_line(f"[CLIWS] RX '{command}'")
+                reply = await loop.run_in_executor(None, self._firmware.handle_command, command)
+                await connection.send(reply or "\n")
+                self._touch(connection)
+        except Exception:  # pragma: no cover - client went away mid-reply
+            pass
+        finally:
+            self._clients.pop(connection, None)
+
+    async def _heartbeat_loop(self) -> None:
+        interval = max(0.05, self._firmware.config.heartbeat_interval_s)
+        while True:
+            await asyncio.sleep(interval)
+            now = time.monotonic()
+            for connection, last_seen in list(self._clients.items()):
+                if now - last_seen > WS_CLIENT_IDLE_TIMEOUT_S:
+                    self._firmware.log_line(f"[CLIWS] client timeout fd={id(connection) & 0xFFFF}")
+                    self._clients.pop(connection, None)
+                    connection.wants_heartbeat = False
+            payload = json.dumps(
+                {
+                    "type": "heartbeat",
+                    "uptime_ms": self._firmware.millis(),
+                    "logs_next": self._firmware.next_log_seq,
+                },
+                separators=(",", ":"),
+            )
+            for connection in list(self._clients):
+                if not connection.wants_heartbeat:
+                    continue
+                try:
+                    await connection.send(payload)
+                except Exception:
+                    self._firmware.log_line(f"[CLIWS] heartbeat failed fd={id(connection) & 0xFFFF}")
+                    self._clients.pop(connection, None)
+                    continue
+                self._clients[connection] = now
+
+
+class _SnapshotHandler(BaseHTTPRequestHandler):
+    firmware: SimulatedFirmware
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server API
+        if self.path.split("?", 1)[0] != SNAPSHOT_PATH:
+            self.send_error(HTTPStatus.NOT_FOUND)
+            return
+        firmware = self.firmware
+        if not firmware.camera_running:
+            self._send_text(HTTPStatus.SERVICE_UNAVAILABLE, "Camera stopped")
+            return
+        if not firmware.config.wifi_connected:
+            self._send_text(HTTPStatus.INTERNAL_SERVER_ERROR, "WiFi disconnected")
+            return
+        frame = firmware.capture()
+        if frame is None:
+            self._send_text(HTTPStatus.SERVICE_UNAVAILABLE, "Camera busy")
+            return
+        _, width, height, _ = firmware.camera_settings()
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "image/jpeg")
+        self.send_header("Content-Length", str(len(frame)))
+        self.send_header("X-Frame-Size", f"{width}x{height}")
+        self.send_header("Cache-Control", "no-cache, no-store, must-revalidate")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(frame)
+
+    def _send_text(self, status: HTTPStatus, text: str) -> None:
+        body = text.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002 - http.server API
+        logger.debug("snapshot http: " + format, *args)
+
+
+class CameraHttpServer:
+    """Serve ``GET /camera/snapshot`` from a background thread."""
+
+    def __init__(self, firmware: SimulatedFirmware, *, host: str = "127.0.0.1", port: int = 0) -> None:
+        handler = type("SnapshotHandler", (_SnapshotHandler,), {"firmware": firmware})
+        self._httpd = ThreadingHTTPServer((host, port), handler)
+        self._httpd.daemon_threads = True
+        self._host = host
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def port(self) -> int:
+        return self._httpd.server_address[1]
+
+    @property
+    def url(self) -> str:
+        return f"http://{self._host}:{self.port}{SNAPSHOT_PATH}"
+
+    def start(self) -> str:
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="sim-http", daemon=True)
+        self._thread.start()
+        return self.url
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+        self._thread = None
+
+
+__all__ = [
+    "CameraHttpServer",
+    "PtySerialServer",
+    "WebSocketCliServer",
+]
@@ -0,0 +1,159 @@
+"""Binary ``STATUS BIN`` codec shared by the links and the simulator.
+
+The firmware packs the ICD register blocks (STATUS0/1, LINES, POWER, DRIVEFB, AUXFB,
+SENS, ODOM) behind a small header into ``StatusBinaryFrame`` (see
+``firmware/src/esp32/src/main.cpp``) and prints it base64-encoded on one line::
+
+    statusb=AQEAAP...
+
+54 bytes of payload become a ~80 byte line instead of the ~400 byte text reply, and
+decoding is a single :meth:`struct.Struct.unpack_from` call. Firmware advertises the
+mode through ``CAPS``; replies that fail to decode fall back to the text ``STATUS``.
+"""
+from __future__ import annotations
+
+import base64
+import binascii
+import struct
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+from .status_frame import StatusFrame
+
+STATUS_BINARY_VERSION = 1
+STATUS_BINARY_COMMAND = "status bin"
+STATUS_BINARY_PREFIX = "statusb="
+STATUS_BINARY_CAPABILITY = "status_bin"
+
+FLAG_WIFI_CONNECTED = 1 << 0
+FLAG_CAM_STREAMING = 1 << 1
+
+# Error bits in the order the text reply lists them in ``status_error``.
+ERROR_BITS = (
+    (1 << 0, "STATUS0"),
+    (1 << 1, "STATUS1"),
+    (1 << 2, "LINES"),
+    (1 << 3, "POWER"),
+    (1 << 4, "SENS"),
+    (1 << 5, "ODOM"),
+    (1 << 15, "UNO_MISSING"),
+)
+
+# header: version, flags, error_bits, uptime_ms, wifi_ip[4]
+# Status0 | Status1 | Lines | Power | DriveFB | AuxFB | Sens | Odom
+STATUS_STRUCT = struct.Struct("<BBHI4s" "BBH" "hh" "HHH" "HBB" "HHHH" "HH" "hh" "ii")
+
+# Frame fields in STATUS_STRUCT order after the header.
+_BLOCK_FIELDS = (
+    "state_id",
+    "seq_ack",
+    "err_flags",
+    "elev_mm",
+    "grip_deg",
+    "line_left",
+    "line_right",
+    "line_thr",
+    "vbatt_mV",
+    "mps",
+    "estop",
+    "drive_left",
+    "drive_right",
+    "drive_res1",
+    "drive_res2",
+    "aux_lift",
+    "aux_grip",
+    "grip_enc",
+    "lift_enc",
+    "odo_left",
+    "odo_right",
+)
+
+
+def decode_status_binary(payload: bytes) -> Optional[StatusFrame]:
+    """Unpack a raw ``StatusBinaryFrame``; returns ``None`` for a foreign layout."""
+
+    if len(payload) != STATUS_STRUCT.size:
+        return None
+    values = STATUS_STRUCT.unpack_from(payload)
+    version, flags, error_bits, uptime_ms, ip_bytes = values[:5]
+    if version != STATUS_BINARY_VERSION:
+        return None
+
+    fields: Dict[str, Any] = dict(zip(_BLOCK_FIELDS, values[5:]))
+    wifi_connected = bool(flags & FLAG_WIFI_CONNECTED)
+    fields["wifi_connected"] = wifi_connected
+    fields["wifi_ip"] = ".".join(str(octet) for octet in ip_bytes) if wifi_connected else ""
+    fields["cam_streaming"] = bool(flags & FLAG_CAM_STREAMING)
+    fields["uptime_ms"] = uptime_ms
+    if error_bits:
+        fields["status_error"] = ",".join(tag for bit, tag in ERROR_BITS if error_bits & bit)
+    return StatusFrame(fields)
+
+
+def decode_status_binary_lines(lines: Iterable[str]) -> Optional[StatusFrame]:
+    """Find the ``statusb=`` line in a reply and decode it."""
+
+    for line in lines:
+        if not line.startswith(STATUS_BINARY_PREFIX):
+            continue
+        try:
+            payload = base64.b64decode(line[len(STATUS_BINARY_PREFIX):].strip(), validate=True)
+        except (binascii.Error, ValueError):
+            return None
+        return decode_status_binary(payload)
+    return None
+
+
+def encode_status_binary(values: Mapping[str, Any]) -> bytes:
+    """Pack status values (``StatusFrame`` field names) the way the firmware does."""
+
+    flags = 0
+    if values.get("wifi_connected"):
+        flags |= FLAG_WIFI_CONNECTED
+    if values.get("cam_streaming"):
+        flags |= FLAG_CAM_STREAMING
+
+    error_bits = 0
+    for tag in str(values.get("status_error") or "").split(","):
+        for bit, name in ERROR_BITS:
+            if tag.strip() == name:
+                error_bits |= bit
+
+    ip_bytes = bytes(4)
+    if flags & FLAG_WIFI_CONNECTED and values.get("wifi_ip"):
+        ip_bytes = bytes(int(octet) for octet in str(values["wifi_ip"]).split("."))
+
+    return STATUS_STRUCT.pack(
+        STATUS_BINARY_VERSION,
+        flags,
+        error_bits,
+        int(values.get("uptime_ms") or 0) & 0xFFFFFFFF,
+        ip_bytes,
+        *(int(values.get(name) or 0) for name in _BLOCK_FIELDS),
+    )
+
+
+def format_status_binary_line(values: Mapping[str, Any]) -> str:
+    return STATUS_BINARY_PREFIX + base64.b64encode(encode_status_binary(values)).decode("ascii")
+
+
+def parse_capabilities(lines: Iterable[str]) -> List[str]:
+    """Extract the ``caps=`` list from a ``CAPS`` reply (empty for older firmware)."""
+
+    for line in lines:
+        for token in line.split():
+            if token.startswith("caps="):
+                return [item.strip().lower() for item in token[len("caps="):].split(",") if item.strip()]
+    return []
+
+
+__all__ = [
+    "STATUS_BINARY_CAPABILITY",
+    "STATUS_BINARY_COMMAND",
+    "STATUS_BINARY_PREFIX",
+    "STATUS_STRUCT",
+    "decode_status_binary",
+    "decode_status_binary_lines",
+    "encode_status_binary",
+    "format_status_binary_line",
+    "parse_capabilities",
+]
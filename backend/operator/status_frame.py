@@ -0,0 +1,271 @@
+"""Schema-driven decoder for the ESP32 ``STATUS`` reply.
+
+``cli_print_status`` in ``firmware/src/esp32/src/main.cpp`` always prints the same
+fields in the same order, so the reply is matched with one precompiled pattern and
+each group is converted with the decoder that belongs to its field type. This keeps
+the poll path free of the per-token ``int``/``float`` trial parsing done by the
+generic ``key=value`` parser. Fields the table does not know about (newer firmware)
+are handed to a fallback parser and kept in :attr:`StatusFrame.extra`.
+"""
+from __future__ import annotations
+
+import itertools
+import re
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+
+# Field types understood by the decoder; each maps to a regex fragment and converter.
+UINT = "uint"
+INT = "int"
+HEX = "hex"
+BOOL = "bool"
+IP = "ip"
+TEXT = "text"
+
+_TYPE_PATTERNS: Dict[str, str] = {
+    UINT: r"\d+",
+    INT: r"-?\d+",
+    HEX: r"0[xX][0-9A-Fa-f]+",
+    BOOL: r"true|false",
+    IP: r"(?:\d{1,3}(?:\.\d{1,3}){3})?",
+    TEXT: r"\S+",
+}
+
+_TYPE_DECODERS: Dict[str, Callable[[str], Any]] = {
+    UINT: int,
+    INT: int,
+    HEX: lambda token: int(token, 16),
+    BOOL: lambda token: token == "true",
+    IP: str,
+    TEXT: str,
+}
+
+# (name, type, optional) in the order printed by cli_print_status().
+STATUS_FIELDS: Tuple[Tuple[str, str, bool], ...] = (
+    ("status_error", TEXT, True),
+    ("state_id", UINT, False),
+    ("seq_ack", UINT, False),
+    ("err_flags", HEX, False),
+    ("elev_mm", INT, False),
+    ("grip_deg", INT, False),
+    ("line_left", UINT, False),
+    ("line_right", UINT, False),
+    ("line_thr", UINT, False),
+    ("vbatt_mV", UINT, False),
+    ("mps", UINT, False),
+    ("estop", UINT, False),
+    ("drive_left", UINT, False),
+    ("drive_right", UINT, False),
+    ("drive_res1", UINT, False),
+    ("drive_res2", UINT, False),
+    ("aux_lift", UINT, False),
+    ("aux_grip", UINT, False),
+    ("grip_enc", INT, False),
+    ("lift_enc", INT, False),
+    ("odo_left", INT, False),
+    ("odo_right", INT, False),
+    ("wifi_connected", BOOL, False),
+    ("wifi_ip", IP, False),
+    ("cam_streaming", BOOL, False),
+    ("uptime_ms", UINT, True),
+)
+
+STATUS_FIELD_NAMES: Tuple[str, ...] = tuple(name for name, _, _ in STATUS_FIELDS)
+_FIELD_SET = frozenset(STATUS_FIELD_NAMES)
+_FRAME_SEQ = itertools.count(1)
+
+
+def _compile_status_pattern() -> "re.Pattern[str]":
+    parts = []
+    leading = True
+    for name, kind, optional in STATUS_FIELDS:
+        fragment = rf"{name}=(?P<{name}>{_TYPE_PATTERNS[kind]})"
+        if leading and optional:
+            # A leading optional field (status_error) owns the separator that follows it.
+            parts.append(rf"(?:{fragment} )?")
+            continue
+        if not leading:
+            fragment = " " + fragment
+        leading = False
+        parts.append(rf"(?:{fragment})?" if optional else fragment)
+    return re.compile(r"\s*" + "".join(parts) + r"(?:\s+(?P<_tail>.*?))?\s*$")
+
+
+STATUS_LINE_RE = _compile_status_pattern()
+_DECODERS: Tuple[Tuple[str, Callable[[str], Any]], ...] = tuple(
+    (name, _TYPE_DECODERS[kind]) for name, kind, _ in STATUS_FIELDS
+)
+
+
+class StatusFrame:
+    """Immutable typed view of one ``STATUS`` reply.
+
+    Optional fields absent from the line are ``None``. Every frame gets a process-wide
+    increasing ``seq`` so consumers can tell whether they already handled it, and the
+    derived views below are computed at most once per frame.
+    """
+
+    __slots__ = STATUS_FIELD_NAMES + ("extra", "seq", "_views")
+
+    def __init__(
+        self,
+        values: Mapping[str, Any],
+        extra: Optional[Mapping[str, Any]] = None,
+        *,
+        seq: Optional[int] = None,
+    ) -> None:
+        setter = object.__setattr__
+        for name in STATUS_FIELD_NAMES:
+            setter(self, name, values.get(name))
+        setter(self, "extra", MappingProxyType(dict(extra) if extra else {}))
+        setter(self, "seq", next(_FRAME_SEQ) if seq is None else seq)
+        setter(self, "_views", {})
+
+    @classmethod
+    def from_mapping(
+        cls,
+        data: Mapping[str, Any],
+        *,
+        base: Optional["StatusFrame"] = None,
+    ) -> "StatusFrame":
+        """Build a frame from generically parsed ``key=value`` data, layered over ``base``."""
+
+        values: Dict[str, Any] = {}
+        extra: Dict[str, Any] = {}
+        if base is not None:
+            values = {name: getattr(base, name) for name in STATUS_FIELD_NAMES}
+            extra = dict(base.extra)
+        for key, value in data.items():
+            if key in _FIELD_SET:
+                values[key] = value
+            else:
+                extra[key] = value
+        return cls(values, extra)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("StatusFrame is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError("StatusFrame is immutable")
+
+    def __contains__(self, key: object) -> bool:
+        if key in _FIELD_SET:
+            return getattr(self, key) is not None  # type: ignore[arg-type]
+        return key in self.extra
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Mapping-style lookup over schema fields and ``extra``."""
+
+        if key in _FIELD_SET:
+            value = getattr(self, key)
+            return default if value is None else value
+        return self.extra.get(key, default)
+
+    def _view(self, key: str, compute: Callable[[], Any]) -> Any:
+        views = self._views
+        try:
+            return views[key]
+        except KeyError:
+            value = views[key] = compute()
+            return value
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the ``key=value`` mapping the generic parser would have produced."""
+
+        return dict(self._view("dict", self._build_dict))
+
+    def _build_dict(self) -> Dict[str, Any]:
+        data: Dict[str, Any] = {}
+        for name in STATUS_FIELD_NAMES:
+            value = getattr(self, name)
+            if value is not None:
+                data[name] = value
+        data.update(self.extra)
+        return data
+
+    @property
+    def wifi_address(self) -> Optional[str]:
+        """IP reported by the ESP32 station interface, ``None`` when not assigned."""
+
+        def compute() -> Optional[str]:
+            candidate = self.wifi_ip or self.extra.get("wifi_ip_addr")
+            text = str(candidate or "").strip()
+            return text or None
+
+        return self._view("wifi_address", compute)
+
+    @property
+    def camera_streaming(self) -> bool:
+        def compute() -> bool:
+            value = self.cam_streaming
+            return value if isinstance(value, bool) else str(value).lower() == "true"
+
+        return self._view("camera_streaming", compute)
+
+    @property
+    def camera_snapshot_url(self) -> Optional[str]:
+        """Snapshot endpoint served by the ESP32 camera task, if it is streaming."""
+
+        def compute() -> Optional[str]:
+            ip = self.wifi_address
+            if not ip or not self.camera_streaming:
+                return None
+            return f"http://{ip}/camera/snapshot"
+
+        return self._view("camera_snapshot_url", compute)
+
+    @property
+    def uno_health(self) -> Mapping[str, Any]:
+        """UNO link summary: I2C errors surface as ``status_error``."""
+
+        def compute() -> Mapping[str, Any]:
+            return MappingProxyType(
+                {
+                    "connected": self.status_error is None,
+                    "error": self.status_error,
+                    "state_id": self.state_id,
+                    "err_flags": self.err_flags,
+                    "seq_ack": self.seq_ack,
+                }
+            )
+
+        return self._view("uno_health", compute)
+
+    def __repr__(self) -> str:  # pragma: no cover - debugging helper
+        return f"StatusFrame(seq={self.seq}, {self.as_dict()!r})"
+
+
+def decode_status_line(
+    line: str,
+    fallback: Optional[Callable[[str], Dict[str, Any]]] = None,
+) -> Optional[StatusFrame]:
+    """Decode a single ``STATUS`` line or return ``None`` when it does not match the schema.
+
+    ``fallback`` parses any trailing ``key=value`` pairs the schema does not cover.
+    """
+
+    match = STATUS_LINE_RE.match(line)
+    if match is None:
+        return None
+    tokens = match.groups()
+    values = {
+        name: decode(token)
+        for (name, decode), token in zip(_DECODERS, tokens)
+        if token is not None
+    }
+    tail = tokens[-1]
+    extra: Optional[Dict[str, Any]] = None
+    if tail:
+        if fallback is None:
+            return None
+        extra = fallback(tail)
+    return StatusFrame(values, extra)
+
+
+__all__ = [
+    "STATUS_FIELDS",
+    "STATUS_FIELD_NAMES",
+    "STATUS_LINE_RE",
+    "StatusFrame",
+    "decode_status_line",
+]
@@ -2,16 +2,21 @@
 from __future__ import annotations
 
 import asyncio
+import json
 from types import SimpleNamespace
-from typing import Any, AsyncGenerator
+from typing import Any, AsyncGenerator, AsyncIterator
 
 import pytest
 import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
 
 from backend.operator import app
-from backend.operator.esp32_link import CommandResult, SerialNotFoundError
-from backend.operator.services import dependencies
+from backend.operator.esp32_link import CommandError, CommandResult, SerialNotFoundError
+from backend.operator.services import dependencies, operator_service
+from backend.operator.services.odometry import ReplayError
+from backend.operator.services.operator_service import OperatorService, TRANSPORT_WIFI
+from backend.operator.services.telemetry_capture import CaptureBuffer, CaptureError, TelemetryCapture
+from backend.operator.services.telemetry_history import TelemetryHistory
 
 
 class _StubService:
@@ -36,6 +41,27 @@ class _StubService:
             data = {}
         return CommandResult(raw=["OK"], data=data)
 
+    async def stream_command(self, command: str, *, raise_on_error: bool = False) -> AsyncIterator[tuple[str, Any]]:
+        self._command_log.append((command, raise_on_error))
+        yield "line", "i2c_device=0x12"
+        yield "line", "i2c_uno_found=true"
+        yield "result", CommandResult(raw=["i2c_device=0x12", "i2c_uno_found=true"], data={"i2c_uno_found": True})
+
+    async def run_sequence(self, steps: list[dict[str, Any]]) -> dict[str, Any]:
+        results = []
+        for step in steps:
+            self._command_log.append((step["command"], step["raise_on_error"]))
+            results.append(
+                {
+                    "command": step["command"],
+                    "ok": True,
+                    "skipped": False,
+                    "error": None,
+                    "result": CommandResult(raw=["OK"], data={}),
+                }
+            )
+        return {"transport": "serial", "results": results}
+
     async def camera_get_config(self) -> dict[str, Any]:
         return dict(self._camera_config)
 
@@ -75,8 +101,35 @@ class _StubService:
     async def get_recent_logs(self, limit: int = 200) -> list[dict[str, Any]]:  # type: ignore[override]
         return [{"id": "1", "timestamp": 0.0, "parameter": "stub", "value": "ok"}]
 
-    async def register_client(self) -> asyncio.Queue[dict[str, Any]]:  # pragma: no cover - WS only
-        return asyncio.Queue()
+    async def capture_telemetry(
+        self, *, duration: float, rate: float | None = None, fields: list[str] | None = None
+    ) -> TelemetryCapture:
+        if fields and "wifi_ip" in fields:
+            raise CaptureError("unknown telemetry fields: wifi_ip")
+        buffer = CaptureBuffer(fields or ["elev_mm"], capacity=2)
+        buffer.append(10.0, 100, {"elev_mm": 5})
+        buffer.append(10.02, 120, {"elev_mm": 6})
+        return TelemetryCapture(buffer, {"rate_hz": 50.0})
+
+    def telemetry_history(self, **kwargs: Any) -> dict[str, Any]:
+        history = TelemetryHistory(["elev_mm", "vbatt_mV"])
+        for index in range(50):
+            history.ingest(100.0 + index, {"elev_mm": index, "vbatt_mV": 7400})
+        return history.query(**kwargs)
+
+    def odometry(self) -> dict[str, Any]:
+        return {"x_mm": 120.0, "y_mm": 0.0, "theta_rad": 0.0, "v_mm_s": 200.0}
+
+    def reset_odometry(self, **pose: float) -> dict[str, Any]:
+        return {**self.odometry(), **pose}
+
+    def replay_odometry(self, configs: list[Any], *, points: int = 200) -> dict[str, Any]:
+        if len(configs) > 1:
+            raise ReplayError("no telemetry capture recorded yet")
+        return {"samples": 0, "runs": [{"config": vars(configs[0])}]}
+
+    async def serve_telemetry(self, websocket: Any) -> None:  # pragma: no cover - WS only
+        await asyncio.Event().wait()
 
 
 class _ErrorService(_StubService):
@@ -134,3 +187,128 @@ async def test_command_endpoint_handles_serial_errors() -> None:
 
     assert response.status_code == 503
     assert "serial" in response.json()["detail"]
+
+
+@pytest.mark.asyncio
+async def test_command_stream_endpoint_emits_ndjson_lines(client: AsyncClient) -> None:
+    response = await client.post("/api/command/stream", json={"command": "I2C SCAN"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert [event["type"] for event in events] == ["line", "line", "result"]
+    assert events[0]["line"] == "i2c_device=0x12"
+    assert events[-1]["data"] == {"i2c_uno_found": True}
+
+
+@pytest.mark.asyncio
+async def test_commands_endpoint_returns_every_step(client: AsyncClient) -> None:
+    response = await client.post(
+        "/api/commands",
+        json={"steps": [{"command": "SMAP SET R,G,B", "stop_on_failure": True}, {"command": "SMAP SAVE"}]},
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert body["transport"] == "serial"
+    assert [item["command"] for item in body["results"]] == ["SMAP SET R,G,B", "SMAP SAVE"]
+    assert all(item["ok"] and item["raw"] == ["OK"] for item in body["results"])
+
+    assert (await client.post("/api/commands", json={"steps": []})).status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_telemetry_capture_downloads_ndjson_or_binary(client: AsyncClient) -> None:
+    response = await client.post("/api/telemetry/capture", json={"duration": 1.0, "rate": 50})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    header, *rows = [json.loads(line) for line in response.text.splitlines()]
+    assert header["columns"] == ["t", "uptime_ms", "elev_mm"]
+    assert rows == [[10.0, 100, 5], [10.02, 120, 6]]
+
+    response = await client.post("/api/telemetry/capture", json={"duration": 1.0, "format": "binary"})
+    assert response.headers["content-type"] == "application/octet-stream"
+    assert response.content.startswith(b"OPTC")
+
+    assert (await client.post("/api/telemetry/capture", json={"duration": 0})).status_code == 422
+    response = await client.post("/api/telemetry/capture", json={"duration": 1.0, "fields": ["wifi_ip"]})
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_telemetry_history_endpoint_downsamples(client: AsyncClient) -> None:
+    response = await client.get("/api/telemetry/history", params={"fields": "elev_mm", "window": 30, "points": 40})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["tier"] == "raw" and body["method"] == "lttb"
+    assert list(body["series"]) == ["elev_mm"] and body["series"]["elev_mm"]["v"] == list(range(19, 50))
+
+    response = await client.get("/api/telemetry/history", params={"fields": "elev_mm,wifi_ip"})
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_odometry_endpoints(client: AsyncClient) -> None:
+    assert (await client.get("/api/odometry")).json()["x_mm"] == 120.0
+    assert (await client.post("/api/odometry/reset")).json()["x_mm"] == 0.0
+    response = await client.post("/api/odometry/reset", json={"x_mm": 50, "theta_rad": 1.5})
+    assert response.json()["x_mm"] == 50.0 and response.json()["theta_rad"] == 1.5
+
+    response = await client.post("/api/odometry/replay", json={"configs": [{"track_mm": 580}]})
+    assert response.status_code == 200
+    assert response.json()["runs"][0]["config"]["track_mm"] == 580.0
+    assert response.json()["runs"][0]["config"]["cpr"] == 192
+    response = await client.post("/api/odometry/replay", json={"configs": [{}, {"cpr": 200}]})
+    assert response.status_code == 409
+    assert (await client.post("/api/odometry/replay", json={"configs": [{"cpr": 0}]})).status_code == 422
+
+
+class RejectingLink:
+    """Answers every command with an ERR line, like the Wi-Fi link does."""
+
+    def __init__(self, endpoint: str) -> None:
+        self.requested_port = endpoint
+        self.active_port = endpoint
+        self.commands: list[str] = []
+
+    def run_command(self, command: str, *, raise_on_error: bool = True, **_: object) -> CommandResult:
+        self.commands.append(command)
+        if raise_on_error:
+            raise CommandError("ERR unknown command")
+        return CommandResult(raw=["ERR unknown command"], data={})
+
+    def collect_pending_logs(self) -> list[tuple[float, str]]:  # pragma: no cover - compatibility
+        return []
+
+    def close(self) -> None:  # pragma: no cover - compatibility
+        pass
+
+
+@pytest.mark.asyncio
+async def test_error_replies_from_the_service_are_not_failed_over(monkeypatch: pytest.MonkeyPatch) -> None:
+    wifi, serial = RejectingLink("ws://stub"), RejectingLink("socket://stub")
+    monkeypatch.setattr(operator_service, "load_wifi_config", lambda: {})
+    monkeypatch.setattr(operator_service, "save_wifi_config", lambda config: None)
+    monkeypatch.setattr(operator_service, "save_last_endpoint", lambda endpoint: None)
+    monkeypatch.setattr(operator_service, "ESP32WSLink", lambda *_, **__: wifi)
+    monkeypatch.setattr(operator_service, "ESP32Link", lambda *_, **__: serial)
+    service = OperatorService(port="socket://stub", ws_endpoint="ws://stub", control_transport="auto")
+    service._set_active_transport(TRANSPORT_WIFI)
+
+    async def _override() -> OperatorService:
+        return service
+
+    app.dependency_overrides[dependencies.get_service] = _override
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://testserver") as client:
+            body = {"command": "START", "raise_on_error": True}
+            response = await client.post("/api/command/stream", json=body)
+            assert response.status_code == 200
+            assert [json.loads(line) for line in response.text.splitlines()] == [
+                {"type": "error", "error": "ERR unknown command"}
+            ]
+            response = await client.post("/api/command", json=body)
+            assert response.status_code == 502 and response.json()["detail"] == "ERR unknown command"
+    finally:
+        app.dependency_overrides.pop(dependencies.get_service, None)
+
+    # The device answered, so START never runs a second time on the other transport.
+    assert wifi.commands == ["START", "START"] and serial.commands == []
@@ -0,0 +1,58 @@
+"""Tests for benchmark summaries and baseline comparison."""
+from __future__ import annotations
+
+import math
+
+import pytest
+
+from backend.operator.benchmarks.stats import (
+    compare_results,
+    latency_summary,
+    metric_direction,
+    percentile,
+    regressions,
+)
+
+
+def test_percentile_interpolates_and_summary_uses_milliseconds() -> None:
+    assert percentile([1.0, 2.0, 3.0, 4.0], 50) == pytest.approx(2.5)
+    assert percentile([5.0], 99) == 5.0
+    assert math.isnan(percentile([], 50))
+
+    summary = latency_summary([0.003, 0.001, 0.002])
+    assert summary["count"] == 3
+    assert summary["p50_ms"] == pytest.approx(2.0)
+    assert summary["max_ms"] == pytest.approx(3.0)
+    assert latency_summary([]) == {"count": 0}
+
+
+def test_compare_results_respects_metric_direction_and_noise_floor() -> None:
+    baseline = {
+        "results": {
+            "command_rtt": {"wifi": {"status": {"p50_ms": 10.0, "count": 50}}},
+            "status_poll": {"wifi": {"polls_per_s": 100.0}},
+            "api_status": {"c1": {"p99_ms": 0.5}},
+            "startup": {"serial": {"ready_s": 1.0}},
+        }
+    }
+    current = {
+        "results": {
+            "command_rtt": {"wifi": {"status": {"p50_ms": 15.0, "count": 10}}},
+            "status_poll": {"wifi": {"polls_per_s": 150.0}},
+            "api_status": {"c1": {"p99_ms": 0.9}},
+            "startup": {"serial": {"ready_s": 1.1}},
+        }
+    }
+
+    findings = {finding.metric: finding.status for finding in compare_results(current, baseline)}
+
+    assert findings["command_rtt.wifi.status.p50_ms"] == "regression"
+    assert findings["status_poll.wifi.polls_per_s"] == "improvement"
+    # +80% but under the 1 ms floor: noise, not a regression.
+    assert findings["api_status.c1.p99_ms"] == "ok"
+    assert findings["startup.serial.ready_s"] == "ok"
+    assert "command_rtt.wifi.status.count" not in findings
+    assert metric_direction("camera.viewers_1.mean_fps") == "higher"
+    assert [finding.metric for finding in regressions(compare_results(current, baseline))] == [
+        "command_rtt.wifi.status.p50_ms"
+    ]
@@ -110,7 +110,7 @@ async def test_diagnostics_marks_camera_configured_when_stream_disabled(monkeypa
 
     service_instance = operator_service.OperatorService(port="socket://stub", control_transport="serial")
 
-    async def fake_run_command(self, command: str, *, raise_on_error: bool = True):
+    async def fake_run_command(self, command: str, *, raise_on_error: bool = True, **_: object):
         normalized = command.strip().upper()
         if normalized == "STATUS":
             return CommandResult(
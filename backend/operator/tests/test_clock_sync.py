@@ -0,0 +1,42 @@
+"""Tests for the ESP32 uptime to host clock estimator."""
+from __future__ import annotations
+
+import pytest
+
+from backend.operator.clock_sync import DeviceClock
+
+
+def test_min_rtt_sample_defines_offset() -> None:
+    clock = DeviceClock()
+    # True offset: host = uptime + 1000 s. The slow reply widens the bracket only.
+    clock.observe_round_trip(1005.000, 1005.400, 5_100)
+    clock.observe_round_trip(1006.000, 1006.010, 6_005)
+
+    assert clock.synced
+    assert clock.to_host(6_005) == pytest.approx(1006.005, abs=0.006)
+    assert clock.snapshot()["min_rtt_ms"] == pytest.approx(10.0)
+
+
+def test_drift_is_estimated_across_epochs() -> None:
+    clock = DeviceClock(epoch_s=10)
+    drift = 100e-6  # ESP32 crystal runs 100 ppm slow relative to the host
+    for uptime_s in range(0, 200, 10):
+        host = 500.0 + uptime_s * (1 + drift)
+        clock.observe_round_trip(host - 0.002, host + 0.002, uptime_s * 1000)
+
+    snapshot = clock.snapshot()
+    assert snapshot["drift_ppm"] == pytest.approx(100.0, abs=5.0)
+    assert clock.to_host(300_000) == pytest.approx(500.0 + 300 * (1 + drift), abs=0.005)
+
+
+def test_heartbeat_only_sync_and_reboot_reset() -> None:
+    clock = DeviceClock()
+    assert clock.to_host(1_000) is None
+
+    clock.observe_one_way(2000.0, 50_000)
+    assert clock.synced
+
+    clock.observe_one_way(2010.0, 200)
+    snapshot = clock.snapshot()
+    assert snapshot["resets"] == 1
+    assert clock.to_host(200) == pytest.approx(2010.0)
@@ -0,0 +1,76 @@
+"""Tests for ordered command sequences run under one link reservation."""
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import pytest
+
+from backend.operator.esp32_link import CommandResult
+from backend.operator.services import operator_service
+from backend.operator.services.operator_service import OperatorService, TRANSPORT_SERIAL
+
+
+class ScriptedLink:
+    def __init__(self, replies: dict[str, list[str]]) -> None:
+        self.requested_port = "socket://stub"
+        self.active_port = "socket://stub"
+        self.replies = replies
+        self.commands: list[str] = []
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def run_command(self, command: str, **_: object) -> CommandResult:
+        self.gate.wait(2.0)
+        self.commands.append(command)
+        return CommandResult(raw=list(self.replies.get(command, ["OK"])), data={})
+
+    def collect_pending_logs(self) -> list[tuple[float, str]]:  # pragma: no cover - compatibility
+        return []
+
+    def close(self) -> None:  # pragma: no cover - compatibility
+        pass
+
+
+def _service(monkeypatch: pytest.MonkeyPatch, link: ScriptedLink) -> OperatorService:
+    monkeypatch.setattr(operator_service, "ESP32Link", lambda *_, **__: link)
+    return OperatorService(port="socket://stub", ws_endpoint=None, control_transport="serial")
+
+
+@pytest.mark.asyncio
+async def test_failed_step_with_stop_on_failure_skips_the_rest(monkeypatch: pytest.MonkeyPatch) -> None:
+    link = ScriptedLink({"SMAP SET X": ["error: bad grid"], "CAMCFG ?": ["ERR busy"]})
+    svc = _service(monkeypatch, link)
+
+    outcome = await svc.run_sequence(
+        [
+            {"command": "CAMCFG ?", "raise_on_error": False},
+            {"command": "SMAP SET X", "raise_on_error": True, "stop_on_failure": True},
+            {"command": "SMAP SAVE"},
+        ]
+    )
+
+    assert outcome["transport"] == TRANSPORT_SERIAL
+    results = outcome["results"]
+    assert [item["ok"] for item in results] == [True, False, False]
+    assert results[1]["error"] == "error: bad grid"
+    assert results[2]["skipped"] is True and results[2]["result"] is None
+    assert link.commands == ["CAMCFG ?", "SMAP SET X"]
+
+
+@pytest.mark.asyncio
+async def test_sequence_holds_the_link_until_it_finishes(monkeypatch: pytest.MonkeyPatch) -> None:
+    link = ScriptedLink({})
+    svc = _service(monkeypatch, link)
+    link.gate.clear()
+
+    sequence = asyncio.create_task(
+        svc.run_sequence([{"command": "CAMSTREAM OFF"}, {"command": "CAMCFG 5"}, {"command": "CAMSTREAM ON"}])
+    )
+    await asyncio.sleep(0.05)
+    brake = asyncio.create_task(svc.run_command("BRAKE"))
+    await asyncio.sleep(0.05)
+    link.gate.set()
+    await asyncio.gather(sequence, brake)
+
+    assert link.commands == ["CAMSTREAM OFF", "CAMCFG 5", "CAMSTREAM ON", "BRAKE"]
@@ -0,0 +1,112 @@
+"""Tests for streamed command output and the ``/ws/command`` channel."""
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+
+import pytest
+from fastapi import WebSocketDisconnect
+
+from backend.operator.esp32_link import CommandResult, reply_line_sink
+from backend.operator.services import operator_service
+from backend.operator.services.operator_service import OperatorService, TRANSPORT_SERIAL
+
+
+class StreamingLink:
+    """Pushes each reply line to the line sink before returning the whole reply."""
+
+    def __init__(self) -> None:
+        self.requested_port = "socket://stub"
+        self.active_port = "socket://stub"
+        self.gate = threading.Event()
+        self.commands: list[str] = []
+
+    def run_command(self, command: str, **_: object) -> CommandResult:
+        self.commands.append(command)
+        sink = reply_line_sink.get()
+        lines = [f"{command.lower()}_line={index}" for index in range(2)]
+        if sink is not None:
+            sink(lines[0])
+        if command == "I2C SCAN":
+            self.gate.wait(2.0)
+        if sink is not None:
+            sink(lines[1])
+        return CommandResult(raw=lines, data={})
+
+    def collect_pending_logs(self) -> list[tuple[float, str]]:  # pragma: no cover - compatibility
+        return []
+
+    def close(self) -> None:  # pragma: no cover - compatibility
+        pass
+
+
+class FakeSocket:
+    def __init__(self) -> None:
+        self.incoming: asyncio.Queue[str | None] = asyncio.Queue()
+        self.sent: list[dict] = []
+
+    async def receive_text(self) -> str:
+        text = await self.incoming.get()
+        if text is None:
+            raise WebSocketDisconnect()
+        return text
+
+    async def send_text(self, text: str) -> None:
+        self.sent.append(json.loads(text))
+
+    async def wait_for(self, request_id: object, kind: str) -> dict:
+        for _ in range(200):
+            for message in self.sent:
+                if message["id"] == request_id and message["type"] == kind:
+                    return message
+            await asyncio.sleep(0.01)
+        raise AssertionError(f"no {kind} for {request_id!r}: {self.sent}")
+
+
+@pytest.mark.asyncio
+async def test_commands_in_flight_stream_lines_and_reply_by_id(monkeypatch: pytest.MonkeyPatch) -> None:
+    link = StreamingLink()
+    monkeypatch.setattr(operator_service, "ESP32Link", lambda *_, **__: link)
+    svc = OperatorService(port="socket://stub", ws_endpoint=None, control_transport="serial")
+    socket = FakeSocket()
+    channel = asyncio.create_task(svc.serve_command_channel(socket))
+
+    await socket.incoming.put(json.dumps({"id": 1, "command": "I2C SCAN"}))
+    assert (await socket.wait_for(1, "line"))["line"] == "i2c scan_line=0"
+    await socket.incoming.put(json.dumps({"id": 1, "command": "STATUS"}))
+    await socket.incoming.put(json.dumps({"id": "brake", "command": "BRAKE"}))
+    await socket.incoming.put("not json")
+    assert (await socket.wait_for(1, "error"))["error"] == "a command with this id is still running"
+
+    link.gate.set()
+    brake = await socket.wait_for("brake", "result")
+    scan = await socket.wait_for(1, "result")
+    await socket.incoming.put(None)
+    with pytest.raises(WebSocketDisconnect):
+        await channel
+
+    assert brake["raw"] == ["brake_line=0", "brake_line=1"]
+    assert scan["transport"] == TRANSPORT_SERIAL
+    assert link.commands == ["I2C SCAN", "BRAKE"]
+    for_scan = [message["type"] for message in socket.sent if message["id"] == 1]
+    assert for_scan == ["line", "error", "line", "result"]
+    assert {"id": None, "type": "error", "error": "message is not valid JSON"} in socket.sent
+
+
+@pytest.mark.asyncio
+async def test_stream_command_yields_first_line_before_completion(monkeypatch: pytest.MonkeyPatch) -> None:
+    link = StreamingLink()
+    monkeypatch.setattr(operator_service, "ESP32Link", lambda *_, **__: link)
+    svc = OperatorService(port="socket://stub", ws_endpoint=None, control_transport="serial")
+
+    events = svc.stream_command("I2C SCAN")
+    assert await asyncio.wait_for(anext(events), 1.0) == ("line", "i2c scan_line=0")
+    link.gate.set()
+    rest = [event async for event in events]
+    assert rest[0] == ("line", "i2c scan_line=1")
+    assert rest[-1][0] == "result" and len(rest) == 2
+
+    # Replies delivered in one piece are replayed as lines before the result.
+    link.run_command = lambda command, **_: CommandResult(raw=["[TLM] st=0", "caps=status_bin"], data={})
+    assert [event async for event in svc.stream_command("caps")][0] == ("line", "caps=status_bin")
@@ -0,0 +1,121 @@
+"""Tests for reply deadlines derived from observed round-trip times."""
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from backend.operator.esp32_link import CommandResult, ReplyTimeoutError, SerialNotFoundError
+from backend.operator.services import operator_service
+from backend.operator.services.command_timeouts import CommandTimeouts, reply_latency
+from backend.operator.services.operator_service import OperatorService, TRANSPORT_SERIAL, TRANSPORT_WIFI
+
+
+def test_timeout_slow_starts_then_tracks_p99_with_backoff() -> None:
+    timeouts = CommandTimeouts(ceiling=5.0, floor=0.25)
+    assert timeouts.timeout("wifi", "status") == pytest.approx(5.0)
+    assert timeouts.timeout("wifi", "caps", initial=1.5) == pytest.approx(1.5)
+
+    for _ in range(20):
+        timeouts.observe("wifi", "STATUS", 0.02)
+    assert timeouts.learned("wifi", "status")
+    assert timeouts.timeout("wifi", "status") == pytest.approx(0.25)
+    assert not timeouts.learned("serial", "status")
+
+    for _ in range(20):
+        timeouts.observe("serial", "smap get", 0.4)
+    assert timeouts.timeout("serial", "smap get") == pytest.approx(0.8)
+    timeouts.record_timeout("serial", "smap get")
+    assert timeouts.timeout("serial", "smap get") == pytest.approx(1.6)
+    timeouts.observe("serial", "smap get", 0.4)
+    assert timeouts.timeout("serial", "smap get") == pytest.approx(0.8)
+
+    for vx in range(10):
+        timeouts.observe("serial", f"CTRL DRIVE vx={vx} t=300", 0.01)
+    assert timeouts.learned("serial", "ctrl drive vx=250 t=300")
+
+    snapshot = timeouts.snapshot("serial")
+    assert snapshot["smap get"]["timeouts"] == 1
+    assert snapshot["smap get"]["p99_ms"] == pytest.approx(400.0)
+
+
+def test_reply_latency_ignores_mirrored_log_lines() -> None:
+    result = CommandResult(
+        raw=["caps=status_bin", "[TLM] st=0"],
+        data={},
+        sent_at=100.0,
+        line_times=[100.01, 100.5],
+    )
+    assert reply_latency(result) == pytest.approx(0.01)
+    assert reply_latency(result, since=100.005) == pytest.approx(0.005)
+    assert reply_latency(CommandResult(raw=["[TLM] st=0"], data={}, sent_at=100.0, line_times=[100.5])) is None
+
+
+class TimedLink:
+    def __init__(self, endpoint: str, *, silent: bool = False) -> None:
+        self.requested_port = endpoint
+        self.active_port = endpoint
+        self.silent = silent
+        self.error: Exception | None = None
+        self.timeouts: list[object] = []
+
+    def run_command(self, command: str, *, timeout: object = None, **_: object) -> CommandResult:
+        self.timeouts.append(timeout)
+        if self.error is not None:
+            raise self.error
+        sent_at = time.time()
+        if self.silent:
+            return CommandResult(raw=[], data={}, sent_at=sent_at, line_times=[])
+        return CommandResult(raw=["ok"], data={"ok": 1}, sent_at=sent_at, line_times=[sent_at + 0.01])
+
+    def collect_pending_logs(self) -> list[tuple[float, str]]:  # pragma: no cover - compatibility
+        return []
+
+    def close(self) -> None:  # pragma: no cover - compatibility
+        pass
+
+
+@pytest.mark.asyncio
+async def test_silent_link_fails_over_once_deadline_is_learned(monkeypatch: pytest.MonkeyPatch) -> None:
+    wifi = TimedLink("ws://stub")
+    serial = TimedLink("socket://stub")
+    monkeypatch.setattr(operator_service, "load_wifi_config", lambda: {})
+    monkeypatch.setattr(operator_service, "save_wifi_config", lambda config: None)
+    monkeypatch.setattr(operator_service, "save_last_endpoint", lambda endpoint: None)
+    monkeypatch.setattr(operator_service, "ESP32WSLink", lambda *_, **__: wifi)
+    monkeypatch.setattr(operator_service, "ESP32Link", lambda *_, **__: serial)
+    monkeypatch.setenv("OPERATOR_HEDGING", "0")
+    svc = OperatorService(port="socket://stub", ws_endpoint="ws://stub", control_transport="auto", timeout=3.0)
+    svc._set_active_transport(TRANSPORT_WIFI)
+
+    for _ in range(10):
+        await svc.run_command("SMAP GET")
+    assert wifi.timeouts[0] == pytest.approx(3.0)
+    assert wifi.timeouts[-1] == pytest.approx(0.25)
+
+    wifi.silent = True
+    result = await svc.run_command("SMAP GET")
+    assert result.data == {"ok": 1}
+    assert svc._active_transport == TRANSPORT_SERIAL
+    transports = {item["id"]: item for item in svc.get_control_state()["transports"]}
+    assert transports[TRANSPORT_WIFI]["available"] is False
+    assert transports[TRANSPORT_WIFI]["timeouts"]["smap get"]["timeouts"] == 1
+    assert "within 0.25s" in transports[TRANSPORT_WIFI]["last_error"]
+
+
+@pytest.mark.asyncio
+async def test_only_expired_deadlines_count_as_timeouts(monkeypatch: pytest.MonkeyPatch) -> None:
+    serial = TimedLink("socket://stub")
+    monkeypatch.setattr(operator_service, "load_wifi_config", lambda: {})
+    monkeypatch.setattr(operator_service, "ESP32Link", lambda *_, **__: serial)
+    svc = OperatorService(port="socket://stub", ws_endpoint=None, control_transport="serial")
+
+    serial.error = SerialNotFoundError("could not open port /dev/ttyUSB0")
+    with pytest.raises(SerialNotFoundError):
+        await svc.run_command("SMAP GET")
+    assert svc._timeouts.snapshot(TRANSPORT_SERIAL).get("smap get", {}).get("timeouts", 0) == 0
+
+    serial.error = ReplyTimeoutError("timed out")
+    with pytest.raises(ReplyTimeoutError):
+        await svc.run_command("SMAP GET")
+    assert svc._timeouts.snapshot(TRANSPORT_SERIAL)["smap get"]["timeouts"] == 1
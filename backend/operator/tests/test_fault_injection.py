@@ -0,0 +1,118 @@
+"""Tests for the fault-injecting link wrapper and the failover summary."""
+from __future__ import annotations
+
+from typing import List
+
+import pytest
+
+from backend.operator.benchmarks.failover import summarize_window
+from backend.operator.esp32_link import CommandResult, SerialNotFoundError
+from backend.operator.fault_injection import Fault, FaultInjectingLink, FaultPlan
+from backend.operator.link_capture import unwrap_link
+
+
+class _Link:
+    def __init__(self) -> None:
+        self.commands: List[str] = []
+        self.active_port = "/dev/fake"
+
+    def run_command(self, command, *, timeout=None, raise_on_error=True, parser=None):
+        self.commands.append(command)
+        lines = ["[CLI] RX: status", "st=0 err=0x0000 uptime_ms=1200", "[TLM] tick"]
+        return CommandResult(raw=lines, data={"st": 0}, sent_at=10.0, line_times=[10.1, 10.2, 10.3])
+
+    def collect_pending_logs(self):
+        return [(10.0, "[TLM] one"), (10.1, "[TLM] two")]
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+        self.slept: List[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.slept.append(seconds)
+
+
+def _wrap(*faults: Fault) -> tuple[FaultInjectingLink, _Link, _Clock]:
+    clock = _Clock()
+    inner = _Link()
+    return FaultInjectingLink(inner, faults, epoch=1000.0, seed=7, clock=clock, sleep=clock.sleep), inner, clock
+
+
+def test_faults_follow_their_window() -> None:
+    link, inner, clock = _wrap(Fault("disconnect", start_s=5.0, duration_s=2.0))
+
+    assert link.run_command("status").raw[1].startswith("st=0")
+    clock.now = 1005.5
+    with pytest.raises(SerialNotFoundError):
+        link.run_command("status")
+    with pytest.raises(SerialNotFoundError):
+        link.collect_pending_logs()
+    clock.now = 1007.0
+    assert link.run_command("status").data == {"st": 0}
+    assert inner.commands == ["status", "status"]
+    assert link.injected["disconnect"] == 2
+    assert link.active_port == "/dev/fake"
+    assert unwrap_link(link) is inner
+
+
+def test_stall_loss_and_latency_cost_time() -> None:
+    link, inner, clock = _wrap(Fault("stall", delay_s=3.0))
+    with pytest.raises(SerialNotFoundError, match="stalled"):
+        link.run_command("status")
+    assert clock.slept == [3.0] and inner.commands == []
+
+    link, inner, clock = _wrap(Fault("loss"))
+    with pytest.raises(SerialNotFoundError, match="reply lost"):
+        link.run_command("status", timeout=0.8)
+    # The device executed the command; only the reply went missing.
+    assert inner.commands == ["status"] and clock.slept == [0.8]
+
+    link, _, clock = _wrap(Fault("latency", delay_s=0.2, jitter_s=0.05))
+    link.run_command("status")
+    assert 0.15 <= clock.slept[0] <= 0.25
+
+
+def test_truncate_and_line_loss_rewrite_the_reply() -> None:
+    link, _, _ = _wrap(Fault("truncate"))
+    result = link.run_command("status")
+    assert result.raw == ["[CLI] RX: status", "st=0 err=0x0000"]
+    assert result.line_times == [10.1, 10.2]
+    assert result.status is None
+
+    link, _, _ = _wrap(Fault("line_loss", probability=1.0))
+    assert link.run_command("status").raw == []
+    assert link.collect_pending_logs() == []
+
+
+def test_plan_round_trips_and_filters_by_transport(tmp_path) -> None:
+    plan = FaultPlan(
+        epoch=50.0,
+        faults=[Fault("stall", transport="wifi"), Fault("latency", delay_s=0.1)],
+        seed=3,
+    )
+    plan.save(tmp_path / "plan.json")
+    loaded = FaultPlan.load(tmp_path / "plan.json")
+
+    assert loaded == plan
+    assert [fault.kind for fault in loaded.for_transport("serial")] == ["latency"]
+    with pytest.raises(ValueError):
+        Fault("meteor")
+
+
+def test_summarize_window_measures_detection_and_recovery() -> None:
+    telemetry = [(99.0, True), (101.0, False), (102.0, False), (103.5, True), (104.5, True)]
+    control = [(99.5, "wifi", True), (101.5, "wifi", False), (103.0, "serial", True)]
+
+    summary = summarize_window(telemetry, control, transport="wifi", start=100.0, end=110.0)
+
+    assert summary["healthy_before"] is True
+    assert summary["detect_s"] == pytest.approx(1.0)
+    assert summary["recover_s"] == pytest.approx(3.5)
+    assert summary["max_gap_s"] == pytest.approx(5.5)
+    assert summary["telemetry_errors"] == 2
+    assert summary["failed_over"] == 1
@@ -0,0 +1,98 @@
+"""Tests for link traffic capture and replay."""
+from __future__ import annotations
+
+import json
+import time
+from pathlib import Path
+
+import pytest
+
+from backend.operator.esp32_link import CommandError, ESP32Link, SerialNotFoundError
+from backend.operator.link_capture import CaptureWriter, RecordingLink, ReplayLink, load_capture
+from backend.operator.simulator import ESP32Simulator, SimulatorConfig
+
+
+def test_serial_session_round_trips_through_capture(tmp_path: Path) -> None:
+    capture = tmp_path / "serial.rbmcap"
+    with ESP32Simulator(SimulatorConfig(baudrate=921600), websocket=False, http=False) as sim:
+        link = ESP32Link(port=sim.serial_port, timeout=0.3, silence_gap=0.1, binary_status=True)
+        writer = CaptureWriter(capture, transport="serial", endpoint=sim.serial_port)
+        recorder = RecordingLink(link, writer)
+        try:
+            live_status = recorder.run_command("status")
+            live_caps = recorder.run_command("caps")
+            live_ctrl = recorder.run_command("ctrl fly")
+            sim.firmware.log_line("[TEST] marker")
+            time.sleep(0.1)
+            live_logs = recorder.collect_pending_logs()
+        finally:
+            recorder.close()
+            writer.close()
+
+    (session,) = load_capture(capture)
+    assert session.transport == "serial"
+    assert [event[1] for event in session.events].count("c") == 3
+
+    replay = ReplayLink(capture, speed=None)
+    status = replay.run_command("STATUS")
+    assert status.status is not None
+    assert status.status.as_dict() == live_status.status.as_dict()
+    assert replay.run_command("caps").raw == live_caps.raw
+    assert replay.run_command("ctrl fly").data == live_ctrl.data
+    assert live_ctrl.data["ctrl_error"] == "UNKNOWN_TARGET"
+    assert [line for _, line in replay.collect_pending_logs()] == [line for _, line in live_logs]
+    assert any("[TEST] marker" in line for _, line in live_logs)
+    with pytest.raises(SerialNotFoundError):
+        replay.run_command("status")
+    assert replay.exhausted
+
+
+def _write_capture(path: Path) -> None:
+    events = [
+        {"capture": 1, "transport": "wifi", "endpoint": "ws://robot/ws/cli", "wall": 1000.0},
+        [0.0, "c", 1, "caps"],
+        [0.01, "r", 1, ["caps=status_bin"], [0.01]],
+        [0.05, "h", 1500, 7],
+        [0.1, "c", 2, "status"],
+        [0.3, "r", 2, ["ERR CLI_LOCK_TIMEOUT"], [0.2]],
+        [0.4, "l", [[0.35, "[CLI] RX: status"]]],
+        [0.5, "c", 3, "status"],
+    ]
+    path.write_text("\n".join(json.dumps(item) for item in events) + "\n[0.6,", encoding="utf-8")
+
+
+def test_replay_paces_the_recorded_timeline(tmp_path: Path) -> None:
+    capture = tmp_path / "wifi.rbmcap"
+    _write_capture(capture)
+
+    replay = ReplayLink(capture, speed=2.0)
+    assert replay.collect_pending_logs() == []
+    started = time.monotonic()
+    # Skips "caps"; the reply landed at t=0.3, i.e. 0.15 s at 2x.
+    result = replay.run_command("status", raise_on_error=False)
+    elapsed = time.monotonic() - started
+    assert 0.12 <= elapsed < 0.5
+    assert result.raw == ["ERR CLI_LOCK_TIMEOUT"]
+    assert result.line_times[0] - result.sent_at == pytest.approx(0.1, abs=1e-3)
+    assert replay.heartbeat_sample is not None and replay.heartbeat_sample[1] == 1500
+    assert replay.logs_next_hint == 7
+
+    time.sleep(0.06)
+    assert [line for _, line in replay.collect_pending_logs()] == ["[CLI] RX: status"]
+    # The last command never got a reply before the recording stopped.
+    with pytest.raises(SerialNotFoundError):
+        replay.run_command("status")
+
+
+def test_fast_replay_raises_recorded_wifi_errors(tmp_path: Path) -> None:
+    capture = tmp_path / "wifi.rbmcap"
+    _write_capture(capture)
+
+    replay = ReplayLink(capture, speed=None)
+    started = time.monotonic()
+    with pytest.raises(CommandError):
+        replay.run_command("status")
+    assert time.monotonic() - started < 0.05
+    assert replay.uptime_ms == 1500
+    with pytest.raises(ValueError):
+        ReplayLink(capture, speed=0)
@@ -0,0 +1,126 @@
+"""Tests for the priority command scheduler in front of ESP32 links."""
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from backend.operator.esp32_link import CommandResult
+from backend.operator.link_capture import unwrap_link
+from backend.operator.link_scheduler import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+    PRIORITY_MOTION,
+    PRIORITY_POLLING,
+    PRIORITY_SAFETY,
+    CommandDropped,
+    ScheduledLink,
+    classify_command,
+)
+
+
+class GatedLink:
+    """Blocks the first command until released so a queue can build up behind it."""
+
+    def __init__(self) -> None:
+        self.gate = threading.Event()
+        self.started = threading.Event()
+        self.commands: list[str] = []
+
+    def run_command(self, command: str, **_: object) -> CommandResult:
+        self.commands.append(command)
+        if len(self.commands) == 1:
+            self.started.set()
+            self.gate.wait(5.0)
+        return CommandResult(raw=[command], data={})
+
+
+def _queue(link: ScheduledLink, command: str, **kwargs: object) -> threading.Thread:
+    thread = threading.Thread(target=lambda: link.run_command(command, **kwargs), daemon=True)
+    thread.start()
+    return thread
+
+
+def _wait_queued(link: ScheduledLink, count: int) -> None:
+    deadline = time.monotonic() + 2.0
+    while sum(item["queued"] for item in link.snapshot().values()) < count:
+        assert time.monotonic() < deadline
+        time.sleep(0.005)
+
+
+def test_commands_are_classified() -> None:
+    assert classify_command("brake") == PRIORITY_SAFETY
+    assert classify_command("CTRL 10 0 0") == PRIORITY_MOTION
+    assert classify_command("START") == PRIORITY_MOTION
+    assert classify_command("STATUS BIN") == PRIORITY_POLLING
+    assert classify_command("LOGS 0 64") == PRIORITY_BACKGROUND
+    assert classify_command("SMAP GET") == PRIORITY_INTERACTIVE
+
+
+def test_brake_overtakes_queued_commands_and_stats_are_kept() -> None:
+    inner = GatedLink()
+    link = ScheduledLink(inner)
+    assert unwrap_link(link) is inner
+
+    threads = [_queue(link, "I2C SCAN")]
+    assert inner.started.wait(2.0)
+    threads.append(_queue(link, "STATUS"))
+    threads.append(_queue(link, "caps", priority=PRIORITY_BACKGROUND))
+    threads.append(_queue(link, "CTRL 5 0 0"))
+    _wait_queued(link, 3)
+    threads.append(_queue(link, "BRAKE"))
+    _wait_queued(link, 4)
+    inner.gate.set()
+    for thread in threads:
+        thread.join(2.0)
+
+    assert inner.commands == ["I2C SCAN", "BRAKE", "CTRL 5 0 0", "STATUS", "caps"]
+    stats = link.snapshot()
+    assert stats[PRIORITY_SAFETY]["executed"] == 1
+    assert stats[PRIORITY_SAFETY]["wait_ms_max"] is not None
+    assert stats[PRIORITY_POLLING]["wait_ms_max"] >= stats[PRIORITY_SAFETY]["wait_ms_max"]
+    assert all(item["queued"] == 0 for item in stats.values())
+
+
+def test_stale_poll_is_dropped_without_being_sent() -> None:
+    inner = GatedLink()
+    link = ScheduledLink(inner)
+    blocker = _queue(link, "I2C SCAN")
+    assert inner.started.wait(2.0)
+
+    with pytest.raises(CommandDropped):
+        link.run_command("STATUS", stale_after=0.05)
+    inner.gate.set()
+    blocker.join(2.0)
+
+    assert inner.commands == ["I2C SCAN"]
+    assert link.snapshot()[PRIORITY_POLLING]["dropped"] == 1
+    assert link.run_command("STATUS", stale_after=0.05).raw == ["STATUS"]
+
+
+def test_cancelled_command_is_dropped_once_the_slot_frees() -> None:
+    inner = GatedLink()
+    link = ScheduledLink(inner)
+    blocker = _queue(link, "I2C SCAN")
+    assert inner.started.wait(2.0)
+
+    cancelled = threading.Event()
+    outcome: list[BaseException] = []
+
+    def loser() -> None:
+        try:
+            link.run_command("STATUS", cancelled=cancelled)
+        except CommandDropped as exc:
+            outcome.append(exc)
+
+    thread = threading.Thread(target=loser, daemon=True)
+    thread.start()
+    _wait_queued(link, 1)
+    cancelled.set()  # the race is lost while the leg waits for the link
+    inner.gate.set()
+    for item in (blocker, thread):
+        item.join(2.0)
+
+    assert inner.commands == ["I2C SCAN"] and len(outcome) == 1
+    assert link.snapshot()[PRIORITY_POLLING]["dropped"] == 1
@@ -0,0 +1,169 @@
+"""Tests for the sequence-keyed log ingest pipeline."""
+from __future__ import annotations
+
+from backend.operator.log_ingest import LogDump, LogSequencer, parse_log_dump
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _dump(entries: list[tuple[int, str]], next_seq: int | None = None) -> LogDump:
+    if next_seq is None:
+        next_seq = (entries[-1][0] + 1) if entries else 1
+    return LogDump(entries=list(entries), next_seq=next_seq, count=len(entries))
+
+
+def test_parse_log_dump_extracts_entries_and_summary() -> None:
+    dump = parse_log_dump(
+        [
+            "10|[ESP32] Boot",
+            "11|[WiFi] Connected | rssi=-40",
+            "[CLI] RX: logs since=9",
+            "logs_next=12 logs_count=2 logs_truncated=1",
+        ]
+    )
+
+    assert dump.entries == [(10, "[ESP32] Boot"), (11, "[WiFi] Connected | rssi=-40")]
+    assert dump.next_seq == 12
+    assert dump.count == 2
+    assert dump.truncated is True
+    assert dump.error is None
+
+
+def test_duplicate_sequence_numbers_are_dropped() -> None:
+    sequencer = LogSequencer(clock=_Clock())
+
+    first = sequencer.ingest_dump(_dump([(1, "a"), (2, "b")]), since=0, timestamp=1.0)
+    second = sequencer.ingest_dump(_dump([(2, "b"), (3, "c")]), since=1, timestamp=2.0)
+
+    assert [record.seq for record in first] == [1, 2]
+    assert [record.seq for record in second] == [3]
+    assert sequencer.cursor == 3
+    assert sequencer.stats["duplicates"] == 1
+
+
+def test_unsequenced_twin_of_sequenced_line_is_emitted_once() -> None:
+    clock = _Clock()
+    sequencer = LogSequencer(clock=clock, hold=0.5)
+    sequencer.ingest_dump(_dump([(1, "[ESP32] Boot")]), since=0, timestamp=1.0)
+
+    # UART mirror arrives after Wi-Fi delivered the same line.
+    late = sequencer.ingest_unsequenced([(1.1, "[ESP32] Boot")], source="serial")
+    assert late == []
+
+    # UART mirror arrives first and is held until the sequenced copy claims it.
+    early = sequencer.ingest_unsequenced([(2.0, "[CLI] RX: status")], source="serial")
+    assert early == []
+    claimed = sequencer.ingest_dump(_dump([(2, "[CLI] RX: status")]), since=1, timestamp=2.5)
+    assert [(record.seq, record.timestamp) for record in claimed] == [(2, 2.0)]
+
+    clock.now += 1.0
+    assert sequencer.release() == []
+
+
+def test_unmatched_unsequenced_lines_are_released_after_hold() -> None:
+    clock = _Clock()
+    sequencer = LogSequencer(clock=clock, hold=0.5)
+    sequencer.ingest_dump(_dump([(1, "a")]), since=0)
+
+    assert sequencer.ingest_unsequenced([(3.0, "Guru Meditation Error")]) == []
+    assert sequencer.release() == []
+
+    clock.now += 0.6
+    released = sequencer.release()
+    assert [record.text for record in released] == ["Guru Meditation Error"]
+
+
+def test_unsequenced_lines_pass_through_without_sequenced_feed() -> None:
+    sequencer = LogSequencer(clock=_Clock())
+
+    emitted = sequencer.ingest_unsequenced([(1.0, "[TLM] UNO offline")], source="serial")
+
+    assert [record.text for record in emitted] == ["[TLM] UNO offline"]
+    # A later sequenced copy of a line already shown is not repeated.
+    assert sequencer.ingest_dump(_dump([(7, "[TLM] UNO offline")]), since=0) == []
+
+
+def test_gaps_are_reported_and_filled() -> None:
+    sequencer = LogSequencer(clock=_Clock())
+    sequencer.ingest_dump(_dump([(1, "a"), (2, "b")]), since=0)
+    # A backfill request for an unrelated range reveals seq 3-4 missing.
+    sequencer.ingest_dump(_dump([(5, "e")]), since=4)
+
+    assert sequencer.gaps() == [(3, 4)]
+    assert sequencer.cursor == 2
+
+    filled = sequencer.ingest_dump(_dump([(3, "c"), (4, "d")]), since=2)
+    assert [record.seq for record in filled] == [3, 4]
+    assert sequencer.gaps() == []
+    assert sequencer.cursor == 5
+
+
+def test_lines_evicted_from_ring_are_reported() -> None:
+    sequencer = LogSequencer(clock=_Clock())
+    sequencer.ingest_dump(_dump([(1, "a")]), since=0)
+
+    records = sequencer.ingest_dump(_dump([(6, "f")]), since=1)
+
+    assert records[0].text == "[LOG] lost=4 first_seq=2 last_seq=5"
+    assert records[1].seq == 6
+    assert sequencer.stats["lost"] == 4
+    assert sequencer.cursor == 6
+
+
+def test_firmware_reboot_resets_cursor() -> None:
+    sequencer = LogSequencer(clock=_Clock())
+    sequencer.ingest_dump(_dump([(40, "x"), (41, "y")]), since=0)
+
+    assert sequencer.ingest_dump(LogDump(entries=[], next_seq=3, count=0), since=41) == []
+    assert sequencer.cursor == 0
+
+    records = sequencer.ingest_dump(_dump([(1, "[ESP32] Boot"), (2, "z")]), since=0)
+    assert [record.seq for record in records] == [1, 2]
+    assert sequencer.stats["resets"] == 1
+
+
+def test_fetch_log_dump_uses_timestamps_and_falls_back() -> None:
+    from backend.operator.esp32_link import CommandResult
+    from backend.operator.log_ingest import fetch_log_dump
+
+    commands: list[str] = []
+
+    def new_firmware(command: str, *, raise_on_error: bool = True) -> CommandResult:
+        commands.append(command)
+        raw = ["4|1500|[ESP32] Boot", "logs_next=5 logs_count=1 logs_truncated=0 logs_uptime_ms=1600"]
+        return CommandResult(raw=raw, data={}, sent_at=10.0, line_times=[10.01, 10.02])
+
+    dump, supported = fetch_log_dump(new_firmware, 3, 16, timestamps=None)
+    assert commands == ["logs since=3 limit=16 ts=1"]
+    assert supported is True
+    assert dump.entries == [(4, "[ESP32] Boot")]
+    assert dump.uptimes == {4: 1500}
+    assert (dump.uptime_ms, dump.sent_at, dump.received_at) == (1600, 10.0, 10.02)
+
+    def old_firmware(command: str, *, raise_on_error: bool = True) -> CommandResult:
+        commands.append(command)
+        if "ts=" in command:
+            return CommandResult(raw=["logs_error=SYNTAX"], data={})
+        return CommandResult(raw=["4|[ESP32] Boot", "logs_next=5 logs_count=1 logs_truncated=0"], data={})
+
+    commands.clear()
+    dump, supported = fetch_log_dump(old_firmware, 3, 16, timestamps=None)
+    assert commands == ["logs since=3 limit=16 ts=1", "logs since=3 limit=16"]
+    assert supported is False
+    assert dump.entries == [(4, "[ESP32] Boot")] and dump.uptimes == {}
+
+
+def test_aligned_timestamps_override_receive_time() -> None:
+    sequencer = LogSequencer(clock=_Clock())
+
+    records = sequencer.ingest_dump(
+        _dump([(1, "a"), (2, "b")]), since=0, timestamp=9.0, timestamps={1: 7.5}
+    )
+
+    assert [record.timestamp for record in records] == [7.5, 9.0]
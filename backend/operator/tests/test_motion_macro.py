@@ -0,0 +1,123 @@
+"""Tests for backend-scheduled motion macros."""
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any
+
+import pytest
+
+from backend.operator.esp32_link import CommandResult, SerialNotFoundError
+from backend.operator.services.motion_macro import (
+    MACRO_CANCELLED,
+    MACRO_DONE,
+    MACRO_FAILED,
+    MacroError,
+    MacroRun,
+    compile_macro,
+)
+
+
+class FakeRobot:
+    def __init__(self, fail: str | None = None) -> None:
+        self.fail = fail
+        self.sent: list[tuple[float, str]] = []
+        self.telemetry: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
+
+    async def run_step(self, command: str) -> CommandResult:
+        now = time.time()
+        self.sent.append((now, command))
+        target = command.split()[1].lower()
+        reply = f"ctrl_{target}=ERR busy" if command == self.fail else f"ctrl_{target}=OK"
+        return CommandResult(raw=[reply], data={}, sent_at=now)
+
+    async def brake(self) -> CommandResult:
+        self.sent.append((time.time(), "BRAKE"))
+        return CommandResult(raw=["BRAKE=OK"], data={})
+
+    async def execute(self, run: MacroRun) -> None:
+        await run.execute(run_step=self.run_step, brake=self.brake, telemetry=self.telemetry.get)
+
+
+def test_macros_are_validated_before_anything_is_sent() -> None:
+    steps = compile_macro([{"command": "ctrl  drive vx=100 t=300", "at_ms": 0}, {"command": "BRAKE", "when": "elev_mm>=120"}])
+    assert steps[0].command == "ctrl drive vx=100 t=300" and steps[0].at == 0.0
+    assert str(steps[1].condition) == "elev_mm >= 120"
+    for bad in (
+        [{"command": "REBOOT"}],
+        [{"command": "CTRL DRIVE vx=1", "at_ms": 100}, {"command": "BRAKE", "at_ms": 50}],
+        [{"command": "BRAKE", "when": "wifi_ip > 3"}],
+        [{"command": "BRAKE", "when": "elev_mm about 3"}],
+        [{"command": "BRAKE", "when": "elev_mm > 3", "timeout_ms": 0}],
+        [],
+    ):
+        with pytest.raises(MacroError):
+            compile_macro(bad)
+
+
+@pytest.mark.asyncio
+async def test_timed_and_conditional_steps_report_jitter() -> None:
+    robot = FakeRobot()
+    run = MacroRun(
+        compile_macro(
+            [
+                {"command": "CTRL DRIVE vx=100 t=500", "at_ms": 0},
+                {"command": "CTRL ELEV h=150", "at_ms": 50},
+                {"command": "CTRL GRIP cmd=1", "when": "elev_mm >= 120"},
+                {"command": "CTRL DRIVE vx=0 t=100", "at_ms": 100},
+            ]
+        )
+    )
+    task = asyncio.create_task(robot.execute(run))
+    await asyncio.sleep(0.07)
+    await robot.telemetry.put({"data": {"elev_mm": 80}, "timestamp": time.time()})
+    await asyncio.sleep(0.01)
+    assert len(robot.sent) == 2
+    await robot.telemetry.put({"data": {"elev_mm": 130}, "timestamp": time.time()})
+    await asyncio.wait_for(task, 1.0)
+
+    report = run.snapshot()
+    assert report["state"] == MACRO_DONE
+    assert [step["ok"] for step in report["steps"]] == [True] * 4
+    start = robot.sent[0][0]
+    assert robot.sent[1][0] - start == pytest.approx(0.05, abs=0.015)
+    assert robot.sent[3][0] - start == pytest.approx(0.1, abs=0.015)
+    assert report["jitter_ms_max"] < 15.0
+    assert report["steps"][2]["when"] == "elev_mm >= 120"
+
+
+@pytest.mark.asyncio
+async def test_failures_and_cancel_brake_and_skip_the_rest() -> None:
+    robot = FakeRobot(fail="CTRL ELEV h=150")
+    run = MacroRun(compile_macro([{"command": "CTRL ELEV h=150"}, {"command": "CTRL GRIP cmd=1"}]))
+    await robot.execute(run)
+    assert run.state == MACRO_FAILED and "not acknowledged" in (run.error or "")
+    assert [command for _, command in robot.sent] == ["CTRL ELEV h=150", "BRAKE"]
+    assert run.snapshot()["steps"][1]["skipped"] is True
+
+    robot = FakeRobot()
+    run = MacroRun(compile_macro([{"command": "CTRL GRIP cmd=1", "when": "elev_mm > 10", "timeout_ms": 30}]))
+    await robot.execute(run)
+    assert run.state == MACRO_FAILED and run.error == "timed out waiting for elev_mm > 10"
+    assert [command for _, command in robot.sent] == ["BRAKE"]
+
+    robot = FakeRobot()
+    run = MacroRun(compile_macro([{"command": "CTRL DRIVE vx=1 t=100"}, {"command": "BRAKE", "at_ms": 5000}]))
+    task = asyncio.create_task(robot.execute(run))
+    await asyncio.sleep(0.02)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert run.state == MACRO_CANCELLED and run.active is False
+    assert [command for _, command in robot.sent] == ["CTRL DRIVE vx=1 t=100", "BRAKE"]
+
+    async def unreachable() -> None:
+        raise SerialNotFoundError("no transport")
+
+    run = MacroRun(compile_macro([{"command": "CTRL DRIVE vx=1 t=100", "at_ms": 5000}]))
+    task = asyncio.create_task(run.execute(run_step=robot.run_step, brake=unreachable, telemetry=robot.telemetry.get))
+    await asyncio.sleep(0.02)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):  # a failed brake does not replace the cancellation
+        await task
+    assert run.state == MACRO_CANCELLED
@@ -0,0 +1,89 @@
+"""Tests for odometry pose integration."""
+from __future__ import annotations
+
+import math
+
+import pytest
+
+from backend.operator.services.odometry import (
+    ERR_ODO_FAIL,
+    OdometryConfig,
+    OdometryTracker,
+    integrate_trajectory,
+    tick_delta,
+)
+
+# 0.2 mm per tick, 200 mm between the wheels
+CONFIG = OdometryConfig(cpr=100, gear_num=1, gear_den=1, wheel_diam_mm=20.0 / math.pi, track_mm=200.0)
+
+
+def frames(ticks: list[tuple[int, int]], start_ms: int = 1000, step_ms: int = 100) -> list[dict[str, int]]:
+    return [
+        {"odo_left": left, "odo_right": right, "uptime_ms": start_ms + index * step_ms, "err_flags": 0}
+        for index, (left, right) in enumerate(ticks)
+    ]
+
+
+def test_counters_wrap_and_arcs_are_exact() -> None:
+    assert tick_delta(-2**31 + 5, 2**31 - 5) == 10
+    assert tick_delta(2**31 - 5, -2**31 + 5) == -10
+    assert CONFIG.mm_per_tick == pytest.approx(0.2)
+
+    tracker = OdometryTracker(CONFIG)
+    start = 2**31 - 250  # both counters wrap during the run
+    for frame in frames([(start + 500 * i, start + 500 * i) for i in range(5)]):
+        tracker.update(frame)
+    pose = tracker.snapshot()
+    assert pose["x_mm"] == pytest.approx(400.0) and pose["y_mm"] == pytest.approx(0.0)
+    assert pose["v_mm_s"] == pytest.approx(1000.0)
+
+    # Half a turn on the spot: the right wheel forward, the left back by π·track/2.
+    tracker = OdometryTracker(CONFIG)
+    quarter = round(math.pi * 100 / 0.2)
+    for frame in frames([(0, 0), (-quarter, quarter)], step_ms=1000):
+        tracker.update(frame)
+    assert abs(tracker.snapshot()["theta_deg"]) == pytest.approx(180.0, abs=0.1)
+    assert tracker.x == pytest.approx(0.0, abs=1e-6)
+
+
+def test_missed_frames_reboots_and_odo_fail_do_not_jump() -> None:
+    # A quarter circle of radius 1 m, sampled every 100 ms or only at both ends.
+    ticks = [(round(i * 900 * math.pi / 2 / 0.2 / 20), round(i * 1100 * math.pi / 2 / 0.2 / 20)) for i in range(21)]
+    dense, sparse = OdometryTracker(CONFIG), OdometryTracker(CONFIG)
+    for frame in frames(ticks):
+        dense.update(frame)
+    for frame in frames(ticks)[::20]:
+        sparse.update(frame)
+    assert sparse.x == pytest.approx(dense.x, abs=1.0) and sparse.y == pytest.approx(dense.y, abs=1.0)
+    assert math.degrees(dense.theta) == pytest.approx(90.0, abs=0.5)
+    assert dense.x == pytest.approx(1000.0, abs=1.0) and dense.y == pytest.approx(1000.0, abs=1.0)
+
+    tracker = OdometryTracker(CONFIG)
+    for frame in frames([(0, 0), (500, 500)]):
+        tracker.update(frame)
+    assert not tracker.update({"odo_left": 0, "odo_right": 0, "uptime_ms": 50, "err_flags": 0})  # reboot
+    assert tracker.update({"odo_left": 500, "odo_right": 500, "uptime_ms": 150, "err_flags": 0})
+    assert not tracker.update({"odo_left": 10**9, "odo_right": 10**9, "uptime_ms": 250, "err_flags": 0})
+    assert not tracker.update({"odo_left": 10**9, "odo_right": 10**9, "uptime_ms": 350, "err_flags": ERR_ODO_FAIL})
+    assert tracker.snapshot()["x_mm"] == pytest.approx(200.0)
+    assert tracker.resets == 2 and tracker.skipped == 1
+
+
+def test_batch_replay_matches_the_tracker_and_sweeps_the_track() -> None:
+    ticks = [(i * 40, i * 60) for i in range(50)]
+    tracker = OdometryTracker(CONFIG)
+    for frame in frames(ticks):
+        tracker.update(frame)
+    uptime = [frame["uptime_ms"] for frame in frames(ticks)]
+    left, right = [float(l) for l, _ in ticks], [float(r) for _, r in ticks]
+    left[10] = math.nan  # a sample the capture could not decode
+
+    run = integrate_trajectory(uptime, left, right, CONFIG)
+    assert run["skipped"] == 2
+    narrow = integrate_trajectory(uptime, left, right, OdometryConfig(100, 1, 1, 20.0 / math.pi, 100.0))
+    assert narrow["final"]["theta_rad"] == pytest.approx(2 * run["final"]["theta_rad"])
+
+    full = integrate_trajectory(uptime, [float(l) for l, _ in ticks], right, CONFIG)
+    assert full["final"]["x_mm"] == pytest.approx(tracker.x)
+    assert full["final"]["theta_rad"] == pytest.approx(tracker.theta)
+    assert len(full["x_mm"]) == 50 and full["x_mm"][0] == 0.0
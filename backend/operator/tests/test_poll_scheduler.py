@@ -0,0 +1,133 @@
+"""Tests for demand-driven polling."""
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+
+from backend.operator.esp32_link import CommandResult
+from backend.operator.link_capture import unwrap_link
+from backend.operator.services import operator_service
+from backend.operator.services.operator_service import OperatorService
+from backend.operator.services.poll_scheduler import POLL_IDLE, POLL_LIVE, POLL_WATCHED, PollScheduler, PollSource
+from backend.operator.tests.test_command_channel import FakeSocket
+
+
+class Recorder:
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def source(self, name: str, intervals: dict, ok: bool = True) -> PollSource:
+        async def poll() -> bool:
+            self.calls.append(name)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            await asyncio.sleep(0.005)
+            self.in_flight -= 1
+            return ok
+
+        return PollSource(name, poll, intervals)
+
+
+@pytest.mark.asyncio
+async def test_rate_follows_demand_and_sources_never_overlap() -> None:
+    recorder = Recorder()
+    demand = [POLL_IDLE]
+    scheduler = PollScheduler(
+        [
+            recorder.source("status", {POLL_IDLE: 10.0, POLL_WATCHED: 0.1, POLL_LIVE: 0.02}),
+            # 0.15 s: two polls in the 0.2 s live window, the second still fresh at the end.
+            recorder.source("camcfg", {POLL_WATCHED: 0.1, POLL_LIVE: 0.15}),
+            recorder.source("i2c", {POLL_WATCHED: 0.1, POLL_LIVE: 0.15}, ok=False),
+        ],
+        lambda: demand[0],
+    )
+    stop = asyncio.Event()
+    task = asyncio.create_task(scheduler.run(stop))
+    await asyncio.sleep(0.1)
+    assert recorder.calls == ["status"]  # idle: one status poll, nothing else
+
+    demand[0] = POLL_LIVE
+    scheduler.poke()
+    await asyncio.sleep(0.2)
+    stop.set()
+    await asyncio.wait_for(task, 1.0)
+
+    assert recorder.calls.count("status") >= 6
+    assert recorder.calls.count("camcfg") == recorder.calls.count("i2c") == 2
+    assert recorder.max_in_flight == 1
+    assert scheduler.fresh("camcfg") and not scheduler.fresh("i2c")
+    snapshot = scheduler.snapshot()
+    assert snapshot["level"] == POLL_LIVE and snapshot["sources"]["i2c"]["failures"] == 2
+
+
+class PollLink:
+    def __init__(self, *_: object, **__: object) -> None:
+        self.requested_port = "socket://stub"
+        self.active_port = "socket://stub"
+        self.commands: list[str] = []
+
+    def run_command(self, command: str, **_: object) -> CommandResult:
+        self.commands.append(command)
+        if command == "camcfg ?":
+            return CommandResult(raw=["cam_resolution=QVGA cam_quality=20"], data={"cam_resolution": "QVGA", "cam_quality": 20})
+        return CommandResult(raw=["state_id=0 elev_mm=0 uptime_ms=5"], data={"state_id": 0, "elev_mm": 0, "uptime_ms": 5})
+
+    def collect_pending_logs(self) -> list[tuple[float, str]]:  # pragma: no cover - compatibility
+        return []
+
+    def close(self) -> None:
+        pass
+
+
+@pytest.mark.asyncio
+async def test_service_demand_follows_subscribers_live_view_and_motion(monkeypatch: pytest.MonkeyPatch) -> None:
+    link = PollLink()
+    monkeypatch.setattr(operator_service, "ESP32Link", lambda *_, **__: link)
+    svc = OperatorService(port="socket://stub", ws_endpoint=None, control_transport="serial")
+    assert svc._poll_demand() == POLL_IDLE
+
+    socket = FakeSocket()
+    serving = asyncio.create_task(svc.serve_telemetry(socket))
+    await asyncio.sleep(0.01)
+    assert svc._poll_demand() == POLL_WATCHED
+    await socket.incoming.put(json.dumps({"live": True}))
+    await asyncio.sleep(0.01)
+    assert svc._poll_demand() == POLL_LIVE
+    await socket.incoming.put(json.dumps({"live": False}))
+    await asyncio.sleep(0.01)
+    assert svc._poll_demand() == POLL_WATCHED
+
+    await svc.run_command("CTRL DRIVE vx=100 t=300", raise_on_error=False)
+    assert svc._poll_demand() == POLL_LIVE
+    svc._motion_until = 0.0
+
+    await socket.incoming.put(None)
+    await asyncio.gather(serving, return_exceptions=True)
+    assert svc._poll_demand() == POLL_IDLE
+
+
+@pytest.mark.asyncio
+async def test_diagnostics_reuses_fresh_polls(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(operator_service, "ESP32Link", PollLink)
+    svc = OperatorService(port="socket://stub", ws_endpoint=None, control_transport="serial")
+    link = unwrap_link(svc._transports["serial"])
+    queue = await svc.register_client()
+    await svc.start()
+    try:
+        await asyncio.wait_for(queue.get(), 2.0)
+        for _ in range(100):
+            if "camcfg ?" in link.commands and "SMAP GET" in link.commands:
+                break
+            await asyncio.sleep(0.01)
+        sent = len(link.commands)
+        diag = await svc.diagnostics()
+    finally:
+        await svc.stop()
+
+    assert len(link.commands) == sent  # status and camcfg came from the poller
+    assert diag["camera"]["resolution"] == "QVGA"
+    assert diag["polling"]["level"] == POLL_WATCHED
@@ -0,0 +1,120 @@
+"""Tests for pipelined command batches on the serial link."""
+from __future__ import annotations
+
+import time
+
+from backend.operator.esp32_link import ESP32Link
+
+
+class ScriptedSerial:
+    """Serial double replaying console lines once the batch has been written."""
+
+    is_open = True
+    in_waiting = 0
+
+    def __init__(self, lines: list[str]) -> None:
+        self.lines = [line.encode("utf-8") + b"\n" for line in lines]
+        self.written = b""
+
+    def write(self, data: bytes) -> int:
+        self.written += data
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def readline(self) -> bytes:
+        if self.lines:
+            return self.lines.pop(0)
+        time.sleep(0.005)
+        return b""
+
+
+def _link(lines: list[str]) -> tuple[ESP32Link, ScriptedSerial]:
+    link = ESP32Link(port="socket://stub", timeout=2.0, silence_gap=0.05)
+    serial = ScriptedSerial(lines)
+    link._serial = serial
+    return link, serial
+
+
+def test_pipelined_replies_are_split_by_cli_echo() -> None:
+    link, serial = _link(
+        [
+            "[CLI] RX: camcfg ?",
+            "cam_resolution=QVGA cam_quality=12",
+            "[TLM] st=0",
+            "[CLI] RX: smap get",
+            "[CLI] RX: i2c scan",
+            "i2c_device=0x12",
+            "i2c_uno_found=true",
+        ]
+    )
+
+    started = time.monotonic()
+    camcfg, smap, i2c = link.run_pipelined(["camcfg ?", "smap get", "i2c scan"], raise_on_error=False)
+
+    assert time.monotonic() - started < 1.0
+    assert serial.written == b"camcfg ?\nsmap get\ni2c scan\n"
+    assert camcfg.data["cam_resolution"] == "QVGA"
+    assert [line for line in smap.raw if not line.startswith("[")] == []
+    assert i2c.raw[-2:] == ["i2c_device=0x12", "i2c_uno_found=true"]
+    assert camcfg.sent_at == i2c.sent_at
+
+
+def test_batch_without_echoes_falls_back_to_one_command_at_a_time() -> None:
+    link, serial = _link(["cam_resolution=QVGA", "K,W,Y"])
+
+    first, second = link.run_pipelined(["camcfg ?", "smap get"], timeout=0.2, raise_on_error=False)
+
+    assert first.raw == ["cam_resolution=QVGA", "K,W,Y"]
+    assert second.raw == []
+    assert link._pipelining is False
+
+    serial.lines = [b"[CLI] RX: caps\n", b"caps=status_bin\n"]
+    caps, smap = link.run_pipelined(["caps", "smap get"], timeout=0.2, raise_on_error=False)
+    assert caps.raw == ["[CLI] RX: caps", "caps=status_bin"]
+    assert smap.raw == []
+    assert smap.sent_at > caps.sent_at
+
+
+def test_ctrl_reply_ends_at_its_single_reply_line() -> None:
+    link, serial = _link(["[CLI] RX: CTRL DRIVE vx=100 t=300", "ctrl_drive=OK vx=100 vy=0 w=0 t=300"])
+    link._silence_gap = 5.0
+
+    started = time.monotonic()
+    result = link.run_command("CTRL DRIVE vx=100 t=300", timeout=5.0)
+
+    assert time.monotonic() - started < 1.0
+    assert result.raw[-1] == "ctrl_drive=OK vx=100 vy=0 w=0 t=300"
+
+
+def test_status_replies_end_at_the_handler_log_line() -> None:
+    link, _ = _link(
+        [
+            "[CLI] status handled",  # tail of an earlier reply, before this echo
+            "[CLI] RX: STATUS",
+            "state_id=0 elev_mm=0 uptime_ms=8",
+            "[CLI] status handled",
+            "[TLM] st=0 err=0x0000 ODO(L=0 R=0) L=474 R=780",
+        ]
+    )
+    binary_link, _ = _link(["[CLI] RX: status bin", "statusb=AQEAAPoDAAB/AAAB"])
+    link._silence_gap = binary_link._silence_gap = 5.0
+
+    started = time.monotonic()
+    result = link.run_command("STATUS", timeout=5.0)
+    binary = binary_link.run_command("status bin", timeout=5.0)
+
+    assert time.monotonic() - started < 1.0
+    assert result.raw[-2:] == ["state_id=0 elev_mm=0 uptime_ms=8", "[CLI] status handled"]
+    assert binary.raw[-1] == "statusb=AQEAAPoDAAB/AAAB"
+
+
+def test_log_only_reply_ends_at_the_silence_gap() -> None:
+    link, _ = _link(["[CLI] RX: camstream on", "[CAM] stream started"])
+
+    started = time.monotonic()
+    result = link.run_command("camstream on", timeout=5.0)
+
+    assert time.monotonic() - started < 1.0
+    assert result.raw == ["[CLI] RX: camstream on", "[CAM] stream started"]
@@ -0,0 +1,150 @@
+"""Tests for the ESP32 simulator and its transports."""
+from __future__ import annotations
+
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+from backend.operator.esp32_link import ESP32Link, parse_key_value_lines
+from backend.operator.esp32_ws_link import ESP32WSLink
+from backend.operator.log_ingest import parse_log_dump
+from backend.operator.simulator import ESP32Simulator, SimulatedFirmware, SimulatorConfig
+from backend.operator.status_binary import decode_status_binary_lines
+from backend.operator.status_frame import decode_status_line
+
+
+def _lines(reply: str) -> list[str]:
+    return [line for line in reply.splitlines() if line]
+
+
+def test_status_text_and_binary_decode_to_same_values() -> None:
+    firmware = SimulatedFirmware(SimulatorConfig(seed=1))
+    firmware.handle_command("ctrl elev h=40 speed=400")
+    time.sleep(0.05)
+
+    text = decode_status_line(_lines(firmware.handle_command("STATUS"))[0])
+    binary = decode_status_binary_lines(_lines(firmware.handle_command("status bin")))
+
+    assert text is not None and binary is not None
+    assert text.status_error is None
+    assert text.wifi_ip == binary.wifi_ip == "127.0.0.1"
+    assert binary.elev_mm >= text.elev_mm > 0
+    assert firmware.handle_command("caps") == "caps=status_bin,logs_ts status_bin_version=1\n"
+
+
+def test_ctrl_replies_follow_firmware_argument_rules() -> None:
+    firmware = SimulatedFirmware()
+
+    assert firmware.handle_command("CTRL DRIVE vx=200,t=100") == "ctrl_drive=OK vx=200 vy=0 w=0 t=100\n"
+    assert firmware.handle_command("ctrl drive t=100") == "ctrl_error=DRIVE_ARGS\n"
+    assert firmware.handle_command("ctrl turn left") == "ctrl_turn=OK w=400 t=500\n"
+    assert firmware.handle_command("ctrl grip deg=30") == "ctrl_grip=OK cmd=2 arg=30\n"
+    assert firmware.handle_command("ctrl fly") == "ctrl_error=UNKNOWN_TARGET\n"
+    assert firmware.handle_command("CAMCFG q=5 res=vga") == "cam_resolution=VGA cam_quality=10 cam_max=UXGA\n"
+    assert firmware.handle_command("camcfg res=8K") == "camcfg_error=RESOLUTION\n"
+    assert firmware.handle_command("SMAP SET R,G,B; -,-,-; Y,Y,Y") == "OK\n"
+    assert firmware.handle_command("smap get") == "R,G,B; -,-,-; Y,Y,Y\n"
+    assert firmware.handle_command("bogus") == "ERR UNKNOWN_CMD\n"
+
+
+def test_logs_dump_matches_firmware_ring_semantics() -> None:
+    firmware = SimulatedFirmware(SimulatorConfig(log_capacity=8))
+    for index in range(10):
+        firmware.log_line(f"line {index}")
+
+    dump = parse_log_dump(_lines(firmware.handle_command("LOGS since=0 limit=3")))
+    # Three boot lines plus ten more in a ring of eight: seq 6 is the oldest survivor.
+    assert [seq for seq, _ in dump.entries] == [6, 7, 8]
+    assert dump.truncated is True
+    assert dump.next_seq == 9
+
+    dump = parse_log_dump(_lines(firmware.handle_command("logs since=9 ts=1")), with_timestamps=True)
+    assert [seq for seq, _ in dump.entries] == [10, 11, 12, 13, 14]
+    assert set(dump.uptimes) == {10, 11, 12, 13, 14}
+    assert firmware.handle_command("logs since") == "logs_error=SYNTAX\n"
+
+
+def test_missing_uno_and_i2c_failures_surface_like_firmware() -> None:
+    firmware = SimulatedFirmware(SimulatorConfig(uno_present=False, i2c_error_delay_s=0.0))
+
+    frame = decode_status_line(_lines(firmware.handle_command("status"))[0])
+    assert frame is not None and frame.status_error == "UNO_MISSING"
+    assert firmware.handle_command("ctrl home") == "ctrl_error=UNO_OFFLINE\n"
+    assert firmware.handle_command("i2c scan") == "i2c_uno_found=false\n"
+
+    flaky = SimulatedFirmware(SimulatorConfig(i2c_failure_rate=1.0, i2c_error_delay_s=0.0, seed=3))
+    frame = decode_status_line(_lines(flaky.handle_command("status"))[0])
+    assert frame is not None
+    assert frame.status_error == "STATUS0,STATUS1,LINES,POWER,SENS,ODOM"
+    diag = parse_key_value_lines(_lines(flaky.handle_command("i2c diag")))
+    assert diag["i2c_using_fallback"] is True
+    assert diag["i2c_current_hz"] == 50000
+
+
+def test_cli_mutex_contention_times_out() -> None:
+    firmware = SimulatedFirmware(SimulatorConfig(cli_lock_timeout_s=0.05))
+    holder = threading.Thread(target=firmware.hold_cli_mutex, args=(0.3,))
+    holder.start()
+    time.sleep(0.02)
+    try:
+        assert firmware.handle_command("status") == "ERR CLI_LOCK_TIMEOUT\n"
+    finally:
+        holder.join()
+    assert firmware.handle_command("camstream ?") == "CAMSTREAM=OFF\n"
+
+
+def test_serial_link_talks_to_pty_console() -> None:
+    with ESP32Simulator(SimulatorConfig(baudrate=921600), websocket=False, http=False) as sim:
+        link = ESP32Link(port=sim.serial_port, timeout=0.5, silence_gap=0.1, binary_status=True)
+        try:
+            result = link.run_command("status")
+            assert result.status is not None and result.status.uptime_ms is not None
+            assert any(line.startswith("statusb=") for line in result.raw)
+
+            result = link.run_command("ctrl drive vx=100 t=50")
+            assert result.data["ctrl_drive"] == "OK"
+            # Console order: command echo logs, then the reply, which ends the exchange;
+            # the handler's own log_line() arrives afterwards on the log stream.
+            assert result.raw[-1] == "ctrl_drive=OK vx=100 vy=0 w=0 t=50"
+            assert "[CLI] RX: ctrl drive vx=100 t=50" in result.raw
+            deadline = time.monotonic() + 2.0
+            logged: list[str] = []
+            while "[CLI] ctrl drive vx=100 vy=0 w=0 t=50" not in logged:
+                assert time.monotonic() < deadline
+                time.sleep(0.02)
+                logged += [line for _, line in link.collect_pending_logs()]
+        finally:
+            link.close()
+
+
+def test_websocket_cli_heartbeats_and_snapshot() -> None:
+    pytest.importorskip("websockets")
+    websocket = pytest.importorskip("websocket")
+
+    config = SimulatorConfig(heartbeat_interval_s=0.1, camera_capture_s=0.0)
+    with ESP32Simulator(config, serial=False) as sim:
+        link = ESP32WSLink(sim.ws_url, timeout=2.0)
+        assert link.run_command("CAMSTREAM ?").raw == ["CAMSTREAM=OFF"]
+        with pytest.raises(urllib.error.HTTPError) as excinfo:
+            urllib.request.urlopen(sim.snapshot_url, timeout=2.0)
+        assert excinfo.value.code == 503
+
+        assert link.run_command("camstream on").raw == ["CAMSTREAM=ON"]
+        with urllib.request.urlopen(sim.snapshot_url, timeout=2.0) as response:
+            body = response.read()
+            assert response.headers["Content-Type"] == "image/jpeg"
+            assert response.headers["X-Frame-Size"] == "160x120"
+        assert body[:2] == b"\xff\xd8" and body[-2:] == b"\xff\xd9"
+
+        listener = websocket.create_connection(sim.ws_url, timeout=2.0)
+        try:
+            listener.ping()
+            message = json.loads(listener.recv())
+        finally:
+            listener.close()
+        assert message["type"] == "heartbeat"
+        assert message["logs_next"] > 1
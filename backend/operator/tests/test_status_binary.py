@@ -0,0 +1,85 @@
+"""Tests for the binary STATUS codec and CAPS negotiation."""
+from __future__ import annotations
+
+from typing import Dict, List
+
+from backend.operator.esp32_link import CommandResult, parse_reply_lines, run_status_query
+from backend.operator.status_binary import (
+    STATUS_STRUCT,
+    decode_status_binary_lines,
+    format_status_binary_line,
+    parse_capabilities,
+)
+
+TEXT_STATUS = (
+    "status_error=LINES,ODOM state_id=3 seq_ack=17 err_flags=0x01A0 elev_mm=-12 grip_deg=45 line_left=512 "
+    "line_right=498 line_thr=300 vbatt_mV=7400 mps=1 estop=0 drive_left=1500 drive_right=1490 drive_res1=0 "
+    "drive_res2=0 aux_lift=1200 aux_grip=900 grip_enc=-3 lift_enc=120 odo_left=-2147483000 "
+    "odo_right=2147483000 wifi_connected=true wifi_ip=192.168.0.72 cam_streaming=true uptime_ms=183245"
+)
+
+
+def test_binary_round_trip_matches_text_reply() -> None:
+    _, text_frame = parse_reply_lines([TEXT_STATUS])
+    assert text_frame is not None
+
+    line = format_status_binary_line(text_frame.as_dict())
+    frame = decode_status_binary_lines(["[CLI] RX: status bin", line])
+
+    assert STATUS_STRUCT.size == 54
+    assert len(line) < len(TEXT_STATUS) / 4
+    assert frame is not None
+    assert frame.as_dict() == text_frame.as_dict()
+
+
+def test_garbled_payload_is_rejected() -> None:
+    assert decode_status_binary_lines(["statusb=not-base64!"]) is None
+    assert decode_status_binary_lines(["statusb=AAAA"]) is None
+
+
+def test_capabilities_parsing() -> None:
+    assert parse_capabilities(["caps=status_bin,logs_ts status_bin_version=1"]) == ["status_bin", "logs_ts"]
+    assert parse_capabilities(["ERR UNKNOWN_CMD"]) == []
+
+
+class _Firmware:
+    def __init__(self, *, binary: bool) -> None:
+        self.binary = binary
+        self.commands: List[str] = []
+        _, frame = parse_reply_lines([TEXT_STATUS])
+        assert frame is not None
+        self.values: Dict[str, object] = frame.as_dict()
+
+    def run_command(self, command: str, **_: object) -> CommandResult:
+        self.commands.append(command)
+        if command == "caps":
+            raw = ["caps=status_bin,logs_ts status_bin_version=1"] if self.binary else ["ERR UNKNOWN_CMD"]
+        elif command == "status bin":
+            raw = [format_status_binary_line(self.values)] if self.binary else ["ERR UNKNOWN_CMD"]
+        else:  # pragma: no cover - not used
+            raw = []
+        return CommandResult(raw=raw, data={}, sent_at=1.0, line_times=[1.01] * len(raw))
+
+
+def test_negotiation_uses_binary_when_advertised() -> None:
+    firmware = _Firmware(binary=True)
+
+    result, supported = run_status_query(firmware.run_command, None)
+    assert supported is True and result is not None
+    assert result.status is not None and result.status.odo_left == -2147483000
+    assert result.data["status_error"] == "LINES,ODOM"
+
+    result, supported = run_status_query(firmware.run_command, supported)
+    assert firmware.commands == ["caps", "status bin", "status bin"]
+    assert result is not None and result.received_at() == 1.01
+
+
+def test_negotiation_falls_back_to_text() -> None:
+    firmware = _Firmware(binary=False)
+
+    result, supported = run_status_query(firmware.run_command, None)
+    assert (result, supported) == (None, False)
+
+    # Firmware downgraded after negotiation: the rejected command disables the mode.
+    result, supported = run_status_query(firmware.run_command, True)
+    assert (result, supported) == (None, False)
@@ -0,0 +1,90 @@
+"""Tests for the schema-driven STATUS decoder."""
+from __future__ import annotations
+
+import pytest
+
+from backend.operator.esp32_link import _parse_key_value_line, parse_reply_lines
+from backend.operator.status_frame import StatusFrame, decode_status_line
+
+STATUS_LINES = [
+    "status_error=UNO_MISSING state_id=0 seq_ack=0 err_flags=0x0000 elev_mm=0 grip_deg=0 line_left=0 "
+    "line_right=0 line_thr=0 vbatt_mV=0 mps=0 estop=0 drive_left=0 drive_right=0 drive_res1=0 drive_res2=0 "
+    "aux_lift=0 aux_grip=0 grip_enc=0 lift_enc=0 odo_left=0 odo_right=0 wifi_connected=true "
+    "wifi_ip=192.168.0.72 cam_streaming=false",
+    "state_id=3 seq_ack=17 err_flags=0x01A0 elev_mm=-12 grip_deg=45 line_left=512 line_right=498 line_thr=300 "
+    "vbatt_mV=7400 mps=1 estop=0 drive_left=1500 drive_right=1490 drive_res1=0 drive_res2=0 aux_lift=1200 "
+    "aux_grip=900 grip_enc=-3 lift_enc=120 odo_left=-2147483000 odo_right=2147483000 wifi_connected=false "
+    "wifi_ip= cam_streaming=true uptime_ms=183245",
+]
+
+
+@pytest.mark.parametrize("line", STATUS_LINES)
+def test_fast_decoder_matches_generic_parser(line: str) -> None:
+    frame = decode_status_line(line)
+
+    assert frame is not None
+    assert frame.as_dict() == _parse_key_value_line(line, {})
+
+
+def test_typed_fields() -> None:
+    frame = decode_status_line(STATUS_LINES[1])
+
+    assert frame is not None
+    assert frame.err_flags == 0x01A0
+    assert frame.odo_left == -2147483000
+    assert frame.wifi_connected is False and frame.cam_streaming is True
+    assert frame.wifi_ip == ""
+    assert frame.status_error is None
+    assert frame.uptime_ms == 183245
+
+
+def test_unknown_fields_use_fallback() -> None:
+    data, frame = parse_reply_lines([STATUS_LINES[1] + " cam_fps=12.5 mode=auto"])
+
+    assert frame is not None
+    assert frame.extra == {"cam_fps": 12.5, "mode": "auto"}
+    assert data["cam_fps"] == 12.5 and data["odo_right"] == 2147483000
+
+
+def test_non_status_lines_take_generic_path() -> None:
+    data, frame = parse_reply_lines(["camcfg_resolution=VGA camcfg_quality=12", "state_id=1 seq_ack=x"])
+
+    assert frame is None
+    assert data == {"camcfg_resolution": "VGA", "camcfg_quality": 12, "state_id": 1, "seq_ack": "x"}
+
+
+def test_frame_is_immutable_and_sequenced() -> None:
+    first = decode_status_line(STATUS_LINES[0])
+    second = decode_status_line(STATUS_LINES[0])
+
+    assert first is not None and second is not None
+    assert second.seq > first.seq
+    with pytest.raises(AttributeError):
+        first.elev_mm = 5  # type: ignore[misc]
+    with pytest.raises(TypeError):
+        first.extra["x"] = 1  # type: ignore[index]
+
+
+def test_derived_views_are_memoised() -> None:
+    frame = decode_status_line(STATUS_LINES[0].replace("cam_streaming=false", "cam_streaming=true"))
+
+    assert frame is not None
+    assert frame.camera_snapshot_url == "http://192.168.0.72/camera/snapshot"
+    assert frame.camera_snapshot_url is frame.camera_snapshot_url
+    assert frame.uno_health is frame.uno_health
+    assert frame.uno_health["connected"] is False and frame.uno_health["error"] == "UNO_MISSING"
+    # as_dict hands out copies so callers cannot corrupt the cached view.
+    frame.as_dict()["elev_mm"] = 99
+    assert frame.as_dict()["elev_mm"] == 0
+
+
+def test_from_mapping_layers_over_base() -> None:
+    base = decode_status_line(STATUS_LINES[1])
+    assert base is not None
+
+    frame = StatusFrame.from_mapping({"elev_mm": 40, "cam_resolution": "VGA"}, base=base)
+
+    assert frame.elev_mm == 40 and frame.odo_left == base.odo_left
+    assert frame.get("cam_resolution") == "VGA"
+    assert "uptime_ms" in frame and "status_error" not in frame
+    assert frame.wifi_address is None and frame.camera_snapshot_url is None
@@ -0,0 +1,86 @@
+"""Tests for burst telemetry capture."""
+from __future__ import annotations
+
+import asyncio
+import json
+import struct
+import time
+
+import pytest
+
+from backend.operator.esp32_link import CommandResult
+from backend.operator.services.telemetry_capture import (
+    CAPTURE_MAGIC,
+    CaptureBuffer,
+    CaptureError,
+    TelemetryCapture,
+    run_capture,
+    validate_capture,
+)
+
+
+class FakeDevice:
+    """Answers status batches with frames 5 ms of device time apart."""
+
+    def __init__(self) -> None:
+        self.uptime = 1000
+        self.batches: list[int] = []
+
+    async def poll(self, count: int) -> list[CommandResult]:
+        self.batches.append(count)
+        await asyncio.sleep(0.002)
+        results = []
+        for _ in range(count):
+            self.uptime += 5
+            data = {"uptime_ms": self.uptime, "elev_mm": self.uptime % 200, "odo_left": -3}
+            results.append(CommandResult(raw=["statusb=..."], data=data, line_times=[time.time()]))
+        return results
+
+
+def test_buffer_downloads_as_ndjson_and_little_endian_columns() -> None:
+    buffer = CaptureBuffer(["elev_mm", "grip_deg"], capacity=4)
+    buffer.append(100.5, 1005, {"elev_mm": 12, "grip_deg": 90})
+    buffer.append(100.51, 1015, {"elev_mm": 13})
+    capture = TelemetryCapture(buffer, {"rate_hz": 100.0})
+
+    header, *rows = [json.loads(line) for line in capture.iter_ndjson()]
+    assert header["columns"] == ["t", "uptime_ms", "elev_mm", "grip_deg"] and header["count"] == 2
+    assert rows == [[100.5, 1005, 12, 90], [100.51, 1015, 13, None]]
+
+    blob = capture.to_binary()
+    magic, version, header_len = struct.unpack_from("<4sB3xI", blob)
+    assert (magic, version) == (CAPTURE_MAGIC, 1)
+    offset = 12 + header_len
+    assert json.loads(blob[12:offset])["count"] == 2
+    t = struct.unpack_from("<2d", blob, offset)
+    uptime = struct.unpack_from("<2I", blob, offset + 16)
+    elev = struct.unpack_from("<2d", blob, offset + 24)
+    grip = struct.unpack_from("<2d", blob, offset + 40)
+    assert t == (100.5, 100.51) and uptime == (1005, 1015) and elev == (12.0, 13.0)
+    assert grip[0] == 90.0 and grip[1] != grip[1]  # NaN marks the missing value
+    assert len(blob) == offset + 2 * (8 + 4 + 8 + 8)
+
+
+def test_capture_parameters_are_validated() -> None:
+    assert validate_capture(1.0, None, ["elev_mm", "elev_mm"]) == ["elev_mm"]
+    for duration, rate, fields in ((0, None, None), (31, None, None), (1.0, 500.0, None), (1.0, None, ["wifi_ip"])):
+        with pytest.raises(CaptureError):
+            validate_capture(duration, rate, fields)
+
+
+@pytest.mark.asyncio
+async def test_unpaced_capture_pipelines_and_paced_capture_follows_the_rate() -> None:
+    device = FakeDevice()
+    buffer = CaptureBuffer(["elev_mm", "odo_left"], capacity=10)
+    stats = await run_capture(buffer, poll=device.poll, to_host=lambda uptime: uptime / 1000.0, duration=5.0)
+    assert buffer.full and device.batches == [4, 4, 2]
+    assert stats["samples"] == 10 and stats["device_aligned"] is True
+    assert stats["spacing_ms_p50"] == stats["spacing_ms_max"] == 5
+    assert buffer.time[0] == pytest.approx(1.005)
+
+    device = FakeDevice()
+    buffer = CaptureBuffer(["elev_mm"], capacity=100)
+    stats = await run_capture(buffer, poll=device.poll, to_host=lambda _: None, duration=0.2, rate=50.0)
+    assert 9 <= stats["samples"] <= 11
+    assert stats["device_aligned"] is False
+    assert max(device.batches) <= 2
@@ -0,0 +1,65 @@
+"""Tests for telemetry rollups and chart downsampling."""
+from __future__ import annotations
+
+import math
+
+import pytest
+
+from backend.operator.services.telemetry_history import HistoryError, TelemetryHistory, lttb
+
+
+def test_lttb_keeps_the_ends_and_the_spike() -> None:
+    xs = [float(i) for i in range(1000)]
+    ys = [math.sin(i / 50) for i in range(1000)]
+    ys[437] = 25.0
+    kept = lttb(xs, ys, 50)
+    assert len(kept) == 50 and kept[0] == 0 and kept[-1] == 999
+    assert 437 in kept and kept == sorted(kept)
+    assert lttb(xs[:10], ys[:10], 50) == list(range(10))
+
+
+def test_queries_use_the_finest_tier_that_fits() -> None:
+    history = TelemetryHistory(["elev_mm", "vbatt_mV"], raw_capacity=100, tiers=(("1s", 1.0, 600), ("10s", 10.0, 600)))
+    for index in range(3000):  # 10 minutes at 5 Hz
+        history.ingest(1000.0 + index * 0.2, {"elev_mm": index % 5, "vbatt_mV": 7400})
+
+    recent = history.query(["elev_mm"], window=10, points=100)
+    assert recent["tier"] == "raw" and recent["series"]["elev_mm"]["v"][-1] == 4
+
+    minute = history.query(["elev_mm"], window=60, points=100)
+    assert minute["tier"] == "1s" and minute["bucket_s"] == 1.0
+    assert set(minute["series"]["elev_mm"]["v"]) == {2.0}  # bucket means
+
+    spread = history.query(["elev_mm"], window=60, points=100, method="minmax")
+    values = spread["series"]["elev_mm"]["v"]
+    assert set(values) == {0.0, 4.0} and len(values) == 2 * 61
+    times = spread["series"]["elev_mm"]["t"]
+    assert times == sorted(times)
+
+    whole = history.query(None, window=600, points=100)
+    assert whole["tier"] == "10s" and len(whole["series"]["vbatt_mV"]["t"]) == 60
+
+    history.ingest(1600.0, {"elev_mm": 20035997, "vbatt_mV": 7400})  # float64 keeps counters exact
+    assert history.query(["elev_mm"], window=1, points=10)["series"]["elev_mm"]["v"][-1] == 20035997.0
+
+    for kwargs in ({"fields": ["wifi_ip"]}, {"fields": None, "method": "mean"}, {"fields": None, "points": 1}):
+        with pytest.raises(HistoryError):
+            history.query(window=60, **{"points": 100, **kwargs})
+
+
+def test_minmax_preserves_spikes_and_their_order() -> None:
+    history = TelemetryHistory(["elev_mm"], raw_capacity=10, tiers=(("1s", 1.0, 3600),))
+    for index in range(3600):
+        value = 100.0
+        if index == 1500:
+            value = 400.0
+        elif index == 1501:
+            value = -50.0
+        history.ingest(2000.0 + index, {"elev_mm": value})
+
+    result = history.query(["elev_mm"], window=3600, points=1200, method="minmax")
+    series = result["series"]["elev_mm"]
+    assert result["tier"] == "1s"
+    spike = series["v"].index(400.0)
+    assert series["v"][spike + 1] == -50.0  # the dip follows the spike in time
+    assert series["t"][spike] < series["t"][spike + 1]
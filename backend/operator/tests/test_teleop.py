@@ -0,0 +1,169 @@
+"""Tests for latest-wins teleoperation with the backend deadman."""
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+from typing import Any, Sequence
+
+import pytest
+
+from backend.operator.esp32_link import CommandResult
+from backend.operator.link_scheduler import ScheduledLink
+from backend.operator.services.teleop import TeleopController, TeleopStats, teleop_command
+
+
+class FakeRobot:
+    def __init__(self) -> None:
+        self.batches: list[list[str]] = []
+        self.brakes = 0
+        self.messages: list[dict[str, Any]] = []
+
+    async def send(self, commands: Sequence[str], cancelled: threading.Event) -> list[CommandResult]:
+        self.batches.append(list(commands))
+        await asyncio.sleep(0.01)
+        now = time.time()
+        results = []
+        for command in commands:
+            target = command.split()[1].lower()
+            raw = ["[CLI] RX: " + command, f"ctrl_{target}=OK"]
+            results.append(CommandResult(raw=raw, data={}, sent_at=now, line_times=[now, now]))
+        return results
+
+    async def brake(self) -> CommandResult:
+        self.brakes += 1
+        return CommandResult(raw=["BRAKE=OK"], data={})
+
+    def controller(self, stats: TeleopStats, **kwargs: Any) -> TeleopController:
+        return TeleopController(send=self.send, brake=self.brake, emit=self.messages.append, stats=stats, **kwargs)
+
+    async def wait_for(self, kind: str, count: int = 1) -> list[dict[str, Any]]:
+        for _ in range(200):
+            found = [message for message in self.messages if message["type"] == kind]
+            if len(found) >= count:
+                return found
+            await asyncio.sleep(0.005)
+        raise AssertionError(f"expected {count} {kind} messages: {self.messages}")
+
+
+def test_setpoints_become_ctrl_commands() -> None:
+    assert teleop_command("drive", {"vx": 120.7, "w": -30, "t": 300}) == "CTRL DRIVE vx=120 w=-30 t=300"
+    assert teleop_command("grip", {"cmd": 1}) == "CTRL GRIP cmd=1"
+    with pytest.raises(ValueError):
+        teleop_command("drive", {"speed": 1})
+    with pytest.raises(ValueError):
+        teleop_command("elev", {"h": "up"})
+
+
+@pytest.mark.asyncio
+async def test_only_the_newest_setpoint_per_actuator_is_sent() -> None:
+    robot = FakeRobot()
+    stats = TeleopStats()
+    controller = robot.controller(stats, rate=20.0, deadman=5.0)
+    for seq, vx in enumerate((100, 150, 200), start=1):
+        controller.handle_frame(json.dumps({"seq": seq, "drive": {"vx": vx, "t": 300}}))
+    controller.handle_frame(json.dumps({"seq": 4, "grip": {"cmd": 0}}))
+    controller.handle_frame(json.dumps({"seq": 5, "drive": {"vx": 1, "bogus": 2}}))
+
+    ticker = asyncio.create_task(controller.run())
+    acks = await robot.wait_for("ack", 2)
+    ticker.cancel()
+
+    assert robot.batches[0] == ["CTRL DRIVE vx=200 t=300", "CTRL GRIP cmd=0"]
+    assert [(ack["actuator"], ack["seq"], ack["ok"]) for ack in acks] == [("drive", 3, True), ("grip", 4, True)]
+    assert acks[0]["latency_ms"] >= 10.0
+    assert robot.messages[0] == {"type": "error", "seq": 5, "error": "unknown drive parameter 'bogus'"}
+    snapshot = stats.snapshot()
+    assert (snapshot["sent"], snapshot["superseded"], snapshot["rejected"]) == (2, 2, 1)
+    assert snapshot["ack_ms_p50"] is not None
+
+
+@pytest.mark.asyncio
+async def test_deadman_brakes_once_when_frames_stop() -> None:
+    robot = FakeRobot()
+    stats = TeleopStats()
+    controller = robot.controller(stats, rate=100.0, deadman=0.05)
+    ticker = asyncio.create_task(controller.run())
+    await asyncio.sleep(0.1)
+    assert robot.brakes == 0  # nothing armed yet
+
+    controller.handle_frame(json.dumps({"seq": 1, "drive": {"vx": 100, "t": 1000}}))
+    brakes = await robot.wait_for("brake")
+    await asyncio.sleep(0.1)
+    ticker.cancel()
+
+    assert brakes[0]["reason"] == "deadman" and brakes[0]["ok"] is True
+    assert robot.brakes == 1
+    assert stats.deadman_brakes == 1
+    await controller.close()
+    assert robot.brakes == 1
+
+
+class GatedLink:
+    """Holds the first command on the wire until released and records the wire order."""
+
+    def __init__(self) -> None:
+        self.gate = threading.Event()
+        self.started = threading.Event()
+        self.commands: list[str] = []
+
+    def run_command(self, command: str, **_: object) -> CommandResult:
+        self.commands.append(command)
+        if len(self.commands) == 1:
+            self.started.set()
+            self.gate.wait(5.0)
+        now = time.time()
+        reply = "BRAKE=OK" if command == "BRAKE" else f"ctrl_{command.split()[1].lower()}=OK"
+        return CommandResult(raw=[reply], data={}, sent_at=now, line_times=[now])
+
+
+async def _stalled_session(robot: FakeRobot) -> tuple[GatedLink, TeleopController, asyncio.Task[None]]:
+    inner = GatedLink()
+    link = ScheduledLink(inner)
+    threading.Thread(target=lambda: link.run_command("CTRL ELEV h=0"), daemon=True).start()
+    assert inner.started.wait(2.0)  # a command holds the link
+
+    async def send(commands: Sequence[str], cancelled: threading.Event) -> list[CommandResult]:
+        robot.batches.append(list(commands))
+        return await asyncio.to_thread(link.run_pipelined, list(commands), cancelled=cancelled)
+
+    async def brake() -> CommandResult:
+        return await asyncio.to_thread(link.run_command, "BRAKE")
+
+    controller = TeleopController(
+        send=send, brake=brake, emit=robot.messages.append, stats=TeleopStats(), rate=100.0, deadman=0.05
+    )
+    ticker = asyncio.create_task(controller.run())
+    controller.handle_frame(json.dumps({"seq": 1, "drive": {"vx": 200, "t": 300}}))
+    for _ in range(200):
+        if robot.batches:
+            break
+        await asyncio.sleep(0.005)
+    return inner, controller, ticker
+
+
+@pytest.mark.asyncio
+async def test_deadman_brake_drops_the_setpoint_queued_behind_it() -> None:
+    robot = FakeRobot()
+    inner, controller, ticker = await _stalled_session(robot)
+    await asyncio.sleep(0.15)  # frames stopped while the batch waits for the link
+    inner.gate.set()
+    brakes = await robot.wait_for("brake")
+    acks = await robot.wait_for("ack")
+    ticker.cancel()
+
+    # BRAKE overtakes the queued CTRL batch, which is dropped instead of driving after it.
+    assert inner.commands == ["CTRL ELEV h=0", "BRAKE"]
+    assert brakes[0]["reason"] == "deadman" and brakes[0]["ok"] is True
+    assert acks[0]["seq"] == 1 and acks[0]["ok"] is False
+
+    robot = FakeRobot()
+    inner, controller, ticker = await _stalled_session(robot)
+    ticker.cancel()  # the client disconnects while the batch waits
+    closing = asyncio.create_task(controller.close())
+    await asyncio.sleep(0.02)
+    inner.gate.set()
+    await closing
+    await asyncio.sleep(0.02)
+    assert inner.commands == ["CTRL ELEV h=0", "BRAKE"]
@@ -0,0 +1,131 @@
+"""Tests for the per-transport circuit breaker."""
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from backend.operator.esp32_link import CommandResult, SerialNotFoundError
+from backend.operator.services import operator_service
+from backend.operator.services.operator_service import OperatorService, TRANSPORT_SERIAL
+from backend.operator.services.transport_breaker import (
+    ADMIT_PROBE,
+    ADMIT_REQUEST,
+    BREAKER_CLOSED,
+    BREAKER_HALF_OPEN,
+    BREAKER_OPEN,
+    TransportBreaker,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_breaker_backs_off_exponentially_and_closes_after_successes() -> None:
+    clock = FakeClock()
+    breaker = TransportBreaker(
+        failure_threshold=2,
+        success_threshold=2,
+        backoff_base=1.0,
+        backoff_max=3.0,
+        jitter=0.0,
+        clock=clock,
+        rng=random.Random(0),
+    )
+
+    assert breaker.record_failure() is False
+    assert breaker.state == BREAKER_CLOSED
+    assert breaker.record_failure() is True
+    assert breaker.state == BREAKER_OPEN
+    assert breaker.admit() is None
+
+    clock.now = 1.0
+    assert breaker.admit() == ADMIT_PROBE
+    assert breaker.admit() is None  # one probe in flight at a time
+    assert breaker.record_failure() is False
+    assert breaker.snapshot()["backoff"] == pytest.approx(2.0)
+
+    clock.now = 3.0
+    assert breaker.admit() == ADMIT_PROBE
+    breaker.record_failure()
+    assert breaker.snapshot()["backoff"] == pytest.approx(3.0)  # capped
+
+    clock.now = 6.0
+    assert breaker.admit() == ADMIT_PROBE
+    breaker.record_success()
+    assert breaker.state == BREAKER_HALF_OPEN
+    assert breaker.admit() == ADMIT_PROBE
+    breaker.record_success()
+    assert breaker.state == BREAKER_CLOSED
+    assert breaker.admit() == ADMIT_REQUEST
+
+    snapshot = breaker.snapshot()
+    assert snapshot["transitions"] == {
+        "closed->open": 1,
+        "open->half_open": 3,
+        "half_open->open": 2,
+        "half_open->closed": 1,
+    }
+    assert snapshot["rejected"] == 2
+    assert snapshot["probes"] == 4
+
+
+def test_breaker_jitter_stays_within_bounds() -> None:
+    clock = FakeClock()
+    breaker = TransportBreaker(backoff_base=10.0, jitter=0.2, clock=clock, rng=random.Random(7))
+    breaker.record_failure()
+    backoff = breaker.snapshot()["backoff"]
+    assert 8.0 <= backoff <= 12.0
+    breaker.expedite()
+    assert breaker.admit() == ADMIT_PROBE
+
+
+@pytest.mark.asyncio
+async def test_half_open_transport_is_probed_before_real_traffic(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(operator_service, "load_wifi_config", lambda: {})
+    monkeypatch.setattr(operator_service, "save_wifi_config", lambda config: None)
+    monkeypatch.setenv("OPERATOR_BREAKER_BACKOFF", "0")
+
+    class ScriptedLink:
+        def __init__(self) -> None:
+            self.requested_port = "socket://stub"
+            self.active_port = None
+            self.commands: list[str] = []
+            self.outcomes: list[object] = [
+                SerialNotFoundError("unplugged"),
+                CommandResult(raw=["caps ok"], data={}),
+                CommandResult(raw=["ok"], data={"ok": 1}),
+            ]
+
+        def run_command(self, command: str, **_: object) -> CommandResult:
+            self.commands.append(command)
+            outcome = self.outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        def close(self) -> None:  # pragma: no cover - compatibility
+            pass
+
+    link = ScriptedLink()
+    monkeypatch.setattr(operator_service, "ESP32Link", lambda *_, **__: link)
+    svc = OperatorService(port="socket://stub", ws_endpoint=None, control_transport="auto")
+
+    with pytest.raises(SerialNotFoundError):
+        await svc.run_command("status")
+    assert svc._breaker(TRANSPORT_SERIAL).state == BREAKER_OPEN
+
+    result = await svc.run_command("status")
+    assert result.data == {"ok": 1}
+    assert link.commands == ["status", operator_service.TRANSPORT_PROBE_COMMAND, "status"]
+
+    state = svc.get_control_state()
+    breaker = {item["id"]: item for item in state["transports"]}[TRANSPORT_SERIAL]["breaker"]
+    assert breaker["state"] == BREAKER_CLOSED
+    assert breaker["transitions"]["closed->open"] == 1
+    assert breaker["transitions"]["half_open->closed"] == 1
@@ -8,6 +8,7 @@ from typing import Iterable, Union
 import pytest
 
 from backend.operator.esp32_link import CommandResult, SerialNotFoundError
+from backend.operator.link_capture import unwrap_link
 from backend.operator.services import operator_service
 from backend.operator.services.operator_service import (
     OperatorService,
@@ -159,7 +160,7 @@ async def test_update_wifi_config_sets_static_endpoint(monkeypatch: pytest.Monke
         def close(self) -> None:
             pass
 
-    monkeypatch.setattr(operator_service, "ESP32WSLink", lambda url, timeout: DummyWS(url, timeout))
+    monkeypatch.setattr(operator_service, "ESP32WSLink", lambda url, timeout, **_: DummyWS(url, timeout))
 
     svc = OperatorService(port="socket://stub", control_transport="auto")
 
@@ -181,7 +182,7 @@ async def test_update_wifi_config_sets_static_endpoint(monkeypatch: pytest.Monke
 async def test_update_wifi_config_rejects_invalid_ip(monkeypatch: pytest.MonkeyPatch) -> None:
     serial_link = StubLink([], endpoint="socket://stub")
     monkeypatch.setattr(operator_service, "ESP32Link", lambda *_, **__: serial_link)
-    monkeypatch.setattr(operator_service, "ESP32WSLink", lambda url, timeout: StubLink([], endpoint=url))
+    monkeypatch.setattr(operator_service, "ESP32WSLink", lambda url, timeout, **_: StubLink([], endpoint=url))
 
     svc = OperatorService(port="socket://stub", control_transport="auto")
 
@@ -217,16 +218,17 @@ async def test_wifi_failure_enables_auto_discovery(monkeypatch: pytest.MonkeyPat
     await asyncio.sleep(0)
 
     assert svc._ws_auto_enabled is True
-    assert svc._transport_endpoints.get(operator_service.TRANSPORT_WIFI) is None
-    assert operator_service.TRANSPORT_WIFI not in svc._transports
+    # The link is kept as a warm standby behind its open breaker while discovery runs.
+    assert unwrap_link(svc._transports[operator_service.TRANSPORT_WIFI]) is wifi_link
     assert clears, "clear_last_endpoint should be called"
 
     state = svc.get_control_state()
     transports = {entry["id"]: entry for entry in state["transports"]}
     wifi_entry = transports.get(TRANSPORT_WIFI)
     assert wifi_entry is not None
-    assert wifi_entry["endpoint"] is None
+    assert wifi_entry["endpoint"] == "ws://stale"
     assert wifi_entry["available"] is False
+    assert wifi_entry["breaker"]["state"] == "open"
     assert state["active"] == TRANSPORT_SERIAL
 
 
@@ -303,7 +305,7 @@ async def test_status_updates_static_wifi_ip(monkeypatch: pytest.MonkeyPatch) ->
 
     created_links: list[RecordingWSLink] = []
 
-    def make_ws_link(url: str, timeout: float) -> RecordingWSLink:
+    def make_ws_link(url: str, timeout: float, **_: object) -> RecordingWSLink:
         link = RecordingWSLink(url, timeout)
         created_links.append(link)
         return link
@@ -345,4 +347,125 @@ async def test_status_updates_static_wifi_ip(monkeypatch: pytest.MonkeyPatch) ->
     assert config["transport_available"] is True
     assert saved_config and saved_config[-1]["ip_address"] == "192.168.31.91"
     assert saved_config[-1]["mac_address"] == "cc:ba:97:aa:bb:cc"
-    assert saved_config[-1]["mac_prefix"] == "cc:ba:97"
\ No newline at end of file
+    assert saved_config[-1]["mac_prefix"] == "cc:ba:97"
+
+
+@pytest.mark.asyncio
+async def test_status_frame_is_shared_and_replaced(monkeypatch: pytest.MonkeyPatch) -> None:
+    from backend.operator.esp32_link import parse_reply_lines
+
+    def status_result(line: str) -> CommandResult:
+        data, frame = parse_reply_lines([line])
+        return CommandResult(raw=[line], data=data, status=frame)
+
+    base = (
+        "state_id=1 seq_ack=0 err_flags=0x0000 elev_mm=0 grip_deg=0 line_left=0 line_right=0 line_thr=0 "
+        "vbatt_mV=7400 mps=0 estop=0 drive_left=0 drive_right=0 drive_res1=0 drive_res2=0 aux_lift=0 "
+        "aux_grip=0 grip_enc=0 lift_enc=0 odo_left=0 odo_right=0 wifi_connected=false wifi_ip= cam_streaming=false"
+    )
+    serial_link = StubLink(
+        [status_result("status_error=UNO_MISSING " + base), status_result(base)],
+        endpoint="socket://stub",
+    )
+    monkeypatch.setattr(operator_service, "ESP32Link", lambda *_, **__: serial_link)
+    svc = OperatorService(port="socket://stub", ws_endpoint=None, control_transport="serial")
+
+    first = svc._adopt_status(await svc.run_command("status"), 1.0)
+    assert first is not None and first.uno_health["connected"] is False
+
+    second = svc._adopt_status(await svc.run_command("status"), 2.0)
+    assert second is not None and second.seq > first.seq
+    # A fresh frame replaces the old one, so a cleared UNO error does not linger.
+    assert svc._last_status is second
+    assert second.uno_health["connected"] is True
+
+
+@pytest.mark.asyncio
+async def test_standby_transport_is_kept_warm(monkeypatch: pytest.MonkeyPatch) -> None:
+    class CountingLink(StubLink):
+        def __init__(self, endpoint: str) -> None:
+            super().__init__([], endpoint)
+            self.commands: list[str] = []
+
+        def run_command(self, command: str, **_: object) -> CommandResult:
+            self.commands.append(command)
+            return CommandResult(raw=["ok"], data={})
+
+    wifi_link = CountingLink("ws://stub")
+    serial_link = CountingLink("socket://stub")
+    monkeypatch.setattr(operator_service, "ESP32WSLink", lambda *_, **__: wifi_link)
+    monkeypatch.setattr(operator_service, "ESP32Link", lambda *_, **__: serial_link)
+    monkeypatch.setattr(operator_service, "save_last_endpoint", lambda endpoint: None)
+
+    svc = OperatorService(port="socket://stub", ws_endpoint="ws://stub", control_transport="auto")
+    svc._set_active_transport(TRANSPORT_WIFI)
+
+    svc._maybe_schedule_standby_keepalive()
+    await asyncio.gather(*svc._standby_tasks.values())
+    assert serial_link.commands == [operator_service.TRANSPORT_PROBE_COMMAND]
+    assert wifi_link.commands == []
+
+    # The keepalive reply pushes the next one a full interval out.
+    svc._maybe_schedule_standby_keepalive()
+    await asyncio.gather(*svc._standby_tasks.values())
+    assert serial_link.commands == [operator_service.TRANSPORT_PROBE_COMMAND]
+    state = {item["id"]: item for item in svc.get_control_state()["transports"]}
+    assert state[TRANSPORT_SERIAL]["available"] is True
+
+
+@pytest.mark.asyncio
+async def test_startup_races_all_candidate_transports(monkeypatch: pytest.MonkeyPatch) -> None:
+    import time
+
+    class RaceLink(StubLink):
+        def __init__(self, endpoint: str, delay: float, fail: bool = False) -> None:
+            super().__init__([], endpoint)
+            self.delay = delay
+            self.fail = fail
+            self.closed = False
+
+        def run_command(self, command: str, **_: object) -> CommandResult:
+            self.calls += 1
+            time.sleep(self.delay)
+            if self.fail:
+                raise SerialNotFoundError(f"{self.endpoint} unreachable")
+            return CommandResult(raw=[f"via {self.endpoint}"], data={"via": self.endpoint})
+
+        def close(self) -> None:
+            self.closed = True
+
+    created: list[RaceLink] = []
+
+    def make_ws_link(url: str, **_: object) -> RaceLink:
+        link = RaceLink(url, 0.02, fail=url == "ws://10.0.0.5:81/ws/cli")
+        created.append(link)
+        return link
+
+    serial_link = RaceLink("socket://stub", 0.3)
+    saved: list[str] = []
+    monkeypatch.setattr(operator_service, "ESP32WSLink", make_ws_link)
+    monkeypatch.setattr(operator_service, "ESP32Link", lambda *_, **__: serial_link)
+    monkeypatch.setattr(operator_service, "load_last_endpoint", lambda: "ws://10.0.0.5:81/ws/cli")
+    monkeypatch.setattr(operator_service, "save_last_endpoint", saved.append)
+    monkeypatch.setattr(operator_service, "clear_last_endpoint", lambda path=None: None)
+    monkeypatch.setattr(operator_service, "discover_wifi_endpoint", lambda **_: "ws://10.0.0.9:81/ws/cli")
+
+    svc = OperatorService(port="socket://stub", control_transport="auto")
+    assert serial_link.calls == 0  # nothing is probed synchronously in the constructor
+
+    svc._startup_result = asyncio.get_running_loop().create_future()
+    probe = asyncio.create_task(svc._initial_probe(startup=True))
+    first = await svc._startup_status()
+
+    assert first is not None and first.data == {"via": "ws://10.0.0.9:81/ws/cli"}
+    assert svc._active_transport == TRANSPORT_WIFI
+    assert svc._transport_endpoints[TRANSPORT_WIFI] == "ws://10.0.0.9:81/ws/cli"
+    assert saved[-1] == "ws://10.0.0.9:81/ws/cli"
+
+    await probe
+    # The slower serial port answered too and stays available as a warm standby.
+    assert serial_link.calls == 1
+    state = {item["id"]: item for item in svc.get_control_state()["transports"]}
+    assert state[TRANSPORT_SERIAL]["available"] is True
+    assert state[TRANSPORT_WIFI]["available"] is True
+    assert svc._active_transport == TRANSPORT_WIFI
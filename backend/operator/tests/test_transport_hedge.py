@@ -0,0 +1,99 @@
+"""Tests for hedged reads across the Wi-Fi and UART transports."""
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+from backend.operator.esp32_link import CommandResult
+from backend.operator.services import operator_service
+from backend.operator.services.operator_service import OperatorService, TRANSPORT_SERIAL, TRANSPORT_WIFI
+from backend.operator.services.transport_hedge import TransportHedger, is_hedgeable
+
+
+class DelayedLink:
+    def __init__(self, endpoint: str, delay: float, payload: dict) -> None:
+        self.requested_port = endpoint
+        self.active_port = endpoint
+        self.delay = delay
+        self.payload = payload
+        self.commands: list[str] = []
+
+    def run_command(self, command: str, **_: object) -> CommandResult:
+        self.commands.append(command)
+        time.sleep(self.delay)
+        return CommandResult(raw=[command], data=dict(self.payload))
+
+    def collect_pending_logs(self) -> list[tuple[float, str]]:  # pragma: no cover - compatibility
+        return []
+
+    def close(self) -> None:  # pragma: no cover - compatibility
+        pass
+
+
+def test_hedge_delay_tracks_p95_within_bounds() -> None:
+    hedger = TransportHedger(default_delay=0.25, min_delay=0.05, max_delay=1.0)
+    assert hedger.delay("wifi", "status") == pytest.approx(0.25)
+    for index in range(20):
+        hedger.observe("wifi", "STATUS", 0.1 if index < 19 else 0.4)
+    assert hedger.delay("wifi", "status") == pytest.approx(0.4)
+    assert hedger.delay("serial", "status") == pytest.approx(0.25)
+    for _ in range(20):
+        hedger.observe("serial", "status", 3.0)
+    assert hedger.delay("serial", "status") == pytest.approx(1.0)
+
+    assert is_hedgeable("SMAP  GET") and is_hedgeable("camcfg ?")
+    assert not is_hedgeable("SMAP SAVE") and not is_hedgeable("camstream on")
+
+
+async def _service(monkeypatch: pytest.MonkeyPatch, wifi: DelayedLink, serial: DelayedLink) -> OperatorService:
+    monkeypatch.setattr(operator_service, "load_wifi_config", lambda: {})
+    monkeypatch.setattr(operator_service, "save_wifi_config", lambda config: None)
+    monkeypatch.setattr(operator_service, "save_last_endpoint", lambda endpoint: None)
+    monkeypatch.setattr(operator_service, "ESP32WSLink", lambda *_, **__: wifi)
+    monkeypatch.setattr(operator_service, "ESP32Link", lambda *_, **__: serial)
+    svc = OperatorService(port="socket://stub", ws_endpoint="ws://stub", control_transport="auto")
+    svc._hedger = TransportHedger(default_delay=0.05, min_delay=0.0)
+    svc._set_active_transport(TRANSPORT_WIFI)
+    return svc
+
+
+@pytest.mark.asyncio
+async def test_stalled_primary_is_hedged_on_standby(monkeypatch: pytest.MonkeyPatch) -> None:
+    wifi = DelayedLink("ws://stub", 0.5, {"via": "wifi"})
+    serial = DelayedLink("socket://stub", 0.0, {"via": "serial"})
+    svc = await _service(monkeypatch, wifi, serial)
+
+    started = time.perf_counter()
+    result = await svc.run_command("status", raise_on_error=False)
+    assert time.perf_counter() - started < 0.4
+    assert result.data == {"via": "serial"}
+    assert svc._active_transport == TRANSPORT_SERIAL
+
+    transports = {item["id"]: item for item in svc.get_control_state()["transports"]}
+    assert transports[TRANSPORT_SERIAL]["hedge"]["hedge_wins"] == 1
+    assert transports[TRANSPORT_SERIAL]["hedge"]["win_rate"] == pytest.approx(1.0)
+    assert transports[TRANSPORT_WIFI]["hedge"]["races"] == 1
+    assert transports[TRANSPORT_WIFI]["hedge"]["wins"] == 0
+
+    # Writes are never duplicated onto the standby, however slow the primary is.
+    await svc.run_command("SMAP SAVE", raise_on_error=False)
+    assert wifi.commands == ["status", "SMAP SAVE"]
+    assert serial.commands == ["status"]
+
+    await asyncio.sleep(0.6)
+    assert not svc._hedge_stragglers
+
+
+@pytest.mark.asyncio
+async def test_fast_primary_is_not_hedged(monkeypatch: pytest.MonkeyPatch) -> None:
+    wifi = DelayedLink("ws://stub", 0.0, {"via": "wifi"})
+    serial = DelayedLink("socket://stub", 0.0, {"via": "serial"})
+    svc = await _service(monkeypatch, wifi, serial)
+
+    result = await svc.run_command("camcfg ?", raise_on_error=False)
+
+    assert result.data == {"via": "wifi"}
+    assert serial.commands == []
+    assert svc._hedger.snapshot(TRANSPORT_WIFI)["races"] == 0
@@ -44,7 +44,7 @@ def test_status_persists_mac_during_auto_mode(monkeypatch: pytest.MonkeyPatch) -
 
     created_links: List[RecordingWSLink] = []
 
-    def make_ws_link(url: str, timeout: float) -> RecordingWSLink:
+    def make_ws_link(url: str, timeout: float, **_: object) -> RecordingWSLink:
         link = RecordingWSLink(url, timeout)
         created_links.append(link)
         return link
@@ -106,4 +106,61 @@ def test_listener_heartbeat_updates_sequence():
     assert link._log_next_seq == 25  # type: ignore[attr-defined]
 
     link._on_listener_message(None, '{"type":"heartbeat","logs_next":30}')  # type: ignore[attr-defined]
-    assert link._log_next_seq == 30  # type: ignore[attr-defined]
\ No newline at end of file
+    assert link._log_next_seq == 30  # type: ignore[attr-defined]
+
+
+def test_fetch_logs_keeps_cursor_untouched(monkeypatch: pytest.MonkeyPatch):
+    link = esp32_ws_link.ESP32WSLink("ws://esp32.local/ws")
+    commands: list[str] = []
+
+    def _fake_run(self, command: str, *, raise_on_error: bool = True):
+        _ = raise_on_error
+        commands.append(command)
+        return CommandResult(raw=["4|[CLI] RX: status", "logs_next=5 logs_count=1 logs_truncated=0"], data={})
+
+    monkeypatch.setattr(link, "run_command", types.MethodType(_fake_run, link))
+
+    dump = link.fetch_logs(3, limit=16)
+
+    assert commands == ["logs since=3 limit=16 ts=1"]
+    assert dump.entries == [(4, "[CLI] RX: status")]
+    assert dump.next_seq == 5
+    assert link._log_next_seq == 0  # type: ignore[attr-defined]
+
+
+def test_commands_reuse_kept_open_socket(patch_websocket, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(esp32_ws_link.websocket, "WebSocketException", RuntimeError, raising=False)
+    link = esp32_ws_link.ESP32WSLink("ws://esp32.local/ws")
+    link.run_command("caps", raise_on_error=False)
+    link.run_command("caps", raise_on_error=False)
+    assert len(patch_websocket) == 1
+
+    class _ClosedSocket(_FakeSocket):
+        def send(self, data: str) -> None:
+            raise OSError("connection reset by peer")
+
+    # The board dropped the idle socket: reconnect once and resend.
+    link._command_ws = _ClosedSocket("")  # type: ignore[attr-defined]
+    result = link.run_command("status", raise_on_error=False)
+    assert result.data["status_ok"] == 1
+    assert len(patch_websocket) == 2
+
+    link.close()
+    assert link._command_ws is None  # type: ignore[attr-defined]
+
+
+def test_receive_failure_on_reused_socket_is_not_resent(patch_websocket, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(esp32_ws_link.websocket, "WebSocketException", RuntimeError, raising=False)
+    link = esp32_ws_link.ESP32WSLink("ws://esp32.local/ws")
+
+    class _DroppedAfterSend(_FakeSocket):
+        def recv(self) -> str:
+            raise OSError("connection reset by peer")
+
+    stale = _DroppedAfterSend("")
+    link._command_ws = stale  # type: ignore[attr-defined]
+    # The board may already have run the command, so it must not run twice.
+    with pytest.raises(esp32_ws_link.SerialNotFoundError):
+        link.run_command("CTRL 10 0 0", raise_on_error=False)
+    assert stale.sent == "CTRL 10 0 0" and stale.closed
+    assert patch_websocket == []
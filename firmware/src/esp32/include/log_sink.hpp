@@ -18,7 +18,8 @@ struct LogDumpResult {
 };
 
 // Dumps log entries newer than since_seq into the provided Stream.
-LogDumpResult log_dump(Stream& io, uint32_t since_seq, size_t limit);
+// With with_timestamps each line carries the capture millis(): "<seq>|<ms>|<text>".
+LogDumpResult log_dump(Stream& io, uint32_t since_seq, size_t limit, bool with_timestamps = false);
 
 // Returns the next log sequence number that will be assigned.
 uint32_t log_sink_next_seq();
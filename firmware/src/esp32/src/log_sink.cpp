@@ -84,7 +84,7 @@ void logf(const char* fmt, ...) {
   append_line(buffer);
 }
 
-LogDumpResult log_dump(Stream& io, uint32_t since_seq, size_t limit) {
+LogDumpResult log_dump(Stream& io, uint32_t since_seq, size_t limit, bool with_timestamps) {
   LogDumpResult result = {g_next_seq, 0, false};
   if (!g_log_mutex) {
     io.println("logs_next=0 logs_count=0 logs_truncated=0");
@@ -107,7 +107,16 @@ LogDumpResult log_dump(Stream& io, uint32_t since_seq, size_t limit) {
   while (available > 0 && emitted < limit) {
     const LogEntry& entry = g_log_entries[index];
     if (entry.seq > since_seq && entry.text[0] != '\0') {
-      io.printf("%lu|%s\n", static_cast<unsigned long>(entry.seq), entry.text);
+      if (with_timestamps) {
+        io.printf(
+          "%lu|%lu|%s\n",
+          static_cast<unsigned long>(entry.seq),
+          static_cast<unsigned long>(entry.timestamp_ms),
+          entry.text
+        );
+      } else {
+        io.printf("%lu|%s\n", static_cast<unsigned long>(entry.seq), entry.text);
+      }
       ++emitted;
       next_seq = entry.seq + 1;
     }
@@ -139,10 +148,11 @@ LogDumpResult log_dump(Stream& io, uint32_t since_seq, size_t limit) {
   result.count = emitted;
   result.truncated = truncated;
   io.printf(
-    "logs_next=%lu logs_count=%u logs_truncated=%u\n",
+    "logs_next=%lu logs_count=%u logs_truncated=%u logs_uptime_ms=%lu\n",
     static_cast<unsigned long>(result.next_seq),
     static_cast<unsigned>(result.count),
-    result.truncated ? 1U : 0U
+    result.truncated ? 1U : 0U,
+    static_cast<unsigned long>(millis())
   );
   return result;
 }
@@ -62,6 +62,7 @@ void loop(){
 #include "wifi_link.hpp"
 #include <freertos/FreeRTOS.h>
 #include <freertos/semphr.h>
+#include "mbedtls/base64.h"
 
 enum BTState { ST_INIT, ST_PICK, ST_GOPLACE, ST_PLACE };
 BTState st = ST_INIT;
@@ -72,6 +73,8 @@ static bool g_uno_ready = false;
 static void process_cli(Stream& io);
 static void cli_execute_unlocked(const String& command, Stream& io);
 static void cli_print_status(Stream& io);
+static void cli_print_status_binary(Stream& io);
+static void cli_print_caps(Stream& io);
 static void cli_print_camcfg(Stream& io);
 static uint32_t g_last_uno_check_ms = 0;
 static SemaphoreHandle_t g_cli_mutex = nullptr;
@@ -658,6 +661,17 @@ static void cli_execute_unlocked(const String& command, Stream& io){
     return;
   }
 
+  if(upper == "STATUS BIN"){
+    // No log_line here: binary status is meant for high-rate polling.
+    cli_print_status_binary(io);
+    return;
+  }
+
+  if(upper == "CAPS"){
+    cli_print_caps(io);
+    return;
+  }
+
   if(upper.startsWith("CAMCFG")){
     String args = command.substring(strlen("CAMCFG"));
     args.trim();
@@ -775,6 +789,7 @@ static void cli_execute_unlocked(const String& command, Stream& io){
     args.trim();
     uint32_t since = 0;
     size_t limit = 64;
+    bool withTimestamps = false;
     bool error = false;
 
     if(args.length()){
@@ -805,6 +820,8 @@ static void cli_execute_unlocked(const String& command, Stream& io){
               break;
             }
             limit = static_cast<size_t>(parsed);
+          }else if(key == "TS"){
+            withTimestamps = value == "1" || value.equalsIgnoreCase("TRUE");
           }else{
             error = true;
             break;
@@ -820,7 +837,7 @@ static void cli_execute_unlocked(const String& command, Stream& io){
       return;
     }
 
-    LogDumpResult dump = log_dump(io, since, limit);
+    LogDumpResult dump = log_dump(io, since, limit, withTimestamps);
     logf(
       "[CLI] logs handled since=%lu limit=%u count=%u truncated=%u",
       static_cast<unsigned long>(since),
@@ -857,91 +874,154 @@ static void cli_execute_unlocked(const String& command, Stream& io){
   log_line("[CLI] unknown command");
 }
 
+// Error bits of the binary status frame; the text reply names the same blocks.
+enum StatusErrorBit : uint16_t {
+  STATUS_ERR_STATUS0 = 1u << 0,
+  STATUS_ERR_STATUS1 = 1u << 1,
+  STATUS_ERR_LINES = 1u << 2,
+  STATUS_ERR_POWER = 1u << 3,
+  STATUS_ERR_SENS = 1u << 4,
+  STATUS_ERR_ODOM = 1u << 5,
+  STATUS_ERR_UNO_MISSING = 1u << 15,
+};
+
+static const uint8_t STATUS_BIN_VERSION = 1;
+static const uint8_t STATUS_FLAG_WIFI = 1u << 0;
+static const uint8_t STATUS_FLAG_CAMERA = 1u << 1;
+
+// Layout mirrored by backend/operator/status_binary.py (little-endian, packed).
+struct StatusBinaryFrame {
+  uint8_t version;
+  uint8_t flags;
+  uint16_t error_bits;
+  uint32_t uptime_ms;
+  uint8_t wifi_ip[4];
+  Status0 s0;
+  Status1 s1;
+  Lines ln;
+  Power pw;
+  DriveFB drv;
+  AuxFB aux;
+  Sens sns;
+  Odom od;
+} __attribute__((packed));
+
+static void cli_collect_status(StatusBinaryFrame& frame){
+  memset(&frame, 0, sizeof(frame));
+  frame.version = STATUS_BIN_VERSION;
+
+  if(g_uno_ready){
+    if(!read_STATUS0(frame.s0)) frame.error_bits |= STATUS_ERR_STATUS0;
+    if(!read_STATUS1(frame.s1)) frame.error_bits |= STATUS_ERR_STATUS1;
+    if(!read_LINES(frame.ln)) frame.error_bits |= STATUS_ERR_LINES;
+    if(!read_POWER(frame.pw)) frame.error_bits |= STATUS_ERR_POWER;
+    bool okDrive = read_DRIVEFB(frame.drv);
+    bool okAux = read_AUXFB(frame.aux);
+    bool okSens = read_SENS(frame.sns);
+    if(!okSens) frame.error_bits |= STATUS_ERR_SENS;
+    if(!read_ODOM(frame.od)) frame.error_bits |= STATUS_ERR_ODOM;
+
+    if(!okDrive) memset(&frame.drv, 0, sizeof(frame.drv));
+    if(!okAux) memset(&frame.aux, 0, sizeof(frame.aux));
+    if(!okSens) memset(&frame.sns, 0, sizeof(frame.sns));
+  }else{
+    frame.error_bits |= STATUS_ERR_UNO_MISSING;
+  }
+
+  if(wifi_is_connected()){
+    frame.flags |= STATUS_FLAG_WIFI;
+    IPAddress ip = wifi_local_ip();
+    for(uint8_t i = 0; i < 4; ++i){
+      frame.wifi_ip[i] = ip[i];
+    }
+  }
+  if(camera_http_is_running()){
+    frame.flags |= STATUS_FLAG_CAMERA;
+  }
+  frame.uptime_ms = millis();
+}
+
 static void cli_print_status(Stream& io){
-  Status0 s0{};
-  Status1 s1{};
-  Lines ln{};
-  Power pw{};
-  DriveFB drv{};
-  AuxFB aux{};
-  Sens sns{};
-  Odom od{};
+  StatusBinaryFrame frame;
+  cli_collect_status(frame);
 
   String err;
-  auto appendErr = [&](const char* tag){
+  auto appendErr = [&](uint16_t bit, const char* tag){
+    if(!(frame.error_bits & bit)) return;
     if(err.length()) err += ',';
     err += tag;
   };
+  appendErr(STATUS_ERR_STATUS0, "STATUS0");
+  appendErr(STATUS_ERR_STATUS1, "STATUS1");
+  appendErr(STATUS_ERR_LINES, "LINES");
+  appendErr(STATUS_ERR_POWER, "POWER");
+  appendErr(STATUS_ERR_SENS, "SENS");
+  appendErr(STATUS_ERR_ODOM, "ODOM");
+  appendErr(STATUS_ERR_UNO_MISSING, "UNO_MISSING");
 
-  if(g_uno_ready){
-    bool ok0 = read_STATUS0(s0);
-    bool ok1 = read_STATUS1(s1);
-    bool okLines = read_LINES(ln);
-    bool okPower = read_POWER(pw);
-    bool okDrive = read_DRIVEFB(drv);
-    bool okAux = read_AUXFB(aux);
-    bool okSens = read_SENS(sns);
-    bool okOdom = read_ODOM(od);
-
-    if(!ok0) appendErr("STATUS0");
-    if(!ok1) appendErr("STATUS1");
-    if(!okLines) appendErr("LINES");
-    if(!okPower) appendErr("POWER");
-    if(!okSens) appendErr("SENS");
-    if(!okOdom) appendErr("ODOM");
-
-    if(!okDrive) memset(&drv, 0, sizeof(drv));
-    if(!okAux) memset(&aux, 0, sizeof(aux));
-    if(!okSens) memset(&sns, 0, sizeof(sns));
-  }else{
-    appendErr("UNO_MISSING");
-    memset(&s0, 0, sizeof(s0));
-    memset(&s1, 0, sizeof(s1));
-    memset(&ln, 0, sizeof(ln));
-    memset(&pw, 0, sizeof(pw));
-    memset(&drv, 0, sizeof(drv));
-    memset(&aux, 0, sizeof(aux));
-    memset(&sns, 0, sizeof(sns));
-    memset(&od, 0, sizeof(od));
-  }
-
-  bool wifiConnected = wifi_is_connected();
-  IPAddress ip = wifi_local_ip();
-  String ipStr = ip.toString();
+  bool wifiConnected = frame.flags & STATUS_FLAG_WIFI;
+  String ipStr = IPAddress(frame.wifi_ip[0], frame.wifi_ip[1], frame.wifi_ip[2], frame.wifi_ip[3]).toString();
 
   if(err.length()){
     io.printf("status_error=%s ", err.c_str());
   }
 
   io.printf(
-    "state_id=%u seq_ack=%u err_flags=0x%04X elev_mm=%d grip_deg=%d line_left=%u line_right=%u line_thr=%u vbatt_mV=%u mps=%u estop=%u drive_left=%u drive_right=%u drive_res1=%u drive_res2=%u aux_lift=%u aux_grip=%u grip_enc=%d lift_enc=%d odo_left=%ld odo_right=%ld wifi_connected=%s wifi_ip=%s cam_streaming=%s\n",
-    s0.state_id,
-    s0.seq_ack,
-    s0.err_flags,
-    s1.elev_mm,
-    s1.grip_deg,
-    ln.L,
-    ln.R,
-    ln.thr,
-    pw.vbatt_mV,
-    pw.mps,
-    pw.estop,
-    drv.left_us,
-    drv.right_us,
-    drv.res1,
-    drv.res2,
-    aux.lift,
-    aux.grip,
-    sns.grip_enc_cnt,
-    sns.lift_enc_cnt,
-    (long)od.L,
-    (long)od.R,
+    "state_id=%u seq_ack=%u err_flags=0x%04X elev_mm=%d grip_deg=%d line_left=%u line_right=%u line_thr=%u vbatt_mV=%u mps=%u estop=%u drive_left=%u drive_right=%u drive_res1=%u drive_res2=%u aux_lift=%u aux_grip=%u grip_enc=%d lift_enc=%d odo_left=%ld odo_right=%ld wifi_connected=%s wifi_ip=%s cam_streaming=%s uptime_ms=%lu\n",
+    frame.s0.state_id,
+    frame.s0.seq_ack,
+    frame.s0.err_flags,
+    frame.s1.elev_mm,
+    frame.s1.grip_deg,
+    frame.ln.L,
+    frame.ln.R,
+    frame.ln.thr,
+    frame.pw.vbatt_mV,
+    frame.pw.mps,
+    frame.pw.estop,
+    frame.drv.left_us,
+    frame.drv.right_us,
+    frame.drv.res1,
+    frame.drv.res2,
+    frame.aux.lift,
+    frame.aux.grip,
+    frame.sns.grip_enc_cnt,
+    frame.sns.lift_enc_cnt,
+    (long)frame.od.L,
+    (long)frame.od.R,
     wifiConnected ? "true" : "false",
     (wifiConnected ? ipStr.c_str() : ""),
-    camera_http_is_running() ? "true" : "false"
+    (frame.flags & STATUS_FLAG_CAMERA) ? "true" : "false",
+    static_cast<unsigned long>(frame.uptime_ms)
   );
 }
 
+static void cli_print_status_binary(Stream& io){
+  StatusBinaryFrame frame;
+  cli_collect_status(frame);
+
+  // base64 keeps the reply a single text line, so the UART/WS framing stays unchanged.
+  unsigned char encoded[((sizeof(frame) + 2) / 3) * 4 + 1];
+  size_t written = 0;
+  int rc = mbedtls_base64_encode(
+    encoded,
+    sizeof(encoded),
+    &written,
+    reinterpret_cast<const unsigned char*>(&frame),
+    sizeof(frame)
+  );
+  if(rc != 0){
+    io.println("statusb_error=ENCODE");
+    return;
+  }
+  encoded[written] = '\0';
+  io.printf("statusb=%s\n", reinterpret_cast<const char*>(encoded));
+}
+
+static void cli_print_caps(Stream& io){
+  io.println("caps=status_bin,logs_ts status_bin_version=1");
+}
+
 static void cli_print_camcfg(Stream& io){
   CameraHttpConfig cfg = camera_http_get_config();
   const char* name = camera_http_resolution_name(cfg.frame_size);
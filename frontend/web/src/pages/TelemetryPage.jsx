@@ -1,9 +1,15 @@
+import { useEffect } from "react";
 import TelemetryChart from "../components/TelemetryChart.jsx";
 import { METRIC_CONFIG } from "../constants.js";
 import { useOperator } from "../state/OperatorProvider.jsx";
 
 export default function TelemetryPage() {
-  const { telemetrySamples } = useOperator();
+  const { telemetrySamples, setTelemetryLive } = useOperator();
+
+  useEffect(() => {
+    setTelemetryLive(true);
+    return () => setTelemetryLive(false);
+  }, [setTelemetryLive]);
 
   return (
     <section className="tab-content active" data-tab-content="telemetry">
@@ -21,6 +21,7 @@ const OperatorContext = createContext(null);
 const TELEMETRY_WS_PATH = "/ws/telemetry";
 const CAMERA_WS_PATH = "/ws/camera";
 const LOG_WS_PATH = "/ws/logs";
+const COMMAND_WS_PATH = "/ws/command";
 const CAMERA_DISABLED_MESSAGE = "Camera stream disabled. Use Enable Stream above.";
 
 function withBase(path) {
@@ -371,11 +372,16 @@ export function OperatorProvider({ children }) {
   const telemetrySocketRef = useRef(null);
   const telemetryReconnectRef = useRef(null);
   const lastTelemetryErrorRef = useRef(null);
+  const telemetryLiveRef = useRef(false);
   const cameraSocketRef = useRef(null);
   const cameraReconnectRef = useRef(null);
   const cameraStreamDesiredRef = useRef(false);
   const logSocketRef = useRef(null);
   const logReconnectRef = useRef(null);
+  const commandSocketRef = useRef(null);
+  const commandPendingRef = useRef(new Map());
+  const commandSeqRef = useRef(0);
+  const commandSocketFailedAtRef = useRef(0);
   const [logEntries, setLogEntries] = useState([]);
   const [logFilters, setLogFilters] = useState({ search: "", source: "all", device: "all", parameter: "all" });
   const [logSort, setLogSort] = useState({ column: "timestamp", direction: "desc" });
@@ -388,6 +394,9 @@ export function OperatorProvider({ children }) {
     if (cameraReconnectRef.current) clearTimeout(cameraReconnectRef.current);
     if (logSocketRef.current) logSocketRef.current.close();
     if (logReconnectRef.current) clearTimeout(logReconnectRef.current);
+    if (commandSocketRef.current) {
+      commandSocketRef.current.then((socket) => socket.close()).catch(() => {});
+    }
   }, []);
 
   const clearToastTimer = useCallback((id) => {
@@ -782,15 +791,86 @@ export function OperatorProvider({ children }) {
     [wifiConfig, requestJson, showToast, fetchServiceInfo, fetchControlState, fetchDiagnostics]
   );
 
+  const openCommandSocket = useCallback(() => {
+    if (commandSocketRef.current) {
+      return commandSocketRef.current;
+    }
+    const opening = new Promise((resolve, reject) => {
+      const socket = new WebSocket(buildWsUrl(COMMAND_WS_PATH));
+      let opened = false;
+      socket.addEventListener("open", () => {
+        opened = true;
+        commandSocketFailedAtRef.current = 0;
+        resolve(socket);
+      });
+      socket.addEventListener("message", (event) => {
+        let payload;
+        try {
+          payload = JSON.parse(event.data);
+        } catch (error) {
+          console.error("Command channel parse error:", error);
+          return;
+        }
+        const entry = commandPendingRef.current.get(payload?.id);
+        if (!entry) {
+          return;
+        }
+        if (payload.type === "line") {
+          entry.onLine?.(payload.line);
+          return;
+        }
+        commandPendingRef.current.delete(payload.id);
+        if (payload.type === "result") {
+          entry.resolve({ command: payload.command, raw: payload.raw, data: payload.data });
+        } else {
+          entry.reject(new Error(payload.error || "Command failed"));
+        }
+      });
+      socket.addEventListener("close", () => {
+        commandSocketRef.current = null;
+        if (!opened) {
+          commandSocketFailedAtRef.current = Date.now();
+        }
+        reject(new Error("Command channel closed"));
+        // Commands already sent are not retried: a motion command must not run twice.
+        commandPendingRef.current.forEach((entry) => entry.reject(new Error("Command channel closed")));
+        commandPendingRef.current.clear();
+      });
+      socket.addEventListener("error", (event) => {
+        console.error("Command WebSocket error:", event);
+        socket.close();
+      });
+    });
+    commandSocketRef.current = opening;
+    return opening;
+  }, []);
+
   const sendCommand = useCallback(
-    async (command, raiseOnError = false) => {
-      return requestJson("/api/command", {
-        method: "POST",
-        headers: { "Content-Type": "application/json" },
-        body: JSON.stringify({ command, raise_on_error: raiseOnError }),
+    async (command, raiseOnError = false, { onLine } = {}) => {
+      let socket = null;
+      // Right after a failed handshake use HTTP instead of waiting for another one.
+      if (Date.now() - commandSocketFailedAtRef.current >= WS_RECONNECT_DELAY_MS) {
+        try {
+          socket = await openCommandSocket();
+        } catch (error) {
+          socket = null;
+        }
+      }
+      if (!socket || socket.readyState !== WebSocket.OPEN) {
+        return requestJson("/api/command", {
+          method: "POST",
+          headers: { "Content-Type": "application/json" },
+          body: JSON.stringify({ command, raise_on_error: raiseOnError }),
+        });
+      }
+      commandSeqRef.current += 1;
+      const id = commandSeqRef.current;
+      return new Promise((resolve, reject) => {
+        commandPendingRef.current.set(id, { resolve, reject, onLine });
+        socket.send(JSON.stringify({ id, command, raise_on_error: raiseOnError }));
       });
     },
-    [requestJson]
+    [openCommandSocket, requestJson]
   );
 
   const startTask = useCallback(
@@ -813,7 +893,13 @@ export function OperatorProvider({ children }) {
   const executeRawCommand = useCallback(
     async (command) => {
       try {
-        const result = await sendCommand(command, false);
+        const lines = [];
+        const result = await sendCommand(command, false, {
+          onLine: (line) => {
+            lines.push(line);
+            setCommandOutput(lines.join("\n"));
+          },
+        });
         setCommandOutput(JSON.stringify(result, null, 2));
         showToast("Command executed", "success");
         fetchDiagnostics();
@@ -1073,6 +1159,9 @@ export function OperatorProvider({ children }) {
     socket.addEventListener("open", () => {
       setHeaderStatus((prev) => ({ ...prev, phase: "ready" }));
       showToast("WebSocket connected", "success");
+      if (telemetryLiveRef.current) {
+        socket.send(JSON.stringify({ live: true }));
+      }
     });
     socket.addEventListener("message", (event) => {
       try {
@@ -1112,6 +1201,15 @@ export function OperatorProvider({ children }) {
     });
   }, [addTelemetrySample, showToast]);
 
+  // The backend polls at its live rate while a live telemetry view is open.
+  const setTelemetryLive = useCallback((live) => {
+    telemetryLiveRef.current = live;
+    const socket = telemetrySocketRef.current;
+    if (socket && socket.readyState === WebSocket.OPEN) {
+      socket.send(JSON.stringify({ live }));
+    }
+  }, []);
+
   const connectCameraSocket = useCallback(() => {
     if (cameraSocketRef.current || !cameraStreamDesiredRef.current) {
       return;
@@ -1328,6 +1426,7 @@ export function OperatorProvider({ children }) {
       wifiLoading,
       wifiSaving,
       telemetrySamples,
+      setTelemetryLive,
       commandOutput,
       toasts,
       showToast,
@@ -1385,6 +1484,7 @@ export function OperatorProvider({ children }) {
       wifiLoading,
       wifiSaving,
       telemetrySamples,
+      setTelemetryLive,
       commandOutput,
       toasts,
       showToast,